@@ -30,6 +30,7 @@ import networkx as nx
 # Import our custom modules
 from supabase_client import is_connected, get_content_inventory
 from content_evaluation import ContentEvaluation
+from evaluation_index import EVALUATION_INDEX_PATH, load_current_evaluations
 from source_evaluation import parse_sources_from_markdown, evaluate_sources
 
 # Configure logging
@@ -50,15 +51,16 @@ os.makedirs('dashboard_static/images', exist_ok=True)
 class Dashboard:
     """Dashboard class for content metrics."""
     
-    def __init__(self, content_dir: str = 'generated_content'):
+    def __init__(self, content_dir: str = 'generated_content', index_path: str = EVALUATION_INDEX_PATH):
         """Initialize dashboard.
         
         Args:
             content_dir: Directory containing generated content
+            index_path: Path to the content evaluation index
         """
         self.content_dir = content_dir
+        self.index_path = index_path
         self.content_files = self._get_content_files()
-        self.evaluation_files = self._get_evaluation_files()
         self.content_inventory = self._get_content_inventory()
         self.evaluations = self._load_evaluations()
         self.content_df = self._create_content_dataframe()
@@ -71,14 +73,6 @@ class Dashboard:
         """
         return glob.glob(os.path.join(self.content_dir, '*.md'))
     
-    def _get_evaluation_files(self) -> List[str]:
-        """Get list of evaluation files.
-        
-        Returns:
-            List of evaluation file paths
-        """
-        return glob.glob(os.path.join(self.content_dir, '*.md.evaluation.json'))
-    
     def _get_content_inventory(self) -> List[Dict]:
         """Get content inventory from Supabase.
         
@@ -97,19 +91,7 @@ class Dashboard:
         Returns:
             Dictionary of content evaluations by content ID
         """
-        evaluations = {}
-        
-        for eval_file in self.evaluation_files:
-            try:
-                with open(eval_file, 'r') as f:
-                    evaluation = json.load(f)
-                    content_id = evaluation.get('content_id')
-                    if content_id:
-                        evaluations[content_id] = evaluation
-            except Exception as e:
-                logger.error(f"Error loading evaluation file {eval_file}: {str(e)}")
-        
-        return evaluations
+        return load_current_evaluations(self.content_files, self.index_path)
     
     def _create_content_dataframe(self) -> pd.DataFrame:
         """Create DataFrame with content data.
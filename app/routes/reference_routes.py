@@ -8,8 +8,10 @@ quality assessments, and linking references to content items.
 
 import json
 import logging
+import threading
 from datetime import datetime
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from markupsafe import Markup
 
 from reference_management.reference_management import (
     Reference, ReferenceQuality, ContentReference,
@@ -17,7 +19,10 @@ from reference_management.reference_management import (
     create_quality_assessment, update_quality_assessment,
     link_reference_to_content, get_content_references,
     get_reference_categories, get_reference_types,
-    search_references, get_reference_statistics
+    search_references, get_reference_statistics, get_search_index,
+    get_citation_index, get_citing_content, get_cited_references,
+    get_co_cited_references, get_shared_references, get_reference_impact,
+    find_near_duplicate_reference
 )
 
 # Configure logging
@@ -87,8 +92,7 @@ def reference_detail(reference_id):
     ref_types = get_reference_types()
 
     # Get linked content
-    # This would require a new function to get content items linked to a reference
-    linked_content = []  # Placeholder
+    linked_content = [{'content_id': content_id} for content_id in get_citing_content(reference_id)]
 
     return render_template(
         'reference_detail.html',
@@ -168,6 +172,9 @@ def new_reference():
                 )
                 ref.quality_assessment = assessment
 
+            # The reference is still created, but the user is pointed at a likely duplicate
+            duplicate = find_near_duplicate_reference(ref.to_dict())
+
             reference_id = create_reference(ref)
             if not reference_id:
                 flash('Failed to create reference', 'error')
@@ -176,6 +183,12 @@ def new_reference():
                 return render_template('reference_form.html', reference=ref, categories=cats, types=ref_types)
 
             flash(f'Reference created: {title}', 'success')
+            if duplicate:
+                duplicate_id, similarity = duplicate
+                flash(Markup('This may duplicate an <a href="{}">existing reference</a> '
+                             '(similarity {:.2f}); deactivate one of them if so.').format(
+                    url_for('reference_management.reference_detail', reference_id=duplicate_id), similarity),
+                    'warning')
             return redirect(url_for('reference_management.reference_detail', reference_id=reference_id))
 
         except Exception as e:
@@ -395,6 +408,82 @@ def update_reference_status(reference_id):
         logger.error(f"Error updating reference status: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
 
+def parse_limit(name, default):
+    """Get a non-negative integer query parameter, falling back to a default."""
+    try:
+        return max(0, int(request.args.get(name, default)))
+    except ValueError:
+        return default
+
+@reference_bp.route('/api/references/<reference_id>/citing-content', methods=['GET'])
+def api_citing_content(reference_id):
+    """API endpoint for the content items that cite a reference."""
+    if get_citation_index() is None:
+        return jsonify({'success': False, 'error': 'Citation index unavailable'})
+
+    content_ids = get_citing_content(reference_id)
+    return jsonify({'success': True, 'reference_id': reference_id, 'content_ids': content_ids})
+
+@reference_bp.route('/api/content/<content_id>/cited-references', methods=['GET'])
+def api_cited_references(content_id):
+    """API endpoint for the references a content item cites."""
+    if get_citation_index() is None:
+        return jsonify({'success': False, 'error': 'Citation index unavailable'})
+
+    reference_ids = get_cited_references(content_id)
+    return jsonify({'success': True, 'content_id': content_id, 'reference_ids': reference_ids})
+
+@reference_bp.route('/api/references/<reference_id>/co-cited', methods=['GET'])
+def api_co_cited_references(reference_id):
+    """API endpoint for the references most often cited together with a reference."""
+    if get_citation_index() is None:
+        return jsonify({'success': False, 'error': 'Citation index unavailable'})
+
+    co_cited = get_co_cited_references(reference_id, parse_limit('limit', 10))
+    return jsonify({
+        'success': True,
+        'reference_id': reference_id,
+        'references': [{'reference_id': ref_id, 'count': count} for ref_id, count in co_cited]
+    })
+
+@reference_bp.route('/api/sections/<section>/shared-references', methods=['GET'])
+def api_shared_references(section):
+    """API endpoint for the references cited by several content items of a section."""
+    if get_citation_index() is None:
+        return jsonify({'success': False, 'error': 'Citation index unavailable'})
+
+    from core.supabase_client import get_content_inventory
+    content_ids = [item['content_id'] for item in get_content_inventory(section=section) or []]
+
+    shared = get_shared_references(content_ids, max(1, parse_limit('min_count', 2)))
+    return jsonify({
+        'success': True,
+        'section': section,
+        'content_count': len(content_ids),
+        'references': [{'reference_id': ref_id, 'count': count} for ref_id, count in shared]
+    })
+
+@reference_bp.route('/api/references/impact', methods=['GET'])
+def api_reference_impact():
+    """API endpoint for what retiring one or more references would affect.
+
+    Reference IDs are given as repeated or comma-separated ids parameters.
+    """
+    reference_ids = [ref_id.strip() for value in request.args.getlist('ids')
+                     for ref_id in value.split(',') if ref_id.strip()]
+    if not reference_ids:
+        return jsonify({'success': False, 'error': 'No reference IDs given'})
+
+    impact = get_reference_impact(reference_ids)
+    if not impact:
+        return jsonify({'success': False, 'error': 'Citation index unavailable'})
+
+    return jsonify({'success': True, **impact})
+
 def init_app(app):
     """Initialize the reference management routes with the Flask app."""
     app.register_blueprint(reference_bp)
+
+    # Load the search and citation indexes in the background so the first query is fast
+    threading.Thread(target=get_search_index, daemon=True).start()
+    threading.Thread(target=get_citation_index, daemon=True).start()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Evaluate the quality of all generated content into the evaluation index.
+
+This script evaluates every markdown file in the content directory across a
+process pool and records the results in the SQLite evaluation index that the
+dashboard reads. Files whose content hash (and evaluator version) match the
+indexed evaluation are skipped, so a re-run only evaluates new or changed
+content.
+"""
+
+import os
+import sys
+import logging
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Import our custom modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'quality'))
+from evaluation_index import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Find clusters of near-duplicate references in the database.
+
+This script builds a MinHash/LSH index over the title, authors and
+publication of every reference, groups near-duplicates into clusters, and
+reports them. Optionally, all but the oldest reference in each cluster can be
+deactivated.
+"""
+
+import json
+import logging
+import argparse
+import datetime
+from typing import List, Dict, Any
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Import our custom modules
+from core.supabase_client import supabase, is_connected
+from reference_management.reference_management import iter_reference_pages
+from reference_management.reference_minhash import ReferenceLSHIndex, NEAR_DUPLICATE_THRESHOLD
+
+# Number of references deactivated per request
+DEACTIVATE_CHUNK_SIZE = 200
+
+def find_duplicate_clusters(threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Find clusters of near-duplicate references.
+
+    Args:
+        threshold: Estimated Jaccard similarity for two references to be near-duplicates
+
+    Returns:
+        List of clusters; each has the canonical (oldest) reference and its duplicates
+    """
+    index = ReferenceLSHIndex(threshold=threshold)
+    references = {}
+
+    for page in iter_reference_pages(page_size=1000, is_active=True,
+                                     columns='id, title, authors, publication_name, publication_date, created_at'):
+        index.add_many(page)
+        for reference in page:
+            references[reference['id']] = reference
+
+    logger.info(f"Indexed {len(index)} references")
+
+    clusters = []
+    for members in index.find_clusters():
+        ordered = sorted((references[reference_id] for reference_id in members),
+                         key=lambda ref: (ref.get('created_at') or '', ref['id']))
+        clusters.append({
+            'canonical': ordered[0],
+            'duplicates': ordered[1:]
+        })
+
+    logger.info(f"Found {len(clusters)} clusters with {sum(len(c['duplicates']) for c in clusters)} duplicates")
+    return clusters
+
+def deactivate_duplicates(clusters: List[Dict[str, Any]]) -> int:
+    """
+    Deactivate every non-canonical reference in the clusters.
+
+    Args:
+        clusters: Clusters from find_duplicate_clusters()
+
+    Returns:
+        Number of references deactivated
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return 0
+
+    duplicate_ids = [ref['id'] for cluster in clusters for ref in cluster['duplicates']]
+    now = datetime.datetime.now().isoformat()
+
+    deactivated = 0
+    for start in range(0, len(duplicate_ids), DEACTIVATE_CHUNK_SIZE):
+        chunk = duplicate_ids[start:start + DEACTIVATE_CHUNK_SIZE]
+        try:
+            result = supabase.table('reference_sources').update({
+                'is_active': False,
+                'updated_at': now
+            }).in_('id', chunk).execute()
+            deactivated += len(result.data) if result.data else 0
+
+        except Exception as e:
+            logger.error(f"Error deactivating {len(chunk)} references: {str(e)}")
+
+    logger.info(f"Deactivated {deactivated} duplicate references")
+    return deactivated
+
+def format_clusters(clusters: List[Dict[str, Any]]) -> str:
+    """
+    Format clusters as a report.
+
+    Args:
+        clusters: Clusters from find_duplicate_clusters()
+
+    Returns:
+        Multi-line report string
+    """
+    lines = [f"Found {len(clusters)} clusters of near-duplicate references"]
+    for number, cluster in enumerate(clusters, 1):
+        canonical = cluster['canonical']
+        lines.append(f"\n{number}. {canonical.get('title', '')} ({canonical['id']})")
+        for duplicate in cluster['duplicates']:
+            lines.append(f"   - {duplicate.get('title', '')} ({duplicate['id']})")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find clusters of near-duplicate references.")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        help="Estimated similarity for references to count as duplicates")
+    parser.add_argument("--output", help="Write the clusters to this JSON file")
+    parser.add_argument("--deactivate", action="store_true",
+                        help="Deactivate all but the oldest reference in each cluster")
+
+    args = parser.parse_args()
+
+    clusters = find_duplicate_clusters(args.threshold)
+    print(format_clusters(clusters))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(clusters, f, indent=2, default=str)
+        print(f"\nClusters written to {args.output}")
+
+    if args.deactivate and clusters:
+        deactivated = deactivate_duplicates(clusters)
+        print(f"\nDeactivated {deactivated} duplicate references")
@@ -2,15 +2,20 @@
 """
 Process all existing references in the database using AI.
 
-This script retrieves all references from the database and processes them
-using AI to improve their structure, validation, and formatting.
+This script pages through the references in the database and processes them
+using AI to improve their structure, validation, and formatting. References
+are read with keyset pagination, processed concurrently under the model's
+rate limiter, and written back one page at a time. The last completed page is
+checkpointed so an interrupted run can be resumed.
 """
 
 import os
+import json
 import logging
 import argparse
 import datetime
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Configure logging
@@ -21,105 +26,108 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # Import our custom modules
-from supabase_client import supabase, is_connected
 from ai_reference_processor import process_reference_with_ai
-from reference_management import Reference, update_reference
+from reference_management import Reference, iter_reference_pages, bulk_update_references
+from core.rate_limiter import get_rate_limiter
 
-def get_all_references(limit: int = 0, offset: int = 0) -> List[Dict[str, Any]]:
+# Default location of the resume checkpoint
+DEFAULT_CHECKPOINT_FILE = "reference_processing_checkpoint.json"
+
+def parse_metadata(reference: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Get all references from the database.
-    
+    Get the metadata of a reference as a dictionary.
+
     Args:
-        limit: Maximum number of references to retrieve (0 for all)
-        offset: Offset for pagination
-        
+        reference: Reference dictionary
+
     Returns:
-        List of reference dictionaries
+        Metadata dictionary (empty if missing or invalid)
     """
-    if not is_connected():
-        logger.error("Not connected to Supabase")
-        return []
-    
-    try:
-        query = supabase.table('reference_sources').select('*')
-        
-        if limit > 0:
-            query = query.limit(limit)
-        
-        if offset > 0:
-            query = query.offset(offset)
-        
-        result = query.execute()
-        
-        return result.data if result.data else []
-    
-    except Exception as e:
-        logger.error(f"Error getting references: {str(e)}")
-        return []
+    metadata = reference.get('metadata') or {}
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except json.JSONDecodeError:
+            metadata = {}
+    return metadata if isinstance(metadata, dict) else {}
 
-def process_reference(reference: Dict[str, Any], model_name: str = "gemini-1.5-flash") -> bool:
+def build_reference_text(reference: Dict[str, Any]) -> str:
     """
-    Process a reference using AI and update it in the database.
-    
+    Get the text to send to the AI for a reference.
+
+    Args:
+        reference: Reference dictionary
+
+    Returns:
+        The stored citation, or one constructed from the available fields
+    """
+    reference_text = reference.get('content', '')
+    if reference_text:
+        return reference_text
+
+    # If no content, try to construct a reference text from the available fields
+    title = reference.get('title', '')
+    authors = reference.get('authors', '')
+    publication_date = reference.get('publication_date', '')
+    publication_name = reference.get('publication_name', '')
+    url = reference.get('url', '')
+    doi = reference.get('doi', '')
+
+    if publication_date and isinstance(publication_date, str):
+        # Try to extract year from ISO date
+        try:
+            year = datetime.datetime.fromisoformat(publication_date).year
+        except (ValueError, TypeError):
+            year = publication_date[:4] if len(publication_date) >= 4 else ''
+    else:
+        year = ''
+
+    # Construct a reference text
+    reference_text = f"{authors}"
+    if year:
+        reference_text += f" ({year})."
+    else:
+        reference_text += "."
+
+    reference_text += f" {title}."
+    if publication_name:
+        reference_text += f" {publication_name}."
+    if doi:
+        reference_text += f" doi:{doi}"
+    elif url:
+        reference_text += f" {url}"
+
+    return reference_text
+
+def build_processed_reference(reference: Dict[str, Any], model_name: str = "gemini-1.5-flash") -> Optional[Reference]:
+    """
+    Process a reference using AI without writing it to the database.
+
     Args:
         reference: Reference dictionary
         model_name: Model name to use for processing
-        
+
     Returns:
-        True if successful, False otherwise
+        The updated Reference, or None if it could not be processed
     """
     reference_id = reference.get('id')
     if not reference_id:
         logger.error("Reference ID is required")
-        return False
-    
-    # Get the reference text to process
-    reference_text = reference.get('content', '')
-    if not reference_text:
-        # If no content, try to construct a reference text from the available fields
-        title = reference.get('title', '')
-        authors = reference.get('authors', '')
-        publication_date = reference.get('publication_date', '')
-        publication_name = reference.get('publication_name', '')
-        url = reference.get('url', '')
-        doi = reference.get('doi', '')
-        
-        if publication_date and isinstance(publication_date, str):
-            # Try to extract year from ISO date
-            try:
-                year = datetime.datetime.fromisoformat(publication_date).year
-            except (ValueError, TypeError):
-                year = publication_date[:4] if len(publication_date) >= 4 else ''
-        else:
-            year = ''
-        
-        # Construct a reference text
-        reference_text = f"{authors}"
-        if year:
-            reference_text += f" ({year})."
-        else:
-            reference_text += "."
-        
-        reference_text += f" {title}."
-        if publication_name:
-            reference_text += f" {publication_name}."
-        if doi:
-            reference_text += f" doi:{doi}"
-        elif url:
-            reference_text += f" {url}"
-    
+        return None
+
+    reference_text = build_reference_text(reference)
     if not reference_text:
         logger.error(f"No reference text available for reference {reference_id}")
-        return False
-    
+        return None
+
     try:
         # Process the reference with AI
         processed = process_reference_with_ai(reference_text, model_name)
-        
+
         if not processed.get('is_valid_reference', False):
             logger.warning(f"AI determined reference {reference_id} is not valid: {processed.get('title', '')}")
-            return False
-        
+            return None
+
         # Create a Reference object with the processed data
         ref = Reference(
             reference_id=reference_id,
@@ -136,56 +144,112 @@ def process_reference(reference: Dict[str, Any], model_name: str = "gemini-1.5-f
             is_active=reference.get('is_active', True),
             created_by=reference.get('created_by', 'system')
         )
-        
-        # Update metadata
-        metadata = reference.get('metadata', {})
-        if isinstance(metadata, str):
-            import json
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError:
-                metadata = {}
-        
+        ref.created_at = reference.get('created_at') or ref.created_at
+
         # Add AI processing metadata
-        ai_metadata = {
+        metadata = parse_metadata(reference)
+        metadata.update({
             'ai_processed': True,
             'processing_date': datetime.datetime.now().isoformat(),
             'model_used': model_name,
             'confidence_score': processed.get('confidence_score', 0),
             'verification': processed.get('verification', {})
-        }
-        
-        # Merge metadata
-        if isinstance(metadata, dict):
-            metadata.update(ai_metadata)
-        else:
-            metadata = ai_metadata
-        
+        })
         ref.metadata = metadata
-        
-        # Update the reference in the database
-        success = update_reference(ref)
-        
-        if success:
-            logger.info(f"Successfully processed and updated reference {reference_id}")
-        else:
-            logger.error(f"Failed to update reference {reference_id}")
-        
-        return success
-    
+
+        return ref
+
     except Exception as e:
         logger.error(f"Error processing reference {reference_id}: {str(e)}")
+        return None
+
+def process_reference(reference: Dict[str, Any], model_name: str = "gemini-1.5-flash") -> bool:
+    """
+    Process a reference using AI and update it in the database.
+
+    Args:
+        reference: Reference dictionary
+        model_name: Model name to use for processing
+
+    Returns:
+        True if successful, False otherwise
+    """
+    ref = build_processed_reference(reference, model_name)
+    if not ref:
         return False
 
-def process_all_references(model_name: str = "gemini-1.5-flash", batch_size: int = 10, max_references: int = 0) -> Dict[str, int]:
+    success = bulk_update_references([ref]) == 1
+
+    if success:
+        logger.info(f"Successfully processed and updated reference {ref.reference_id}")
+    else:
+        logger.error(f"Failed to update reference {ref.reference_id}")
+
+    return success
+
+def load_checkpoint(checkpoint_file: str) -> Dict[str, Any]:
+    """
+    Load a processing checkpoint.
+
+    Args:
+        checkpoint_file: Path to the checkpoint file
+
+    Returns:
+        Checkpoint dictionary (empty if there is no usable checkpoint)
+    """
+    if not checkpoint_file or not os.path.exists(checkpoint_file):
+        return {}
+
+    try:
+        with open(checkpoint_file, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {checkpoint_file}: {str(e)}")
+        return {}
+
+def save_checkpoint(checkpoint_file: str, last_id: str, stats: Dict[str, int], model_name: str) -> None:
+    """
+    Save a processing checkpoint.
+
+    The file is replaced atomically so an interrupted write never leaves a
+    truncated checkpoint behind.
+
+    Args:
+        checkpoint_file: Path to the checkpoint file
+        last_id: ID of the last reference whose page was fully written
+        stats: Processing statistics so far
+        model_name: Model name used for processing
+    """
+    if not checkpoint_file:
+        return
+
+    checkpoint = {
+        'last_id': last_id,
+        'stats': stats,
+        'model': model_name,
+        'updated_at': datetime.datetime.now().isoformat()
+    }
+
+    temp_file = f"{checkpoint_file}.tmp"
+    with open(temp_file, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temp_file, checkpoint_file)
+
+def process_all_references(model_name: str = "gemini-1.5-flash", batch_size: int = 100, max_references: int = 0,
+                           max_workers: Optional[int] = None, checkpoint_file: Optional[str] = DEFAULT_CHECKPOINT_FILE,
+                           resume: bool = False) -> Dict[str, int]:
     """
     Process all references in the database using AI.
-    
+
     Args:
         model_name: Model name to use for processing
-        batch_size: Number of references to process in each batch
+        batch_size: Number of references to read and write per page
         max_references: Maximum number of references to process (0 for all)
-        
+        max_workers: Number of references processed at once (defaults to the
+            rate limiter's maximum concurrency for the model)
+        checkpoint_file: Path of the checkpoint file (None to disable)
+        resume: Whether to continue after the last checkpointed reference
+
     Returns:
         Dictionary with processing statistics
     """
@@ -195,88 +259,95 @@ def process_all_references(model_name: str = "gemini-1.5-flash", batch_size: int
         'failed': 0,
         'skipped': 0
     }
-    
-    # Get total count of references
-    total_references = len(get_all_references())
-    stats['total'] = total_references
-    
-    logger.info(f"Found {total_references} references in the database")
-    
-    if max_references > 0 and max_references < total_references:
-        logger.info(f"Processing only {max_references} references")
-        total_references = max_references
-    
-    # Process references in batches
-    offset = 0
-    while offset < total_references:
-        # Calculate batch size
-        current_batch_size = min(batch_size, total_references - offset)
-        
-        # Get batch of references
-        references = get_all_references(limit=current_batch_size, offset=offset)
-        
-        if not references:
-            break
-        
-        logger.info(f"Processing batch of {len(references)} references (offset: {offset})")
-        
-        # Process each reference in the batch
-        for reference in references:
-            reference_id = reference.get('id', 'Unknown')
-            logger.info(f"Processing reference {reference_id}")
-            
-            # Check if reference has already been processed
-            metadata = reference.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except json.JSONDecodeError:
-                    metadata = {}
-            
-            if isinstance(metadata, dict) and metadata.get('ai_processed', False):
-                logger.info(f"Skipping already processed reference {reference_id}")
-                stats['skipped'] += 1
-                continue
-            
-            # Process the reference
-            success = process_reference(reference, model_name)
-            
-            if success:
-                stats['processed'] += 1
-            else:
-                stats['failed'] += 1
-        
-        # Update offset for next batch
-        offset += len(references)
-        
-        logger.info(f"Processed {offset}/{total_references} references")
-    
+
+    last_id = None
+    if resume:
+        checkpoint = load_checkpoint(checkpoint_file)
+        last_id = checkpoint.get('last_id')
+        if last_id:
+            stats.update(checkpoint.get('stats', {}))
+            logger.info(f"Resuming after reference {last_id} ({stats['total']} already examined)")
+
+    limiter = get_rate_limiter(model_name)
+    if max_workers is None:
+        max_workers = limiter.max_concurrency
+    max_workers = max(1, max_workers)
+
+    examined = 0
+    # Set once a page is not fully written; the checkpoint then stays at the last complete page
+    checkpoint_held = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for page in iter_reference_pages(page_size=batch_size, after_id=last_id):
+            if max_references > 0:
+                page = page[:max_references - examined]
+
+            # Skip references that have already been processed
+            pending = []
+            for reference in page:
+                if parse_metadata(reference).get('ai_processed', False):
+                    logger.info(f"Skipping already processed reference {reference.get('id', 'Unknown')}")
+                    stats['skipped'] += 1
+                else:
+                    pending.append(reference)
+
+            logger.info(f"Processing page of {len(page)} references ({len(pending)} pending, {max_workers} workers)")
+
+            results = list(executor.map(lambda ref: build_processed_reference(ref, model_name), pending))
+            updates = [ref for ref in results if ref is not None]
+
+            updated = bulk_update_references(updates, chunk_size=batch_size) if updates else 0
+            stats['processed'] += updated
+            stats['failed'] += len(pending) - updated
+
+            examined += len(page)
+            stats['total'] += len(page)
+
+            # Only checkpoint while every page so far has been written; written references are
+            # marked as processed, so resuming from an earlier page only retries the failed writes
+            if updated < len(updates) and not checkpoint_held:
+                logger.warning(f"{len(updates) - updated} references on this page were not written; "
+                               f"--resume will retry from after reference {last_id}")
+                checkpoint_held = True
+            if not checkpoint_held:
+                last_id = page[-1]['id']
+                save_checkpoint(checkpoint_file, last_id, stats, model_name)
+
+            logger.info(f"Examined {stats['total']} references so far; {limiter.format_stats()}")
+
+            if max_references > 0 and examined >= max_references:
+                break
+
     logger.info(f"Finished processing references: {stats['processed']} processed, {stats['failed']} failed, {stats['skipped']} skipped")
-    
+
     return stats
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process all references in the database using AI.")
     parser.add_argument("--model", default="gemini-1.5-flash", help="Model name")
-    parser.add_argument("--batch-size", type=int, default=10, help="Number of references to process in each batch")
+    parser.add_argument("--batch-size", type=int, default=100, help="Number of references to read and write per page")
     parser.add_argument("--max-references", type=int, default=0, help="Maximum number of references to process (0 for all)")
-    
+    parser.add_argument("--max-workers", type=int, help="Number of references to process at once (defaults to LLM_MAX_CONCURRENCY)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_FILE, help="Checkpoint file for resuming")
+    parser.add_argument("--resume", action="store_true", help="Resume after the last checkpointed reference")
+
     args = parser.parse_args()
-    
+
     stats = process_all_references(
         model_name=args.model,
         batch_size=args.batch_size,
-        max_references=args.max_references
+        max_references=args.max_references,
+        max_workers=args.max_workers,
+        checkpoint_file=args.checkpoint,
+        resume=args.resume
     )
-    
+
     # Print statistics
     print("\nProcessing Statistics:")
     print(f"Total references: {stats['total']}")
     print(f"Successfully processed: {stats['processed']}")
     print(f"Failed to process: {stats['failed']}")
     print(f"Skipped (already processed): {stats['skipped']}")
-    
+
     # Exit with appropriate status code
     import sys
     sys.exit(0 if stats['failed'] == 0 else 1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Rebuild the reference statistics table.
+
+Database triggers keep the reference_statistics table current as references,
+quality assessments, categories and content links change. This script
+recomputes it from the tables to correct any drift, and can first compare the
+stored statistics with a full aggregation to report whether they have drifted.
+"""
+
+import sys
+import logging
+import argparse
+from typing import List, Dict, Any
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Import our custom modules
+from reference_management.reference_management import (
+    get_reference_statistics, compute_reference_statistics, rebuild_reference_statistics
+)
+
+# Breakdown lists and the field naming their entries
+BREAKDOWNS = {'type_breakdown': 'reference_type', 'category_breakdown': 'name'}
+
+def find_statistics_drift(stored: Dict[str, Any], computed: Dict[str, Any]) -> List[str]:
+    """
+    Compare stored statistics with freshly computed ones.
+
+    Args:
+        stored: Statistics from the reference_statistics table
+        computed: Statistics aggregated from the reference tables
+
+    Returns:
+        List of differences; empty if the statistics match
+    """
+    differences = []
+
+    for field in ['total_references', 'unique_types', 'linked_content_count']:
+        if stored.get(field, 0) != computed.get(field, 0):
+            differences.append(f"{field}: stored {stored.get(field, 0)}, actual {computed.get(field, 0)}")
+
+    if abs((stored.get('avg_quality') or 0) - (computed.get('avg_quality') or 0)) > 1e-6:
+        differences.append(f"avg_quality: stored {stored.get('avg_quality')}, actual {computed.get('avg_quality')}")
+
+    for field, key in BREAKDOWNS.items():
+        stored_counts = {item[key]: item['count'] for item in stored.get(field, [])}
+        computed_counts = {item[key]: item['count'] for item in computed.get(field, [])}
+        for name in sorted(set(stored_counts) | set(computed_counts)):
+            if stored_counts.get(name, 0) != computed_counts.get(name, 0):
+                differences.append(f"{field} {name}: stored {stored_counts.get(name, 0)}, "
+                                   f"actual {computed_counts.get(name, 0)}")
+
+    return differences
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the reference statistics table.")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare the stored statistics with the tables and only rebuild if they differ")
+
+    args = parser.parse_args()
+
+    if args.check:
+        differences = find_statistics_drift(get_reference_statistics(), compute_reference_statistics())
+        if not differences:
+            print("Reference statistics are up to date")
+            sys.exit(0)
+
+        print(f"Reference statistics have drifted ({len(differences)} differences):")
+        for difference in differences:
+            print(f"  - {difference}")
+
+    success = rebuild_reference_statistics()
+    print("Reference statistics rebuilt" if success else "Failed to rebuild reference statistics")
+    sys.exit(0 if success else 1)
@@ -3,7 +3,7 @@
 # Import key components for easier access
 from core.supabase_client import (
     supabase, is_connected, get_content_inventory, update_content_status,
-    get_content_by_id, update_content_item
+    update_content_statuses, get_content_by_id, update_content_item
 )
 
 from core.google_ai_client import (
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Batch planner for the AI Hub Content Creation System.
+
+This module forecasts the cost and duration of a batch generation run from
+historical prompt and output sizes and latencies. It estimates tokens, API
+calls, wall-clock time at a given concurrency, and the critical path through
+the dependency graph, so concurrency and quota can be sized before a run.
+"""
+
+import math
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, List, Any
+import networkx as nx
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for Gemini models on English text
+CHARS_PER_TOKEN = 4
+
+# Used when there is no history for a model; based on a content prompt plus a
+# sources prompt per item
+DEFAULT_PROFILE = {
+    'calls_per_item': 2.0,
+    'prompt_tokens_per_item': 1000.0,
+    'output_tokens_per_item': 3000.0,
+    'latency_per_call': 20.0,
+    'sample_size': 0,
+}
+
+
+def build_model_profile(history: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Summarise historical generations into per-item averages.
+
+    Args:
+        history: Records from get_generation_history(), one per prompt
+
+    Returns:
+        Dictionary with calls_per_item, prompt_tokens_per_item,
+        output_tokens_per_item, latency_per_call and sample_size
+    """
+    sessions = defaultdict(list)
+    for record in history:
+        sessions[record.get('session_id')].append(record)
+
+    if not sessions:
+        logger.warning("No generation history available; the forecast uses default estimates")
+        return dict(DEFAULT_PROFILE)
+
+    latencies = [record['latency_seconds'] for record in history if record.get('latency_seconds') is not None]
+    session_count = len(sessions)
+
+    return {
+        'calls_per_item': sum(len(records) for records in sessions.values()) / session_count,
+        'prompt_tokens_per_item': sum(record['prompt_chars'] for record in history) / CHARS_PER_TOKEN / session_count,
+        'output_tokens_per_item': sum(record['output_chars'] for record in history) / CHARS_PER_TOKEN / session_count,
+        'latency_per_call': (sum(latencies) / len(latencies)) if latencies else DEFAULT_PROFILE['latency_per_call'],
+        'sample_size': session_count,
+    }
+
+
+def find_critical_path(G: nx.DiGraph, durations: Dict[str, float]) -> List[str]:
+    """Find the longest chain of dependent items by total duration.
+
+    Args:
+        G: Dependency graph restricted to the planned items
+        durations: Estimated duration per item in seconds
+
+    Returns:
+        List of content IDs on the critical path, in generation order
+    """
+    try:
+        order = list(nx.topological_sort(G))
+    except nx.NetworkXUnfeasible:
+        logger.warning("Dependency cycle detected! Critical path ignores dependencies.")
+        return [max(G.nodes(), key=lambda node: durations[node])] if len(G) else []
+
+    finish = {}
+    previous = {}
+    for node in order:
+        best = None
+        for pred in G.predecessors(node):
+            if best is None or finish[pred] > finish[best]:
+                best = pred
+        previous[node] = best
+        finish[node] = durations[node] + (finish[best] if best is not None else 0)
+
+    if not finish:
+        return []
+
+    node = max(finish, key=finish.get)
+    path = []
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return list(reversed(path))
+
+
+def simulate_schedule(G: nx.DiGraph, order: List[str], durations: Dict[str, float], concurrency: int) -> float:
+    """Simulate a dependency-aware run with a fixed number of workers.
+
+    Items start in the given order as soon as a worker is free and their
+    dependencies have finished, matching the batch scheduler.
+
+    Args:
+        G: Dependency graph restricted to the planned items
+        order: Items in generation order
+        durations: Estimated duration per item in seconds
+        concurrency: Number of items generated at once
+
+    Returns:
+        Estimated wall-clock time in seconds
+    """
+    concurrency = max(1, concurrency)
+    pending = list(order)
+    finish_times = {}
+    running = []
+    now = 0.0
+
+    while pending or running:
+        for node in list(pending):
+            if len(running) >= concurrency:
+                break
+            blocked = any(pred not in finish_times for pred in G.predecessors(node))
+            if blocked and (running or pending[0] != node):
+                continue
+            pending.remove(node)
+            heapq.heappush(running, (now + durations[node], node))
+
+        if not running:
+            continue
+
+        now, node = heapq.heappop(running)
+        finish_times[node] = now
+
+    return now
+
+
+def plan_batch(G: nx.DiGraph, order: List[str], profile: Dict[str, float], concurrency: int) -> Dict[str, Any]:
+    """Forecast tokens, API calls and duration for a batch run.
+
+    Args:
+        G: Dependency graph of all content items
+        order: Items the run would generate, in generation order
+        profile: Model profile from build_model_profile()
+        concurrency: Number of items generated at once
+
+    Returns:
+        Dictionary with the forecast
+    """
+    subgraph = G.subgraph(order)
+    item_seconds = profile['calls_per_item'] * profile['latency_per_call']
+    durations = {content_id: item_seconds for content_id in order}
+
+    critical_path = find_critical_path(subgraph, durations)
+    prompt_tokens = profile['prompt_tokens_per_item'] * len(order)
+    output_tokens = profile['output_tokens_per_item'] * len(order)
+
+    return {
+        'items': len(order),
+        'api_calls': int(math.ceil(profile['calls_per_item'] * len(order))),
+        'prompt_tokens': int(prompt_tokens),
+        'output_tokens': int(output_tokens),
+        'total_tokens': int(prompt_tokens + output_tokens),
+        'concurrency': concurrency,
+        'serial_seconds': item_seconds * len(order),
+        'wall_clock_seconds': simulate_schedule(subgraph, order, durations, concurrency),
+        'critical_path': critical_path,
+        'critical_path_seconds': item_seconds * len(critical_path),
+        'profile': profile,
+    }
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration in seconds as a short human-readable string."""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def format_plan(plan: Dict[str, Any], model: str) -> str:
+    """Format a batch plan as a report.
+
+    Args:
+        plan: Forecast from plan_batch()
+        model: Model the forecast is for
+
+    Returns:
+        Multi-line report string
+    """
+    profile = plan['profile']
+    source = f"{profile['sample_size']} historical sessions" if profile['sample_size'] else "default estimates (no history)"
+
+    lines = [
+        f"Batch plan for {model} ({source})",
+        f"  Items:                 {plan['items']}",
+        f"  API calls:             {plan['api_calls']}",
+        f"  Prompt tokens:         ~{plan['prompt_tokens']:,}",
+        f"  Output tokens:         ~{plan['output_tokens']:,}",
+        f"  Total tokens:          ~{plan['total_tokens']:,}",
+        f"  Avg latency per call:  {profile['latency_per_call']:.1f}s",
+        f"  Serial duration:       {format_duration(plan['serial_seconds'])}",
+        f"  Wall clock at {plan['concurrency']:>2}x:    {format_duration(plan['wall_clock_seconds'])}",
+        f"  Critical path:         {len(plan['critical_path'])} items, {format_duration(plan['critical_path_seconds'])}",
+    ]
+    if plan['critical_path']:
+        lines.append(f"    {' -> '.join(plan['critical_path'])}")
+    if not profile['sample_size']:
+        lines.append(f"  Note: no generation history for {model}; tokens and durations are defaults, not forecasts")
+
+    return "\n".join(lines)
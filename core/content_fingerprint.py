@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Content fingerprints for incremental batch generation.
+
+A fingerprint is a hash of everything that determines a content item's output:
+its inventory fields, the prompt template version, the model and temperature,
+and the fingerprints of the items it depends on. Like a build system, a batch
+run only regenerates items whose stored fingerprint no longer matches, plus
+everything downstream of them in the dependency graph.
+"""
+
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional, Set
+import networkx as nx
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Inventory fields that feed the content generation prompt
+FINGERPRINT_FIELDS = [
+    'content_id',
+    'title',
+    'content_type',
+    'dependencies',
+    'audience_technical_level',
+    'audience_role',
+    'audience_constraints',
+    'primary_mission_pillar_1',
+    'primary_mission_pillar_2',
+    'secondary_mission_pillars',
+    'smart_objectives',
+    'practical_components',
+]
+
+def parse_metadata(item: Dict) -> Dict:
+    """Get an inventory item's metadata as a dictionary.
+
+    Args:
+        item: Content inventory item
+
+    Returns:
+        Metadata dictionary (empty if missing or invalid)
+    """
+    metadata = item.get('metadata') or {}
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except json.JSONDecodeError:
+            metadata = {}
+    return metadata if isinstance(metadata, dict) else {}
+
+def compute_item_fingerprint(item: Dict, model: str, temperature: float,
+                             prompt_version: str, dependency_fingerprints: List[str]) -> str:
+    """Compute the fingerprint of a single content item.
+
+    Args:
+        item: Content inventory item
+        model: Model used for generation
+        temperature: Temperature used for generation
+        prompt_version: Version of the content prompt template
+        dependency_fingerprints: Fingerprints of the item's dependencies
+
+    Returns:
+        Hex digest fingerprint
+    """
+    payload = {
+        'fields': {field: (item.get(field) or '') for field in FINGERPRINT_FIELDS},
+        'prompt_version': str(prompt_version),
+        'model': model,
+        'temperature': float(temperature),
+        'dependencies': sorted(dependency_fingerprints),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def compute_fingerprints(G: nx.DiGraph, model: str, temperature: float,
+                         prompt_version: str) -> Dict[str, str]:
+    """Compute fingerprints for every item in the dependency graph.
+
+    Args:
+        G: Dependency graph with inventory items stored in the 'data' node attribute
+        model: Model used for generation
+        temperature: Temperature used for generation
+        prompt_version: Version of the content prompt template
+
+    Returns:
+        Dictionary mapping content ID to fingerprint
+    """
+    try:
+        order = list(nx.topological_sort(G))
+    except nx.NetworkXUnfeasible:
+        # Items on a cycle cannot include each other's fingerprints
+        logger.warning("Dependency cycle detected! Fingerprints ignore dependencies on the cycle.")
+        order = list(G.nodes())
+
+    fingerprints = {}
+    for content_id in order:
+        dependency_fingerprints = [fingerprints[pred] for pred in G.predecessors(content_id) if pred in fingerprints]
+        fingerprints[content_id] = compute_item_fingerprint(
+            G.nodes[content_id]['data'], model, temperature, prompt_version, dependency_fingerprints
+        )
+
+    return fingerprints
+
+def find_stale_items(G: nx.DiGraph, fingerprints: Dict[str, str]) -> Set[str]:
+    """Find items that need regeneration.
+
+    An item is stale when it is not completed or its stored fingerprint differs
+    from the current one. Every downstream dependent of a stale item is stale too.
+
+    Args:
+        G: Dependency graph with inventory items stored in the 'data' node attribute
+        fingerprints: Current fingerprints from compute_fingerprints()
+
+    Returns:
+        Set of stale content IDs
+    """
+    stale = set()
+    for content_id, fingerprint in fingerprints.items():
+        item = G.nodes[content_id]['data']
+        stored = parse_metadata(item).get('fingerprint')
+        if item.get('status') != 'Completed' or stored != fingerprint:
+            stale.add(content_id)
+
+    for content_id in list(stale):
+        stale.update(nx.descendants(G, content_id))
+
+    return stale
+
+def with_fingerprint(item: Optional[Dict], fingerprint: str) -> Dict:
+    """Build updated metadata that records a fingerprint.
+
+    Args:
+        item: Current content inventory item (may be None)
+        fingerprint: Fingerprint to record
+
+    Returns:
+        Metadata dictionary including the fingerprint
+    """
+    metadata = parse_metadata(item or {})
+    metadata['fingerprint'] = fingerprint
+    return metadata
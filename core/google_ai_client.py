@@ -8,6 +8,7 @@ It supports both Python and Node.js implementations, with automatic fallback.
 
 import os
 import json
+import time
 import subprocess
 import tempfile
 import logging
@@ -25,6 +26,13 @@ except ImportError:
         def fix_json(json_str):
             return json.loads(json_str.strip())
 
+# Import the adaptive concurrency limiter
+try:
+    from core.rate_limiter import get_rate_limiter, is_rate_limit_error
+except ImportError:
+    # If we're running from the root directory
+    from rate_limiter import get_rate_limiter, is_rate_limit_error
+
 # Load environment variables
 load_dotenv()
 
@@ -39,19 +47,24 @@ except ImportError:
 class GoogleAIClient:
     """Google Generative AI client class."""
 
-    def __init__(self, api_key=None, model_name="gemini-1.5-flash"):
+    def __init__(self, api_key=None, model_name="gemini-1.5-flash", limiter=None, max_rate_limit_retries=2):
         """Initialize the Google Generative AI client.
 
         Args:
             api_key (str, optional): Google Generative AI API key. If not provided,
                                      it will be loaded from the GOOGLE_GENAI_API_KEY environment variable.
             model_name (str, optional): Model name to use. Defaults to "gemini-1.5-flash".
+            limiter (AdaptiveConcurrencyLimiter, optional): Concurrency limiter for requests.
+                                     Defaults to the shared limiter for the model.
+            max_rate_limit_retries (int, optional): Retries after a 429/quota response. Defaults to 2.
         """
         self.api_key = api_key or os.environ.get('GOOGLE_GENAI_API_KEY')
         if not self.api_key:
             raise ValueError("GOOGLE_GENAI_API_KEY environment variable not found")
 
         self.model_name = model_name
+        self.limiter = limiter or get_rate_limiter(model_name)
+        self.max_rate_limit_retries = max_rate_limit_retries
 
         # Initialize the Python client if available
         if GOOGLE_AI_AVAILABLE:
@@ -61,6 +74,32 @@ class GoogleAIClient:
     def generate_content(self, prompt, temperature=0.7, max_tokens=None):
         """Generate content using Google Generative AI.
 
+        Args:
+            prompt (str): The prompt for content generation.
+            temperature (float, optional): Temperature for generation. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to None.
+
+        Returns:
+            str: The generated content.
+        """
+        attempt = 0
+        while True:
+            try:
+                # Hold a limiter slot so throttling feeds back into the shared concurrency
+                with self.limiter.slot():
+                    return self._generate(prompt, temperature, max_tokens)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_rate_limit_retries:
+                    raise
+                attempt += 1
+                backoff = min(2 ** attempt, 30)
+                logging.warning(f"Rate limit hit for {self.model_name}, retrying in {backoff} seconds "
+                                f"(attempt {attempt}/{self.max_rate_limit_retries})")
+                time.sleep(backoff)
+
+    def _generate(self, prompt, temperature=0.7, max_tokens=None):
+        """Send a single generation request without limiting or retries.
+
         Args:
             prompt (str): The prompt for content generation.
             temperature (float, optional): Temperature for generation. Defaults to 0.7.
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Adaptive concurrency limiter for the AI Hub Content Creation System.
+
+This module provides an AIMD (additive increase, multiplicative decrease)
+controller for in-flight LLM requests. The limit grows by one slot per
+round of healthy responses and is halved whenever the provider answers with
+a 429 / quota error, so batch tools converge on the real provider limit
+without a hand-tuned delay or worker count.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Substrings that identify throttling responses from the Gemini API
+RATE_LIMIT_MARKERS = (
+    "429",
+    "quota",
+    "rate limit",
+    "ratelimit",
+    "resource exhausted",
+    "resource_exhausted",
+    "too many requests",
+)
+
+# Exception class names raised by google-api-core for throttling
+RATE_LIMIT_EXCEPTIONS = ("ResourceExhausted", "TooManyRequests")
+
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 8))
+DEFAULT_INITIAL_CONCURRENCY = int(os.environ.get('LLM_INITIAL_CONCURRENCY', 2))
+
+# Fixed latency target in seconds; when unset, the target follows observed latency
+DEFAULT_LATENCY_TARGET = float(os.environ['LLM_LATENCY_TARGET']) if os.environ.get('LLM_LATENCY_TARGET') else None
+
+# Without a fixed target, growth stops once recent latency exceeds the
+# long-run baseline by this factor
+DEFAULT_LATENCY_TOLERANCE = 2.0
+
+# Weight of each success in the long-run latency baseline (about 50 requests of memory)
+BASELINE_SMOOTHING = 0.02
+
+# Number of most recent successes compared against the baseline
+RECENT_LATENCY_SAMPLES = 10
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an exception is a 429 / quota response.
+
+    Args:
+        error: Exception raised by the AI client
+
+    Returns:
+        True if the error signals throttling, False otherwise
+    """
+    if type(error).__name__ in RATE_LIMIT_EXCEPTIONS:
+        return True
+
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD controller for the number of in-flight LLM requests."""
+
+    def __init__(self, name: str = "default",
+                 initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 increase_step: float = 1.0,
+                 decrease_factor: float = 0.5,
+                 latency_target: Optional[float] = DEFAULT_LATENCY_TARGET,
+                 latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+                 error_rate_threshold: float = 0.2,
+                 window_size: int = 50):
+        """Initialize the limiter.
+
+        Args:
+            name: Name used in log messages (usually the model name)
+            initial_concurrency: Starting number of concurrent requests
+            min_concurrency: Lower bound for the limit
+            max_concurrency: Upper bound for the limit
+            increase_step: Slots added per full round of healthy responses
+            decrease_factor: Multiplier applied on a throttling response
+            latency_target: Average latency (seconds) above which the limit stops growing;
+                when None, it is the long-run average latency times latency_tolerance
+            latency_tolerance: Factor over the long-run latency at which the limit stops growing
+            error_rate_threshold: Error rate above which the limit stops growing
+            window_size: Number of recent requests used for observed rates
+        """
+        if min_concurrency < 1:
+            raise ValueError("min_concurrency must be at least 1")
+        if max_concurrency < min_concurrency:
+            raise ValueError("max_concurrency must be greater than or equal to min_concurrency")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.name = name
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.error_rate_threshold = error_rate_threshold
+
+        self._condition = threading.Condition()
+        self._limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        # Incremented on every decrease so that a burst of throttled requests
+        # issued under the same limit only halves it once
+        self._epoch = 0
+        self._round_successes = 0
+        self._high_water = 0
+        self._window = deque(maxlen=window_size)
+        self._baseline_latency = None
+        self._started_at = time.monotonic()
+
+        self._counters = {
+            'requests': 0,
+            'successes': 0,
+            'errors': 0,
+            'throttled': 0,
+            'increases': 0,
+            'decreases': 0,
+        }
+
+    @property
+    def concurrency(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.min_concurrency, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently in flight."""
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """Wait for a free slot.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            Epoch token to pass back to release()
+
+        Raises:
+            TimeoutError: If no slot became free within the timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < self.concurrency, timeout):
+                raise TimeoutError(f"Timed out waiting for a {self.name} request slot")
+
+            self._in_flight += 1
+            self._high_water = max(self._high_water, self._in_flight)
+            self._counters['requests'] += 1
+            return self._epoch
+
+    def release(self, epoch: int, latency: float, error: Optional[BaseException] = None) -> None:
+        """Release a slot and feed the outcome back into the controller.
+
+        Args:
+            epoch: Token returned by acquire()
+            latency: Request duration in seconds
+            error: Exception raised by the request, if any
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+
+            if error is None:
+                self._counters['successes'] += 1
+                self._window.append((now, 'success', latency))
+                self._round_successes += 1
+                if self._baseline_latency is None:
+                    self._baseline_latency = latency
+                else:
+                    self._baseline_latency += BASELINE_SMOOTHING * (latency - self._baseline_latency)
+
+                # Grow once per full round of successes, and only if every slot was
+                # actually used since the last change
+                if (self._round_successes >= self.concurrency
+                        and self._high_water >= self.concurrency
+                        and self._limit < self.max_concurrency
+                        and self._is_healthy()):
+                    self._limit = min(self.max_concurrency, self._limit + self.increase_step)
+                    self._start_round()
+                    self._counters['increases'] += 1
+                    logger.info(f"[{self.name}] Increasing concurrency to {self.concurrency}")
+            elif is_rate_limit_error(error):
+                self._counters['throttled'] += 1
+                self._window.append((now, 'throttled', latency))
+
+                if epoch == self._epoch:
+                    self._limit = max(self.min_concurrency, self._limit * self.decrease_factor)
+                    self._epoch += 1
+                    self._start_round()
+                    self._counters['decreases'] += 1
+                    logger.warning(f"[{self.name}] Rate limit hit, reducing concurrency to {self.concurrency}")
+            else:
+                self._counters['errors'] += 1
+                self._window.append((now, 'error', latency))
+
+            self._condition.notify_all()
+
+    def _start_round(self) -> None:
+        """Reset the per-round bookkeeping after the limit changes."""
+        self._round_successes = 0
+        self._high_water = self._in_flight
+
+    def _is_healthy(self) -> bool:
+        """Check recent latency and error rates against the thresholds."""
+        if not self._window:
+            return True
+
+        error_count = sum(1 for _, outcome, _ in self._window if outcome == 'error')
+        if error_count / len(self._window) > self.error_rate_threshold:
+            return False
+
+        latencies = [latency for _, outcome, latency in self._window if outcome == 'success']
+        if self.latency_target is not None:
+            if latencies and sum(latencies) / len(latencies) > self.latency_target:
+                return False
+        elif self._baseline_latency is not None:
+            # Latency rising well above its long-run level means the provider is queueing requests
+            recent = latencies[-RECENT_LATENCY_SAMPLES:]
+            if recent and sum(recent) / len(recent) > self._baseline_latency * self.latency_tolerance:
+                return False
+
+        return True
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """Context manager that holds a slot for the duration of a request.
+
+        Args:
+            timeout: Maximum time to wait for a slot in seconds
+        """
+        epoch = self.acquire(timeout)
+        start_time = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.release(epoch, time.monotonic() - start_time, e)
+            raise
+        except BaseException:
+            # Interrupted rather than failed: free the slot without recording an outcome
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+            raise
+        else:
+            self.release(epoch, time.monotonic() - start_time)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a function while holding a slot.
+
+        Args:
+            func: Function making the LLM request
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        with self.slot():
+            return func(*args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current limit and observed rates.
+
+        Returns:
+            Dictionary with concurrency, counters, and rates over the recent window
+        """
+        with self._condition:
+            window = list(self._window)
+            stats = {
+                'name': self.name,
+                'concurrency': self.concurrency,
+                'in_flight': self._in_flight,
+                'max_concurrency': self.max_concurrency,
+                'uptime_seconds': round(time.monotonic() - self._started_at, 2),
+            }
+            stats.update(self._counters)
+
+        latencies = [latency for _, outcome, latency in window if outcome == 'success']
+        elapsed = window[-1][0] - window[0][0] if len(window) > 1 else 0
+
+        stats['window_size'] = len(window)
+        stats['error_rate'] = (sum(1 for _, outcome, _ in window if outcome == 'error') / len(window)) if window else 0.0
+        stats['throttle_rate'] = (sum(1 for _, outcome, _ in window if outcome == 'throttled') / len(window)) if window else 0.0
+        stats['avg_latency'] = (sum(latencies) / len(latencies)) if latencies else 0.0
+        stats['requests_per_minute'] = (len(window) - 1) * 60.0 / elapsed if elapsed > 0 else 0.0
+
+        return stats
+
+    def format_stats(self) -> str:
+        """Format the current stats as a single log line."""
+        stats = self.get_stats()
+        return (f"[{self.name}] concurrency={stats['concurrency']}/{stats['max_concurrency']} "
+                f"in_flight={stats['in_flight']} requests={stats['requests']} "
+                f"throttled={stats['throttled']} error_rate={stats['error_rate']:.2f} "
+                f"avg_latency={stats['avg_latency']:.2f}s rpm={stats['requests_per_minute']:.1f}")
+
+
+# Shared limiters, one per model, so every caller in the process sees the same quota
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str = "default", **kwargs) -> AdaptiveConcurrencyLimiter:
+    """Get the shared limiter for a model, creating it on first use.
+
+    Args:
+        name: Limiter name, usually the model name
+        **kwargs: Constructor arguments used when the limiter is created
+
+    Returns:
+        The shared AdaptiveConcurrencyLimiter instance
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(name=name, **kwargs)
+            _limiters[name] = limiter
+        return limiter
+
+
+def get_all_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every limiter created in this process.
+
+    Returns:
+        Dictionary mapping limiter name to its stats
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters}
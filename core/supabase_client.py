@@ -261,6 +261,54 @@ def update_content_status(content_id, status, metadata=None):
         logger.error(f"Error updating content status: {str(e)}")
         return False
 
+# Maximum number of content IDs per bulk update; keeps the in.(...) filter
+# comfortably within URL length limits
+STATUS_UPDATE_CHUNK_SIZE = 200
+
+def update_content_statuses(content_ids, status, metadata=None, chunk_size=STATUS_UPDATE_CHUNK_SIZE):
+    """Update the status of many content items at once.
+
+    Items are updated with one request per chunk of content IDs instead of one
+    request per item.
+
+    Args:
+        content_ids: Content IDs to update
+        status: New status for every item
+        metadata: Metadata to store on every item
+        chunk_size: Maximum number of content IDs per request
+
+    Returns:
+        Number of content items updated
+    """
+    if not supabase:
+        logger.error("Supabase client not initialized")
+        return 0
+
+    content_ids = list(dict.fromkeys(content_ids))
+    if not content_ids:
+        return 0
+
+    update_data = {
+        'status': status,
+        'updated_at': datetime.datetime.now().isoformat()
+    }
+
+    if metadata:
+        update_data['metadata'] = json.dumps(metadata)
+
+    updated = 0
+    try:
+        for start in range(0, len(content_ids), chunk_size):
+            chunk = content_ids[start:start + chunk_size]
+            result = supabase.table('content_inventory').update(update_data).in_('content_id', chunk).execute()
+            updated += len(result.data) if result.data else 0
+
+        logger.info(f"Updated status for {updated} content items to {status}")
+        return updated
+    except Exception as e:
+        logger.error(f"Error updating content statuses: {str(e)}")
+        return updated
+
 def get_prompt_logs(session_id=None, content_id=None, limit=100):
     """Get prompt logs from Supabase."""
     if not supabase:
@@ -318,6 +366,52 @@ def get_full_content(output_id):
         logger.error(f"Error getting full content: {str(e)}")
         return None
 
+# Number of content files fetched per page
+CONTENT_FILE_PAGE_SIZE = 100
+
+def iter_content_file_pages(page_size=CONTENT_FILE_PAGE_SIZE, after_id=None):
+    """Page through stored content files in ID order using keyset pagination.
+
+    Each file comes with the content ID of its generation output, so the
+    archive can be read with one request per page instead of one request per
+    output.
+
+    Args:
+        page_size: Number of content files per page
+        after_id: Optional content file ID to start after
+
+    Yields:
+        Lists of dictionaries with id, output_id, content_id and file_content
+    """
+    if not supabase:
+        logger.error("Supabase client not initialized")
+        return
+
+    last_id = after_id
+    while True:
+        try:
+            query = supabase.table('content_files').select('id, output_id, file_content, generation_outputs(content_id)')
+            if last_id:
+                query = query.gt('id', last_id)
+            result = query.order('id').limit(page_size).execute()
+        except Exception as e:
+            logger.error(f"Error getting content files after {last_id}: {str(e)}")
+            return
+
+        page = result.data if result.data else []
+        if not page:
+            return
+
+        for row in page:
+            output = row.pop('generation_outputs', None) or {}
+            row['content_id'] = output.get('content_id')
+
+        yield page
+
+        if len(page) < page_size:
+            return
+        last_id = page[-1]['id']
+
 def get_content_by_id(content_id):
     """Get content details by ID."""
     if not supabase:
@@ -333,6 +427,10 @@ def get_content_by_id(content_id):
         logger.error(f"Error getting content by ID: {str(e)}")
         return None
 
+def get_content_item(content_id):
+    """Get a content inventory item by ID."""
+    return get_content_by_id(content_id)
+
 def update_content_item(content_id, data):
     """Update content item in Supabase.
 
@@ -512,6 +610,105 @@ def get_generation_outputs_for_content(content_id, limit=100):
         logger.error(f"Error getting generation outputs for content: {str(e)}")
         return []
 
+# Maximum number of prompt IDs per generation output request; keeps the
+# in.(...) filter comfortably within URL length limits
+PROMPT_ID_CHUNK_SIZE = 200
+
+def _fetch_generation_history(model, limit, chunk_size, lengths=True):
+    """Fetch recent prompt logs and their generation outputs.
+
+    Args:
+        model: Only include prompts sent to this model
+        limit: Maximum number of prompt logs to include
+        chunk_size: Maximum number of prompt IDs per output request
+        lengths: Select the stored text lengths instead of downloading the text
+
+    Returns:
+        Tuple of (prompts, outputs), with prompt_chars and output_chars set on every row
+    """
+    prompt_column = 'prompt_chars' if lengths else 'prompt_text'
+    output_column = 'output_chars' if lengths else 'output_text'
+
+    query = supabase.table('prompt_logs').select(f'id, session_id, content_id, model, prompt_type, {prompt_column}, created_at')
+    if model:
+        query = query.filter('model', 'eq', model)
+    prompts = query.order('created_at', desc=True).limit(limit).execute().data or []
+
+    prompt_ids = [prompt['id'] for prompt in prompts]
+    outputs = []
+    for start in range(0, len(prompt_ids), chunk_size):
+        chunk = prompt_ids[start:start + chunk_size]
+        result = supabase.table('generation_outputs').select(f'prompt_id, {output_column}, created_at').in_('prompt_id', chunk).order('created_at').execute()
+        outputs.extend(result.data or [])
+
+    if not lengths:
+        for prompt in prompts:
+            prompt['prompt_chars'] = len(prompt.pop('prompt_text', None) or '')
+        for output in outputs:
+            output['output_chars'] = len(output.pop('output_text', None) or '')
+
+    return prompts, outputs
+
+def get_generation_history(model=None, limit=500, chunk_size=PROMPT_ID_CHUNK_SIZE):
+    """Get recent prompt and output sizes and latencies for forecasting.
+
+    Each prompt log is paired with its first generation output; the latency is
+    the time between the prompt being logged and the output being logged. Text
+    lengths are read from the prompt_chars and output_chars columns; databases
+    without them fall back to downloading the text.
+
+    Args:
+        model: Only include prompts sent to this model
+        limit: Maximum number of prompt logs to include
+        chunk_size: Maximum number of prompt IDs per output request
+
+    Returns:
+        List of dictionaries with session_id, content_id, model, prompt_type,
+        prompt_chars, output_chars and latency_seconds
+    """
+    if not supabase:
+        logger.error("Supabase client not initialized")
+        return []
+
+    try:
+        try:
+            prompts, outputs = _fetch_generation_history(model, limit, chunk_size)
+        except Exception as e:
+            logger.warning(f"Text length columns unavailable, downloading text instead (apply sql/create_tables.sql): {str(e)}")
+            prompts, outputs = _fetch_generation_history(model, limit, chunk_size, lengths=False)
+
+        # Keep the first output per prompt; later ones are post-processed copies
+        first_outputs = {}
+        for output in outputs:
+            first_outputs.setdefault(output['prompt_id'], output)
+
+        history = []
+        for prompt in prompts:
+            output = first_outputs.get(prompt['id'])
+            if not output:
+                continue
+
+            try:
+                latency = (datetime.datetime.fromisoformat(output['created_at']) -
+                           datetime.datetime.fromisoformat(prompt['created_at'])).total_seconds()
+            except (TypeError, ValueError):
+                latency = None
+
+            history.append({
+                'session_id': prompt.get('session_id'),
+                'content_id': prompt.get('content_id'),
+                'model': prompt.get('model'),
+                'prompt_type': prompt.get('prompt_type'),
+                'prompt_chars': prompt.get('prompt_chars') or 0,
+                'output_chars': output.get('output_chars') or 0,
+                'latency_seconds': latency if latency is not None and latency >= 0 else None
+            })
+
+        return history
+    except Exception as e:
+        logger.error(f"Error getting generation history: {str(e)}")
+        return []
+
 def get_available_models():
     """Get list of available models.
 
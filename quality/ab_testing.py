@@ -12,6 +12,8 @@ import json
 import logging
 import argparse
 import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -21,10 +23,17 @@ from datetime import datetime
 # Import our custom modules
 from supabase_client import (
     is_connected, get_content_inventory, update_content_status,
-    get_content_item, update_content_item
+    get_content_item
 )
-from content_workflow_supabase import generate_content_for_id
-from content_evaluation import ContentEvaluation
+from content_workflow_supabase import check_dependencies, generate_content_for_item
+from content_evaluation import evaluate_content
+from sequential_testing import SequentialComparison, DEFAULT_ALPHA, DEFAULT_MIN_SAMPLES
+
+try:
+    from core.rate_limiter import get_rate_limiter
+except ImportError:
+    # If we're running from the core directory
+    from rate_limiter import get_rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -50,17 +59,34 @@ class ABTest:
         self.temperatures = temperatures or [0.7]  # Default temperature
         self.output_dir = output_dir
         self.results = []
+        self.comparison = None
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
     
-    def run_test(self, force: bool = False, delay: int = 0) -> List[Dict]:
+    def run_test(self, force: bool = False, delay: int = 0, max_concurrency: Optional[int] = None,
+                 sequential: bool = False, alpha: float = DEFAULT_ALPHA,
+                 min_samples: int = DEFAULT_MIN_SAMPLES) -> List[Dict]:
         """Run A/B test.
-        
+
+        Variants are generated concurrently; each one is written to its own
+        directory, so variants of the same content item do not overwrite each
+        other or the content in generated_content. Requests to each model go
+        through its shared rate limiter.
+
+        In sequential mode, content items are sampled in rounds and after each
+        round every model and temperature arm is compared with the leading arm
+        on paired scores. Arms that are settled as worse stop being sampled,
+        and the test ends once a single arm remains.
+
         Args:
             force: Whether to force generation even if dependencies aren't met
-            delay: Delay between generations in seconds
-            
+            delay: Delay between starting generations in seconds
+            max_concurrency: Maximum number of concurrent generations (defaults to the rate limiters' limit)
+            sequential: Whether to stop sampling arms once they are settled as worse than the leader
+            alpha: False positive rate of the sequential test
+            min_samples: Content items an arm is sampled on before it can be stopped
+
         Returns:
             List of test results
         """
@@ -68,133 +94,171 @@ class ABTest:
         if not is_connected():
             logger.error("Not connected to Supabase")
             return []
-        
+
         # Get content items
         content_items = []
         for content_id in self.content_ids:
             item = get_content_item(content_id)
-            if item:
-                content_items.append(item)
-            else:
+            if not item:
                 logger.warning(f"Content item {content_id} not found")
-        
+                continue
+
+            # Variants are generated with force, so dependencies are checked once here
+            if not force:
+                deps_met, incomplete_deps = check_dependencies(content_id)
+                if not deps_met:
+                    logger.warning(f"Skipping {content_id}: dependencies not met ({', '.join(incomplete_deps)})")
+                    continue
+
+            content_items.append(item)
+
         if not content_items:
             logger.error("No content items found")
             return []
-        
-        # Run test for each content item, model, and temperature
-        for item in content_items:
-            content_id = item['content_id']
-            title = item.get('title', content_id)
-            
-            logger.info(f"Testing content item: {content_id} - {title}")
-            
-            for model in self.models:
-                for temperature in self.temperatures:
-                    # Create variant ID
-                    variant_id = f"{content_id}_{model.replace('-', '_')}_{temperature}"
-                    
-                    logger.info(f"Generating variant: {variant_id}")
-                    
-                    # Save original status
-                    original_status = item.get('status')
-                    original_model = item.get('model')
-                    
-                    try:
-                        # Set model and temperature
-                        update_content_item(content_id, {
-                            'model': model,
-                            'temperature': temperature
-                        })
-                        
-                        # Reset status to force regeneration
-                        update_content_status(content_id, "Not Started")
-                        
-                        # Generate content
-                        start_time = time.time()
-                        result = generate_content_for_id(content_id, model, temperature, force=force)
-                        generation_time = time.time() - start_time
-                        
-                        # Check result
-                        if result:
-                            logger.info(f"Successfully generated variant {variant_id}")
-                            
-                            # Get content file path
-                            content_path = os.path.join('generated_content', f"{content_id}.md")
-                            
-                            # Copy content to variant file
-                            variant_path = os.path.join(self.output_dir, f"{variant_id}.md")
-                            with open(content_path, 'r') as src, open(variant_path, 'w') as dst:
-                                dst.write(src.read())
-                            
-                            # Evaluate content
-                            evaluation = ContentEvaluation(content_path, content_id)
-                            eval_result = evaluation.evaluate()
-                            
-                            # Save evaluation
-                            eval_path = os.path.join(self.output_dir, f"{variant_id}.evaluation.json")
-                            with open(eval_path, 'w') as f:
-                                json.dump(eval_result, f, indent=2)
-                            
-                            # Add to results
-                            self.results.append({
-                                'content_id': content_id,
-                                'title': title,
-                                'model': model,
-                                'temperature': temperature,
-                                'variant_id': variant_id,
-                                'success': True,
-                                'generation_time': generation_time,
-                                'scores': eval_result['scores'],
-                                'quality_rating': eval_result['quality_rating'],
-                                'source_count': eval_result['source_count'],
-                                'word_count': eval_result['word_count']
-                            })
-                        else:
-                            logger.error(f"Failed to generate variant {variant_id}")
-                            
-                            # Add to results
-                            self.results.append({
-                                'content_id': content_id,
-                                'title': title,
-                                'model': model,
-                                'temperature': temperature,
-                                'variant_id': variant_id,
-                                'success': False,
-                                'generation_time': generation_time
-                            })
-                    
-                    except Exception as e:
-                        logger.error(f"Error generating variant {variant_id}: {str(e)}")
-                        
-                        # Add to results
-                        self.results.append({
-                            'content_id': content_id,
-                            'title': title,
-                            'model': model,
-                            'temperature': temperature,
-                            'variant_id': variant_id,
-                            'success': False,
-                            'error': str(e)
-                        })
-                    
-                    finally:
-                        # Restore original status and model
-                        update_content_item(content_id, {
-                            'model': original_model
-                        })
-                        update_content_status(content_id, original_status)
-                    
-                    # Add delay if specified
-                    if delay > 0:
-                        logger.info(f"Waiting {delay} seconds before next generation...")
-                        time.sleep(delay)
-        
+
+        arms = [(model, temperature) for model in self.models for temperature in self.temperatures]
+        if max_concurrency is None:
+            max_concurrency = max(get_rate_limiter(model).max_concurrency for model in self.models)
+        max_concurrency = max(1, max_concurrency)
+
+        comparison = SequentialComparison(arms, alpha, min_samples=min_samples) if sequential else None
+        self.comparison = comparison
+
+        # Save original statuses, which generation overwrites
+        original_statuses = {item['content_id']: item.get('status') for item in content_items}
+
+        logger.info(f"Testing {len(content_items)} content items with {len(arms)} model/temperature arms, "
+                    f"{max_concurrency} at a time{' (sequential)' if sequential else ''}")
+
+        remaining = list(content_items)
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                while remaining:
+                    active_arms = comparison.active if comparison else arms
+
+                    # Without sequential testing everything is submitted at once; with it, each
+                    # round holds enough content items to keep every worker busy
+                    if comparison:
+                        round_size = max(1, max_concurrency // len(active_arms))
+                    else:
+                        round_size = len(remaining)
+                    round_items, remaining = remaining[:round_size], remaining[round_size:]
+
+                    futures = []
+                    for item in round_items:
+                        for model, temperature in active_arms:
+                            if delay > 0 and futures:
+                                time.sleep(delay)
+                            futures.append(executor.submit(self._run_variant, item, model, temperature))
+
+                    for future in as_completed(futures):
+                        result = future.result()
+                        self.results.append(result)
+                        if comparison and result['success']:
+                            comparison.add((result['model'], result['temperature']), result['content_id'],
+                                           result['scores'].get('average', 0))
+
+                        logger.info(f"Completed {len(self.results)} variants")
+
+                    if not comparison:
+                        continue
+
+                    for (model, temperature), details in comparison.update():
+                        leader_model, leader_temperature = details['leader']
+                        logger.info(f"Stopped sampling {model} at {temperature} after {details['samples']} items: "
+                                    f"{details['difference']:.2f} below {leader_model} at {leader_temperature}")
+
+                    if comparison.finished:
+                        model, temperature = comparison.active[0]
+                        logger.info(f"Sequential test settled on {model} at {temperature}; "
+                                    f"skipping {len(remaining)} remaining content items")
+                        break
+
+        finally:
+            # Restore original statuses
+            for content_id, status in original_statuses.items():
+                update_content_status(content_id, status)
+
+        # Report results in content item and arm order
+        content_order = {item['content_id']: i for i, item in enumerate(content_items)}
+        self.results.sort(key=lambda r: (content_order.get(r['content_id'], len(content_order)),
+                                         arms.index((r['model'], r['temperature']))))
+
+        logger.info(f"Generated {len(self.results)} of {len(content_items) * len(arms)} variants")
+
         # Save results
         self.save_results()
-        
+
         return self.results
-    
+
+    def _run_variant(self, item: Dict, model: str, temperature: float) -> Dict:
+        """Generate and evaluate one variant.
+
+        Args:
+            item: Content item
+            model: Model to use
+            temperature: Temperature for generation
+
+        Returns:
+            Test result
+        """
+        content_id = item['content_id']
+        variant_id = f"{content_id}_{model.replace('-', '_')}_{temperature}"
+        result = {
+            'content_id': content_id,
+            'title': item.get('title', content_id),
+            'model': model,
+            'temperature': temperature,
+            'variant_id': variant_id,
+            'success': False
+        }
+
+        logger.info(f"Generating variant: {variant_id}")
+
+        # Generate into a directory of the variant's own
+        variant_dir = os.path.join(self.output_dir, 'variants', variant_id)
+        start_time = time.time()
+        try:
+            success, _ = generate_content_for_item(content_id, model, temperature, output_dir=variant_dir,
+                                                   force=True)
+            result['generation_time'] = time.time() - start_time
+
+            content_path = os.path.join(variant_dir, f"{content_id}.md")
+            if not success or not os.path.exists(content_path):
+                logger.error(f"Failed to generate variant {variant_id}")
+                return result
+
+            logger.info(f"Successfully generated variant {variant_id}")
+
+            # Move content to variant file
+            variant_path = os.path.join(self.output_dir, f"{variant_id}.md")
+            os.replace(content_path, variant_path)
+
+            # Evaluate content, reusing the memoised evaluation if it is unchanged
+            eval_result = evaluate_content(variant_path, content_id)
+
+            # Save evaluation
+            eval_path = os.path.join(self.output_dir, f"{variant_id}.evaluation.json")
+            with open(eval_path, 'w') as f:
+                json.dump(eval_result, f, indent=2)
+
+            result.update({
+                'success': True,
+                'scores': eval_result['scores'],
+                'quality_rating': eval_result['quality_rating'],
+                'source_count': eval_result['source_count'],
+                'word_count': eval_result['word_count']
+            })
+
+        except Exception as e:
+            logger.error(f"Error generating variant {variant_id}: {str(e)}")
+            result['error'] = str(e)
+
+        finally:
+            shutil.rmtree(variant_dir, ignore_errors=True)
+
+        return result
+
     def save_results(self):
         """Save test results to file."""
         results_path = os.path.join(self.output_dir, 'results.json')
@@ -203,6 +267,39 @@ class ABTest:
         
         logger.info(f"Saved test results to {results_path}")
     
+    def sequential_summary(self) -> List[Dict]:
+        """Summarize the sequential test for each model and temperature arm.
+
+        Returns:
+            List of arm summaries, empty if the test was not sequential
+        """
+        if not self.comparison:
+            return []
+
+        leader = self.comparison.leader()
+        summary = []
+        for arm in self.comparison.arms:
+            model, temperature = arm
+            details = self.comparison.stopped.get(arm)
+            if details:
+                leader_model, leader_temperature = details['leader']
+                status = (f"Stopped after {details['samples']} items, {details['difference']:.2f} below "
+                          f"{leader_model} at {leader_temperature}")
+            elif arm == leader:
+                status = "Leading"
+            else:
+                status = "Not settled"
+
+            summary.append({
+                'model': model,
+                'temperature': temperature,
+                'samples': len(self.comparison.scores[arm]),
+                'mean_score': self.comparison.mean(arm),
+                'status': status
+            })
+
+        return summary
+
     def analyze_results(self) -> Dict:
         """Analyze test results.
         
@@ -276,7 +373,8 @@ class ABTest:
             'successful_variants': len(success_df),
             'content_items': len(df['content_id'].unique()),
             'models': list(df['model'].unique()),
-            'temperatures': list(df['temperature'].unique())
+            'temperatures': list(df['temperature'].unique()),
+            'sequential': self.sequential_summary()
         }
     
     def _create_model_comparison_plot(self, df: pd.DataFrame):
@@ -460,7 +558,37 @@ class ABTest:
         
         html += """
     </table>
-    
+"""
+        
+        # Add sequential test rows
+        if analysis['sequential']:
+            html += """
+    <h2>Sequential Testing</h2>
+    <table>
+        <tr>
+            <th>Model</th>
+            <th>Temp</th>
+            <th>Items Sampled</th>
+            <th>Avg. Score</th>
+            <th>Status</th>
+        </tr>
+"""
+            for arm in analysis['sequential']:
+                mean_score = f"{arm['mean_score']:.2f}" if arm['mean_score'] is not None else "N/A"
+                html += f"""
+        <tr>
+            <td>{arm['model']}</td>
+            <td>{arm['temperature']:.1f}</td>
+            <td>{arm['samples']}</td>
+            <td>{mean_score}</td>
+            <td>{arm['status']}</td>
+        </tr>"""
+            
+            html += """
+    </table>
+"""
+        
+        html += """
     <h2>Temperature Metrics</h2>
     <table>
         <tr>
@@ -590,7 +718,17 @@ def main():
     
     # Generation options
     parser.add_argument("--force", action="store_true", help="Force generation even if dependencies aren't met")
-    parser.add_argument("--delay", type=int, default=0, help="Delay between generations in seconds")
+    parser.add_argument("--delay", type=int, default=0, help="Delay between starting generations in seconds")
+    parser.add_argument("--max-concurrency", type=int,
+                        help="Maximum number of concurrent generations (defaults to the rate limiters' limit)")
+    
+    # Sequential testing options
+    parser.add_argument("--sequential", action="store_true",
+                        help="Stop sampling model/temperature arms once they are settled as worse than the leader")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help="False positive rate of the sequential test")
+    parser.add_argument("--min-samples", type=int, default=DEFAULT_MIN_SAMPLES,
+                        help="Content items an arm is sampled on before it can be stopped")
     
     args = parser.parse_args()
     
@@ -607,7 +745,8 @@ def main():
     
     # Create and run A/B test
     ab_test = ABTest(content_ids, models, temperatures, args.output_dir)
-    ab_test.run_test(args.force, args.delay)
+    ab_test.run_test(args.force, args.delay, max_concurrency=args.max_concurrency, sequential=args.sequential,
+                     alpha=args.alpha, min_samples=args.min_samples)
     
     # Generate report
     ab_test.generate_report()
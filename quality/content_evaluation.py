@@ -16,18 +16,137 @@ import re
 import argparse
 import logging
 import json
+import copy
+import hashlib
+import datetime
+import threading
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 import markdown
 from bs4 import BeautifulSoup
 
 # Import our custom modules
 from source_evaluation import parse_sources_from_markdown, evaluate_sources
+from markdown_outline import MarkdownOutline, parse_outline
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump when the scoring rules change so memoised evaluations are recomputed
+EVALUATOR_VERSION = 3
+
+# Where memoised evaluations are stored between runs
+EVALUATION_CACHE_DIR = os.getenv("EVALUATION_CACHE_DIR", "data/evaluation_cache")
+
+# Mission pillars and the keywords that indicate them
+MISSION_PILLARS = {
+    "responsible_ai": ["responsible ai", "ethical", "ethics", "bias", "fairness", "transparency", "accountability"],
+    "sustainability": ["sustainability", "sustainable", "environmental", "carbon", "energy", "climate"],
+    "inclusion": ["inclusion", "inclusive", "diversity", "diverse", "accessibility", "accessible", "global"]
+}
+
+# Language that indicates uncertainty
+HEDGING_TERMS = ["may", "might", "could", "possibly", "perhaps", "seems", "appears"]
+
+# Technical terminology
+TECHNICAL_TERMS = ["algorithm", "model", "neural", "training", "inference", "parameter", "hyperparameter",
+                   "gradient", "backpropagation", "optimization"]
+
+WORD_SPLIT_PATTERN = re.compile(r'(\w+)')
+WORD_PATTERN = re.compile(r'\b\w+\b')
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n\s*\n')
+LIST_ITEM_PATTERN = re.compile(r'\n\s*[-*]\s')
+CITATION_PATTERN = re.compile(r'\[\w+\d+\w*\]')
+
+
+class ContentFeatures:
+    """Counts the evaluation criteria need, extracted from a document in one pass.
+    
+    The lowercase document is split into words once. Term counts and counts
+    of adjacent word pairs (with the text between them) then answer every
+    keyword query with a dictionary lookup, giving the same counts as a
+    whole-word regular expression search of the lowercase text.
+    """
+    
+    def __init__(self, content: str):
+        """Extract the features of a document.
+        
+        Args:
+            content: Markdown content
+        """
+        self.lower = content.lower()
+        
+        # Alternating separators and words: [separator, word, separator, ..., word, separator]
+        parts = WORD_SPLIT_PATTERN.split(self.lower)
+        words = parts[1::2]
+        self.term_counts = Counter(words)
+        self.pair_counts = Counter(zip(words, words[1:], parts[2:-1:2]))
+        
+        # Structure
+        self.word_count = len(WORD_PATTERN.findall(content))
+        self.sentence_count = len(SENTENCE_END_PATTERN.findall(content))
+        self.paragraph_count = len(PARAGRAPH_BREAK_PATTERN.findall(content))
+        self.question_count = content.count('?')
+        self.list_item_count = len(LIST_ITEM_PATTERN.findall(content))
+        self.code_fence_count = content.count('```')
+        self.image_count = content.count('![')
+        self.citations = set(CITATION_PATTERN.findall(content))
+    
+    def count(self, *terms: str) -> int:
+        """Count whole-word occurrences of terms in the lowercase content.
+        
+        Args:
+            terms: Lowercase words, or phrases of words separated by single spaces
+            
+        Returns:
+            Total number of occurrences
+        """
+        total = 0
+        for term in terms:
+            words = term.split(' ')
+            if len(words) == 1:
+                total += self.term_counts[term]
+            elif len(words) == 2:
+                total += self.pair_counts[(words[0], words[1], ' ')]
+            else:
+                total += len(re.findall(r'\b' + re.escape(term) + r'\b', self.lower))
+        return total
+    
+    def count_spaced(self, first: str, second: str) -> int:
+        """Count occurrences of two words separated by any run of whitespace.
+        
+        Args:
+            first: First lowercase word
+            second: Second lowercase word
+            
+        Returns:
+            Number of occurrences
+        """
+        return sum(count for (word, next_word, separator), count in self.pair_counts.items()
+                   if word == first and next_word == second and separator.isspace())
+
+
+def audience_level(content_id: Optional[str]) -> str:
+    """Get the target audience level a content ID encodes.
+    
+    Args:
+        content_id: Content ID, such as LRN-BEG-001
+        
+    Returns:
+        'beginner', 'intermediate' or 'advanced' (beginner if the ID has no level)
+    """
+    if content_id and "-BEG-" in content_id:
+        return "beginner"
+    elif content_id and "-INT-" in content_id:
+        return "intermediate"
+    elif content_id and "-ADV-" in content_id:
+        return "advanced"
+    return "beginner"
+
+
 class ContentEvaluation:
     """Content evaluation class."""
     
@@ -41,10 +160,14 @@ class ContentEvaluation:
         self.content_path = content_path
         self.content_id = content_id or self._extract_content_id(content_path)
         self.content = self._load_content()
-        self.html = markdown.markdown(self.content)
-        self.soup = BeautifulSoup(self.html, 'html.parser')
         self.sources = parse_sources_from_markdown(self.content)
         self.source_evaluations = evaluate_sources(self.sources)
+        self._features = None
+        self._outline = None
+        self._html = None
+        self._soup = None
+        self._source_quality = None
+        self._results = None
         
         # Initialize scores
         self.scores = {
@@ -67,6 +190,34 @@ class ContentEvaluation:
             "general": ""
         }
     
+    def revise(self, content: str) -> 'ContentEvaluation':
+        """Get an evaluation of a revision of this content, such as one with rewritten sections.
+        
+        When the revision cites the same sources, their parsed form and CRAAP
+        evaluations are reused, so only the text features are extracted again.
+        The revision is not written to disk.
+        
+        Args:
+            content: Revised markdown content
+            
+        Returns:
+            Evaluation of the revised content
+        """
+        revision = copy.copy(self)
+        revision.content = content
+        revision.sources = parse_sources_from_markdown(content)
+        if revision.sources != self.sources:
+            revision.source_evaluations = evaluate_sources(revision.sources)
+        revision._features = None
+        revision._outline = None
+        revision._html = None
+        revision._soup = None
+        revision._source_quality = None
+        revision._results = None
+        revision.scores = dict.fromkeys(self.scores, 0)
+        revision.notes = dict.fromkeys(self.notes, "")
+        return revision
+    
     def _extract_content_id(self, path: str) -> str:
         """Extract content ID from filename.
         
@@ -89,12 +240,46 @@ class ContentEvaluation:
         with open(self.content_path, 'r') as f:
             return f.read()
     
+    @property
+    def outline(self) -> MarkdownOutline:
+        """Outline of the content, parsed on first use."""
+        if self._outline is None:
+            self._outline = parse_outline(self.content)
+        return self._outline
+    
+    @property
+    def html(self) -> str:
+        """Content rendered to HTML, on first use; evaluation itself does not need it."""
+        if self._html is None:
+            self._html = markdown.markdown(self.content)
+        return self._html
+    
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Parsed HTML of the content, built on first use; evaluation itself does not need it."""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, 'html.parser')
+        return self._soup
+    
+    @property
+    def features(self) -> ContentFeatures:
+        """Features of the content, extracted on first use."""
+        if self._features is None:
+            self._features = ContentFeatures(self.content)
+        return self._features
+    
     def evaluate_source_quality(self) -> Tuple[int, str]:
         """Evaluate source quality.
         
         Returns:
             Tuple of (score, notes)
         """
+        if self._source_quality is None:
+            self._source_quality = self._evaluate_source_quality()
+        return self._source_quality
+    
+    def _evaluate_source_quality(self) -> Tuple[int, str]:
+        """Evaluate source quality without the cached result."""
         if not self.sources:
             return 1, "No sources found"
         
@@ -104,8 +289,7 @@ class ContentEvaluation:
         avg_total = sum(eval.average_score for eval in self.source_evaluations) / len(self.source_evaluations)
         
         # Check source integration
-        source_citations = re.findall(r'\[\w+\d+\w*\]', self.content)
-        unique_citations = set(source_citations)
+        unique_citations = self.features.citations
         
         # Calculate score based on source quality and integration
         score = 3  # Default middle score
@@ -155,19 +339,10 @@ class ContentEvaluation:
             Tuple of (score, notes)
         """
         # Mission pillars to look for
-        pillars = {
-            "responsible_ai": ["responsible ai", "ethical", "ethics", "bias", "fairness", "transparency", "accountability"],
-            "sustainability": ["sustainability", "sustainable", "environmental", "carbon", "energy", "climate"],
-            "inclusion": ["inclusion", "inclusive", "diversity", "diverse", "accessibility", "accessible", "global"]
-        }
+        pillars = MISSION_PILLARS
         
         # Check for mission pillar mentions
-        pillar_mentions = {}
-        for pillar, keywords in pillars.items():
-            mentions = 0
-            for keyword in keywords:
-                mentions += len(re.findall(r'\b' + keyword + r'\b', self.content.lower()))
-            pillar_mentions[pillar] = mentions
+        pillar_mentions = {pillar: self.features.count(*keywords) for pillar, keywords in pillars.items()}
         
         # Calculate score based on mission pillar integration
         score = 3  # Default middle score
@@ -192,7 +367,7 @@ class ContentEvaluation:
             notes.append("No mission pillars mentioned")
         
         # Check for dedicated sections on mission pillars
-        section_titles = [h.text.lower() for h in self.soup.find_all(['h1', 'h2', 'h3', 'h4'])]
+        section_titles = [h.text.lower() for h in self.outline.headings if h.level <= 4]
         pillar_sections = 0
         for title in section_titles:
             for pillar, keywords in pillars.items():
@@ -215,17 +390,19 @@ class ContentEvaluation:
         Returns:
             Tuple of (score, notes)
         """
+        features = self.features
+        
         # Basic readability metrics
-        word_count = len(re.findall(r'\b\w+\b', self.content))
-        sentence_count = len(re.findall(r'[.!?]+', self.content))
-        paragraph_count = len(re.findall(r'\n\s*\n', self.content))
+        word_count = features.word_count
+        sentence_count = features.sentence_count
+        paragraph_count = features.paragraph_count
         
         # Check for engagement elements
-        has_examples = len(re.findall(r'\bexample\b|\bfor instance\b|\bsuch as\b', self.content.lower())) > 0
-        has_questions = len(re.findall(r'\?', self.content)) > 5
-        has_lists = len(re.findall(r'\n\s*[-*]\s', self.content)) > 3
-        has_code = len(re.findall(r'```', self.content)) > 0
-        has_images = len(re.findall(r'!\[', self.content)) > 0
+        has_examples = features.count("example", "for instance", "such as") > 0
+        has_questions = features.question_count > 5
+        has_lists = features.list_item_count > 3
+        has_code = features.code_fence_count > 0
+        has_images = features.image_count > 0
         
         # Calculate score based on engagement elements
         score = 3  # Default middle score
@@ -277,10 +454,7 @@ class ContentEvaluation:
         source_score, _ = self.evaluate_source_quality()
         
         # Check for hedging language (indicates uncertainty)
-        hedging_terms = ["may", "might", "could", "possibly", "perhaps", "seems", "appears"]
-        hedging_count = 0
-        for term in hedging_terms:
-            hedging_count += len(re.findall(r'\b' + term + r'\b', self.content.lower()))
+        hedging_count = self.features.count(*HEDGING_TERMS)
         
         # Calculate score
         score = source_score  # Start with source quality score
@@ -292,10 +466,7 @@ class ContentEvaluation:
             notes.append(f"Excessive hedging language ({hedging_count} instances)")
         
         # Check for technical terms
-        technical_terms = ["algorithm", "model", "neural", "training", "inference", "parameter", "hyperparameter", "gradient", "backpropagation", "optimization"]
-        technical_count = 0
-        for term in technical_terms:
-            technical_count += len(re.findall(r'\b' + term + r'\b', self.content.lower()))
+        technical_count = self.features.count(*TECHNICAL_TERMS)
         
         if technical_count > 10:
             score += 0.5
@@ -321,19 +492,15 @@ class ContentEvaluation:
         # A full evaluation would require knowledge of the target audience
         
         # Extract audience from content ID
-        audience = "beginner"  # Default
-        if self.content_id and "-BEG-" in self.content_id:
-            audience = "beginner"
-        elif self.content_id and "-INT-" in self.content_id:
-            audience = "intermediate"
-        elif self.content_id and "-ADV-" in self.content_id:
-            audience = "advanced"
+        audience = audience_level(self.content_id)
+        
+        features = self.features
         
         # Check for audience-appropriate language
         if audience == "beginner":
             # Check for explanations of basic terms
-            explanations = len(re.findall(r'\bis\s+a\b|\bmeans\b|\brefers to\b', self.content.lower()))
-            simple_language = len(re.findall(r'\bsimple\b|\bbasic\b|\bfundamental\b|\bintroduction\b', self.content.lower()))
+            explanations = features.count_spaced("is", "a") + features.count("means", "refers to")
+            simple_language = features.count("simple", "basic", "fundamental", "introduction")
             
             score = 3  # Default
             notes = []
@@ -348,8 +515,8 @@ class ContentEvaluation:
             
         elif audience == "intermediate":
             # Check for more advanced concepts but still with explanations
-            advanced_concepts = len(re.findall(r'\barchitecture\b|\bimplementation\b|\bframework\b|\bworkflow\b', self.content.lower()))
-            practical_examples = len(re.findall(r'\bexample\b|\bcase study\b|\bapplication\b', self.content.lower()))
+            advanced_concepts = features.count("architecture", "implementation", "framework", "workflow")
+            practical_examples = features.count("example", "case study", "application")
             
             score = 3  # Default
             notes = []
@@ -360,8 +527,8 @@ class ContentEvaluation:
             
         elif audience == "advanced":
             # Check for technical depth
-            technical_depth = len(re.findall(r'\boptimization\b|\barchitecture\b|\bimplementation\b|\balgorithm\b|\bperformance\b', self.content.lower()))
-            research_references = len(re.findall(r'\bresearch\b|\bstudy\b|\bpaper\b|\bpublication\b', self.content.lower()))
+            technical_depth = features.count("optimization", "architecture", "implementation", "algorithm", "performance")
+            research_references = features.count("research", "study", "paper", "publication")
             
             score = 3  # Default
             notes = []
@@ -384,9 +551,15 @@ class ContentEvaluation:
     def evaluate(self) -> Dict:
         """Evaluate content on all criteria.
         
+        The results are computed once per instance and returned again on
+        later calls.
+        
         Returns:
             Dictionary with evaluation results
         """
+        if self._results is not None:
+            return self._results
+        
         # Evaluate each criterion
         self.scores["source_quality"], self.notes["source_quality"] = self.evaluate_source_quality()
         self.scores["mission_alignment"], self.notes["mission_alignment"] = self.evaluate_mission_alignment()
@@ -417,31 +590,20 @@ class ContentEvaluation:
             quality_rating = "Poor"
         
         # Compile results
-        return {
+        self._results = {
             "content_id": self.content_id,
             "content_path": self.content_path,
             "scores": self.scores,
             "notes": self.notes,
             "quality_rating": quality_rating,
             "source_count": len(self.sources),
-            "word_count": len(re.findall(r'\b\w+\b', self.content))
+            "word_count": self.features.word_count
         }
+        return self._results
     
     def print_evaluation(self):
         """Print evaluation results to console."""
-        evaluation = self.evaluate()
-        
-        print(f"\nContent Evaluation for {evaluation['content_id']}")
-        print(f"Path: {evaluation['content_path']}")
-        print(f"Word Count: {evaluation['word_count']}")
-        print(f"Source Count: {evaluation['source_count']}")
-        print("\nScores:")
-        print(f"  Accuracy: {evaluation['scores']['accuracy']}/5 - {evaluation['notes']['accuracy']}")
-        print(f"  Relevance: {evaluation['scores']['relevance']}/5 - {evaluation['notes']['relevance']}")
-        print(f"  Engagement: {evaluation['scores']['engagement']}/5 - {evaluation['notes']['engagement']}")
-        print(f"  Mission Alignment: {evaluation['scores']['mission_alignment']}/5 - {evaluation['notes']['mission_alignment']}")
-        print(f"  Source Quality: {evaluation['scores']['source_quality']}/5 - {evaluation['notes']['source_quality']}")
-        print(f"\nOverall Rating: {evaluation['quality_rating']} ({evaluation['scores']['average']:.1f}/5)")
+        print_evaluation(self.evaluate())
     
     def save_evaluation(self, output_path: Optional[str] = None):
         """Save evaluation results to JSON file.
@@ -449,15 +611,231 @@ class ContentEvaluation:
         Args:
             output_path: Path to save evaluation results (default: content_path + .evaluation.json)
         """
-        evaluation = self.evaluate()
+        save_evaluation(self.evaluate(), output_path or f"{self.content_path}.evaluation.json")
+
+
+def print_evaluation(evaluation: Dict):
+    """Print evaluation results to console.
+    
+    Args:
+        evaluation: Evaluation results
+    """
+    print(f"\nContent Evaluation for {evaluation['content_id']}")
+    print(f"Path: {evaluation['content_path']}")
+    print(f"Word Count: {evaluation['word_count']}")
+    print(f"Source Count: {evaluation['source_count']}")
+    print("\nScores:")
+    print(f"  Accuracy: {evaluation['scores']['accuracy']}/5 - {evaluation['notes']['accuracy']}")
+    print(f"  Relevance: {evaluation['scores']['relevance']}/5 - {evaluation['notes']['relevance']}")
+    print(f"  Engagement: {evaluation['scores']['engagement']}/5 - {evaluation['notes']['engagement']}")
+    print(f"  Mission Alignment: {evaluation['scores']['mission_alignment']}/5 - {evaluation['notes']['mission_alignment']}")
+    print(f"  Source Quality: {evaluation['scores']['source_quality']}/5 - {evaluation['notes']['source_quality']}")
+    print(f"\nOverall Rating: {evaluation['quality_rating']} ({evaluation['scores']['average']:.1f}/5)")
+
+
+def save_evaluation(evaluation: Dict, output_path: str):
+    """Save evaluation results to a JSON file.
+    
+    Args:
+        evaluation: Evaluation results
+        output_path: Path to save evaluation results
+    """
+    with open(output_path, 'w') as f:
+        json.dump(evaluation, f, indent=2)
+    
+    logger.info(f"Saved evaluation to {output_path}")
+
+
+def hash_content_file(content_path: str) -> Optional[str]:
+    """Get the SHA-256 hex digest of a content file.
+    
+    Args:
+        content_path: Path to the content file
+        
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(content_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError as e:
+        logger.error(f"Error reading content file {content_path}: {str(e)}")
+        return None
+
+
+class EvaluationCache:
+    """Memoised content evaluations, kept in-process and on disk.
+    
+    Evaluations are keyed by the content hash, the content ID (which sets the
+    audience), the evaluator version and the current year (which source
+    currency is measured against), so an entry is only reused when
+    evaluating again would give the same result. Each entry is a JSON file
+    under the cache directory, written atomically.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = EVALUATION_CACHE_DIR):
+        """Initialize a cache.
+        
+        Args:
+            cache_dir: Directory for the on-disk store (None to keep evaluations in-process only)
+        """
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(content_hash: str, content_id: str) -> str:
+        """Get the cache key of an evaluation.
         
-        if not output_path:
-            output_path = f"{self.content_path}.evaluation.json"
+        Args:
+            content_hash: SHA-256 hex digest of the content
+            content_id: Content ID
+            
+        Returns:
+            Cache key
+        """
+        parts = [EVALUATOR_VERSION, datetime.datetime.now().year, content_hash, content_id]
+        return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        """Get the file an entry is stored in."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a memoised evaluation.
         
-        with open(output_path, 'w') as f:
-            json.dump(evaluation, f, indent=2)
+        Args:
+            key: Cache key
+            
+        Returns:
+            A copy of the evaluation, or None if it is not cached
+        """
+        with self._lock:
+            evaluation = self._memory.get(key)
+        
+        if evaluation is None and self.cache_dir:
+            path = self._path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r') as f:
+                        evaluation = json.load(f)
+                    with self._lock:
+                        self._memory[key] = evaluation
+                except Exception as e:
+                    logger.error(f"Error reading cached evaluation {path}: {str(e)}")
+        
+        return copy.deepcopy(evaluation) if evaluation is not None else None
+    
+    def put(self, key: str, evaluation: Dict) -> bool:
+        """Memoise an evaluation.
         
-        logger.info(f"Saved evaluation to {output_path}")
+        Args:
+            key: Cache key
+            evaluation: Evaluation results
+            
+        Returns:
+            True if successful, False if it could not be written to disk
+        """
+        evaluation = copy.deepcopy(evaluation)
+        with self._lock:
+            self._memory[key] = evaluation
+        
+        if not self.cache_dir:
+            return True
+        
+        try:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(evaluation, f)
+            os.replace(temp_path, path)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error writing cached evaluation: {str(e)}")
+            return False
+    
+    def clear(self) -> None:
+        """Forget the in-process evaluations; the on-disk store is kept."""
+        with self._lock:
+            self._memory.clear()
+
+
+_evaluation_cache = None
+_evaluation_cache_lock = threading.Lock()
+
+
+def get_evaluation_cache() -> EvaluationCache:
+    """Get the shared evaluation cache, creating it on first use.
+    
+    Returns:
+        The cache
+    """
+    global _evaluation_cache
+    
+    if _evaluation_cache is None:
+        with _evaluation_cache_lock:
+            if _evaluation_cache is None:
+                _evaluation_cache = EvaluationCache()
+    
+    return _evaluation_cache
+
+
+def _content_id_from_path(content_path: str) -> str:
+    """Get the content ID a ContentEvaluation would derive from a path."""
+    return os.path.splitext(os.path.basename(content_path))[0]
+
+
+def get_cached_evaluation(content_path: str, content_id: Optional[str] = None) -> Optional[Dict]:
+    """Get the memoised evaluation of a content file without evaluating it.
+    
+    Args:
+        content_path: Path to the content file
+        content_id: Content ID (if not provided, will be extracted from the filename)
+        
+    Returns:
+        Evaluation results, or None if the file's current content has not been evaluated
+    """
+    content_hash = hash_content_file(content_path)
+    if content_hash is None:
+        return None
+    
+    evaluation = get_evaluation_cache().get(
+        EvaluationCache.key(content_hash, content_id or _content_id_from_path(content_path)))
+    if evaluation is not None:
+        evaluation["content_path"] = content_path
+    return evaluation
+
+
+def evaluate_content(content_path: str, content_id: Optional[str] = None, use_cache: bool = True) -> Dict:
+    """Evaluate a content file, reusing the memoised evaluation if its content is unchanged.
+    
+    Args:
+        content_path: Path to the content file
+        content_id: Content ID (if not provided, will be extracted from the filename)
+        use_cache: Whether to look up and memoise the evaluation
+        
+    Returns:
+        Evaluation results
+    """
+    if not use_cache:
+        return ContentEvaluation(content_path, content_id).evaluate()
+    
+    content_hash = hash_content_file(content_path)
+    if content_hash is None:
+        return ContentEvaluation(content_path, content_id).evaluate()
+    
+    cache = get_evaluation_cache()
+    key = EvaluationCache.key(content_hash, content_id or _content_id_from_path(content_path))
+    evaluation = cache.get(key)
+    if evaluation is not None:
+        evaluation["content_path"] = content_path
+        return evaluation
+    
+    evaluation = ContentEvaluation(content_path, content_id).evaluate()
+    cache.put(key, evaluation)
+    return evaluation
 
 
 def main():
@@ -465,22 +843,29 @@ def main():
     parser = argparse.ArgumentParser(description="Evaluate content quality")
     parser.add_argument("content_path", help="Path to content file")
     parser.add_argument("--content-id", help="Content ID (if not in filename)")
-    parser.add_argument("--output", help="Path to save evaluation results")
+    parser.add_argument("--output", help="Path to save evaluation results (default: the evaluation index)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     
     args = parser.parse_args()
     
-    evaluation = ContentEvaluation(args.content_path, args.content_id)
+    # Evaluate once, through the evaluation cache, and print, save or index that result
+    evaluation = evaluate_content(args.content_path, args.content_id)
     
     if args.json:
-        print(json.dumps(evaluation.evaluate(), indent=2))
+        print(json.dumps(evaluation, indent=2))
     else:
-        evaluation.print_evaluation()
+        print_evaluation(evaluation)
     
     if args.output:
-        evaluation.save_evaluation(args.output)
+        save_evaluation(evaluation, args.output)
     else:
-        evaluation.save_evaluation()
+        # Record the evaluation in the corpus index the dashboard reads
+        from evaluation_index import EvaluationIndex
+        content_hash = hash_content_file(args.content_path)
+        if content_hash is None:
+            logger.warning(f"Could not hash {args.content_path}; the evaluation was not added to the index")
+        else:
+            EvaluationIndex().put_many([(EvaluationCache.key(content_hash, evaluation['content_id']), evaluation)])
 
 if __name__ == "__main__":
     main()
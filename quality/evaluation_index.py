@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide content evaluation index for AI Hub Content.
+
+This module evaluates every markdown file in the generated content directory
+across a process pool and keeps the results in one SQLite index, instead of an
+evaluation JSON file next to each piece of content. Each row records the
+evaluation cache key (content hash, content ID, evaluator version and year),
+so a re-run only evaluates files that are new, have changed, or were scored
+by an older evaluator.
+
+Evaluations themselves come from content_evaluation's memoised evaluation
+cache, which stays the source of truth: workers evaluate through it, and
+load_current_evaluations only trusts an index row whose key matches the
+file's current content, falling back to the cache otherwise. The dashboard
+reads the whole index with one query.
+"""
+
+import os
+import sys
+import glob
+import json
+import sqlite3
+import logging
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Import our custom modules
+from content_evaluation import EvaluationCache, evaluate_content, get_cached_evaluation, hash_content_file
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Where the consolidated evaluation index is stored
+EVALUATION_INDEX_PATH = os.getenv("EVALUATION_INDEX_PATH", "data/evaluation_index.sqlite")
+
+# Default directory of content to evaluate
+DEFAULT_CONTENT_DIR = "generated_content"
+
+# Number of evaluations written to the index per transaction
+INDEX_WRITE_BATCH_SIZE = 32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    content_id TEXT PRIMARY KEY,
+    content_path TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    average_score REAL,
+    quality_rating TEXT,
+    evaluated_at TEXT NOT NULL,
+    evaluation TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_quality_rating ON evaluations (quality_rating);
+"""
+
+
+class EvaluationIndex:
+    """Content evaluations for the whole corpus, one row per content ID, in SQLite."""
+
+    def __init__(self, path: str = EVALUATION_INDEX_PATH):
+        """Initialize an index.
+
+        Args:
+            path: Path to the SQLite database (created on the first write)
+        """
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating its schema if needed."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def get_keys(self) -> Dict[str, str]:
+        """Get the cache key each indexed evaluation was made for.
+
+        Returns:
+            Dictionary of content ID to cache key (empty if the index cannot be read)
+        """
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            connection = self._connect()
+            try:
+                return dict(connection.execute("SELECT content_id, cache_key FROM evaluations"))
+            finally:
+                connection.close()
+
+        except Exception as e:
+            logger.error(f"Error reading evaluation index {self.path}: {str(e)}")
+            return {}
+
+    def put_many(self, entries: List[Tuple[str, Dict]]) -> bool:
+        """Add or replace evaluations in a single transaction.
+
+        Args:
+            entries: List of (cache key, evaluation results)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not entries:
+            return True
+
+        evaluated_at = datetime.datetime.now().isoformat()
+        rows = [
+            (evaluation['content_id'], evaluation['content_path'], key,
+             evaluation['scores'].get('average'), evaluation.get('quality_rating'),
+             evaluated_at, json.dumps(evaluation))
+            for key, evaluation in entries
+        ]
+
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO evaluations (content_id, content_path, cache_key, average_score, "
+                        "quality_rating, evaluated_at, evaluation) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            finally:
+                connection.close()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error writing to evaluation index {self.path}: {str(e)}")
+            return False
+
+    def remove(self, content_ids: List[str]) -> int:
+        """Remove evaluations from the index.
+
+        Args:
+            content_ids: Content IDs to remove
+
+        Returns:
+            Number of evaluations removed
+        """
+        if not content_ids or not os.path.exists(self.path):
+            return 0
+
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    cursor = connection.executemany("DELETE FROM evaluations WHERE content_id = ?",
+                                                    [(content_id,) for content_id in content_ids])
+                    return cursor.rowcount
+            finally:
+                connection.close()
+
+        except Exception as e:
+            logger.error(f"Error removing from evaluation index {self.path}: {str(e)}")
+            return 0
+
+    def get(self, content_id: str) -> Optional[Dict]:
+        """Get the indexed evaluation of one content item.
+
+        Args:
+            content_id: Content ID
+
+        Returns:
+            Evaluation results, or None if it is not indexed
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute("SELECT evaluation FROM evaluations WHERE content_id = ?",
+                                         (content_id,)).fetchone()
+            finally:
+                connection.close()
+            return json.loads(row[0]) if row else None
+
+        except Exception as e:
+            logger.error(f"Error reading evaluation index {self.path}: {str(e)}")
+            return None
+
+    def load_entries(self) -> Dict[str, Tuple[str, Dict]]:
+        """Load every indexed evaluation with the cache key it was made for.
+
+        Returns:
+            Dictionary of content ID to (cache key, evaluation results) (empty if there is no index)
+        """
+        if not os.path.exists(self.path):
+            logger.warning(f"No evaluation index at {self.path}; run evaluate_corpus to build it")
+            return {}
+
+        try:
+            connection = self._connect()
+            try:
+                rows = connection.execute("SELECT content_id, cache_key, evaluation FROM evaluations").fetchall()
+            finally:
+                connection.close()
+            return {content_id: (key, json.loads(evaluation)) for content_id, key, evaluation in rows}
+
+        except Exception as e:
+            logger.error(f"Error reading evaluation index {self.path}: {str(e)}")
+            return {}
+
+    def load_evaluations(self) -> Dict[str, Dict]:
+        """Load every indexed evaluation.
+
+        Returns:
+            Dictionary of evaluations by content ID (empty if there is no index)
+        """
+        return {content_id: evaluation for content_id, (_, evaluation) in self.load_entries().items()}
+
+
+def load_current_evaluations(content_files: List[str], index_path: str = EVALUATION_INDEX_PATH) -> Dict[str, Dict]:
+    """Load the evaluations of content files as they are now.
+
+    An indexed evaluation is only used if its cache key matches the file's
+    current content; otherwise, such as when a file changed after the last
+    evaluate_corpus run, the memoised evaluation is used if there is one.
+
+    Args:
+        content_files: Content file paths
+        index_path: Path to the evaluation index
+
+    Returns:
+        Dictionary of evaluations by content ID, for the files with a current evaluation
+    """
+    entries = EvaluationIndex(index_path).load_entries()
+
+    evaluations = {}
+    for content_path in content_files:
+        content_id = os.path.splitext(os.path.basename(content_path))[0]
+        content_hash = hash_content_file(content_path)
+        if content_hash is None:
+            continue
+
+        key, evaluation = entries.get(content_id, (None, None))
+        if key != EvaluationCache.key(content_hash, content_id):
+            evaluation = get_cached_evaluation(content_path, content_id)
+        if evaluation:
+            evaluations[content_id] = evaluation
+
+    return evaluations
+
+
+def evaluate_file(task: Tuple[str, str]) -> Optional[Dict]:
+    """Evaluate one content file through the evaluation cache; runs in a worker process.
+
+    Args:
+        task: (content path, content ID)
+
+    Returns:
+        Evaluation results, or None if the file could not be evaluated
+    """
+    content_path, content_id = task
+    try:
+        return evaluate_content(content_path, content_id)
+    except Exception as e:
+        logger.error(f"Error evaluating {content_path}: {str(e)}")
+        return None
+
+
+def evaluate_corpus(content_dir: str = DEFAULT_CONTENT_DIR, index_path: str = EVALUATION_INDEX_PATH,
+                    full: bool = False, prune: bool = False, max_workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Evaluate every new or changed content file and record the results in the index.
+
+    Files are hashed in this process; only those whose cache key differs from
+    the indexed one are evaluated, across a process pool. Results are written
+    to the index in batches as they arrive.
+
+    Args:
+        content_dir: Directory of markdown content
+        index_path: Path to the evaluation index
+        full: Whether to evaluate every file regardless of the index
+        prune: Whether to remove indexed evaluations of content no longer in the directory
+        max_workers: Number of worker processes (defaults to the CPU count; 1 evaluates in this process)
+
+    Returns:
+        Dictionary with evaluation statistics
+    """
+    stats = {
+        'files': 0,
+        'unchanged': 0,
+        'evaluated': 0,
+        'failed': 0,
+        'removed': 0
+    }
+
+    index = EvaluationIndex(index_path)
+    indexed_keys = {} if full else index.get_keys()
+
+    tasks = []
+    keys = {}
+    content_ids = set()
+    for content_path in sorted(glob.glob(os.path.join(content_dir, '*.md'))):
+        stats['files'] += 1
+        content_id = os.path.splitext(os.path.basename(content_path))[0]
+        content_ids.add(content_id)
+
+        content_hash = hash_content_file(content_path)
+        if content_hash is None:
+            stats['failed'] += 1
+            continue
+
+        key = EvaluationCache.key(content_hash, content_id)
+        if indexed_keys.get(content_id) == key:
+            stats['unchanged'] += 1
+            continue
+
+        tasks.append((content_path, content_id))
+        keys[content_id] = key
+
+    # Tasks counted as evaluated or failed, so a crashed pool only fails the rest
+    settled = 0
+
+    def write(entries: List[Tuple[str, Dict]]) -> None:
+        nonlocal settled
+        if index.put_many(entries):
+            stats['evaluated'] += len(entries)
+        else:
+            stats['failed'] += len(entries)
+        settled += len(entries)
+
+    def record(results) -> None:
+        nonlocal settled
+        entries = []
+        for (content_path, content_id), evaluation in zip(tasks, results):
+            if evaluation is None:
+                stats['failed'] += 1
+                settled += 1
+                continue
+
+            entries.append((keys[content_id], evaluation))
+            if len(entries) >= INDEX_WRITE_BATCH_SIZE:
+                write(entries)
+                entries = []
+        write(entries)
+
+    if tasks:
+        try:
+            if max_workers == 1:
+                record(map(evaluate_file, tasks))
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    record(executor.map(evaluate_file, tasks, chunksize=4))
+        except Exception as e:
+            logger.error(f"Error evaluating content in {content_dir}: {str(e)}")
+            stats['failed'] += len(tasks) - settled
+
+    if prune:
+        stale = [content_id for content_id in (indexed_keys or index.get_keys()) if content_id not in content_ids]
+        stats['removed'] = index.remove(stale)
+
+    logger.info(f"Evaluated {stats['evaluated']} of {stats['files']} content files "
+                f"({stats['unchanged']} unchanged, {stats['failed']} failed) into {index_path}")
+
+    return stats
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Evaluate the quality of all generated content")
+    parser.add_argument("--content-dir", default=DEFAULT_CONTENT_DIR, help="Directory of markdown content")
+    parser.add_argument("--index", default=EVALUATION_INDEX_PATH, help="Path to the evaluation index")
+    parser.add_argument("--full", action="store_true", help="Evaluate every file, ignoring the index")
+    parser.add_argument("--prune", action="store_true", help="Remove evaluations of content no longer present")
+    parser.add_argument("--max-workers", type=int, help="Number of worker processes (defaults to the CPU count)")
+
+    args = parser.parse_args()
+
+    stats = evaluate_corpus(args.content_dir, args.index, full=args.full, prune=args.prune,
+                            max_workers=args.max_workers)
+
+    # Print statistics
+    print("\nEvaluation Statistics:")
+    print(f"Content files: {stats['files']}")
+    print(f"Unchanged (skipped): {stats['unchanged']}")
+    print(f"Evaluated: {stats['evaluated']}")
+    print(f"Failed: {stats['failed']}")
+    if args.prune:
+        print(f"Removed: {stats['removed']}")
+
+    # Exit with appropriate status code
+    sys.exit(0 if stats['failed'] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
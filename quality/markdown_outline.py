@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Lightweight markdown outline parser for AI Hub Content.
+
+This module reads the structure of a markdown document line by line:
+headings (ATX and setext), sections, fenced code blocks, list items and
+images. It is much cheaper than rendering the document to HTML and building
+a BeautifulSoup tree, which content evaluation only needs for the heading
+text. Lines inside code blocks tagged with a programming language are code,
+so a `# comment` in a code sample is not taken for a heading.
+"""
+
+import re
+import html
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})[ \t]*([^`\s]*)')
+ATX_HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE_PATTERN = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+LIST_ITEM_PATTERN = re.compile(r'^[ \t]*(?:[-*+]|\d+[.)])[ \t]+\S')
+INDENTED_CODE_PATTERN = re.compile(r'^(?: {4}|\t)')
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]*)>?[^)]*\)')
+
+# Fence languages whose headings still count: untagged and markdown fences
+# often hold templates, or are mis-nested by the generator so that later
+# prose ends up inside them
+MARKDOWN_FENCE_LANGUAGES = ('', 'markdown', 'md')
+
+# Inline markup removed from heading text, in order
+INLINE_MARKUP = [
+    (IMAGE_PATTERN, ''),
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),         # inline links
+    (re.compile(r'\[([^\]]*)\]\[[^\]]*\]'), r'\1'),         # reference links
+    (re.compile(r'(`+)(.+?)\1'), r'\2'),                   # code spans
+    (re.compile(r'(\*{1,3}|_{1,3})(\S(?:.*?\S)?)\1'), r'\2'),  # emphasis
+    (re.compile(r'<[^>]+>'), ''),                          # HTML tags
+    (re.compile(r'\\([\\`*_{}\[\]()#+\-.!])'), r'\1'),      # backslash escapes
+]
+
+
+@dataclass
+class Heading:
+    """A heading and where it is."""
+    level: int
+    text: str
+    line: int  # 0-based line number
+    body_start: int  # first line after the heading, past a setext underline
+
+
+@dataclass
+class Section:
+    """The lines from a heading up to the next heading."""
+    heading: Optional[Heading]  # None for any text before the first heading
+    start: int  # first line of the body
+    end: int    # line after the last line of the body
+
+
+@dataclass
+class CodeBlock:
+    """A fenced code block."""
+    language: str
+    start: int  # line of the opening fence
+    end: int    # line after the closing fence
+
+
+@dataclass
+class MarkdownOutline:
+    """The structure of a markdown document."""
+    lines: List[str]
+    headings: List[Heading] = field(default_factory=list)
+    code_blocks: List[CodeBlock] = field(default_factory=list)
+    list_item_lines: List[int] = field(default_factory=list)
+    images: List[Tuple[str, str]] = field(default_factory=list)  # (alt text, source)
+
+    @property
+    def sections(self) -> List[Section]:
+        """The document split at each heading."""
+        sections = []
+        first = self.headings[0].line if self.headings else len(self.lines)
+        if any(line.strip() for line in self.lines[:first]):
+            sections.append(Section(None, 0, first))
+        for i, heading in enumerate(self.headings):
+            end = self.headings[i + 1].line if i + 1 < len(self.headings) else len(self.lines)
+            sections.append(Section(heading, heading.body_start, end))
+        return sections
+
+    def section_text(self, section: Section) -> str:
+        """Get the body text of a section."""
+        return "\n".join(self.lines[section.start:section.end])
+
+
+def plain_text(text: str) -> str:
+    """Strip inline markdown and HTML from a line, keeping the text a reader sees.
+
+    Args:
+        text: Inline markdown
+
+    Returns:
+        Plain text
+    """
+    for pattern, replacement in INLINE_MARKUP:
+        text = pattern.sub(replacement, text)
+    return html.unescape(text).strip()
+
+
+def parse_outline(content: str) -> MarkdownOutline:
+    """Parse the outline of a markdown document in one pass over its lines.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        The document outline
+    """
+    outline = MarkdownOutline(lines=content.split('\n'))
+
+    fence = None           # (fence characters, language, start line) while inside a fenced block
+    paragraph_line = None  # line number of a one-line paragraph that a setext underline would turn into a heading
+    previous_blank = True
+    in_list = False        # whether indented list markers start nested list items rather than indented code
+
+    for number, line in enumerate(outline.lines):
+        if fence is not None:
+            marker, language, start = fence
+            if line.strip().startswith(marker[0] * len(marker)) and not line.strip().strip(marker[0]):
+                outline.code_blocks.append(CodeBlock(language, start, number + 1))
+                fence = None
+            elif language.lower() in MARKDOWN_FENCE_LANGUAGES and ATX_HEADING_PATTERN.match(line):
+                match = ATX_HEADING_PATTERN.match(line)
+                outline.headings.append(Heading(len(match.group(1)), plain_text(match.group(2) or ""), number,
+                                                number + 1))
+            continue
+
+        blank = not line.strip()
+        candidate = None
+
+        match = FENCE_PATTERN.match(line)
+        if match:
+            fence = (match.group(1), match.group(2), number)
+        elif blank:
+            pass
+        elif INDENTED_CODE_PATTERN.match(line) and not (in_list and LIST_ITEM_PATTERN.match(line)):
+            # Indented code, or the continuation of a paragraph or list item
+            pass
+        elif ATX_HEADING_PATTERN.match(line):
+            match = ATX_HEADING_PATTERN.match(line)
+            outline.headings.append(Heading(len(match.group(1)), plain_text(match.group(2) or ""), number,
+                                            number + 1))
+        elif paragraph_line is not None and SETEXT_UNDERLINE_PATTERN.match(line):
+            level = 1 if line.strip()[0] == '=' else 2
+            outline.headings.append(Heading(level, plain_text(outline.lines[paragraph_line]), paragraph_line,
+                                            number + 1))
+        elif LIST_ITEM_PATTERN.match(line):
+            outline.list_item_lines.append(number)
+            in_list = True
+        elif previous_blank or (outline.headings and outline.headings[-1].line == number - 1):
+            candidate = number
+
+        if not blank and '![' in line:
+            outline.images.extend(IMAGE_PATTERN.findall(line))
+
+        if not blank and not INDENTED_CODE_PATTERN.match(line) and not LIST_ITEM_PATTERN.match(line):
+            in_list = False
+        paragraph_line = candidate
+        previous_blank = blank
+
+    if fence is not None:
+        marker, language, start = fence
+        outline.code_blocks.append(CodeBlock(language, start, len(outline.lines)))
+
+    return outline
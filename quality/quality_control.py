@@ -13,6 +13,10 @@ import json
 import logging
 import argparse
 import time
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 from datetime import datetime
@@ -22,14 +26,31 @@ from supabase_client import (
     is_connected, get_content_inventory, update_content_status,
     get_content_item, update_content_item
 )
-from content_workflow_supabase import generate_content_for_id
-from content_evaluation import ContentEvaluation
+from content_workflow_supabase import generate_content_for_id, generate_content_for_item
+from content_evaluation import ContentEvaluation, evaluate_content
+from section_regeneration import regenerate_sections, DEFAULT_MAX_SECTIONS
+
+try:
+    from core.rate_limiter import get_rate_limiter
+except ImportError:
+    # If we're running from the core directory
+    from rate_limiter import get_rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Score thresholds and the evaluation score each applies to
+SCORE_THRESHOLDS = {
+    'average_score': 'average',
+    'accuracy_score': 'accuracy',
+    'relevance_score': 'relevance',
+    'engagement_score': 'engagement',
+    'mission_alignment_score': 'mission_alignment',
+    'source_quality_score': 'source_quality'
+}
+
 class QualityControl:
     """Quality control class for content generation."""
     
@@ -69,21 +90,29 @@ class QualityControl:
             logger.error(f"Content file not found: {content_path}")
             return False, {}
         
-        # Evaluate content
-        evaluation = ContentEvaluation(content_path)
-        results = evaluation.evaluate()
+        # Evaluate content, reusing the memoised evaluation if the file is unchanged;
+        # thresholds are applied afresh so changing them never reuses a stale verdict
+        return self.check_thresholds(evaluate_content(content_path))
+    
+    def check_thresholds(self, results: Dict) -> Tuple[bool, Dict]:
+        """Check evaluation results against the quality thresholds.
         
+        Args:
+            results: Evaluation results
+            
+        Returns:
+            Tuple of (passes_thresholds, evaluation_results with the verdict and failures added)
+        """
         # Check if content meets thresholds
         passes_thresholds = True
         failures = []
         
         # Check scores
-        for score_type in ['average_score', 'accuracy_score', 'relevance_score', 
-                          'engagement_score', 'mission_alignment_score', 'source_quality_score']:
-            if score_type in self.thresholds and score_type in results['scores']:
-                if results['scores'][score_type] < self.thresholds[score_type]:
+        for score_type, score_key in SCORE_THRESHOLDS.items():
+            if score_type in self.thresholds and score_key in results['scores']:
+                if results['scores'][score_key] < self.thresholds[score_type]:
                     passes_thresholds = False
-                    failures.append(f"{score_type} below threshold: {results['scores'][score_type]} < {self.thresholds[score_type]}")
+                    failures.append(f"{score_type} below threshold: {results['scores'][score_key]} < {self.thresholds[score_type]}")
         
         # Check word count
         if 'min_word_count' in self.thresholds and 'word_count' in results:
@@ -103,9 +132,110 @@ class QualityControl:
         
         return passes_thresholds, results
     
+    def failing_criteria(self, evaluation: Dict) -> List[str]:
+        """Get the evaluation criteria that keep content below the thresholds.
+        
+        Args:
+            evaluation: Evaluation results
+            
+        Returns:
+            Criteria below their threshold, lowest score first. Content that is
+            too short counts as failing engagement. If only the average fails,
+            the lowest-scoring criteria are returned.
+        """
+        scores = evaluation.get('scores', {})
+        criteria = sorted(
+            (key for threshold, key in SCORE_THRESHOLDS.items()
+             if key != 'average' and key in scores and threshold in self.thresholds
+             and scores[key] < self.thresholds[threshold]),
+            key=lambda key: scores[key]
+        )
+        
+        if ('engagement' not in criteria and 'min_word_count' in self.thresholds
+                and evaluation.get('word_count', 0) < self.thresholds['min_word_count']):
+            criteria.append('engagement')
+        
+        if not criteria and scores.get('average', 0) < self.thresholds.get('average_score', 0):
+            criterion_scores = {key: scores[key] for key in SCORE_THRESHOLDS.values() if key != 'average' and key in scores}
+            if criterion_scores:
+                lowest = min(criterion_scores.values())
+                criteria = [key for key, score in criterion_scores.items() if score == lowest]
+        
+        return criteria
+    
+    def regenerate_failing_sections(self, content_id: str, content_path: str, evaluation: Dict,
+                                    model: str = "gemini-1.5-flash", temperature: float = 0.7,
+                                    max_sections: int = DEFAULT_MAX_SECTIONS) -> Tuple[bool, Dict]:
+        """Rewrite only the sections behind the failing criteria, instead of the whole document.
+        
+        The revision is evaluated reusing the parsed sources, and replaces the
+        content only if it ranks above the current content.
+        
+        Args:
+            content_id: Content ID
+            content_path: Path to the content file
+            evaluation: Evaluation of the current content
+            model: Model to use for the rewrites
+            temperature: Temperature for the rewrites
+            max_sections: Maximum number of sections to rewrite
+            
+        Returns:
+            Tuple of (passes_thresholds, final_evaluation)
+        """
+        criteria = self.failing_criteria(evaluation)
+        if not criteria:
+            return False, evaluation
+        
+        best_score = evaluation['scores'].get('average', 0)
+        logger.info(f"Rewriting sections of {content_id} for failing criteria: {', '.join(criteria)}")
+        
+        update_content_status(content_id, "Regenerating", {
+            "criteria": criteria,
+            "max_sections": max_sections,
+            "previous_score": best_score,
+            "regeneration_time": datetime.now().isoformat()
+        })
+        
+        try:
+            revision = regenerate_sections(ContentEvaluation(content_path, content_id), criteria, model,
+                                           temperature, max_sections)
+        except Exception as e:
+            logger.error(f"Error rewriting sections of {content_id}: {str(e)}")
+            return False, evaluation
+        
+        if revision is None:
+            return False, evaluation
+        
+        passes_thresholds, new_evaluation = self.check_thresholds(revision.evaluate())
+        new_score = new_evaluation['scores'].get('average', 0)
+        
+        if (passes_thresholds, new_score) <= (bool(evaluation.get('passes_thresholds')), best_score):
+            logger.info(f"Rewritten sections did not improve {content_id} (score: {new_score:.2f}, "
+                        f"previous: {best_score:.2f}); keeping the current content")
+            return False, evaluation
+        
+        # Write the revision atomically so readers never see a partial file
+        temp_path = f"{content_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(revision.content)
+        os.replace(temp_path, content_path)
+        
+        logger.info(f"Rewritten sections raised {content_id} from {best_score:.2f} to {new_score:.2f}")
+        
+        if passes_thresholds:
+            update_content_status(content_id, "Completed", {
+                "regenerated_criteria": criteria,
+                "final_score": new_score,
+                "quality_rating": new_evaluation['quality_rating']
+            })
+        
+        return passes_thresholds, new_evaluation
+    
     def check_and_regenerate(self, content_id: str, model: str = "gemini-1.5-flash", 
                            temperature: float = 0.7, max_attempts: int = 3, 
-                           delay: int = 60, force: bool = False) -> Tuple[bool, Dict]:
+                           delay: int = 60, force: bool = False, candidates: int = 1,
+                           models: Optional[List[str]] = None, targeted: bool = False,
+                           max_sections: int = DEFAULT_MAX_SECTIONS) -> Tuple[bool, Dict]:
         """Check content quality and regenerate if needed.
         
         Args:
@@ -115,6 +245,10 @@ class QualityControl:
             max_attempts: Maximum number of regeneration attempts
             delay: Delay between attempts in seconds
             force: Whether to force regeneration even if content passes thresholds
+            candidates: Number of candidates to generate concurrently (1 regenerates one attempt at a time)
+            models: Models to rotate through for concurrent candidates (default: model)
+            targeted: Whether to first rewrite only the sections behind the failing criteria
+            max_sections: Maximum number of sections to rewrite when targeted
             
         Returns:
             Tuple of (success, final_evaluation)
@@ -158,10 +292,22 @@ class QualityControl:
             for failure in evaluation['failures']:
                 logger.warning(f"  - {failure}")
         
+        # Try rewriting the failing sections before regenerating the whole document
+        if targeted:
+            passes_thresholds, evaluation = self.regenerate_failing_sections(
+                content_id, content_path, evaluation, model, temperature, max_sections)
+            if passes_thresholds:
+                return True, evaluation
+            logger.info(f"Content {content_id} still fails after rewriting sections; regenerating the whole document")
+        
+        if candidates > 1:
+            return self.regenerate_best_of_n(content_id, content_path, evaluation, models or [model],
+                                             temperature, candidates)
+        
         # Regenerate content
         attempt = 1
         best_evaluation = evaluation
-        best_score = evaluation['scores'].get('average_score', 0)
+        best_score = evaluation['scores'].get('average', 0)
         
         while attempt <= max_attempts:
             logger.info(f"Regeneration attempt {attempt}/{max_attempts} for {content_id}")
@@ -192,7 +338,7 @@ class QualityControl:
             
             # Evaluate regenerated content
             passes_thresholds, new_evaluation = self.evaluate_content(content_path)
-            new_score = new_evaluation['scores'].get('average_score', 0)
+            new_score = new_evaluation['scores'].get('average', 0)
             
             logger.info(f"Regenerated content score: {new_score:.2f} (previous best: {best_score:.2f})")
             
@@ -245,6 +391,149 @@ class QualityControl:
             
             return False, best_evaluation
     
+    def regenerate_best_of_n(self, content_id: str, content_path: str, evaluation: Dict,
+                             models: List[str], temperature: float = 0.7,
+                             candidates: int = 3) -> Tuple[bool, Dict]:
+        """Regenerate content by generating several candidates concurrently and keeping the best.
+        
+        Candidate i uses models[i % len(models)] at the temperature attempt i
+        would use when regenerating one attempt at a time. Every candidate is
+        written to its own directory and evaluated as soon as it lands.
+        Candidates run at most as many at a time as the models' rate limiters
+        currently allow, so some are usually still queued when one passes the
+        thresholds; those are then skipped, while candidates already
+        generating are allowed to finish, since their requests cannot be
+        recalled. Candidates that pass rank above those that do not, then by
+        average score; the best replaces the content only if it ranks above
+        the current content.
+        
+        Args:
+            content_id: Content ID to regenerate
+            content_path: Path to the current content file
+            evaluation: Evaluation of the current content
+            models: Models to rotate through
+            temperature: Base temperature for regeneration
+            candidates: Number of candidates to generate
+            
+        Returns:
+            Tuple of (success, final_evaluation)
+        """
+        best_evaluation = evaluation
+        best_score = evaluation['scores'].get('average', 0)
+        best_rank = (bool(evaluation.get('passes_thresholds')), best_score)
+        best_path = None
+        
+        update_content_status(content_id, "Regenerating", {
+            "candidates": candidates,
+            "models": models,
+            "previous_score": best_score,
+            "regeneration_time": datetime.now().isoformat()
+        })
+        
+        # Leave candidates queued beyond what the limiters allow now, so a pass can skip them
+        candidate_models = [models[i % len(models)] for i in range(candidates)]
+        max_workers = min([candidates] + [get_rate_limiter(m).concurrency for m in set(candidate_models)])
+        stop = threading.Event()
+        
+        def run_candidate(candidate_model, candidate_temperature, output_dir):
+            # Evaluate in the worker, so a pass stops the next queued candidate before it starts
+            if stop.is_set():
+                return None
+            success, _ = generate_content_for_item(content_id, candidate_model, candidate_temperature,
+                                                   output_dir=output_dir, force=True)
+            candidate_path = os.path.join(output_dir, f"{content_id}.md")
+            if not success or not os.path.exists(candidate_path):
+                return False, None
+            passes_thresholds, new_evaluation = self.evaluate_content(candidate_path)
+            if passes_thresholds:
+                stop.set()
+            return passes_thresholds, new_evaluation
+        
+        candidate_root = tempfile.mkdtemp(prefix=f".{content_id}-candidates-",
+                                          dir=os.path.dirname(content_path) or '.')
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = {}
+                for i, candidate_model in enumerate(candidate_models):
+                    candidate_temperature = min(0.9, temperature + ((i + 1) * 0.1))
+                    output_dir = os.path.join(candidate_root, str(i + 1))
+                    future = executor.submit(run_candidate, candidate_model, candidate_temperature, output_dir)
+                    futures[future] = (i + 1, candidate_model, candidate_temperature, output_dir)
+                
+                skipped = 0
+                for future in as_completed(futures):
+                    candidate, candidate_model, candidate_temperature, output_dir = futures[future]
+                    if future.cancelled():
+                        skipped += 1
+                        continue
+                    
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Candidate {candidate} for {content_id} raised an error: {str(e)}")
+                        result = (False, None)
+                    
+                    if result is None:
+                        skipped += 1
+                        continue
+                    
+                    passes_thresholds, new_evaluation = result
+                    if new_evaluation is None:
+                        logger.error(f"Failed to generate candidate {candidate}/{candidates} for {content_id} "
+                                     f"({candidate_model}, temperature {candidate_temperature:.1f})")
+                        continue
+                    
+                    new_score = new_evaluation['scores'].get('average', 0)
+                    
+                    logger.info(f"Candidate {candidate}/{candidates} for {content_id} ({candidate_model}, "
+                                f"temperature {candidate_temperature:.1f}) scored {new_score:.2f} "
+                                f"(best so far: {best_score:.2f})")
+                    
+                    # A candidate that passes beats one that does not, whatever its average
+                    if (passes_thresholds, new_score) > best_rank:
+                        best_evaluation = new_evaluation
+                        best_score = new_score
+                        best_rank = (passes_thresholds, new_score)
+                        best_path = os.path.join(output_dir, f"{content_id}.md")
+                    
+                    if passes_thresholds:
+                        # Drop what has not started; queued candidates that slip through skip themselves
+                        for pending in futures:
+                            pending.cancel()
+                
+                if skipped:
+                    logger.info(f"Skipped {skipped} candidates for {content_id} after one passed quality thresholds")
+            
+            # Keep the best candidate if it beats the current content
+            if best_path:
+                os.replace(best_path, content_path)
+                best_evaluation['content_path'] = content_path
+        
+        finally:
+            shutil.rmtree(candidate_root, ignore_errors=True)
+        
+        if best_evaluation.get('passes_thresholds'):
+            logger.info(f"Content {content_id} passes quality thresholds (score: {best_score:.2f})")
+            
+            update_content_status(content_id, "Completed", {
+                "regeneration_candidates": candidates,
+                "final_score": best_score,
+                "quality_rating": best_evaluation['quality_rating']
+            })
+            
+            return True, best_evaluation
+        else:
+            logger.warning(f"Content {content_id} still fails quality thresholds after {candidates} candidates "
+                           f"(best score: {best_score:.2f})")
+            
+            update_content_status(content_id, "Quality Check Failed", {
+                "regeneration_candidates": candidates,
+                "best_score": best_score,
+                "failures": best_evaluation['failures']
+            })
+            
+            return False, best_evaluation
+    
     def batch_quality_check(self, content_ids: Optional[List[str]] = None, 
                           status: Optional[str] = None,
                           section: Optional[str] = None,
@@ -252,9 +541,22 @@ class QualityControl:
                           temperature: float = 0.7,
                           max_attempts: int = 3,
                           delay: int = 60,
-                          force: bool = False) -> Dict[str, Dict]:
+                          force: bool = False,
+                          candidates: int = 1,
+                          models: Optional[List[str]] = None,
+                          targeted: bool = False,
+                          max_sections: int = DEFAULT_MAX_SECTIONS,
+                          max_concurrency: Optional[int] = None,
+                          report_path: Optional[str] = None) -> Dict[str, Dict]:
         """Batch check and regenerate content.
         
+        Items are checked concurrently on a worker pool. Their LLM requests go
+        through the model's shared adaptive limiter, which decides how many
+        actually run at once; max_attempts (and candidates) bound the work
+        spent on any one item. When a report path is given, the HTML report is
+        rewritten as each item finishes, so a long sweep can be followed while
+        it runs.
+        
         Args:
             content_ids: List of content IDs to check
             status: Filter by status
@@ -264,9 +566,16 @@ class QualityControl:
             max_attempts: Maximum number of regeneration attempts
             delay: Delay between attempts in seconds
             force: Whether to force regeneration even if content passes thresholds
+            candidates: Number of candidates to generate concurrently per item
+            models: Models to rotate through for concurrent candidates
+            targeted: Whether to first rewrite only the sections behind the failing criteria
+            max_sections: Maximum number of sections to rewrite when targeted
+            max_concurrency: Maximum number of items checked at once (defaults to the
+                model limiter's maximum)
+            report_path: Path to write the HTML report to as results come in
             
         Returns:
-            Dictionary of results by content ID
+            Dictionary of results by content ID, in inventory order
         """
         # Check Supabase connection
         if not is_connected():
@@ -295,10 +604,11 @@ class QualityControl:
             logger.info(f"No content items match the criteria (status={status}, content_ids={content_ids}, section={section})")
             return {}
         
-        # Check and regenerate each item
-        results = {}
+        limiter = get_rate_limiter(model)
+        if max_concurrency is None:
+            max_concurrency = limiter.max_concurrency
         
-        for item in filtered_items:
+        def check(item: Dict) -> Dict:
             content_id = item['content_id']
             title = item.get('title', content_id)
             
@@ -310,39 +620,110 @@ class QualityControl:
                 temperature=temperature,
                 max_attempts=max_attempts,
                 delay=delay,
-                force=force
+                force=force,
+                candidates=candidates,
+                models=models,
+                targeted=targeted,
+                max_sections=max_sections
             )
             
-            results[content_id] = {
+            return {
                 'title': title,
                 'success': success,
                 'evaluation': evaluation
             }
         
+        # Check and regenerate the items, up to max_concurrency at a time
+        completed = {}
+        started_at = time.monotonic()
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            futures = {executor.submit(check, item): item for item in filtered_items}
+            
+            for future in as_completed(futures):
+                item = futures[future]
+                content_id = item['content_id']
+                
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error checking quality for {content_id}: {str(e)}")
+                    result = {
+                        'title': item.get('title', content_id),
+                        'success': False,
+                        'evaluation': {'failures': [f"Quality check error: {str(e)}"]}
+                    }
+                
+                completed[content_id] = result
+                logger.info(f"Checked {len(completed)}/{len(futures)}: {content_id} "
+                            f"{'passed' if result['success'] else 'failed'} "
+                            f"({time.monotonic() - started_at:.0f}s elapsed)")
+                logger.info(limiter.format_stats())
+                
+                if report_path:
+                    self.write_quality_report(completed, report_path, total=len(futures))
+        
+        results = {item['content_id']: completed[item['content_id']] for item in filtered_items}
+        
+        if report_path:
+            self.write_quality_report(results, report_path)
+        
         return results
     
-    def generate_quality_report(self, results: Dict[str, Dict]) -> str:
+    def write_quality_report(self, results: Dict[str, Dict], report_path: str,
+                             total: Optional[int] = None) -> bool:
+        """Write the HTML quality report, replacing the file atomically.
+        
+        Args:
+            results: Dictionary of quality check results so far
+            report_path: Path to save the report to
+            total: Number of items in the run, if it is still in progress
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            temp_path = f"{report_path}.tmp"
+            with open(temp_path, 'w') as f:
+                f.write(self.generate_quality_report(results, total))
+            os.replace(temp_path, report_path)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error writing quality report {report_path}: {str(e)}")
+            return False
+    
+    def generate_quality_report(self, results: Dict[str, Dict], total: Optional[int] = None) -> str:
         """Generate HTML quality report.
         
         Args:
             results: Dictionary of quality check results
+            total: Number of items in the run, if it is still in progress
             
         Returns:
             HTML report
         """
-        if not results:
+        in_progress = total is not None and len(results) < total
+        
+        if not results and not in_progress:
             return "<h1>No results to report</h1>"
         
         # Count successes and failures
         success_count = sum(1 for r in results.values() if r['success'])
         failure_count = len(results) - success_count
         
+        # A report of a run in progress reloads itself and says how far the run has got
+        refresh = '<meta http-equiv="refresh" content="30">' if in_progress else ""
+        progress = (f"<p><strong>In progress:</strong> {len(results)} of {total} items checked; "
+                    f"this page reloads every 30 seconds.</p>") if in_progress else ""
+        
         # Create HTML report
         html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    {refresh}
     <title>Content Quality Report</title>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; }}
@@ -363,6 +744,7 @@ class QualityControl:
 <body>
     <h1>Content Quality Report</h1>
     <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    {progress}
     
     <div class="container">
         <div class="card metric-card">
@@ -379,7 +761,7 @@ class QualityControl:
         </div>
         <div class="card metric-card">
             <div class="metric-label">Success Rate</div>
-            <div class="metric-value">{success_count / len(results):.1%}</div>
+            <div class="metric-value">{success_count / max(1, len(results)):.1%}</div>
         </div>
     </div>
     
@@ -478,12 +860,20 @@ def main():
     regen_group.add_argument("--model", default="gemini-1.5-flash", help="Model to use for regeneration")
     regen_group.add_argument("--temperature", type=float, default=0.7, help="Temperature for regeneration")
     regen_group.add_argument("--max-attempts", type=int, default=3, help="Maximum number of regeneration attempts")
-    regen_group.add_argument("--delay", type=int, default=60, help="Delay between attempts in seconds")
+    regen_group.add_argument("--delay", type=int, default=0, help="Delay between attempts in seconds (the shared rate limiter already backs off on throttling)")
     regen_group.add_argument("--force", action="store_true", help="Force regeneration even if content passes thresholds")
+    regen_group.add_argument("--candidates", type=int, default=1, help="Number of candidates to generate concurrently, keeping the best (default: 1, one attempt at a time)")
+    regen_group.add_argument("--models", help="Comma-separated list of models to rotate through for concurrent candidates")
+    regen_group.add_argument("--targeted", action="store_true", help="First rewrite only the sections behind the failing criteria")
+    regen_group.add_argument("--max-sections", type=int, default=DEFAULT_MAX_SECTIONS, help=f"Maximum number of sections to rewrite when targeted (default: {DEFAULT_MAX_SECTIONS})")
     
     # Output options
     output_group = parser.add_argument_group("Output Options")
-    output_group.add_argument("--report", help="Path to save HTML report")
+    output_group.add_argument("--report", help="Path to save HTML report (updated as items finish)")
+    
+    # Concurrency options
+    concurrency_group = parser.add_argument_group("Concurrency Options")
+    concurrency_group.add_argument("--max-concurrency", type=int, help="Maximum number of items checked at once (default: adaptive limiter maximum)")
     
     args = parser.parse_args()
     
@@ -516,16 +906,18 @@ def main():
         temperature=args.temperature,
         max_attempts=args.max_attempts,
         delay=args.delay,
-        force=args.force
+        force=args.force,
+        candidates=args.candidates,
+        models=[m.strip() for m in args.models.split(',')] if args.models else None,
+        targeted=args.targeted,
+        max_sections=args.max_sections,
+        max_concurrency=args.max_concurrency,
+        report_path=args.report
     )
     
-    # Generate report
+    # The report is written as items finish
     if results:
-        report_html = qc.generate_quality_report(results)
-        
         if args.report:
-            with open(args.report, 'w') as f:
-                f.write(report_html)
             logger.info(f"Report saved to {args.report}")
         
         # Print summary
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Section-level regeneration for content that fails quality criteria.
+
+Instead of regenerating a whole document when it fails a criterion such as
+mission alignment or engagement, this module picks the sections that
+contribute least to each failing criterion, rewrites only their bodies with a
+prompt focused on that criterion, and splices them back into the document.
+The revision is then evaluated reusing the parsed sources and their CRAAP
+evaluations, since the Sources section is never rewritten.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Import our custom modules
+from content_evaluation import (
+    ContentEvaluation, ContentFeatures, MISSION_PILLARS, HEDGING_TERMS, TECHNICAL_TERMS, audience_level
+)
+from markdown_outline import Section
+
+try:
+    from core.google_ai_client import generate_content
+except ImportError:
+    # If we're running from the core directory
+    from google_ai_client import generate_content
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Criteria that can be improved by rewriting sections, as named in evaluation scores
+SECTION_CRITERIA = ["accuracy", "relevance", "engagement", "mission_alignment", "source_quality"]
+
+# Sections that are never rewritten; the Sources section is where sources are parsed from
+EXCLUDED_SECTION_TITLES = ("sources", "references", "bibliography", "further reading")
+
+# Sections with shorter bodies (usually a heading directly above its subsections) are not targeted
+MIN_SECTION_WORDS = 40
+
+# Default number of sections rewritten per document, and per failing criterion
+DEFAULT_MAX_SECTIONS = 3
+SECTIONS_PER_CRITERION = 2
+
+PILLAR_NAMES = {
+    "responsible_ai": "responsible AI",
+    "sustainability": "sustainability",
+    "inclusion": "inclusion"
+}
+
+# What a rewritten section should do for each criterion
+CRITERION_INSTRUCTIONS = {
+    "accuracy": "Make the claims precise: replace vague hedging (may, might, could) with specific, supported "
+                "statements, and use the correct technical terminology.",
+    "engagement": "Make the section more engaging: add a concrete example (introduced with \"for example\" or "
+                  "\"such as\"), a short bulleted list where it helps, and a question that invites the reader "
+                  "to reflect.",
+    "mission_alignment": "Integrate {pillars} where they genuinely bear on the topic, with concrete points "
+                         "rather than passing mentions.",
+    "source_quality": "Support the key claims with citations to the sources listed below, using their "
+                      "bracketed keys as written (for example {citation_key}).",
+    "relevance": {
+        "beginner": "Pitch the section at beginners: explain each technical term in plain language where it "
+                    "first appears (\"X is a ...\", \"X means ...\").",
+        "intermediate": "Pitch the section at practitioners: connect the concepts to architectures, frameworks "
+                        "and workflows, with practical examples and applications.",
+        "advanced": "Pitch the section at experts: add technical depth on algorithms, implementation and "
+                    "performance, and relate it to published research."
+    }
+}
+
+SECTION_PROMPT = """You are revising one section of the AI Hub article "{title}", written for a {audience} audience.
+
+Rewrite the body of the section "{heading}" below. {instructions}
+
+Keep the section's topic, facts, citations and any code, and keep it at least as long as it is now. Reply with the revised section body in markdown only: do not repeat the section heading, do not add headings above level {subheading_level}, and do not comment on your changes.
+{sources}
+Section body:
+{body}
+"""
+
+META_COMMENTARY_PATTERN = re.compile(r'^(?:Okay, )?(?:[Hh]ere is|[Hh]ere\'s|Below is)[^\n]*\n\s*\n')
+WRAPPING_FENCE_PATTERN = re.compile(r'^```(?:markdown|md)?[ \t]*\n(.*)\n```$', re.DOTALL)
+CITATION_KEY_PATTERN = re.compile(r'^\[[^\]]+\]')
+
+
+@dataclass
+class SectionTarget:
+    """A section to rewrite and the failing criteria it should address."""
+    index: int  # position in MarkdownOutline.sections
+    section: Section
+    criteria: List[str] = field(default_factory=list)
+
+
+def section_signals(criterion: str, features: ContentFeatures, audience: str) -> int:
+    """Count what a section already contributes to a criterion.
+
+    These are the same signals the evaluation criteria count over the whole
+    document.
+
+    Args:
+        criterion: Criterion name
+        features: Features of the section body
+        audience: Target audience level
+
+    Returns:
+        Number of signals
+    """
+    if criterion == "mission_alignment":
+        return features.count(*[keyword for keywords in MISSION_PILLARS.values() for keyword in keywords])
+    if criterion == "engagement":
+        return (features.count("example", "for instance", "such as") + features.question_count +
+                features.list_item_count + features.code_fence_count + features.image_count)
+    if criterion == "accuracy":
+        # Hedging counts against the section
+        return features.count(*TECHNICAL_TERMS) - features.count(*HEDGING_TERMS)
+    if criterion == "source_quality":
+        return len(features.citations)
+    if criterion == "relevance":
+        if audience == "intermediate":
+            return (features.count("architecture", "implementation", "framework", "workflow") +
+                    features.count("example", "case study", "application"))
+        if audience == "advanced":
+            return (features.count("optimization", "architecture", "implementation", "algorithm", "performance") +
+                    features.count("research", "study", "paper", "publication"))
+        return (features.count_spaced("is", "a") + features.count("means", "refers to") +
+                features.count("simple", "basic", "fundamental", "introduction"))
+    return 0
+
+
+def _is_targetable(evaluation: ContentEvaluation, section: Section) -> bool:
+    """Check whether a section may be rewritten."""
+    if section.heading is None or section.heading.text.lower() in EXCLUDED_SECTION_TITLES:
+        return False
+
+    # Sections whose heading or end falls inside a code block cannot be spliced cleanly
+    for block in evaluation.outline.code_blocks:
+        if block.start < section.heading.line < block.end:
+            return False
+        if section.start <= block.start < section.end < block.end:
+            return False
+    return True
+
+
+def select_sections(evaluation: ContentEvaluation, criteria: List[str],
+                    max_sections: int = DEFAULT_MAX_SECTIONS) -> List[SectionTarget]:
+    """Pick the sections to rewrite for a set of failing criteria.
+
+    For each criterion, in order, the sections with the fewest signals per
+    word are chosen, so long sections that do little for the criterion are
+    rewritten first. A section chosen for several criteria is rewritten once
+    for all of them.
+
+    Args:
+        evaluation: Evaluation of the content
+        criteria: Failing criteria, most important first
+        max_sections: Maximum number of sections to rewrite
+
+    Returns:
+        Targets in document order
+    """
+    audience = audience_level(evaluation.content_id)
+    outline = evaluation.outline
+
+    candidates = []
+    for index, section in enumerate(outline.sections):
+        if not _is_targetable(evaluation, section):
+            continue
+        features = ContentFeatures(outline.section_text(section))
+        if features.word_count >= MIN_SECTION_WORDS:
+            candidates.append((index, section, features))
+
+    targets = {}
+    for criterion in criteria:
+        if criterion not in SECTION_CRITERIA:
+            continue
+
+        ranked = sorted(candidates, key=lambda c: (1 + max(0, section_signals(criterion, c[2], audience))) /
+                        c[2].word_count)
+        for index, section, _ in ranked[:SECTIONS_PER_CRITERION]:
+            if index not in targets:
+                if len(targets) >= max_sections:
+                    continue
+                targets[index] = SectionTarget(index, section)
+            targets[index].criteria.append(criterion)
+
+    return [targets[index] for index in sorted(targets)]
+
+
+def build_section_prompt(evaluation: ContentEvaluation, target: SectionTarget) -> str:
+    """Build the prompt that rewrites one section.
+
+    Args:
+        evaluation: Evaluation of the content
+        target: Section to rewrite
+
+    Returns:
+        Prompt text
+    """
+    audience = audience_level(evaluation.content_id)
+    outline = evaluation.outline
+    title = next((h.text for h in outline.headings if h.level == 1), evaluation.content_id)
+
+    # Name the pillars the document never mentions, or all of them
+    missing = [pillar for pillar, keywords in MISSION_PILLARS.items() if not evaluation.features.count(*keywords)]
+    names = [PILLAR_NAMES[pillar] for pillar in (missing or MISSION_PILLARS)]
+    pillars = f"{', '.join(names[:-1])} and {names[-1]}" if len(names) > 1 else names[0]
+
+    citation_keys = [match.group(0) for match in (CITATION_KEY_PATTERN.match(source.citation)
+                                                  for source in evaluation.sources) if match]
+
+    instructions = []
+    for criterion in target.criteria:
+        instruction = CRITERION_INSTRUCTIONS[criterion]
+        if isinstance(instruction, dict):
+            instruction = instruction[audience]
+        instructions.append(instruction.format(pillars=pillars,
+                                               citation_key=citation_keys[0] if citation_keys else "[REF1]"))
+
+    sources = ""
+    if evaluation.sources and {"source_quality", "accuracy"} & set(target.criteria):
+        sources = "\nSources the article cites:\n" + "\n".join(source.citation for source in evaluation.sources) + "\n"
+
+    return SECTION_PROMPT.format(
+        title=title,
+        audience=audience,
+        heading=target.section.heading.text,
+        instructions=" ".join(instructions),
+        subheading_level=target.section.heading.level + 1,
+        sources=sources,
+        body=outline.section_text(target.section).strip()
+    )
+
+
+def clean_section_body(text: str, heading: str) -> str:
+    """Strip what a model adds around a rewritten section body.
+
+    Args:
+        text: Generated text
+        heading: Text of the section heading
+
+    Returns:
+        Section body
+    """
+    text = text.strip()
+    match = WRAPPING_FENCE_PATTERN.match(text)
+    if match:
+        text = match.group(1).strip()
+    text = META_COMMENTARY_PATTERN.sub("", text).strip()
+
+    # Drop a repeated heading
+    first_line, _, rest = text.partition("\n")
+    if first_line.startswith("#") and first_line.lstrip("#").strip().lower() == heading.lower():
+        text = rest.strip()
+
+    return text
+
+
+def splice_sections(evaluation: ContentEvaluation, bodies: Dict[int, str]) -> str:
+    """Replace section bodies in the content.
+
+    Args:
+        evaluation: Evaluation of the content
+        bodies: New body text by section index
+
+    Returns:
+        Revised content
+    """
+    lines = list(evaluation.outline.lines)
+    sections = evaluation.outline.sections
+
+    # Splice from the end so earlier line numbers stay valid
+    for index in sorted(bodies, reverse=True):
+        section = sections[index]
+        lines[section.start:section.end] = [""] + bodies[index].split("\n") + [""]
+
+    return "\n".join(lines)
+
+
+def regenerate_sections(evaluation: ContentEvaluation, criteria: List[str], model: str = "gemini-1.5-flash",
+                        temperature: float = 0.7,
+                        max_sections: int = DEFAULT_MAX_SECTIONS) -> Optional[ContentEvaluation]:
+    """Rewrite the sections that contribute least to the failing criteria.
+
+    The sections are rewritten concurrently; requests go through the shared
+    rate limiter of the AI client.
+
+    Args:
+        evaluation: Evaluation of the content
+        criteria: Failing criteria, most important first
+        model: Model to use
+        temperature: Temperature for generation
+        max_sections: Maximum number of sections to rewrite
+
+    Returns:
+        Evaluation of the revised content (not yet written to disk), or None if no section was rewritten
+    """
+    targets = select_sections(evaluation, criteria, max_sections)
+    if not targets:
+        logger.info(f"No sections of {evaluation.content_id} to rewrite for {', '.join(criteria)}")
+        return None
+
+    def rewrite(target: SectionTarget) -> Optional[str]:
+        try:
+            text = generate_content(build_section_prompt(evaluation, target), model_name=model,
+                                    temperature=temperature)
+        except Exception as e:
+            logger.error(f"Error rewriting section '{target.section.heading.text}' of "
+                         f"{evaluation.content_id}: {str(e)}")
+            return None
+
+        body = clean_section_body(text or "", target.section.heading.text)
+        return body or None
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        bodies = {target.index: body for target, body in zip(targets, executor.map(rewrite, targets)) if body}
+
+    if not bodies:
+        return None
+
+    rewritten = [target.section.heading.text for target in targets if target.index in bodies]
+    logger.info(f"Rewrote {len(bodies)} of {len(evaluation.outline.sections)} sections of {evaluation.content_id} "
+                f"for {', '.join(criteria)}: {'; '.join(rewritten)}")
+
+    return evaluation.revise(splice_sections(evaluation, bodies))
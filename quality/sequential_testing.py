@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Sequential testing for A/B comparisons of content generation settings.
+
+An A/B test samples each arm (a model and temperature) on the same content
+items, so arms are compared on paired score differences. After every round
+the arms are compared with the current leader using a mixture sequential
+probability ratio test (mSPRT), which stays valid however often the results
+are looked at. An arm is stopped as soon as it is settled as worse than the
+leader, and the test can end once a single arm remains, so clear losers stop
+costing generations early.
+"""
+
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Default false positive rate across all comparisons
+DEFAULT_ALPHA = 0.05
+
+# Standard deviation of the mixing distribution over the standardized effect
+# size (the mean score difference over its standard deviation)
+DEFAULT_TAU = 1.0
+
+# Paired samples needed before an arm can be stopped
+DEFAULT_MIN_SAMPLES = 5
+
+
+def msprt_log_statistic(differences: List[float], tau: float = DEFAULT_TAU) -> float:
+    """Get the log mixture likelihood ratio against a mean difference of zero.
+
+    This is the sequential t-test form of the mSPRT: the effect size is mixed
+    over a normal distribution with standard deviation tau, and the unknown
+    variance is integrated out, so the ratio depends on the data only through
+    the t statistic. Stopping when it exceeds log(1 / alpha) keeps the false
+    positive rate below alpha however many times it is checked.
+
+    Args:
+        differences: Paired score differences
+        tau: Standard deviation of the mixing distribution over the effect size
+
+    Returns:
+        Log likelihood ratio (0 with fewer than two differences)
+    """
+    n = len(differences)
+    if n < 2:
+        return 0.0
+
+    mean = sum(differences) / n
+    sum_of_squares = sum((d - mean) ** 2 for d in differences)
+    degrees_of_freedom = n - 1
+    spread = 1 + n * tau ** 2
+
+    if sum_of_squares == 0:
+        # Identical differences: the limit as the t statistic grows, or no evidence if they are all zero
+        return degrees_of_freedom / 2 * math.log(spread) if mean else -0.5 * math.log(spread)
+
+    t_squared = n * mean ** 2 / (sum_of_squares / degrees_of_freedom)
+    return (-0.5 * math.log(spread) +
+            n / 2 * (math.log(1 + t_squared / degrees_of_freedom) -
+                     math.log(1 + t_squared / (degrees_of_freedom * spread))))
+
+
+class SequentialComparison:
+    """Paired sequential comparison of A/B test arms against the leading arm."""
+
+    def __init__(self, arms: List[Hashable], alpha: float = DEFAULT_ALPHA, tau: float = DEFAULT_TAU,
+                 min_samples: int = DEFAULT_MIN_SAMPLES):
+        """Initialize a comparison.
+
+        Args:
+            arms: Arms to compare, such as (model, temperature) pairs
+            alpha: False positive rate, split evenly across every pair of arms
+            tau: Standard deviation of the mixing distribution over the effect size
+            min_samples: Paired samples needed before an arm can be stopped
+        """
+        self.arms = list(arms)
+        self.alpha = alpha
+        self.tau = tau
+        self.min_samples = min_samples
+        self.scores = {arm: {} for arm in self.arms}
+        self.stopped = {}
+
+    @property
+    def active(self) -> List[Hashable]:
+        """Arms that are still being sampled."""
+        return [arm for arm in self.arms if arm not in self.stopped]
+
+    @property
+    def finished(self) -> bool:
+        """Whether a single arm remains."""
+        return len(self.active) <= 1
+
+    def add(self, arm: Hashable, sample_id: Hashable, score: float) -> None:
+        """Record an arm's score on a sample.
+
+        Args:
+            arm: Arm
+            sample_id: Sample the score is for, such as a content ID
+            score: Score
+        """
+        self.scores[arm][sample_id] = score
+
+    def mean(self, arm: Hashable) -> Optional[float]:
+        """Get an arm's mean score, or None if it has no scores."""
+        scores = self.scores[arm]
+        return sum(scores.values()) / len(scores) if scores else None
+
+    def leader(self) -> Optional[Hashable]:
+        """Get the active arm with the highest mean score, or None if no arm has scores."""
+        scored = [arm for arm in self.active if self.scores[arm]]
+        return max(scored, key=self.mean) if scored else None
+
+    def differences(self, first: Hashable, second: Hashable) -> List[float]:
+        """Get the paired differences of two arms' scores on the samples both have."""
+        second_scores = self.scores[second]
+        return [score - second_scores[sample_id] for sample_id, score in self.scores[first].items()
+                if sample_id in second_scores]
+
+    def update(self) -> List[Tuple[Hashable, Dict]]:
+        """Stop every arm that is settled as worse than the leader.
+
+        Returns:
+            List of (arm, details) for the arms stopped by this update
+        """
+        leader = self.leader()
+        if leader is None or self.finished:
+            return []
+
+        # Bonferroni correction over every pair of arms, since the leader is chosen from the data
+        pairs = len(self.arms) * (len(self.arms) - 1) / 2
+        threshold = math.log(pairs / self.alpha)
+
+        newly_stopped = []
+        for arm in self.active:
+            if arm == leader:
+                continue
+
+            differences = self.differences(leader, arm)
+            if len(differences) < self.min_samples:
+                continue
+
+            statistic = msprt_log_statistic(differences, self.tau)
+            difference = sum(differences) / len(differences)
+            if difference > 0 and statistic >= threshold:
+                details = {
+                    'samples': len(differences),
+                    'leader': leader,
+                    'difference': difference,
+                    'log_statistic': statistic
+                }
+                self.stopped[arm] = details
+                newly_stopped.append((arm, details))
+
+        return newly_stopped
@@ -4,10 +4,18 @@
 from reference_management.reference_management import (
     Reference, ReferenceQuality, ContentReference,
     get_references, get_reference, create_reference, update_reference,
+    create_references, link_references,
     create_quality_assessment, update_quality_assessment,
     link_reference_to_content, get_content_references,
-    get_reference_categories, get_reference_types,
-    search_references, get_reference_statistics
+    get_reference_categories, get_reference_types, invalidate_reference_lookups,
+    search_references, get_reference_statistics,
+    compute_reference_statistics, rebuild_reference_statistics,
+    iter_reference_pages, bulk_update_references,
+    get_search_index, build_search_index, save_search_index,
+    get_dedup_index, get_near_duplicate_index, build_near_duplicate_index,
+    find_near_duplicate_reference,
+    get_citation_index, build_citation_index, get_citing_content, get_cited_references,
+    get_co_cited_references, get_shared_references, get_reference_impact
 )
 
 from reference_management.ai_reference_processor import (
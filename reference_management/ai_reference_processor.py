@@ -8,8 +8,10 @@ AI Hub Content Creation system.
 
 import os
 import json
+import time
 import logging
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union
 from dotenv import load_dotenv
 
@@ -22,7 +24,8 @@ load_dotenv()
 
 # Import our custom modules
 from core.google_ai_client import generate_json
-from reference_management.reference_management import Reference, create_reference, link_reference_to_content
+from core.rate_limiter import get_rate_limiter
+from reference_management.reference_management import Reference, create_references, link_references
 
 def process_reference_with_ai(reference_text: str, model_name: str = "gemini-1.5-flash") -> Dict[str, Any]:
     """
@@ -50,7 +53,7 @@ def process_reference_with_ai(reference_text: str, model_name: str = "gemini-1.5
         "publication_name": "Name of journal/book/website",
         "url": "Full URL if available",
         "doi": "DOI if available (just the DOI, not the URL)",
-        "reference_type": "One of: Journal Article, Book, Book Chapter, Conference Paper, Report, Thesis, Website, Encyclopedia, Other",
+        "reference_type": "One of: Article, Book, Conference, Report, Website, Dataset, Software, Video, Podcast, Social Media, Interview, Other",
         "is_valid_reference": true/false, // Your assessment if this is actually a reference
         "confidence_score": 0.95, // 0-1 score of confidence in the extraction
         "verification": {{
@@ -106,79 +109,82 @@ def process_reference_with_ai(reference_text: str, model_name: str = "gemini-1.5
         return structured_reference
     except Exception as e:
         logger.error(f"Error processing reference with AI: {str(e)}")
-        return {
-            "title": reference_text[:100] + "..." if len(reference_text) > 100 else reference_text,
-            "authors": "Unknown",
-            "publication_date": None,
-            "publication_name": "Unknown",
-            "url": None,
-            "doi": None,
-            "reference_type": "Other",
-            "is_valid_reference": False,
-            "confidence_score": 0.0,
-            "verification": {
-                "source_exists": False,
-                "verification_method": "None",
-                "verification_notes": f"Error processing reference: {str(e)}"
-            },
-            "apa_citation": reference_text
-        }
+        return _fallback_reference(reference_text, e)
 
-def process_references_batch(reference_texts: List[str], model_name: str = "gemini-1.5-flash", rate_limit_delay: float = 4.0) -> List[Dict[str, Any]]:
+def process_references_batch(reference_texts: List[str], model_name: str = "gemini-1.5-flash", rate_limit_delay: float = 4.0,
+                             max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Process a batch of reference texts using AI.
 
+    Requests run concurrently under the shared adaptive limiter for the model,
+    which backs off on quota errors and grows while the API stays healthy.
+
     Args:
         reference_texts: List of reference texts to process
         model_name: The AI model to use
-        rate_limit_delay: Delay in seconds between API calls to avoid rate limits
+        rate_limit_delay: Delay in seconds between API calls when processing sequentially (max_workers=1)
+        max_workers: Maximum number of worker threads (defaults to the limiter's maximum concurrency)
 
     Returns:
-        List of structured reference data
+        List of structured reference data, in the same order as the input
     """
-    processed_references = []
-
-    for i, ref_text in enumerate(reference_texts):
-        logger.info(f"Processing reference {i+1}/{len(reference_texts)}")
-
-        # Add delay to avoid rate limits (except for the first request)
-        if i > 0:
-            import time
-            logger.info(f"Waiting {rate_limit_delay} seconds to avoid rate limits...")
-            time.sleep(rate_limit_delay)
+    limiter = get_rate_limiter(model_name)
+    if max_workers is None:
+        max_workers = limiter.max_concurrency
 
-        # Process the reference
+    def process_one(index: int, ref_text: str) -> Dict[str, Any]:
+        logger.info(f"Processing reference {index+1}/{len(reference_texts)}")
         try:
-            processed_ref = process_reference_with_ai(ref_text, model_name)
-            processed_references.append(processed_ref)
+            return process_reference_with_ai(ref_text, model_name)
         except Exception as e:
             logger.error(f"Error processing reference: {str(e)}")
             # Create a fallback reference with minimal information
-            fallback_ref = {
-                "title": ref_text[:100] + "..." if len(ref_text) > 100 else ref_text,
-                "authors": "Unknown",
-                "publication_date": None,
-                "publication_name": "Unknown",
-                "url": None,
-                "doi": None,
-                "reference_type": "Other",
-                "is_valid_reference": False,
-                "confidence_score": 0.0,
-                "verification": {
-                    "source_exists": False,
-                    "verification_method": "None",
-                    "verification_notes": f"Error processing reference: {str(e)}"
-                },
-                "apa_citation": ref_text
-            }
-            processed_references.append(fallback_ref)
+            return _fallback_reference(ref_text, e)
+
+    if max_workers <= 1:
+        processed_references = []
+        for i, ref_text in enumerate(reference_texts):
+            # Add delay to avoid rate limits (except for the first request)
+            if i > 0 and rate_limit_delay > 0:
+                logger.info(f"Waiting {rate_limit_delay} seconds to avoid rate limits...")
+                time.sleep(rate_limit_delay)
+            processed_references.append(process_one(i, ref_text))
+        return processed_references
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        processed_references = list(executor.map(process_one, range(len(reference_texts)), reference_texts))
+
+    logger.info(limiter.format_stats())
+    return processed_references
 
-            # If we hit a rate limit, wait longer
-            if "quota" in str(e).lower() or "rate limit" in str(e).lower():
-                logger.warning(f"Rate limit hit, waiting {rate_limit_delay * 2} seconds...")
-                time.sleep(rate_limit_delay * 2)
+def _fallback_reference(ref_text: str, error: Exception) -> Dict[str, Any]:
+    """
+    Build a placeholder reference for a text that could not be processed.
 
-    return processed_references
+    Args:
+        ref_text: The reference text
+        error: The error raised while processing it
+
+    Returns:
+        Structured reference data marked as invalid
+    """
+    return {
+        "title": ref_text[:100] + "..." if len(ref_text) > 100 else ref_text,
+        "authors": "Unknown",
+        "publication_date": None,
+        "publication_name": "Unknown",
+        "url": None,
+        "doi": None,
+        "reference_type": "Other",
+        "is_valid_reference": False,
+        "confidence_score": 0.0,
+        "verification": {
+            "source_exists": False,
+            "verification_method": "None",
+            "verification_notes": f"Error processing reference: {str(error)}"
+        },
+        "apa_citation": ref_text
+    }
 
 def store_processed_references(content_id: str, processed_references: List[Dict[str, Any]]) -> List[str]:
     """
@@ -191,7 +197,8 @@ def store_processed_references(content_id: str, processed_references: List[Dict[
     Returns:
         List of reference IDs
     """
-    reference_ids = []
+    references = []
+    citation_keys = []
 
     for i, ref_data in enumerate(processed_references):
         # Skip invalid references
@@ -200,7 +207,7 @@ def store_processed_references(content_id: str, processed_references: List[Dict[
             continue
 
         # Create reference object
-        ref = Reference(
+        references.append(Reference(
             title=ref_data.get("title", ""),
             authors=ref_data.get("authors", ""),
             publication_date=ref_data.get("publication_date"),
@@ -218,27 +225,36 @@ def store_processed_references(content_id: str, processed_references: List[Dict[
                 "processing_date": datetime.datetime.now().isoformat(),
                 "model_used": "gemini-1.5-flash"
             }
-        )
+        ))
+        citation_keys.append(f"REF{i+1}")
+
+    if not references:
+        return []
+
+    # Store all references, then link them to the content, in bulk
+    created_ids = create_references(references)
+    links = [
+        {
+            "reference_id": reference_id,
+            "citation_key": citation_key,
+            "citation_context": "AI-processed reference"
+        }
+        for reference_id, citation_key in zip(created_ids, citation_keys)
+        if reference_id
+    ]
+    link_ids = iter(link_references(content_id, links)) if links else iter([])
+
+    reference_ids = []
+    for ref, reference_id in zip(references, created_ids):
+        if not reference_id:
+            logger.error(f"Failed to create reference: {ref.title}")
+            continue
 
-        # Store reference in database
-        reference_id = create_reference(ref)
-        if reference_id:
-            # Link reference to content
-            citation_key = f"REF{i+1}"
-            link_id = link_reference_to_content(
-                content_id=content_id,
-                reference_id=reference_id,
-                citation_key=citation_key,
-                citation_context="AI-processed reference"
-            )
-
-            if link_id:
-                reference_ids.append(reference_id)
-                logger.info(f"Stored and linked reference: {ref_data.get('title')} for content {content_id}")
-            else:
-                logger.error(f"Failed to link reference {reference_id} to content {content_id}")
+        if next(link_ids):
+            reference_ids.append(reference_id)
+            logger.info(f"Stored and linked reference: {ref.title} for content {content_id}")
         else:
-            logger.error(f"Failed to create reference: {ref_data.get('title')}")
+            logger.error(f"Failed to link reference {reference_id} to content {content_id}")
 
     return reference_ids
 
@@ -269,7 +285,7 @@ def generate_references_for_content(content_text: str, topic: str, model_name: s
         "publication_name": "Name of journal/book/website",
         "url": "Full URL if available",
         "doi": "DOI if available (just the DOI, not the URL)",
-        "reference_type": "One of: Journal Article, Book, Book Chapter, Conference Paper, Report, Thesis, Website, Encyclopedia, Other",
+        "reference_type": "One of: Article, Book, Conference, Report, Website, Dataset, Software, Video, Podcast, Social Media, Interview, Other",
         "citation_context": "Brief description of how this reference relates to the content",
         "apa_citation": "The reference formatted in APA 7th edition style"
     }}
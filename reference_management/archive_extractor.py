@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Archive-wide reference extraction for AI Hub Content Creation.
+
+This module extracts the reference sections of every generated markdown file
+and every stored generation output, parses each citation, and streams the
+normalised records to a JSONL (or Parquet) file for bulk import. Sources are
+parsed across a process pool. A manifest records the content hash of every
+source, so a re-run only extracts sources that are new or have changed.
+"""
+
+import os
+import json
+import glob
+import hashlib
+import logging
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from core.supabase_client import iter_content_file_pages
+from reference_management.citation_parser import parse_citation
+from reference_management.improved_reference_extractor import extract_references_from_content
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default locations of the archive, the output file and the hash manifest
+DEFAULT_ARCHIVE_DIR = "generated_content"
+DEFAULT_OUTPUT_FILE = "extracted_references.jsonl"
+DEFAULT_MANIFEST_FILE = "reference_extraction_manifest.json"
+
+# Number of sources handed to the process pool at a time
+SOURCE_BATCH_SIZE = 64
+
+OUTPUT_FORMATS = ['jsonl', 'parquet']
+
+# A source is (source name, content ID, content hash, text)
+Source = Tuple[str, Optional[str], str, str]
+
+
+def hash_content(text: str) -> str:
+    """Get the SHA-256 hex digest of a text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def extract_source_records(source: Source) -> List[Dict[str, Any]]:
+    """Extract and parse the references of one source.
+
+    Repeated citations within the source are kept once. Citation keys follow
+    the position of the citation in the reference section, as the importers
+    number them.
+
+    Args:
+        source: (source name, content ID, content hash, text)
+
+    Returns:
+        List of normalised reference records
+    """
+    name, content_id, content_hash, text = source
+
+    records = []
+    seen_texts = set()
+    for i, reference_text in enumerate(extract_references_from_content(text)):
+        reference_text = reference_text.strip()
+        if reference_text in seen_texts:
+            continue
+        seen_texts.add(reference_text)
+
+        record = {
+            'source': name,
+            'source_hash': content_hash,
+            'content_id': content_id,
+            'citation_key': f"REF{i+1}"
+        }
+        record.update(parse_citation(reference_text))
+        records.append(record)
+
+    return records
+
+
+def iter_archive_files(archive_dir: str = DEFAULT_ARCHIVE_DIR) -> Iterator[Source]:
+    """Read the generated markdown files in an archive directory.
+
+    Args:
+        archive_dir: Directory of generated content; file names are content IDs
+
+    Yields:
+        Sources named file:<file name>
+    """
+    for path in sorted(glob.glob(os.path.join(archive_dir, '*.md'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Error reading {path}: {str(e)}")
+            continue
+
+        file_name = os.path.basename(path)
+        yield f"file:{file_name}", os.path.splitext(file_name)[0], hash_content(text), text
+
+
+def iter_stored_outputs() -> Iterator[Source]:
+    """Read the stored generation outputs from the content_files table.
+
+    Yields:
+        Sources named output:<generation output ID>
+    """
+    for page in iter_content_file_pages():
+        for row in page:
+            text = row.get('file_content')
+            if text:
+                yield f"output:{row.get('output_id') or row['id']}", row.get('content_id'), hash_content(text), text
+
+
+def load_manifest(manifest_file: Optional[str]) -> Dict[str, str]:
+    """
+    Load the content hashes recorded by the previous extraction.
+
+    Args:
+        manifest_file: Path to the manifest file
+
+    Returns:
+        Dictionary of source name to content hash (empty if there is no usable manifest)
+    """
+    if not manifest_file or not os.path.exists(manifest_file):
+        return {}
+
+    try:
+        with open(manifest_file, 'r') as f:
+            return json.load(f).get('sources', {})
+    except (OSError, json.JSONDecodeError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_file}: {str(e)}")
+        return {}
+
+
+def save_manifest(manifest_file: Optional[str], hashes: Dict[str, str]) -> None:
+    """
+    Save the content hashes of the extracted sources.
+
+    The file is replaced atomically so an interrupted write never leaves a
+    truncated manifest behind.
+
+    Args:
+        manifest_file: Path to the manifest file
+        hashes: Dictionary of source name to content hash
+    """
+    if not manifest_file:
+        return
+
+    manifest = {
+        'sources': hashes,
+        'updated_at': datetime.datetime.now().isoformat()
+    }
+
+    temp_file = f"{manifest_file}.tmp"
+    with open(temp_file, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_file, manifest_file)
+
+
+class RecordWriter:
+    """Write reference records to a JSONL or Parquet file.
+
+    Records are written to a temporary file that replaces the output file on
+    close, so an interrupted run never leaves a partial output behind. JSONL
+    records are streamed as they arrive; Parquet needs pandas with pyarrow or
+    fastparquet and is written in one go on close.
+    """
+
+    def __init__(self, output_file: str, output_format: str = 'jsonl'):
+        """
+        Open a record writer.
+
+        Args:
+            output_file: Path of the output file
+            output_format: 'jsonl' or 'parquet'
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.output_file = output_file
+        self.output_format = output_format
+        self.temp_file = f"{output_file}.tmp"
+        self.count = 0
+        self._records = []
+        self._file = open(self.temp_file, 'w', encoding='utf-8') if output_format == 'jsonl' else None
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Write a batch of records."""
+        if self._file:
+            for record in records:
+                self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            self._records.extend(records)
+        self.count += len(records)
+
+    def close(self) -> bool:
+        """
+        Finish the output file.
+
+        Returns:
+            True if the output file was written, False otherwise
+        """
+        if self._file:
+            self._file.close()
+        else:
+            try:
+                import pandas as pd
+                pd.DataFrame(self._records).to_parquet(self.temp_file, index=False)
+            except ImportError as e:
+                logger.error(f"Writing Parquet requires pandas with pyarrow or fastparquet: {str(e)}")
+                self.abort()
+                return False
+            except Exception as e:
+                logger.error(f"Error writing Parquet file {self.output_file}: {str(e)}")
+                self.abort()
+                return False
+
+        os.replace(self.temp_file, self.output_file)
+        return True
+
+    def abort(self) -> None:
+        """Discard the records written so far, leaving any previous output file in place."""
+        if self._file:
+            self._file.close()
+        if os.path.exists(self.temp_file):
+            os.remove(self.temp_file)
+
+
+def extract_archive_references(archive_dir: Optional[str] = DEFAULT_ARCHIVE_DIR, include_outputs: bool = True,
+                               output_file: str = DEFAULT_OUTPUT_FILE, output_format: str = 'jsonl',
+                               manifest_file: Optional[str] = DEFAULT_MANIFEST_FILE, full: bool = False,
+                               max_workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Extract the references of every new or changed source in the archive.
+
+    Only sources whose content hash differs from the manifest are parsed and
+    written; the output file therefore holds the records to import since the
+    last run. The manifest is only updated once the output file is complete.
+
+    Args:
+        archive_dir: Directory of generated markdown files (None to skip)
+        include_outputs: Whether to read the stored generation outputs
+        output_file: Path of the output file
+        output_format: 'jsonl' or 'parquet'
+        manifest_file: Path of the hash manifest (None to disable)
+        full: Whether to extract every source regardless of the manifest
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Dictionary with extraction statistics
+    """
+    stats = {
+        'sources': 0,
+        'unchanged': 0,
+        'extracted': 0,
+        'records': 0,
+        'failed': 0
+    }
+
+    previous_hashes = {} if full else load_manifest(manifest_file)
+    hashes = dict(previous_hashes)
+
+    def iter_sources() -> Iterator[Source]:
+        if archive_dir:
+            yield from iter_archive_files(archive_dir)
+        if include_outputs:
+            yield from iter_stored_outputs()
+
+    def extract_batch(executor: ProcessPoolExecutor, batch: List[Source]) -> None:
+        for source, records in zip(batch, executor.map(extract_source_records, batch, chunksize=4)):
+            writer.write(records)
+            hashes[source[0]] = source[2]
+            stats['extracted'] += 1
+            stats['records'] += len(records)
+
+    writer = RecordWriter(output_file, output_format)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            batch = []
+            for source in iter_sources():
+                stats['sources'] += 1
+                if previous_hashes.get(source[0]) == source[2]:
+                    stats['unchanged'] += 1
+                    continue
+
+                batch.append(source)
+                if len(batch) >= SOURCE_BATCH_SIZE:
+                    extract_batch(executor, batch)
+                    batch = []
+
+            if batch:
+                extract_batch(executor, batch)
+    except Exception as e:
+        logger.error(f"Error extracting archive references: {str(e)}")
+        stats['failed'] = stats['sources'] - stats['unchanged']
+        writer.abort()
+        return stats
+
+    if not writer.close():
+        stats['failed'] = stats['extracted']
+        return stats
+
+    save_manifest(manifest_file, hashes)
+
+    logger.info(f"Extracted {stats['records']} references from {stats['extracted']} sources "
+                f"({stats['unchanged']} unchanged) into {output_file}")
+
+    return stats
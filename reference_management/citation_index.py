@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Bipartite citation index for AI Hub Content Creation.
+
+This module keeps the content_references links in memory as a bipartite
+graph between content items and references. Content and reference IDs are
+interned to compact integers and each side keeps an adjacency set per node,
+so "which content cites this reference?", "which references are cited
+together?", "which references does a section share?" and "what loses its
+sources if this reference is retired?" are answered from the adjacency sets
+instead of scanning content_references.
+"""
+
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _Interner:
+    """Map string IDs to compact integer IDs and back."""
+
+    def __init__(self):
+        """Initialize an empty interner."""
+        self.ids = {}   # string ID -> integer ID
+        self.keys = []  # integer ID -> string ID
+
+    def get(self, key: str) -> Optional[int]:
+        """Get the integer ID of a string ID, or None if it is unknown."""
+        return self.ids.get(key)
+
+    def add(self, key: str) -> int:
+        """Get the integer ID of a string ID, assigning the next one if needed."""
+        number = self.ids.get(key)
+        if number is None:
+            number = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return number
+
+
+class CitationIndex:
+    """Bipartite adjacency index between content items and references."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._contents = _Interner()
+        self._references = _Interner()
+        self._references_by_content = []  # content number -> set of reference numbers
+        self._content_by_reference = []   # reference number -> set of content numbers
+        self._link_count = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of content-reference links."""
+        return self._link_count
+
+    @property
+    def content_count(self) -> int:
+        """Number of content items with at least one link."""
+        with self._lock:
+            return sum(1 for references in self._references_by_content if references)
+
+    @property
+    def reference_count(self) -> int:
+        """Number of references cited by at least one content item."""
+        with self._lock:
+            return sum(1 for contents in self._content_by_reference if contents)
+
+    def add(self, content_id: str, reference_id: str) -> None:
+        """Add a link between a content item and a reference.
+
+        Args:
+            content_id: ID of the content item
+            reference_id: ID of the reference
+        """
+        if not content_id or not reference_id:
+            return
+
+        with self._lock:
+            content = self._contents.add(content_id)
+            if content == len(self._references_by_content):
+                self._references_by_content.append(set())
+            reference = self._references.add(reference_id)
+            if reference == len(self._content_by_reference):
+                self._content_by_reference.append(set())
+
+            if reference not in self._references_by_content[content]:
+                self._references_by_content[content].add(reference)
+                self._content_by_reference[reference].add(content)
+                self._link_count += 1
+
+    def add_many(self, links: Iterable[Dict[str, Any]]) -> None:
+        """Add several links.
+
+        Args:
+            links: Link dictionaries with content_id and reference_id
+        """
+        with self._lock:
+            for link in links:
+                self.add(link.get('content_id'), link.get('reference_id'))
+
+    def remove(self, content_id: str, reference_id: str) -> None:
+        """Remove a link between a content item and a reference.
+
+        Args:
+            content_id: ID of the content item
+            reference_id: ID of the reference
+        """
+        with self._lock:
+            content = self._contents.get(content_id)
+            reference = self._references.get(reference_id)
+            if content is None or reference is None or reference not in self._references_by_content[content]:
+                return
+
+            self._references_by_content[content].discard(reference)
+            self._content_by_reference[reference].discard(content)
+            self._link_count -= 1
+
+    def _content_numbers(self, reference_id: str) -> Set[int]:
+        """Get the content numbers citing a reference; the caller must hold the lock."""
+        reference = self._references.get(reference_id)
+        return self._content_by_reference[reference] if reference is not None else set()
+
+    def _reference_numbers(self, content_id: str) -> Set[int]:
+        """Get the reference numbers cited by a content item; the caller must hold the lock."""
+        content = self._contents.get(content_id)
+        return self._references_by_content[content] if content is not None else set()
+
+    def get_content_references(self, content_id: str) -> List[str]:
+        """Get the references cited by a content item.
+
+        Args:
+            content_id: ID of the content item
+
+        Returns:
+            Sorted list of reference IDs
+        """
+        with self._lock:
+            return sorted(self._references.keys[number] for number in self._reference_numbers(content_id))
+
+    def get_citing_content(self, reference_id: str) -> List[str]:
+        """Get the content items that cite a reference.
+
+        Args:
+            reference_id: ID of the reference
+
+        Returns:
+            Sorted list of content IDs
+        """
+        with self._lock:
+            return sorted(self._contents.keys[number] for number in self._content_numbers(reference_id))
+
+    def get_co_cited_references(self, reference_id: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get the references most often cited together with a reference.
+
+        Args:
+            reference_id: ID of the reference
+            limit: Maximum number of references to return (0 for all)
+
+        Returns:
+            List of (reference ID, number of content items citing both), most
+            co-cited first
+        """
+        with self._lock:
+            reference = self._references.get(reference_id)
+            counts = Counter()
+            for content in self._content_numbers(reference_id):
+                counts.update(self._references_by_content[content])
+            counts.pop(reference, None)
+            ranked = [(self._references.keys[number], count) for number, count in counts.items()]
+
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit > 0 else ranked
+
+    def get_shared_references(self, content_ids: Iterable[str], min_count: int = 2) -> List[Tuple[str, int]]:
+        """Get the references cited by several of a group of content items.
+
+        Args:
+            content_ids: IDs of the content items, e.g. those of a section
+            min_count: Minimum number of the content items that must cite a reference
+
+        Returns:
+            List of (reference ID, number of the content items citing it), most
+            shared first
+        """
+        with self._lock:
+            counts = Counter()
+            for content_id in set(content_ids):
+                counts.update(self._reference_numbers(content_id))
+            shared = [(self._references.keys[number], count) for number, count in counts.items()
+                      if count >= min_count]
+
+        shared.sort(key=lambda item: (-item[1], item[0]))
+        return shared
+
+    def get_impact(self, reference_ids: Iterable[str]) -> Dict[str, Any]:
+        """Work out what retiring one or more references would affect.
+
+        Args:
+            reference_ids: IDs of the references to retire
+
+        Returns:
+            Dictionary with the retired reference_ids, the affected_content
+            (content ID -> number of references it would keep) and the
+            orphaned_content left without any references
+        """
+        reference_ids = list(dict.fromkeys(reference_ids))
+
+        with self._lock:
+            retired = {self._references.get(reference_id) for reference_id in reference_ids}
+            retired.discard(None)
+
+            affected = set()
+            for reference in retired:
+                affected.update(self._content_by_reference[reference])
+
+            remaining = {self._contents.keys[content]: len(self._references_by_content[content] - retired)
+                         for content in affected}
+
+        return {
+            'reference_ids': reference_ids,
+            'affected_content': dict(sorted(remaining.items())),
+            'orphaned_content': sorted(content_id for content_id, count in remaining.items() if count == 0)
+        }
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Single-pass citation parser for AI Hub Content Creation.
+
+This module parses a citation string into reference fields. The citation is
+cleaned once (list markers, citation keys and markdown or HTML emphasis are
+removed, and the emphasised spans remembered), its URL and DOI are lifted
+out, and the remainder is split into sentences. APA, MLA, IEEE/numeric and
+plain "Author. Title. Publication." forms are then recognised from those
+pieces. All patterns are precompiled, anchored on a literal character where
+possible, and free of nested quantifiers, so parsing time grows linearly with
+the length of the citation.
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional, Any, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Citations shorter than this are treated as a bare title
+MIN_STRUCTURED_LENGTH = 50
+
+# Longest title stored; longer titles are truncated
+MAX_TITLE_LENGTH = 255
+
+# Leading "[key] ", "[1] ", "1. ", "(1) " or bullet markers
+PREFIX_PATTERN = re.compile(r'\s*(?:\[([^\]\s]{1,80})\]|\(?(\d{1,3})[.)]|[-*•])\s+')
+
+# Markdown (*text*, **text**, _text_) and HTML (<em>, <i>) emphasis, each
+# starting with its literal marker so the scan skips straight to candidates
+EMPHASIS_PATTERNS = [
+    ('*', re.compile(r'\*\*?([^*\n]+)\*\*?')),
+    ('<', re.compile(r'<(?:em|i)>([^<]*)</(?:em|i)>')),
+    ('_', re.compile(r'_(?<!\w_)([^_\n]+)_(?!\w)')),
+]
+
+URL_PATTERN = re.compile(r'https?://[^\s<>"\)\]]+')
+DOI_PATTERN = re.compile(r'10\.\d{4,9}/[^\s<>"\]]+')
+DOI_LABEL_PATTERN = re.compile(r'(?:doi|DOI):\s*\S+')
+ACCESS_NOTE_PATTERN = re.compile(r'(?:Retrieved from|Available (?:at|from):?|Accessed:?)\s*|\[Online\]\.?\s*',
+                                 re.IGNORECASE)
+
+# APA year: "(2020)", "(2020a)", "(2020, March 5)" or "(n.d.)"
+APA_YEAR_PATTERN = re.compile(r'\(((?:1[89]|20)\d\d)[a-z]?(?:,[^()]*)?\)|\(n\.d\.\)')
+YEAR_PATTERN = re.compile(r'(?:1[89]|20)\d\d(?!\d)')
+QUOTED_PATTERN = re.compile(r'["“]([^"“”]+)["”]')
+
+# A sentence ends at ".", "?" or "!" before whitespace, except after an
+# initial ("J.") or a common abbreviation. The punctuation is matched first so
+# the lookbehinds only run at candidate sentence ends.
+SENTENCE_END_PATTERN = re.compile(
+    r'[?!](?=\s|$)|\.(?=\s|$)(?<!\b[A-Z]\.)(?<!\bEds\.)(?<!\beds\.)(?<!\bEd\.)(?<!\bed\.)(?<!\bpp\.)'
+    r'(?<!\bVol\.)(?<!\bvol\.)(?<!\bNo\.)(?<!\bno\.)(?<!\bProc\.)(?<!\bInt\.)'
+)
+
+# Where a publication name ends: volume, issue, pages or year
+PUBLICATION_END_PATTERN = re.compile(r',\s*(?:\d|[Vv]ol\.|[Nn]o\.|pp\.)|\s\d+\(\d|\s\((?:pp?|[Vv]ol)\.|,\s*$')
+
+# Volume and issue numbers in lowercased text, as in "12(3)", "vol. 4" or ", 37, 105408"
+VOLUME_PATTERN = re.compile(r'\d\s*\(\d|\bvol\.\s*\d|,\s*\d+\s*,\s*\d')
+
+NAME_PATTERN = re.compile(r'[A-Z][a-z]+(?:\s[A-Z][a-z]+)+')
+LEADING_IN_PATTERN = re.compile(r'In:?\s+', re.IGNORECASE)
+EDITION_PATTERN = re.compile(r'\([^()]*\)\.?\s*')
+
+# Reference types from the reference_types table with the words that give them
+# away in the publication part of a citation, checked in this order
+TYPE_KEYWORDS = [
+    ('Conference', ('proceedings', 'conference', 'symposium', 'workshop', 'proc.')),
+    ('Report', ('report', 'white paper', 'working paper', 'technical note')),
+    ('Dataset', ('dataset',)),
+    ('Software', ('computer software', 'github.com', 'gitlab.com', 'pypi.org')),
+    ('Book', (' press', 'publisher', 'publishing', '(eds.)', '(ed.)', ' ed.)')),
+    ('Article', ('journal', 'review', 'transactions', 'letters', 'arxiv', 'quarterly', 'magazine')),
+]
+
+
+def _clean(text: str) -> Tuple[str, List[str], bool]:
+    """Strip list markers and emphasis from a citation.
+
+    Args:
+        text: Raw citation text
+
+    Returns:
+        (cleaned text, emphasised spans, whether the citation was numbered)
+    """
+    numbered = False
+    prefix = PREFIX_PATTERN.match(text)
+    if prefix:
+        numbered = bool(prefix.group(2) or (prefix.group(1) and prefix.group(1).isdigit()))
+        text = text[prefix.end():]
+
+    emphasised = []
+
+    def unwrap(match):
+        emphasised.append(match.group(1).strip())
+        return match.group(1)
+
+    for marker, pattern in EMPHASIS_PATTERNS:
+        if marker in text:
+            text = pattern.sub(unwrap, text)
+
+    return text.strip(), emphasised, numbered
+
+
+def _sentences(text: str, limit: int = 3) -> List[str]:
+    """Split text into sentences, keeping "?" and "!" but not the final period.
+
+    Args:
+        text: Text to split
+        limit: Stop after this many sentences; the last one holds the rest
+
+    Returns:
+        List of at most limit sentences
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END_PATTERN.finditer(text):
+        if len(sentences) == limit - 1:
+            break
+        end = match.end() if match.group() in '?!' else match.start()
+        sentence = text[start:end].strip(' ,;')
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    rest = text[start:].strip(' ,;.')
+    if rest:
+        sentences.append(rest)
+    return sentences
+
+
+def _years(text: str) -> List[str]:
+    """Find the four-digit years in text that are not part of a longer number or word."""
+    return [match.group() for match in YEAR_PATTERN.finditer(text)
+            if not match.start() or not text[match.start() - 1].isalnum()]
+
+
+def _publication(text: str) -> str:
+    """Cut a publication name before its volume, issue, pages or year."""
+    text = text.strip()
+    leading_in = LEADING_IN_PATTERN.match(text)
+    if leading_in:
+        text = text[leading_in.end():]
+    end = PUBLICATION_END_PATTERN.search(text)
+    if end:
+        text = text[:end.start()]
+    return text.strip(' ,.')
+
+
+def _authors(text: str) -> str:
+    """Tidy an author list, keeping the period of a final initial or "et al."."""
+    text = text.strip().strip(',;').strip()
+    if text.endswith(' et al'):
+        text += '.'
+    if text.endswith('.') and not (text.endswith('al.') or (len(text) > 1 and text[-2].isupper()
+                                                           and (len(text) == 2 or not text[-3].isalpha()))):
+        text = text[:-1].rstrip()
+    return text or "Unknown"
+
+
+def _emphasised_in(emphasised: List[str], text: str) -> Optional[str]:
+    """Get the first emphasised span that occurs in text."""
+    for span in emphasised:
+        if span and span in text:
+            return span
+    return None
+
+
+def _finish_title(title: str) -> str:
+    """Remove wrapping quotes and trailing punctuation, and cap the title length."""
+    title = title.strip().rstrip(',;.').strip()
+    if len(title) > 1 and title[0] in '"\'“' and title[-1] in '"\'”':
+        title = title[1:-1].strip()
+    if len(title) > MAX_TITLE_LENGTH:
+        title = title[:MAX_TITLE_LENGTH - 3] + '...'
+    return title
+
+
+def _reference_type(venue: str, url: Optional[str], publication: str, italic_title: bool) -> str:
+    """Guess the reference type of a citation.
+
+    Args:
+        venue: The part of the citation after the authors and title, or the
+            title as well for an emphasised (book) title
+        url: URL of the reference, also checked for keywords
+        publication: Parsed publication name
+        italic_title: Whether the title was emphasised, as book titles are in APA
+
+    Returns:
+        Reference type name
+    """
+    venue = venue.lower()
+    if url:
+        venue += ' ' + url.lower()
+    for reference_type, keywords in TYPE_KEYWORDS:
+        for keyword in keywords:
+            if keyword in venue:
+                return reference_type
+    if VOLUME_PATTERN.search(venue):
+        return 'Article'
+    if italic_title:
+        return 'Book'
+    if url and publication == "Unknown":
+        return 'Website'
+    return 'Article'
+
+
+def parse_citation(text: str) -> Dict[str, Any]:
+    """Parse a citation into reference fields.
+
+    Args:
+        text: Citation text in APA, MLA, IEEE/numeric or a similar style
+
+    Returns:
+        Dictionary with authors, publication_date, title, publication_name,
+        url, doi, reference_type and content (the original text)
+    """
+    text = text.strip()
+
+    reference = {
+        'authors': 'Unknown',
+        'publication_date': None,
+        'title': text,
+        'publication_name': 'Unknown',
+        'url': None,
+        'doi': None,
+        'reference_type': 'Article',
+        'content': text
+    }
+
+    # If the text is very short, just use it as the title
+    if len(text) < MIN_STRUCTURED_LENGTH:
+        return reference
+
+    body, emphasised, numbered = _clean(text)
+
+    # Lift out the URL and DOI
+    doi_match = DOI_PATTERN.search(body)
+    if doi_match:
+        reference['doi'] = doi_match.group().rstrip('.,;)')
+    url_match = URL_PATTERN.search(body)
+    if url_match:
+        reference['url'] = url_match.group().rstrip('.,;')
+        body = URL_PATTERN.sub('', body)
+    elif reference['doi']:
+        reference['url'] = f"https://doi.org/{reference['doi']}"
+    if reference['doi'] and ('doi:' in body or 'DOI:' in body):
+        body = DOI_LABEL_PATTERN.sub('', body)
+
+    lower = body.lower()
+    if 'retrieved' in lower or 'available' in lower or 'accessed' in lower or '[online]' in lower:
+        body = ACCESS_NOTE_PATTERN.sub('', body)
+    body = body.strip()
+
+    year = None
+    title = None
+    publication = None
+    venue = ''
+    italic_title = False
+    apa_year = APA_YEAR_PATTERN.search(body)
+    quoted = None if apa_year else QUOTED_PATTERN.search(body)
+
+    if apa_year:
+        # APA: Authors (Year). Title. Publication, volume(issue), pages.
+        year = apa_year.group(1)
+        reference['authors'] = _authors(body[:apa_year.start()])
+        rest = body[apa_year.end():].lstrip(' .')
+        italic = _emphasised_in(emphasised, rest)
+
+        if italic and rest.startswith(italic):
+            # Book: the title is emphasised and followed by the publisher
+            title = italic
+            italic_title = True
+            venue = rest
+            after = rest[len(italic):].lstrip(' .')
+            edition = EDITION_PATTERN.match(after)
+            if edition:
+                after = after[edition.end():]
+            publication = _sentences(after, limit=1)[0] if after else None
+        else:
+            sentences = _sentences(rest, limit=2)
+            if sentences:
+                title = sentences[0]
+                venue = sentences[1] if len(sentences) > 1 else ''
+                if italic and italic not in title:
+                    # The emphasised journal, or the book an edited chapter is in
+                    publication = italic
+                elif venue:
+                    publication = venue
+    elif quoted:
+        # MLA: Author. "Title." Container, ..., Year.  IEEE: A. Author, "Title," in Container, Year.
+        reference['authors'] = _authors(body[:quoted.start()])
+        title = quoted.group(1)
+        venue = body[quoted.end():].lstrip(' ,.')
+        publication = _emphasised_in(emphasised, venue) or (venue.split(',')[0] if venue else None)
+        years = _years(venue)
+        year = years[-1] if years else None
+    else:
+        years = _years(body)
+        sentences = _sentences(body)
+        structured = bool(reference['url'] or (years and len(sentences) >= 2) or numbered)
+
+        if structured and len(sentences) >= 2:
+            # Author. Title. Publication, Year.
+            reference['authors'] = _authors(sentences[0])
+            title = sentences[1]
+            if len(sentences) > 2:
+                venue = publication = sentences[2]
+        elif structured and sentences:
+            title = sentences[0]
+        else:
+            # Unstructured snippet: first sentence as the title, a leading name as the author
+            name = NAME_PATTERN.match(body)
+            if name:
+                reference['authors'] = name.group()
+            reference['title'] = _finish_title(sentences[0] if sentences else text[:100])
+            return reference
+        year = years[-1] if years else None
+
+    if publication:
+        reference['publication_name'] = _publication(publication) or 'Unknown'
+    if title:
+        reference['title'] = _finish_title(title)
+    if year:
+        reference['publication_date'] = f"{year}-01-01"
+
+    reference['reference_type'] = _reference_type(venue, reference['url'], reference['publication_name'],
+                                                  italic_title)
+    return reference
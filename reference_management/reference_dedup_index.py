@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+De-duplication index for references.
+
+This module maps normalised DOIs, URLs and titles to reference IDs so that
+importers can check whether an extracted reference is already in the library
+with a dictionary lookup instead of scanning every reference.
+"""
+
+import re
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from urllib.parse import urlsplit
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Keys are tried in this order; a DOI match is the strongest evidence
+KEY_KINDS = ['doi', 'url', 'title']
+
+# Placeholder titles produced by the extractors that must never match
+IGNORED_TITLES = {'', 'unknown', 'untitled', 'no title'}
+
+DOI_PREFIX_PATTERN = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^a-z0-9]+')
+TRAILING_PUNCTUATION = '.,;:)]}>\'"'
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """Normalise a DOI, accepting doi: and doi.org URL forms.
+
+    Args:
+        doi: DOI string
+
+    Returns:
+        Lowercase bare DOI, or None if it is not a DOI
+    """
+    if not doi:
+        return None
+    doi = DOI_PREFIX_PATTERN.sub('', doi.strip()).rstrip(TRAILING_PUNCTUATION).lower()
+    return doi if doi.startswith('10.') and '/' in doi else None
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """Normalise a URL by dropping the scheme, "www.", fragment and trailing slash.
+
+    Bare domains are ignored because many unrelated references cite only a
+    site's home page.
+
+    Args:
+        url: URL string
+
+    Returns:
+        Normalised URL, or None if it cannot identify a reference
+    """
+    if not url:
+        return None
+    url = url.strip().rstrip(TRAILING_PUNCTUATION)
+    if '://' not in url:
+        return None
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    if not host or not path:
+        return None
+
+    query = f"?{parts.query}" if parts.query else ''
+    return f"{host}{path}{query}"
+
+
+def normalize_title(title: Optional[str]) -> Optional[str]:
+    """Normalise a title to lowercase words separated by single spaces.
+
+    Args:
+        title: Title string
+
+    Returns:
+        Normalised title, or None for empty and placeholder titles
+    """
+    if not title:
+        return None
+    title = NON_ALPHANUMERIC_PATTERN.sub(' ', title.lower()).strip()
+    return None if title in IGNORED_TITLES else title
+
+
+def reference_keys(reference: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Get the de-duplication keys of a reference.
+
+    Args:
+        reference: Reference dictionary with any of doi, url and title
+
+    Returns:
+        List of (kind, key) tuples, strongest first
+    """
+    keys = []
+
+    doi = normalize_doi(reference.get('doi')) or normalize_doi(reference.get('url'))
+    if doi:
+        keys.append(('doi', doi))
+
+    url = normalize_url(reference.get('url'))
+    if url:
+        keys.append(('url', url))
+
+    title = normalize_title(reference.get('title'))
+    if title:
+        keys.append(('title', title))
+
+    return keys
+
+
+class ReferenceDedupIndex:
+    """Hash index from normalised DOI, URL and title to reference ID."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.keys = {kind: {} for kind in KEY_KINDS}  # kind -> {key: reference_id}
+        self.keys_by_id = {}                          # reference_id -> [(kind, key)]
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of indexed references."""
+        return len(self.keys_by_id)
+
+    def add(self, reference: Dict[str, Any], replace: bool = True) -> None:
+        """Add or replace a reference in the index.
+
+        Keys already held by another reference are kept, so the first
+        reference with a given key stays the canonical match for it.
+
+        Args:
+            reference: Reference dictionary with an ID
+            replace: Whether to drop the reference's previous keys; pass False
+                to record another variant of an existing reference
+        """
+        reference_id = reference.get('id') or reference.get('reference_id')
+        if not reference_id:
+            return
+
+        with self._lock:
+            if replace:
+                self._remove(reference_id)
+            added = self.keys_by_id.setdefault(reference_id, [])
+            for kind, key in reference_keys(reference):
+                if key not in self.keys[kind]:
+                    self.keys[kind][key] = reference_id
+                    added.append((kind, key))
+
+    def add_many(self, references: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace several references.
+
+        Args:
+            references: Reference dictionaries
+        """
+        for reference in references:
+            self.add(reference)
+
+    def remove(self, reference_id: str) -> None:
+        """Remove a reference from the index.
+
+        Args:
+            reference_id: ID of the reference to remove
+        """
+        with self._lock:
+            self._remove(reference_id)
+
+    def _remove(self, reference_id: str) -> None:
+        """Remove a reference; the caller must hold the lock."""
+        for kind, key in self.keys_by_id.pop(reference_id, []):
+            if self.keys[kind].get(key) == reference_id:
+                del self.keys[kind][key]
+
+    def find(self, reference: Dict[str, Any]) -> Optional[str]:
+        """Find an existing reference matching a DOI, URL or title.
+
+        Args:
+            reference: Reference dictionary with any of doi, url and title
+
+        Returns:
+            The ID of the matching reference, or None
+        """
+        with self._lock:
+            for kind, key in reference_keys(reference):
+                reference_id = self.keys[kind].get(key)
+                if reference_id:
+                    return reference_id
+        return None
@@ -26,47 +26,10 @@ load_dotenv()
 from supabase_client import get_generation_outputs, get_full_content
 from reference_management import (
     Reference, create_reference, link_reference_to_content,
-    get_references, get_content_references
+    get_content_references, get_dedup_index
 )
-
-def extract_reference_from_text(text):
-    """Extract reference information from text."""
-    # This is a simplified example - adapt to your reference format
-    # Example format: Author(s). (Year). Title. Publication. URL/DOI
-    
-    # Try to extract author
-    author_match = re.search(r'^([^\.]+)\.', text)
-    authors = author_match.group(1).strip() if author_match else "Unknown"
-    
-    # Try to extract year
-    year_match = re.search(r'\((\d{4})\)', text)
-    year = year_match.group(1) if year_match else None
-    
-    # Try to extract title
-    title_match = re.search(r'\(\d{4}\)\.\s+([^\.]+)\.', text)
-    if title_match:
-        title = title_match.group(1).strip()
-    else:
-        # If no year or standard format, just use the first sentence or part of text
-        title_alt_match = re.search(r'^[^\.]+\.\s+([^\.]+)\.', text)
-        title = title_alt_match.group(1).strip() if title_alt_match else text[:100]
-    
-    # Try to extract publication
-    pub_match = re.search(r'\.\s+([^\.]+)\.\s+(?:https?|doi|Retrieved)', text, re.IGNORECASE)
-    publication = pub_match.group(1).strip() if pub_match else "Unknown"
-    
-    # Try to extract URL/DOI
-    url_match = re.search(r'(https?://[^\s]+|doi:[^\s]+)', text, re.IGNORECASE)
-    url = url_match.group(1) if url_match else None
-    
-    return {
-        'authors': authors,
-        'publication_date': f"{year}-01-01" if year else None,
-        'title': title,
-        'publication_name': publication,
-        'url': url,
-        'reference_type': 'Article'  # Default type
-    }
+from reference_dedup_index import ReferenceDedupIndex
+from citation_parser import parse_citation
 
 def extract_references_from_content(content_text):
     """Extract references from content text."""
@@ -98,9 +61,8 @@ def import_references_from_database():
     outputs = get_generation_outputs(limit=1000)
     logger.info(f"Retrieved {len(outputs)} generation outputs from database")
     
-    # Get existing references to avoid duplicates
-    existing_references = get_references()
-    existing_titles = [ref.title.lower() if ref.title else "" for ref in existing_references]
+    # Look up existing references by DOI, URL or title to avoid duplicates
+    dedup_index = get_dedup_index() or ReferenceDedupIndex()
     
     imported_count = 0
     for output in outputs:
@@ -131,10 +93,10 @@ def import_references_from_database():
         # Process each reference
         for i, ref_text in enumerate(reference_items):
             # Extract reference data
-            ref_data = extract_reference_from_text(ref_text)
+            ref_data = parse_citation(ref_text)
             
-            # Skip if title already exists
-            if ref_data['title'].lower() in existing_titles:
+            # Skip if the reference already exists
+            if dedup_index.find(ref_data):
                 logger.info(f"Skipping duplicate reference: {ref_data['title']}")
                 continue
             
@@ -145,6 +107,7 @@ def import_references_from_database():
                 publication_date=ref_data['publication_date'],
                 publication_name=ref_data['publication_name'],
                 url=ref_data['url'],
+                doi=ref_data['doi'],
                 reference_type=ref_data['reference_type'],
                 content=ref_text,  # Store original text
                 abstract="Automatically extracted from generated content",
@@ -154,6 +117,9 @@ def import_references_from_database():
             # Store reference in database
             reference_id = create_reference(ref)
             if reference_id:
+                # Later duplicates should match the new reference
+                dedup_index.add({**ref_data, 'id': reference_id}, replace=False)
+                
                 # Link reference to content
                 citation_key = f"REF{i+1}"
                 link_id = link_reference_to_content(
@@ -165,7 +131,6 @@ def import_references_from_database():
                 
                 if link_id:
                     imported_count += 1
-                    existing_titles.append(ref_data['title'].lower())
                     logger.info(f"Imported reference: {ref_data['title']} for content {content_id}")
                 else:
                     logger.error(f"Failed to link reference {reference_id} to content {content_id}")
@@ -9,12 +9,19 @@ and linking references to content items.
 import os
 import json
 import logging
+import atexit
 import datetime
+import threading
+import time
 import uuid
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterator, Tuple, Callable
 
 from dotenv import load_dotenv
 from core.supabase_client import supabase, is_connected
+from reference_management.reference_search_index import ReferenceSearchIndex
+from reference_management.reference_dedup_index import ReferenceDedupIndex
+from reference_management.reference_minhash import ReferenceLSHIndex
+from reference_management.citation_index import CitationIndex
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +30,49 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Default page size for paging through and bulk-writing reference_sources
+REFERENCE_PAGE_SIZE = 100
+
+# Where the reference search index is saved between restarts
+REFERENCE_SEARCH_INDEX_PATH = os.getenv("REFERENCE_SEARCH_INDEX_PATH", "data/reference_search_index.pkl")
+
+# Maximum number of IDs per in.(...) filter; larger ID lists are fetched in
+# chunks to keep each request comfortably within URL length limits
+ID_FILTER_CHUNK_SIZE = 200
+
+# Error codes meaning a database function is not installed (PostgREST, PostgreSQL)
+MISSING_FUNCTION_CODES = {'PGRST202', '42883'}
+
+# Database functions from create_reference_database_tables.sql found to be
+# missing; they are not called again and the table queries are used instead
+_missing_functions = set()
+
+# Seconds reference categories and types are cached before being reloaded
+REFERENCE_LOOKUP_CACHE_TTL = float(os.getenv("REFERENCE_LOOKUP_CACHE_TTL", "300"))
+
+# In-process cache of the reference_categories and reference_types tables:
+# table -> (version, loaded_at, rows). Invalidation bumps the version so a load
+# that started before it is not cached.
+_lookup_cache = {}
+_lookup_cache_version = 0
+_lookup_cache_lock = threading.Lock()
+
+# In-process search index, loaded on first search
+_search_index = None
+_search_index_lock = threading.Lock()
+
+# In-process de-duplication index, loaded on first import
+_dedup_index = None
+_dedup_index_lock = threading.Lock()
+
+# In-process near-duplicate index, loaded on first reference creation
+_near_duplicate_index = None
+_near_duplicate_index_lock = threading.Lock()
+
+# In-process content <-> reference citation index, loaded on first query
+_citation_index = None
+_citation_index_lock = threading.Lock()
+
 class Reference:
     """Class representing a reference source."""
 
@@ -223,11 +273,18 @@ class ContentReference:
         return link
 
 
-def create_reference(reference: Reference) -> Optional[str]:
+def create_reference(reference: Reference, reuse_near_duplicates: bool = False) -> Optional[str]:
     """Create a new reference in the database.
 
+    A reference whose title, authors and publication closely match an
+    existing one is logged as a likely near-duplicate and still created. If
+    reuse_near_duplicates is set, it is not created and the existing
+    reference's ID is returned instead; its categories and quality assessment
+    are then not written.
+
     Args:
         reference: The reference to create
+        reuse_near_duplicates: Whether to return an existing near-duplicate instead of creating the reference
 
     Returns:
         The reference ID if successful, None otherwise
@@ -237,8 +294,19 @@ def create_reference(reference: Reference) -> Optional[str]:
         return None
 
     try:
-        # Insert the reference
         reference_data = reference.to_dict()
+
+        duplicate = find_near_duplicate_reference(reference_data)
+        if duplicate:
+            duplicate_id, similarity = duplicate
+            if reuse_near_duplicates:
+                logger.info(f"Reference {reference.title} is a near-duplicate of {duplicate_id} "
+                            f"(similarity {similarity:.2f}); using the existing reference")
+                return duplicate_id
+            logger.warning(f"Reference {reference.title} may be a near-duplicate of {duplicate_id} "
+                           f"(similarity {similarity:.2f})")
+
+        # Insert the reference
         result = supabase.table('reference_sources').insert(reference_data).execute()
 
         if not result.data:
@@ -246,6 +314,7 @@ def create_reference(reference: Reference) -> Optional[str]:
             return None
 
         reference_id = result.data[0]['id']
+        _index_reference({**reference_data, 'id': reference_id})
 
         # Add categories if provided
         if reference.categories:
@@ -270,9 +339,161 @@ def create_reference(reference: Reference) -> Optional[str]:
         return None
 
 
+def _insert_rows(table: str, rows: List[Dict[str, Any]], **upsert_options) -> List[Dict[str, Any]]:
+    """Insert rows in one request, falling back to one request per row on failure.
+
+    A single bad row fails a multi-row insert, so the fallback isolates it and
+    lets the remaining rows through.
+
+    Args:
+        table: Table name
+        rows: Rows to insert
+        **upsert_options: If given, upsert with these options instead of inserting
+
+    Returns:
+        The rows that were written, as returned by the database
+    """
+    if not rows:
+        return []
+
+    def write(data):
+        query = supabase.table(table)
+        query = query.upsert(data, **upsert_options) if upsert_options else query.insert(data)
+        return query.execute().data or []
+
+    try:
+        return write(rows)
+
+    except Exception as e:
+        logger.warning(f"Bulk insert into {table} failed, retrying row by row: {str(e)}")
+
+    written = []
+    for row in rows:
+        try:
+            written.extend(write(row))
+        except Exception as e:
+            logger.error(f"Error inserting into {table}: {str(e)}")
+    return written
+
+
+def create_references(references: List[Reference], reuse_near_duplicates: bool = False) -> List[Optional[str]]:
+    """Create several references with a few multi-row requests.
+
+    References, their category links and their quality assessments are each
+    written with one request. As with create_reference(), near-duplicates of
+    an existing reference, or of an earlier reference in the same list, are
+    logged; with reuse_near_duplicates they map to that reference's ID instead
+    of being inserted.
+
+    Args:
+        references: The references to create
+        reuse_near_duplicates: Whether to map near-duplicates to existing references instead of creating them
+
+    Returns:
+        One entry per input reference: its ID, or None if it could not be created
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return [None] * len(references)
+
+    reference_ids = [None] * len(references)
+    batch_index = ReferenceLSHIndex()
+    to_insert = {}  # reference_id -> position of the input that inserts it
+
+    for position, reference in enumerate(references):
+        reference_data = reference.to_dict()
+
+        duplicate = find_near_duplicate_reference(reference_data) or batch_index.find_near_duplicate(reference_data)
+        if duplicate:
+            if reuse_near_duplicates:
+                logger.info(f"Reference {reference.title} is a near-duplicate of {duplicate[0]}; using the existing reference")
+                reference_ids[position] = duplicate[0]
+                continue
+            logger.warning(f"Reference {reference.title} may be a near-duplicate of {duplicate[0]}")
+        batch_index.add(reference_data)
+
+        to_insert[reference.reference_id] = position
+
+    try:
+        # Insert the references
+        rows = [references[position].to_dict() for position in to_insert.values()]
+        created = {row['id']: row for row in _insert_rows('reference_sources', rows)}
+
+        # Near-duplicates of a reference that failed to insert fail with it
+        for position, reference_id in enumerate(reference_ids):
+            if reference_id in to_insert and reference_id not in created:
+                reference_ids[position] = None
+
+        for reference_id, position in to_insert.items():
+            if reference_id in created:
+                reference_ids[position] = reference_id
+                _index_reference(created[reference_id])
+            else:
+                logger.error(f"Failed to create reference: {references[position].title}")
+
+        # Add categories and quality assessments of the created references
+        category_rows = []
+        quality_rows = []
+        for reference_id in created:
+            reference = references[to_insert[reference_id]]
+            for category_id in reference.categories:
+                category_rows.append({"reference_id": reference_id, "category_id": category_id})
+
+            if reference.quality_assessment:
+                assessment = reference.quality_assessment
+                assessment.reference_id = reference_id
+                _fill_overall_score(assessment)
+                quality_rows.append(assessment.to_dict())
+
+        if len(_insert_rows('reference_to_category', category_rows)) < len(category_rows):
+            logger.error("Failed to add some reference categories")
+        if len(_insert_rows('reference_quality', quality_rows)) < len(quality_rows):
+            logger.error("Failed to create some quality assessments")
+
+        logger.info(f"Created {len(created)} references ({len(references) - len(to_insert)} near-duplicates reused, "
+                    f"{len(to_insert) - len(created)} failed)")
+
+    except Exception as e:
+        logger.error(f"Error creating references: {str(e)}")
+
+    return reference_ids
+
+
+def _call_database_function(name: str, params: Optional[Dict[str, Any]] = None) -> Tuple[bool, Any]:
+    """Call one of the reference database functions.
+
+    Args:
+        name: Function name
+        params: Function parameters
+
+    Returns:
+        (called, data) tuple; called is False if the function could not be
+        used and the caller should fall back to querying the tables
+    """
+    if name in _missing_functions:
+        return False, None
+
+    try:
+        result = supabase.rpc(name, params or {}).execute()
+        return True, result.data
+
+    except Exception as e:
+        if getattr(e, 'code', None) in MISSING_FUNCTION_CODES:
+            _missing_functions.add(name)
+            logger.warning(f"Database function {name} is not installed; run "
+                           "sql/create_reference_database_tables.sql to enable it")
+        else:
+            logger.warning(f"Error calling database function {name}, querying tables instead: {str(e)}")
+        return False, None
+
+
 def get_reference(reference_id: str) -> Optional[Reference]:
     """Get a reference by ID.
 
+    The reference, its categories and its quality assessment are fetched in
+    one round trip with the get_reference_details database function, falling
+    back to querying each table if the function is not available.
+
     Args:
         reference_id: The ID of the reference to retrieve
 
@@ -283,6 +504,30 @@ def get_reference(reference_id: str) -> Optional[Reference]:
         logger.error("Not connected to Supabase")
         return None
 
+    called, data = _call_database_function('get_reference_details', {'p_reference_id': reference_id})
+    if not called:
+        return _get_reference_from_tables(reference_id)
+
+    if not data:
+        logger.warning(f"Reference not found: {reference_id}")
+        return None
+
+    reference = Reference.from_dict(data)
+    reference.categories = data.get('categories') or []
+    if data.get('quality_assessment'):
+        reference.quality_assessment = ReferenceQuality.from_dict(data['quality_assessment'])
+    return reference
+
+
+def _get_reference_from_tables(reference_id: str) -> Optional[Reference]:
+    """Get a reference by ID with one query per table.
+
+    Args:
+        reference_id: The ID of the reference to retrieve
+
+    Returns:
+        The reference if found, None otherwise
+    """
     try:
         # Get the reference
         result = supabase.table('reference_sources').select('*').eq('id', reference_id).execute()
@@ -311,6 +556,30 @@ def get_reference(reference_id: str) -> Optional[Reference]:
         return None
 
 
+def _select_in_chunks(table: str, columns: str, column: str, values: List[str],
+                      apply_filters: Optional[Callable] = None) -> List[Dict[str, Any]]:
+    """Select the rows whose column is in a list of values, one request per chunk of values.
+
+    Args:
+        table: Table name
+        columns: Columns to select
+        column: Column to filter on
+        values: Values to match
+        apply_filters: Optional function adding further filters to each query
+
+    Returns:
+        Matching rows
+    """
+    rows = []
+    for start in range(0, len(values), ID_FILTER_CHUNK_SIZE):
+        query = supabase.table(table).select(columns)
+        if apply_filters:
+            query = apply_filters(query)
+        result = query.in_(column, values[start:start + ID_FILTER_CHUNK_SIZE]).execute()
+        rows.extend(result.data or [])
+    return rows
+
+
 def get_references(reference_type: Optional[str] = None, category_id: Optional[str] = None,
                   is_active: bool = True, search_term: Optional[str] = None,
                   min_quality: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -320,7 +589,8 @@ def get_references(reference_type: Optional[str] = None, category_id: Optional[s
         reference_type: Optional reference type to filter by
         category_id: Optional category ID to filter by
         is_active: Whether to return only active references
-        search_term: Optional search term to filter by title or authors
+        search_term: Optional search term; every word must match the title,
+            authors, abstract, keywords or DOI, and results are ranked by relevance
         min_quality: Optional minimum overall quality score
 
     Returns:
@@ -331,22 +601,32 @@ def get_references(reference_type: Optional[str] = None, category_id: Optional[s
         return []
 
     try:
-        # Start with a basic query on reference_sources
-        query = supabase.table('reference_sources').select('*')
-
-        # Apply filters
-        if reference_type:
-            query = query.eq('reference_type', reference_type)
-
-        if is_active is not None:
-            query = query.eq('is_active', is_active)
-
+        # Match the search term with the search index when it is available
+        search_ranks = None
         if search_term:
-            query = query.or_(f"title.ilike.%{search_term}%,authors.ilike.%{search_term}%")
-
-        # Execute the query
-        result = query.execute()
-        references = result.data if result.data else []
+            index = get_search_index()
+            if index is not None:
+                matches = index.search_ids(search_term, limit=None, active_only=False, match_all=True)
+                if not matches:
+                    return []
+                search_ranks = {reference_id: rank for rank, (reference_id, _) in enumerate(matches)}
+
+        def apply_filters(query):
+            if reference_type:
+                query = query.eq('reference_type', reference_type)
+            if is_active is not None:
+                query = query.eq('is_active', is_active)
+            return query
+
+        if search_ranks is not None:
+            # Fetch the matches by ID, a chunk at a time
+            references = _select_in_chunks('reference_sources', '*', 'id', list(search_ranks), apply_filters)
+        else:
+            query = apply_filters(supabase.table('reference_sources').select('*'))
+            if search_term:
+                query = query.or_(f"title.ilike.%{search_term}%,authors.ilike.%{search_term}%")
+            result = query.execute()
+            references = result.data if result.data else []
 
         if not references:
             return []
@@ -354,28 +634,25 @@ def get_references(reference_type: Optional[str] = None, category_id: Optional[s
         # Get all reference IDs
         reference_ids = [ref['id'] for ref in references]
 
-        # Get all quality scores in one query
-        quality_result = supabase.table('reference_quality').select('reference_id, overall_score').in_('reference_id', reference_ids).execute()
-        quality_scores = {item['reference_id']: item['overall_score'] for item in quality_result.data} if quality_result.data else {}
+        # Get all quality scores, one query per chunk of IDs
+        quality_rows = _select_in_chunks('reference_quality', 'reference_id, overall_score', 'reference_id', reference_ids)
+        quality_scores = {item['reference_id']: item['overall_score'] for item in quality_rows}
 
-        # Get all category mappings in one query
-        cat_result = supabase.table('reference_to_category').select('reference_id, category_id').in_('reference_id', reference_ids).execute()
+        # Get all category mappings, one query per chunk of IDs
+        category_rows = _select_in_chunks('reference_to_category', 'reference_id, category_id', 'reference_id', reference_ids)
         category_mappings = {}
-        for item in cat_result.data if cat_result.data else []:
+        for item in category_rows:
             if item['reference_id'] not in category_mappings:
                 category_mappings[item['reference_id']] = []
             category_mappings[item['reference_id']].append(item['category_id'])
 
-        # Get all category names in one query
+        # Get category names from the cached categories
         all_category_ids = []
         for cat_ids in category_mappings.values():
             all_category_ids.extend(cat_ids)
         all_category_ids = list(set(all_category_ids))  # Remove duplicates
 
-        category_names = {}
-        if all_category_ids:
-            cat_names_result = supabase.table('reference_categories').select('id, name').in_('id', all_category_ids).execute()
-            category_names = {item['id']: item['name'] for item in cat_names_result.data} if cat_names_result.data else {}
+        category_names = _get_category_names(all_category_ids) if all_category_ids else {}
 
         # Process each reference to add categories and quality score
         for ref in references:
@@ -400,8 +677,11 @@ def get_references(reference_type: Optional[str] = None, category_id: Optional[s
                 # If min_quality is not a valid integer, ignore this filter
                 pass
 
-        # Sort by title
-        references.sort(key=lambda x: x.get('title', ''))
+        # Sort by search rank, or by title
+        if search_ranks is not None:
+            references.sort(key=lambda x: search_ranks[x['id']])
+        else:
+            references.sort(key=lambda x: x.get('title', ''))
 
         return references
 
@@ -444,6 +724,8 @@ def update_reference(reference: Reference) -> bool:
             logger.error("Failed to update reference")
             return False
 
+        _index_reference(reference_data)
+
         # Update categories
         # First, delete existing categories
         supabase.table('reference_to_category').delete().eq('reference_id', reference.reference_id).execute()
@@ -481,6 +763,116 @@ def update_reference(reference: Reference) -> bool:
         return False
 
 
+def iter_reference_pages(page_size: int = REFERENCE_PAGE_SIZE, after_id: Optional[str] = None,
+                         is_active: Optional[bool] = None, updated_since: Optional[str] = None,
+                         columns: str = '*') -> Iterator[List[Dict[str, Any]]]:
+    """Page through reference_sources in ID order using keyset pagination.
+
+    Each page is fetched with `id > last_id` rather than an offset, so the cost
+    of a page does not grow with its position and rows added or removed while
+    paging do not shift later pages.
+
+    Args:
+        page_size: Number of references per page
+        after_id: Optional ID to start after, e.g. from a checkpoint
+        is_active: Optional active status to filter by
+        updated_since: Optional ISO timestamp; only references updated at or
+            after it are returned
+        columns: Columns to select; must include id
+
+    Yields:
+        Lists of reference dictionaries, in ascending ID order
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return
+
+    last_id = after_id
+    while True:
+        try:
+            query = supabase.table('reference_sources').select(columns)
+
+            if is_active is not None:
+                query = query.eq('is_active', is_active)
+
+            if updated_since:
+                query = query.gte('updated_at', updated_since)
+
+            if last_id:
+                query = query.gt('id', last_id)
+
+            result = query.order('id').limit(page_size).execute()
+
+        except Exception as e:
+            logger.error(f"Error getting references after {last_id}: {str(e)}")
+            return
+
+        page = result.data if result.data else []
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < page_size:
+            return
+        last_id = page[-1]['id']
+
+
+def bulk_update_references(references: List[Reference], chunk_size: int = REFERENCE_PAGE_SIZE) -> int:
+    """Write the reference_sources rows of several references at once.
+
+    Unlike update_reference(), this only writes the reference rows themselves;
+    categories and quality assessments are left untouched. Rows are upserted
+    on ID, one request per chunk.
+
+    Args:
+        references: References to write; each must have a reference ID
+        chunk_size: Maximum number of rows per request
+
+    Returns:
+        Number of references written
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return 0
+
+    rows = []
+    now = datetime.datetime.now().isoformat()
+    for reference in references:
+        if not reference.reference_id:
+            logger.error(f"Reference ID is required for update: {reference.title}")
+            continue
+        reference.updated_at = now
+        rows.append(reference.to_dict())
+
+    updated = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            result = supabase.table('reference_sources').upsert(chunk).execute()
+            updated += len(result.data) if result.data else 0
+
+            for row in result.data or []:
+                _index_reference(row)
+
+        except Exception as e:
+            logger.error(f"Error updating {len(chunk)} references: {str(e)}")
+
+    logger.info(f"Updated {updated}/{len(rows)} references")
+    return updated
+
+
+def _fill_overall_score(assessment: ReferenceQuality) -> None:
+    """Set the overall score to the mean of the CRAAP scores if it is missing and all are present."""
+    scores = [
+        assessment.currency_score, assessment.relevance_score,
+        assessment.authority_score, assessment.accuracy_score,
+        assessment.purpose_score
+    ]
+    if assessment.overall_score is None and all(score is not None for score in scores):
+        assessment.overall_score = round(sum(scores) / len(scores))
+
+
 def create_quality_assessment(assessment: ReferenceQuality) -> Optional[str]:
     """Create a new quality assessment for a reference.
 
@@ -500,17 +892,7 @@ def create_quality_assessment(assessment: ReferenceQuality) -> Optional[str]:
 
     try:
         # Calculate overall score if not provided
-        if assessment.overall_score is None and all(score is not None for score in [
-            assessment.currency_score, assessment.relevance_score,
-            assessment.authority_score, assessment.accuracy_score,
-            assessment.purpose_score
-        ]):
-            scores = [
-                assessment.currency_score, assessment.relevance_score,
-                assessment.authority_score, assessment.accuracy_score,
-                assessment.purpose_score
-            ]
-            assessment.overall_score = round(sum(scores) / len(scores))
+        _fill_overall_score(assessment)
 
         # Insert the assessment
         assessment_data = assessment.to_dict()
@@ -548,17 +930,7 @@ def update_quality_assessment(assessment: ReferenceQuality) -> bool:
 
     try:
         # Calculate overall score if not provided
-        if assessment.overall_score is None and all(score is not None for score in [
-            assessment.currency_score, assessment.relevance_score,
-            assessment.authority_score, assessment.accuracy_score,
-            assessment.purpose_score
-        ]):
-            scores = [
-                assessment.currency_score, assessment.relevance_score,
-                assessment.authority_score, assessment.accuracy_score,
-                assessment.purpose_score
-            ]
-            assessment.overall_score = round(sum(scores) / len(scores))
+        _fill_overall_score(assessment)
 
         # Update the assessment
         assessment.assessed_at = datetime.datetime.now().isoformat()
@@ -602,6 +974,7 @@ def link_reference_to_content(content_id: str, reference_id: str, citation_key:
 
         if existing.data:
             logger.info(f"Reference {reference_id} is already linked to content {content_id}")
+            _index_links(content_id, [reference_id])
             return existing.data[0]['id']
 
         # Create the link
@@ -631,6 +1004,7 @@ def link_reference_to_content(content_id: str, reference_id: str, citation_key:
             return None
 
         link_id = result.data[0]['id']
+        _index_links(content_id, [reference_id])
         logger.info(f"Linked reference {reference_id} to content {content_id}")
         return link_id
 
@@ -639,9 +1013,89 @@ def link_reference_to_content(content_id: str, reference_id: str, citation_key:
         return None
 
 
+def link_references(content_id: str, links: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """Link several references to a content item with a few requests.
+
+    Existing links are looked up in one query and reused; the rest are inserted
+    together.
+
+    Args:
+        content_id: The ID of the content item
+        links: One dictionary per link with reference_id and optional
+            citation_key, citation_context and relevance_score
+
+    Returns:
+        One entry per input link: the link ID, or None if it could not be created
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return [None] * len(links)
+
+    reference_ids = list(dict.fromkeys(link['reference_id'] for link in links if link.get('reference_id')))
+    if not reference_ids:
+        return [None] * len(links)
+
+    try:
+        # Find links that already exist
+        existing = supabase.table('content_references').select('id, reference_id')\
+            .eq('content_id', content_id).in_('reference_id', reference_ids).execute()
+        link_ids = {item['reference_id']: item['id'] for item in existing.data} if existing.data else {}
+
+        # Insert the rest, the first citation for each reference winning
+        rows = {}
+        for link in links:
+            reference_id = link.get('reference_id')
+            if not reference_id or reference_id in link_ids or reference_id in rows:
+                continue
+            link_object = ContentReference(
+                content_id=content_id,
+                reference_id=reference_id,
+                citation_key=link.get('citation_key'),
+                citation_context=link.get('citation_context'),
+                relevance_score=link.get('relevance_score')
+            )
+            rows[reference_id] = {
+                'id': link_object.link_id,
+                'content_id': link_object.content_id,
+                'reference_id': link_object.reference_id,
+                'citation_key': link_object.citation_key,
+                'citation_context': link_object.citation_context,
+                'relevance_score': link_object.relevance_score,
+                'created_at': link_object.created_at,
+                'updated_at': link_object.created_at
+            }
+
+        # Links created concurrently by someone else are skipped, not duplicated
+        created = _insert_rows('content_references', list(rows.values()),
+                               on_conflict='content_id,reference_id', ignore_duplicates=True)
+        link_ids.update({item['reference_id']: item['id'] for item in created})
+
+        missing = [reference_id for reference_id in rows if reference_id not in link_ids]
+        if missing:
+            raced = supabase.table('content_references').select('id, reference_id')\
+                .eq('content_id', content_id).in_('reference_id', missing).execute()
+            link_ids.update({item['reference_id']: item['id'] for item in raced.data or []})
+
+        result = [link_ids.get(link.get('reference_id')) for link in links]
+        _index_links(content_id, list(link_ids))
+        failed = sum(1 for link_id in result if link_id is None)
+        logger.info(f"Linked {len(links) - failed} references to content {content_id}"
+                    + (f" ({failed} failed)" if failed else ""))
+        return result
+
+    except Exception as e:
+        logger.error(f"Error linking references to content: {str(e)}")
+        return [None] * len(links)
+
+
 def get_content_references(content_id: str) -> List[Dict[str, Any]]:
     """Get references linked to a content item.
 
+    The references, their citations, quality scores and category names are
+    fetched in one round trip with the get_content_reference_details database
+    function, falling back to querying each table if the function is not
+    available.
+
     Args:
         content_id: The ID of the content item
 
@@ -652,6 +1106,22 @@ def get_content_references(content_id: str) -> List[Dict[str, Any]]:
         logger.error("Not connected to Supabase")
         return []
 
+    called, data = _call_database_function('get_content_reference_details', {'p_content_id': content_id})
+    if not called:
+        return _get_content_references_from_tables(content_id)
+
+    return data or []
+
+
+def _get_content_references_from_tables(content_id: str) -> List[Dict[str, Any]]:
+    """Get references linked to a content item with one query per table.
+
+    Args:
+        content_id: The ID of the content item
+
+    Returns:
+        List of references linked to the content item
+    """
     try:
         # Get content references for this content ID
         content_refs_result = supabase.table('content_references').select('*').eq('content_id', content_id).execute()
@@ -688,10 +1158,7 @@ def get_content_references(content_id: str) -> List[Dict[str, Any]]:
             all_category_ids.extend(cat_ids)
         all_category_ids = list(set(all_category_ids))  # Remove duplicates
 
-        category_names = {}
-        if all_category_ids:
-            cat_names_result = supabase.table('reference_categories').select('id,name').in_('id', all_category_ids).execute()
-            category_names = {item['id']: item['name'] for item in cat_names_result.data} if cat_names_result.data else {}
+        category_names = _get_category_names(all_category_ids) if all_category_ids else {}
 
         # Create a citation key mapping
         citation_mapping = {ref['reference_id']: ref for ref in content_refs}
@@ -726,9 +1193,69 @@ def get_content_references(content_id: str) -> List[Dict[str, Any]]:
         return []
 
 
+def _get_lookup_table(table: str) -> List[Dict[str, Any]]:
+    """Get the rows of a small lookup table, ordered by name, from the in-process cache.
+
+    Rows are reloaded after REFERENCE_LOOKUP_CACHE_TTL seconds or after
+    invalidate_reference_lookups() is called.
+
+    Args:
+        table: reference_categories or reference_types
+
+    Returns:
+        Copies of the cached rows
+    """
+    with _lookup_cache_lock:
+        version = _lookup_cache_version
+        cached = _lookup_cache.get(table)
+        if cached and cached[0] == version and time.monotonic() - cached[1] < REFERENCE_LOOKUP_CACHE_TTL:
+            return [dict(row) for row in cached[2]]
+
+    result = supabase.table(table).select('*').order('name').execute()
+    rows = result.data if result.data else []
+
+    with _lookup_cache_lock:
+        if _lookup_cache_version == version:
+            _lookup_cache[table] = (version, time.monotonic(), rows)
+
+    return [dict(row) for row in rows]
+
+
+def _get_category_names(category_ids: List[str]) -> Dict[str, str]:
+    """Map category IDs to names with the cached categories.
+
+    The cache is reloaded once if a category is missing, since it may have been
+    added by another process since the cache was loaded.
+
+    Args:
+        category_ids: Category IDs to look up
+
+    Returns:
+        Dictionary mapping category IDs to names
+    """
+    category_names = {item['id']: item['name'] for item in _get_lookup_table('reference_categories')}
+    if any(category_id not in category_names for category_id in category_ids):
+        invalidate_reference_lookups()
+        category_names = {item['id']: item['name'] for item in _get_lookup_table('reference_categories')}
+    return category_names
+
+
+def invalidate_reference_lookups() -> None:
+    """Drop the cached reference categories and types.
+
+    Call this after editing the reference_categories or reference_types tables.
+    """
+    global _lookup_cache_version
+    with _lookup_cache_lock:
+        _lookup_cache_version += 1
+        _lookup_cache.clear()
+
+
 def get_reference_categories() -> List[Dict[str, Any]]:
     """Get all reference categories.
 
+    Categories are cached in-process; see _get_lookup_table().
+
     Returns:
         List of reference categories
     """
@@ -737,8 +1264,7 @@ def get_reference_categories() -> List[Dict[str, Any]]:
         return []
 
     try:
-        result = supabase.table('reference_categories').select('*').order('name').execute()
-        return result.data if result.data else []
+        return _get_lookup_table('reference_categories')
 
     except Exception as e:
         logger.error(f"Error getting reference categories: {str(e)}")
@@ -748,6 +1274,8 @@ def get_reference_categories() -> List[Dict[str, Any]]:
 def get_reference_types() -> List[Dict[str, Any]]:
     """Get all reference types.
 
+    Types are cached in-process; see _get_lookup_table().
+
     Returns:
         List of reference types
     """
@@ -756,16 +1284,390 @@ def get_reference_types() -> List[Dict[str, Any]]:
         return []
 
     try:
-        result = supabase.table('reference_types').select('*').order('name').execute()
-        return result.data if result.data else []
+        return _get_lookup_table('reference_types')
 
     except Exception as e:
         logger.error(f"Error getting reference types: {str(e)}")
         return []
 
 
+def _index_reference(reference_data: Dict[str, Any]) -> None:
+    """Add a created or updated reference to whichever in-process indexes are loaded."""
+    if _search_index is not None:
+        _search_index.add(reference_data)
+    if _dedup_index is not None:
+        _dedup_index.add(reference_data)
+    if _near_duplicate_index is not None:
+        # Inactive references are not offered as duplicates
+        if reference_data.get('is_active', True) is False:
+            _near_duplicate_index.remove(reference_data.get('id'))
+        else:
+            _near_duplicate_index.add(reference_data)
+
+
+def _index_links(content_id: str, reference_ids: List[str]) -> None:
+    """Add created content-reference links to the citation index if it is loaded."""
+    if _citation_index is not None:
+        for reference_id in reference_ids:
+            _citation_index.add(content_id, reference_id)
+
+
+def build_near_duplicate_index() -> Optional[ReferenceLSHIndex]:
+    """Build a MinHash/LSH index of every active reference in the database.
+
+    Returns:
+        The index if successful, None otherwise
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return None
+
+    index = ReferenceLSHIndex()
+    for page in iter_reference_pages(page_size=1000, is_active=True,
+                                     columns='id, title, authors, publication_name, publication_date'):
+        index.add_many(page)
+
+    logger.info(f"Built near-duplicate index with {len(index)} references")
+    return index
+
+
+def get_near_duplicate_index() -> Optional[ReferenceLSHIndex]:
+    """Get the near-duplicate index, building it on first use.
+
+    Returns:
+        The index, or None if it could not be built
+    """
+    global _near_duplicate_index
+
+    if _near_duplicate_index is not None:
+        return _near_duplicate_index
+
+    with _near_duplicate_index_lock:
+        if _near_duplicate_index is None:
+            _near_duplicate_index = build_near_duplicate_index()
+
+    return _near_duplicate_index
+
+
+def find_near_duplicate_reference(reference_data: Dict[str, Any]) -> Optional[Tuple[str, float]]:
+    """Check whether a reference is a near-duplicate of one in the library.
+
+    Args:
+        reference_data: Reference dictionary with title, authors, publication_name and publication_date
+
+    Returns:
+        (reference ID, estimated similarity) of the closest match, or None
+    """
+    index = get_near_duplicate_index()
+    if index is None:
+        return None
+    return index.find_near_duplicate(reference_data)
+
+
+def get_dedup_index() -> Optional[ReferenceDedupIndex]:
+    """Get the reference de-duplication index, loading it on first use.
+
+    The index is loaded once per process and kept in sync as references are
+    created and updated through this module.
+
+    Returns:
+        The index, or None if it could not be loaded
+    """
+    global _dedup_index
+
+    if _dedup_index is not None:
+        return _dedup_index
+
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return None
+
+    with _dedup_index_lock:
+        if _dedup_index is None:
+            index = ReferenceDedupIndex()
+            for page in iter_reference_pages(page_size=1000, columns='id, title, url, doi'):
+                index.add_many(page)
+            logger.info(f"Loaded reference de-duplication index with {len(index)} references")
+            _dedup_index = index
+
+    return _dedup_index
+
+
+def build_citation_index(page_size: int = 1000) -> Optional[CitationIndex]:
+    """Build the citation index from the content_references table.
+
+    Links are read in ID order with keyset pagination.
+
+    Args:
+        page_size: Number of links per request
+
+    Returns:
+        The index if successful, None otherwise
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return None
+
+    index = CitationIndex()
+    last_id = None
+    try:
+        while True:
+            query = supabase.table('content_references').select('id, content_id, reference_id')
+            if last_id:
+                query = query.gt('id', last_id)
+            page = query.order('id').limit(page_size).execute().data or []
+
+            index.add_many(page)
+            if len(page) < page_size:
+                break
+            last_id = page[-1]['id']
+    except Exception as e:
+        logger.error(f"Error building citation index: {str(e)}")
+        return None
+
+    logger.info(f"Built citation index with {len(index)} links between {index.content_count} content items "
+                f"and {index.reference_count} references")
+    return index
+
+
+def get_citation_index() -> Optional[CitationIndex]:
+    """Get the citation index, building it on first use.
+
+    The index is built once per process and kept in sync as references are
+    linked to content through this module.
+
+    Returns:
+        The index, or None if it could not be built
+    """
+    global _citation_index
+
+    if _citation_index is not None:
+        return _citation_index
+
+    with _citation_index_lock:
+        if _citation_index is None:
+            _citation_index = build_citation_index()
+
+    return _citation_index
+
+
+def get_citing_content(reference_id: str) -> List[str]:
+    """Get the IDs of the content items that cite a reference.
+
+    Args:
+        reference_id: The ID of the reference
+
+    Returns:
+        Sorted list of content IDs
+    """
+    index = get_citation_index()
+    return index.get_citing_content(reference_id) if index is not None else []
+
+
+def get_cited_references(content_id: str) -> List[str]:
+    """Get the IDs of the references a content item cites.
+
+    Args:
+        content_id: The ID of the content item
+
+    Returns:
+        Sorted list of reference IDs
+    """
+    index = get_citation_index()
+    return index.get_content_references(content_id) if index is not None else []
+
+
+def get_co_cited_references(reference_id: str, limit: int = 10) -> List[Tuple[str, int]]:
+    """Get the references most often cited together with a reference.
+
+    Args:
+        reference_id: The ID of the reference
+        limit: Maximum number of references to return (0 for all)
+
+    Returns:
+        List of (reference ID, number of content items citing both)
+    """
+    index = get_citation_index()
+    return index.get_co_cited_references(reference_id, limit) if index is not None else []
+
+
+def get_shared_references(content_ids: List[str], min_count: int = 2) -> List[Tuple[str, int]]:
+    """Get the references cited by several of a group of content items.
+
+    Args:
+        content_ids: IDs of the content items, e.g. those of a section
+        min_count: Minimum number of the content items that must cite a reference
+
+    Returns:
+        List of (reference ID, number of the content items citing it)
+    """
+    index = get_citation_index()
+    return index.get_shared_references(content_ids, min_count) if index is not None else []
+
+
+def get_reference_impact(reference_ids: List[str]) -> Dict[str, Any]:
+    """Work out which content items would be affected by retiring references.
+
+    Args:
+        reference_ids: IDs of the references to retire
+
+    Returns:
+        Dictionary with reference_ids, affected_content (content ID -> number
+        of references it would keep) and orphaned_content; empty if the
+        citation index could not be built
+    """
+    index = get_citation_index()
+    return index.get_impact(reference_ids) if index is not None else {}
+
+
+def build_search_index(save: bool = True) -> Optional[ReferenceSearchIndex]:
+    """Build the reference search index from the database.
+
+    Args:
+        save: Whether to save the index to REFERENCE_SEARCH_INDEX_PATH
+
+    Returns:
+        The index if successful, None otherwise
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return None
+
+    index = ReferenceSearchIndex()
+    index.synced_at = datetime.datetime.now().isoformat()
+    for page in iter_reference_pages(page_size=1000):
+        index.add_many(page)
+
+    logger.info(f"Built reference search index with {len(index)} references")
+
+    if save:
+        index.save(REFERENCE_SEARCH_INDEX_PATH)
+    return index
+
+
+def refresh_search_index(index: ReferenceSearchIndex) -> int:
+    """Catch an index up with references updated or deleted since it was last synced.
+
+    Deleted references leave no updated_at to find, so every reference ID is
+    also scanned and indexed references missing from the scan are removed.
+
+    Args:
+        index: The index to refresh
+
+    Returns:
+        Number of references re-indexed or removed
+    """
+    if not index.synced_at:
+        return 0
+
+    synced_at = datetime.datetime.now().isoformat()
+    refreshed = 0
+    for page in iter_reference_pages(page_size=1000, updated_since=index.synced_at):
+        index.add_many(page)
+        refreshed += len(page)
+
+    # The scan runs in ID order and stops early on errors, so only IDs up to
+    # the last one seen are known to be gone
+    existing_ids = set()
+    last_id = None
+    for page in iter_reference_pages(page_size=1000, columns='id'):
+        existing_ids.update(row['id'] for row in page)
+        last_id = page[-1]['id']
+
+    removed = 0
+    if last_id is not None:
+        for reference_id in list(index.docs):
+            if reference_id <= last_id and reference_id not in existing_ids:
+                index.remove(reference_id)
+                removed += 1
+
+    index.synced_at = synced_at
+    if refreshed or removed:
+        logger.info(f"Refreshed {refreshed} and removed {removed} references in the search index")
+    return refreshed + removed
+
+
+def get_search_index() -> Optional[ReferenceSearchIndex]:
+    """Get the reference search index, loading or building it on first use.
+
+    A saved index is caught up with references updated since it was saved.
+
+    Returns:
+        The index, or None if it could not be loaded or built
+    """
+    global _search_index
+
+    if _search_index is not None:
+        return _search_index
+
+    with _search_index_lock:
+        if _search_index is None:
+            index = ReferenceSearchIndex.load(REFERENCE_SEARCH_INDEX_PATH)
+            if index is not None:
+                refresh_search_index(index)
+            else:
+                index = build_search_index()
+            _search_index = index
+
+    return _search_index
+
+
+def save_search_index() -> bool:
+    """Save the search index if it has changed since it was loaded or saved.
+
+    Returns:
+        True if the index was saved, False otherwise
+    """
+    if _search_index is None or not _search_index.dirty:
+        return False
+    return _search_index.save(REFERENCE_SEARCH_INDEX_PATH)
+
+
+atexit.register(save_search_index)
+
+
 def search_references(query: str, limit: int = 10) -> List[Dict[str, Any]]:
-    """Search for references by title, authors, or content.
+    """Search for references by title, authors, abstract, keywords, or DOI.
+
+    Results are ranked with BM25 by the in-process search index, and the last
+    word of the query also matches as a prefix. If the index is unavailable,
+    the database is searched instead.
+
+    Args:
+        query: The search query
+        limit: Maximum number of results to return
+
+    Returns:
+        List of matching references
+    """
+    index = get_search_index()
+    if index is None:
+        return _search_references_in_database(query, limit)
+
+    try:
+        references = index.search(query, limit)
+
+        if not references:
+            return []
+
+        # Get quality scores
+        reference_ids = [ref['id'] for ref in references]
+        quality_result = supabase.table('reference_quality').select('reference_id,overall_score').in_('reference_id', reference_ids).execute()
+        quality_scores = {item['reference_id']: item['overall_score'] for item in quality_result.data} if quality_result.data else {}
+
+        # Add quality scores to references
+        for ref in references:
+            ref['quality_score'] = quality_scores.get(ref['id'], 0)
+
+        return references
+
+    except Exception as e:
+        logger.error(f"Error searching references: {str(e)}")
+        return []
+
+
+def _search_references_in_database(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Search for references by title, authors, or content with database filters.
 
     Args:
         query: The search query
@@ -843,6 +1745,54 @@ def search_references(query: str, limit: int = 10) -> List[Dict[str, Any]]:
 def get_reference_statistics() -> Dict[str, Any]:
     """Get statistics about references.
 
+    The statistics are read from the running totals in the
+    reference_statistics table, which database triggers keep current, so this
+    is one small query whatever the size of the library. If the statistics
+    functions are not installed they are computed from the tables instead.
+
+    Returns:
+        Dictionary with reference statistics
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return {}
+
+    called, data = _call_database_function('get_reference_statistics')
+    if called and data:
+        return data
+
+    return compute_reference_statistics()
+
+
+def rebuild_reference_statistics() -> bool:
+    """Recompute the reference_statistics table from the reference tables.
+
+    The triggers keep the statistics current; this corrects any drift, for
+    example after rows were changed with the triggers disabled.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return False
+
+    try:
+        supabase.rpc('rebuild_reference_statistics', {}).execute()
+        logger.info("Rebuilt reference statistics")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error rebuilding reference statistics: {str(e)}")
+        return False
+
+
+def compute_reference_statistics() -> Dict[str, Any]:
+    """Compute statistics about references by aggregating every reference.
+
+    This reads all active references, quality scores and links, so it is only
+    used when the statistics table is unavailable, and to check it for drift.
+
     Returns:
         Dictionary with reference statistics
     """
@@ -895,10 +1845,9 @@ def get_reference_statistics() -> Dict[str, Any]:
         cat_result = supabase.table('reference_to_category').select('reference_id, category_id').in_('reference_id', reference_ids).execute()
         category_ids = [item['category_id'] for item in cat_result.data] if cat_result.data else []
 
-        # Get all category names in one query
+        # Get category names from the cached categories
         if category_ids:
-            cat_names_result = supabase.table('reference_categories').select('id, name').in_('id', list(set(category_ids))).execute()
-            category_names = {item['id']: item['name'] for item in cat_names_result.data} if cat_names_result.data else {}
+            category_names = _get_category_names(category_ids)
 
             # Get category breakdown
             category_breakdown = {}
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate reference detection with MinHash and locality-sensitive hashing.
+
+References are reduced to a set of normalised words from their title, authors
+and publication name, so reordered authors, "et al." forms, punctuation and
+small subtitle differences still produce similar sets. Numbers (versions,
+editions and the publication year) are kept, and two references whose
+numbers conflict are never near-duplicates, so "GPT-4" and "GPT-3" or two
+years of an annual report stay apart. Each set is summarised
+by a MinHash signature whose bands are hashed into LSH buckets; only
+references sharing a bucket are compared, which keeps both the online check
+and clustering the whole library far below quadratic.
+"""
+
+import re
+import zlib
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default signature size and banding; 32 bands of 4 rows make pairs with a
+# similarity above about (1/32) ** (1/4) = 0.42 likely to share a bucket, and
+# candidates are then checked against the threshold below
+NUM_PERM = 128
+NUM_BANDS = 32
+
+# Default estimated Jaccard similarity for two references to count as duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.65
+
+# Fields whose words make up a reference's shingles
+SHINGLE_FIELDS = ['title', 'authors', 'publication_name']
+
+# Words that do not help tell references apart
+STOPWORDS = {
+    'a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'in', 'into', 'of', 'on', 'or', 'the',
+    'to', 'with', 'et', 'al', 'eds', 'ed', 'unknown', 'vol', 'pp', 'no',
+}
+
+# Smallest prime above 2**32, so a * x + b wraps many times for 32-bit x
+HASH_PRIME = 4294967311
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def shingle_reference(reference: Dict[str, Any]) -> Set[str]:
+    """Get the set of normalised words describing a reference.
+
+    Single letters (initials) and stopwords are dropped so that
+    "Smith, J. et al." and "J Smith" produce the same words. Numbers are kept
+    whatever their length, and the publication year is added as a number.
+
+    Args:
+        reference: Reference dictionary
+
+    Returns:
+        Set of words
+    """
+    words = set()
+    for field in SHINGLE_FIELDS:
+        value = reference.get(field)
+        if not value:
+            continue
+        for word in WORD_PATTERN.findall(str(value).lower()):
+            if (len(word) > 1 or word.isdigit()) and word not in STOPWORDS:
+                words.add(word)
+
+    year = YEAR_PATTERN.search(str(reference.get('publication_date') or ''))
+    if year:
+        words.add(year.group())
+    return words
+
+
+def numbers_conflict(first: Set[str], second: Set[str]) -> bool:
+    """Check whether two references' numbers rule out their being the same.
+
+    A reference missing a number the other has (such as an unknown year) can
+    still match, but two different sets of numbers cannot.
+
+    Args:
+        first: Shingles of one reference
+        second: Shingles of the other reference
+
+    Returns:
+        True if neither reference's numbers contain the other's
+    """
+    first_numbers = {word for word in first if word.isdigit()}
+    second_numbers = {word for word in second if word.isdigit()}
+    return not (first_numbers <= second_numbers or second_numbers <= first_numbers)
+
+
+class MinHasher:
+    """Compute MinHash signatures with a fixed family of hash functions."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        """Initialize the hash functions.
+
+        Args:
+            num_perm: Number of hash functions (signature length)
+            seed: Random seed, so signatures are reproducible
+        """
+        generator = np.random.RandomState(seed)
+        # Keep coefficients below 2**31 so a * x + b fits in 64 bits for 32-bit x
+        self.a = generator.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.b = generator.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        """Compute the MinHash signature of a set of shingles.
+
+        Args:
+            shingles: Shingles to hash
+
+        Returns:
+            Array of num_perm unsigned integers; all maximal for an empty set
+        """
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, HASH_PRIME, dtype=np.uint64)
+        permuted = (np.outer(hashes, self.a) + self.b) % np.uint64(HASH_PRIME)
+        return permuted.min(axis=0)
+
+
+def estimate_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two sets from their signatures.
+
+    Args:
+        first: MinHash signature
+        second: MinHash signature of the same length
+
+    Returns:
+        Fraction of matching signature positions
+    """
+    return float(np.mean(first == second))
+
+
+class ReferenceLSHIndex:
+    """LSH index of reference MinHash signatures for near-duplicate lookups."""
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, num_perm: int = NUM_PERM,
+                 num_bands: int = NUM_BANDS):
+        """Initialize an empty index.
+
+        Args:
+            threshold: Estimated Jaccard similarity for a near-duplicate
+            num_perm: Signature length
+            num_bands: Number of LSH bands; must divide num_perm
+        """
+        if num_perm % num_bands:
+            raise ValueError("num_bands must divide num_perm")
+
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.rows = num_perm // num_bands
+        self.hasher = MinHasher(num_perm)
+        self.signatures = {}                                   # reference_id -> signature
+        self.numbers = {}                                      # reference_id -> numeric shingles
+        self.buckets = [defaultdict(set) for _ in range(num_bands)]  # band -> {band hash: ids}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of indexed references."""
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Split a signature into one hashable key per band."""
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.num_bands)]
+
+    def add(self, reference: Dict[str, Any]) -> None:
+        """Add or replace a reference in the index.
+
+        References without any usable words are not indexed.
+
+        Args:
+            reference: Reference dictionary with an ID
+        """
+        reference_id = reference.get('id') or reference.get('reference_id')
+        if not reference_id:
+            return
+
+        shingles = shingle_reference(reference)
+        signature = self.hasher.signature(shingles) if shingles else None
+
+        with self._lock:
+            self._remove(reference_id)
+            if signature is None:
+                return
+            self.signatures[reference_id] = signature
+            self.numbers[reference_id] = {word for word in shingles if word.isdigit()}
+            for band, key in enumerate(self._band_keys(signature)):
+                self.buckets[band][key].add(reference_id)
+
+    def add_many(self, references: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace several references.
+
+        Args:
+            references: Reference dictionaries
+        """
+        for reference in references:
+            self.add(reference)
+
+    def remove(self, reference_id: str) -> None:
+        """Remove a reference from the index.
+
+        Args:
+            reference_id: ID of the reference to remove
+        """
+        with self._lock:
+            self._remove(reference_id)
+
+    def _remove(self, reference_id: str) -> None:
+        """Remove a reference; the caller must hold the lock."""
+        signature = self.signatures.pop(reference_id, None)
+        self.numbers.pop(reference_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(reference_id)
+                if not bucket:
+                    del self.buckets[band][key]
+
+    def _candidates(self, signature: np.ndarray) -> Set[str]:
+        """Get the IDs sharing at least one band with a signature."""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        return candidates
+
+    def query(self, reference: Dict[str, Any]) -> List[Tuple[str, float]]:
+        """Find indexed references that are near-duplicates of a reference.
+
+        Args:
+            reference: Reference dictionary; its own ID, if indexed, is skipped
+
+        Returns:
+            List of (reference ID, estimated similarity) tuples, most similar first
+        """
+        shingles = shingle_reference(reference)
+        if not shingles:
+            return []
+        signature = self.hasher.signature(shingles)
+        own_id = reference.get('id') or reference.get('reference_id')
+
+        matches = []
+        with self._lock:
+            for candidate_id in self._candidates(signature):
+                if candidate_id == own_id or numbers_conflict(shingles, self.numbers[candidate_id]):
+                    continue
+                similarity = estimate_similarity(signature, self.signatures[candidate_id])
+                if similarity >= self.threshold:
+                    matches.append((candidate_id, similarity))
+
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def find_near_duplicate(self, reference: Dict[str, Any]) -> Optional[Tuple[str, float]]:
+        """Find the most similar near-duplicate of a reference.
+
+        Args:
+            reference: Reference dictionary
+
+        Returns:
+            (reference ID, estimated similarity) tuple, or None
+        """
+        matches = self.query(reference)
+        return matches[0] if matches else None
+
+    def find_clusters(self) -> List[List[str]]:
+        """Group all indexed references into clusters of near-duplicates.
+
+        Only pairs sharing an LSH bucket are compared, and pairs above the
+        threshold are merged with union-find, so near-duplicates chain into one
+        cluster.
+
+        Returns:
+            List of clusters with at least two references, each sorted, largest first
+        """
+        parent = {}
+
+        def find(node):
+            while parent.get(node, node) != node:
+                parent[node] = parent.get(parent[node], parent[node])
+                node = parent[node]
+            return node
+
+        compared = set()
+        with self._lock:
+            for band_buckets in self.buckets:
+                for bucket in band_buckets.values():
+                    if len(bucket) < 2:
+                        continue
+                    members = sorted(bucket)
+                    for i, first in enumerate(members):
+                        for second in members[i + 1:]:
+                            if (first, second) in compared:
+                                continue
+                            compared.add((first, second))
+                            if find(first) == find(second) or \
+                                    numbers_conflict(self.numbers[first], self.numbers[second]):
+                                continue
+                            if estimate_similarity(self.signatures[first], self.signatures[second]) >= self.threshold:
+                                parent.setdefault(first, first)
+                                parent.setdefault(second, second)
+                                parent[find(second)] = find(first)
+
+        clusters = defaultdict(list)
+        for node in parent:
+            clusters[find(node)].append(node)
+
+        return sorted((sorted(members) for members in clusters.values() if len(members) > 1),
+                      key=lambda members: (-len(members), members[0]))
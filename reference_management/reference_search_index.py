@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+In-process full-text search index for references.
+
+This module provides an inverted index over reference titles, authors,
+abstracts, keywords and DOIs with BM25 ranking and prefix matching of the
+last query term, so search-as-you-type does not have to scan the
+reference_sources table. The index is updated incrementally as references are
+created or updated and can be saved to disk for fast restarts.
+"""
+
+import os
+import re
+import math
+import heapq
+import pickle
+import bisect
+import logging
+import threading
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes so old files are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+# Term frequency weight of each indexed field
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'doi': 3.0,
+    'authors': 2.0,
+    'keywords': 2.0,
+    'abstract': 1.0,
+}
+
+# Fields kept for each reference so results can be returned without a query
+STORED_FIELDS = ['id', 'title', 'authors', 'publication_date', 'publication_name',
+                 'reference_type', 'url', 'doi', 'is_active']
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Maximum number of vocabulary terms a prefix expands to
+MAX_PREFIX_EXPANSIONS = 50
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Any) -> List[str]:
+    """Split text into lowercase alphanumeric terms.
+
+    Args:
+        text: Text to tokenize; lists are joined with spaces
+
+    Returns:
+        List of terms
+    """
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        text = " ".join(str(part) for part in text if part)
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class ReferenceSearchIndex:
+    """Inverted index over references with BM25 ranking.
+
+    Postings are kept in dictionaries so references can be added and removed
+    cheaply; each term's postings are also cached as NumPy arrays, rebuilt only
+    when the term changes, so a query scores every matching reference at once.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.postings = defaultdict(dict)  # term -> {slot: weighted tf}
+        self.doc_terms = {}                # reference_id -> {term: weighted tf}
+        self.docs = {}                     # reference_id -> stored fields
+        self.slots = {}                    # reference_id -> slot
+        self.slot_ids = []                 # slot -> reference_id (None if free)
+        self.free_slots = []
+        self.lengths = np.zeros(0)         # slot -> weighted length
+        self.live = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self.total_length = 0.0
+        self.vocabulary = []               # sorted terms, for prefix lookups
+        self.synced_at = None              # when the index last caught up with the database
+        self.dirty = False
+        self._arrays = {}                  # term -> (slots, frequencies)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of indexed references."""
+        return len(self.docs)
+
+    def add(self, reference: Dict[str, Any]) -> None:
+        """Add or replace a reference in the index.
+
+        Args:
+            reference: Reference dictionary with at least an ID
+        """
+        with self._lock:
+            for term in self._add(reference):
+                bisect.insort(self.vocabulary, term)
+
+    def add_many(self, references: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace several references.
+
+        Args:
+            references: Reference dictionaries
+        """
+        with self._lock:
+            new_terms = []
+            for reference in references:
+                new_terms.extend(self._add(reference))
+            if new_terms:
+                self.vocabulary = sorted(set(self.vocabulary).union(new_terms))
+
+    def remove(self, reference_id: str) -> None:
+        """Remove a reference from the index.
+
+        Args:
+            reference_id: ID of the reference to remove
+        """
+        with self._lock:
+            if self._remove(reference_id):
+                self.dirty = True
+
+    def _add(self, reference: Dict[str, Any]) -> List[str]:
+        """Index a reference; the caller must hold the lock.
+
+        Returns:
+            Terms that are new to the vocabulary
+        """
+        reference_id = reference.get('id') or reference.get('reference_id')
+        if not reference_id:
+            return []
+
+        terms = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(reference.get(field)):
+                terms[term] += weight
+
+        self._remove(reference_id)
+        slot = self._allocate_slot(reference_id)
+
+        new_terms = []
+        for term, frequency in terms.items():
+            postings = self.postings[term]
+            if not postings:
+                new_terms.append(term)
+            postings[slot] = frequency
+            self._arrays.pop(term, None)
+
+        length = sum(terms.values())
+        self.doc_terms[reference_id] = dict(terms)
+        self.lengths[slot] = length
+        self.live[slot] = True
+        self.active[slot] = reference.get('is_active', True) is not False
+        self.total_length += length
+        self.docs[reference_id] = {field: reference.get(field) for field in STORED_FIELDS}
+        self.docs[reference_id]['id'] = reference_id
+        self.dirty = True
+        return new_terms
+
+    def _allocate_slot(self, reference_id: str) -> int:
+        """Assign a reference to a free slot, growing the arrays if needed."""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.slot_ids[slot] = reference_id
+        else:
+            slot = len(self.slot_ids)
+            self.slot_ids.append(reference_id)
+            if slot >= len(self.lengths):
+                capacity = max(1024, 2 * len(self.lengths))
+                self.lengths = np.resize(self.lengths, capacity)
+                self.live = np.resize(self.live, capacity)
+                self.active = np.resize(self.active, capacity)
+                self.lengths[slot:] = 0.0
+                self.live[slot:] = False
+                self.active[slot:] = False
+        self.slots[reference_id] = slot
+        return slot
+
+    def _remove(self, reference_id: str) -> bool:
+        """Remove a reference; the caller must hold the lock."""
+        terms = self.doc_terms.pop(reference_id, None)
+        if terms is None:
+            return False
+        slot = self.slots.pop(reference_id)
+
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(slot, None)
+            self._arrays.pop(term, None)
+            if not postings:
+                del self.postings[term]
+                position = bisect.bisect_left(self.vocabulary, term)
+                if position < len(self.vocabulary) and self.vocabulary[position] == term:
+                    del self.vocabulary[position]
+
+        self.total_length -= self.lengths[slot]
+        self.lengths[slot] = 0.0
+        self.live[slot] = False
+        self.active[slot] = False
+        self.slot_ids[slot] = None
+        self.free_slots.append(slot)
+        self.docs.pop(reference_id, None)
+        return True
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get a term's postings as (slots, frequencies) arrays."""
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self.postings.get(term, {})
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+            self._arrays[term] = arrays
+        return arrays
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Find vocabulary terms starting with a prefix.
+
+        When there are more than MAX_PREFIX_EXPANSIONS candidates, the most
+        common terms are kept.
+
+        Args:
+            prefix: Term prefix
+
+        Returns:
+            List of matching terms
+        """
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff")
+        terms = self.vocabulary[start:end]
+        if len(terms) > MAX_PREFIX_EXPANSIONS:
+            terms = heapq.nlargest(MAX_PREFIX_EXPANSIONS, terms, key=lambda term: len(self.postings[term]))
+        return terms
+
+    def search_ids(self, query: str, limit: Optional[int] = 10, active_only: bool = True,
+                   match_all: bool = False) -> List[Tuple[str, float]]:
+        """Rank references against a query.
+
+        Each query term is matched exactly, except the last one, which also
+        matches as a prefix unless the query ends with whitespace.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results (None for all)
+            active_only: Whether to skip inactive references
+            match_all: Whether every query term must match
+
+        Returns:
+            List of (reference ID, score) tuples, best first
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+        prefix_last = not query[-1:].isspace()
+
+        with self._lock:
+            doc_count = len(self.docs)
+            if not doc_count:
+                return []
+
+            size = len(self.slot_ids)
+            lengths = self.lengths[:size]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (self.total_length / doc_count))
+            scores = np.zeros(size)
+            matched = np.zeros(size, dtype=np.int64)
+
+            for position, query_term in enumerate(query_terms):
+                is_last = position == len(query_terms) - 1
+                expansions = self.expand_prefix(query_term) if is_last and prefix_last else [query_term]
+
+                # A reference's score for this query term is its best expansion
+                term_scores = np.zeros(size)
+                for term in expansions:
+                    slots, frequencies = self._term_arrays(term)
+                    if not len(slots):
+                        continue
+                    idf = math.log(1 + (doc_count - len(slots) + 0.5) / (len(slots) + 0.5))
+                    expansion_scores = idf * frequencies * (BM25_K1 + 1) / (frequencies + norm[slots])
+                    term_scores[slots] = np.maximum(term_scores[slots], expansion_scores)
+
+                scores += term_scores
+                matched += term_scores > 0
+
+            required = len(query_terms) if match_all else 1
+            mask = (matched >= required) & (self.active[:size] if active_only else self.live[:size])
+            candidates = np.flatnonzero(mask)
+
+            if limit is not None and len(candidates) > limit:
+                best = np.argpartition(-scores[candidates], limit - 1)[:limit]
+                candidates = candidates[best]
+
+            results = [(self.slot_ids[slot], float(scores[slot])) for slot in candidates]
+
+        return sorted(results, key=lambda item: (-item[1], item[0]))
+
+    def search(self, query: str, limit: Optional[int] = 10, active_only: bool = True,
+               match_all: bool = False) -> List[Dict[str, Any]]:
+        """Search references and return their stored fields.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results (None for all)
+            active_only: Whether to skip inactive references
+            match_all: Whether every query term must match
+
+        Returns:
+            List of reference dictionaries with a search_score, best first
+        """
+        results = []
+        for reference_id, score in self.search_ids(query, limit, active_only, match_all):
+            reference = dict(self.docs[reference_id])
+            reference['search_score'] = round(score, 4)
+            results.append(reference)
+        return results
+
+    def save(self, path: str) -> bool:
+        """Save the index to disk.
+
+        Args:
+            path: File to write
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self._lock:
+                state = {
+                    'version': INDEX_FORMAT_VERSION,
+                    'postings': dict(self.postings),
+                    'doc_terms': self.doc_terms,
+                    'docs': self.docs,
+                    'slots': self.slots,
+                    'slot_ids': self.slot_ids,
+                    'free_slots': self.free_slots,
+                    'lengths': self.lengths,
+                    'live': self.live,
+                    'active': self.active,
+                    'total_length': self.total_length,
+                    'vocabulary': self.vocabulary,
+                    'synced_at': self.synced_at,
+                }
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, path)
+                self.dirty = False
+
+            logger.info(f"Saved reference search index with {len(self.docs)} references to {path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving reference search index: {str(e)}")
+            return False
+
+    @classmethod
+    def load(cls, path: str) -> Optional['ReferenceSearchIndex']:
+        """Load an index saved with save().
+
+        Args:
+            path: File to read
+
+        Returns:
+            The index, or None if the file is missing, unreadable or outdated
+        """
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+
+            if state.get('version') != INDEX_FORMAT_VERSION:
+                logger.info(f"Ignoring reference search index in old format: {path}")
+                return None
+
+            index = cls()
+            index.postings = defaultdict(dict, state['postings'])
+            for key in ['doc_terms', 'docs', 'slots', 'slot_ids', 'free_slots', 'lengths',
+                        'live', 'active', 'total_length', 'vocabulary', 'synced_at']:
+                setattr(index, key, state[key])
+
+            logger.info(f"Loaded reference search index with {len(index.docs)} references from {path}")
+            return index
+
+        except Exception as e:
+            logger.error(f"Error loading reference search index: {str(e)}")
+            return None
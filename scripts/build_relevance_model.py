@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Fit the source relevance model on the reference library.
+
+CRAAP source evaluation scores relevance as the TF-IDF similarity between a
+topic and a source's title and abstract. This script fits the vocabulary and
+IDF weights on every reference in reference_sources and saves the model to
+RELEVANCE_MODEL_PATH, where source evaluation loads it from.
+"""
+
+import os
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Import our custom modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'quality'))
+from reference_management.reference_management import iter_reference_pages
+from source_evaluation import RelevanceModel, RELEVANCE_MODEL_PATH
+
+def iter_reference_texts(active_only: bool = False):
+    """
+    Yield the title and abstract of every reference.
+
+    Args:
+        active_only: Whether to skip inactive references
+
+    Yields:
+        Reference texts
+    """
+    for page in iter_reference_pages(page_size=1000, is_active=True if active_only else None,
+                                     columns='id, title, abstract'):
+        for reference in page:
+            yield " ".join(part for part in (reference.get('title'), reference.get('abstract')) if part)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the source relevance model on the reference library.")
+    parser.add_argument("--output", default=RELEVANCE_MODEL_PATH, help="File to save the model to")
+    parser.add_argument("--active-only", action="store_true", help="Fit on active references only")
+
+    args = parser.parse_args()
+
+    texts = list(iter_reference_texts(args.active_only))
+    if not texts:
+        print("No references to fit the relevance model on")
+        sys.exit(1)
+
+    model = RelevanceModel.fit(texts)
+    success = model.save(args.output)
+    print(f"Fitted relevance model on {len(texts)} references ({len(model)} terms)" if success
+          else "Failed to save the relevance model")
+    sys.exit(0 if success else 1)
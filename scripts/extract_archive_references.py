@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Extract references from the whole content archive for bulk import.
+
+This script walks every generated markdown file and every stored generation
+output, extracts and parses their reference sections across a process pool,
+and writes the normalised records to a JSONL or Parquet file. Sources whose
+content hash matches the manifest from the previous run are skipped, so the
+output holds only the references of new or changed content.
+"""
+
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Import our custom modules
+from reference_management.archive_extractor import (
+    extract_archive_references, DEFAULT_ARCHIVE_DIR, DEFAULT_OUTPUT_FILE, DEFAULT_MANIFEST_FILE, OUTPUT_FORMATS
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract references from the content archive for bulk import.")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR, help="Directory of generated markdown content")
+    parser.add_argument("--no-files", action="store_true", help="Skip the generated markdown files")
+    parser.add_argument("--no-outputs", action="store_true", help="Skip the generation outputs stored in Supabase")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="Output file")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl", help="Output format")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_FILE, help="Manifest of content hashes from the last run")
+    parser.add_argument("--full", action="store_true", help="Extract every source, ignoring the manifest")
+    parser.add_argument("--max-workers", type=int, help="Number of worker processes (defaults to the CPU count)")
+
+    args = parser.parse_args()
+
+    stats = extract_archive_references(
+        archive_dir=None if args.no_files else args.archive_dir,
+        include_outputs=not args.no_outputs,
+        output_file=args.output,
+        output_format=args.format,
+        manifest_file=args.manifest,
+        full=args.full,
+        max_workers=args.max_workers
+    )
+
+    # Print statistics
+    print("\nExtraction Statistics:")
+    print(f"Sources examined: {stats['sources']}")
+    print(f"Unchanged (skipped): {stats['unchanged']}")
+    print(f"Extracted: {stats['extracted']}")
+    print(f"References written: {stats['records']}")
+    print(f"Failed: {stats['failed']}")
+
+    # Exit with appropriate status code
+    sys.exit(0 if stats['failed'] == 0 else 1)
@@ -11,7 +11,7 @@ import datetime
 from dotenv import load_dotenv
 
 # Import our custom modules
-from supabase_client import is_connected, get_content_inventory, get_content_by_id, update_content_status
+from supabase_client import is_connected, get_content_inventory, get_content_by_id, update_content_statuses
 from content_workflow_supabase import generate_content_for_item, check_dependencies
 
 # Configure logging
@@ -93,14 +93,13 @@ def reset_content_status(content_ids=None):
             content_items = get_content_inventory()
             content_ids = [item['content_id'] for item in content_items]
 
-        # Reset status for each content item
-        for content_id in content_ids:
-            update_content_status(content_id, "Not Started", {
-                "reset_time": datetime.datetime.now().isoformat()
-            })
-            logger.info(f"Reset status for content ID {content_id} to Not Started")
+        # Reset status for all content items in bulk
+        reset_count = update_content_statuses(content_ids, "Not Started", {
+            "reset_time": datetime.datetime.now().isoformat()
+        })
+        logger.info(f"Reset status for {reset_count} content items to Not Started")
 
-        return True
+        return reset_count == len(set(content_ids))
     except Exception as e:
         logger.error(f"Error resetting content status: {str(e)}")
         return False
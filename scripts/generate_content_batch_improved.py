@@ -9,15 +9,21 @@ import argparse
 import logging
 import time
 import json
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Dict, Set, Optional, Tuple
 import networkx as nx
 from datetime import datetime
 
 # Import our custom modules
 from supabase_client import (
-    is_connected, get_content_inventory, update_content_status
+    is_connected, get_content_inventory, update_content_statuses,
+    get_content_by_id, update_content_item, get_generation_history
 )
-from content_workflow_supabase import generate_content_for_id
+from content_workflow_supabase import generate_content_for_id, CONTENT_PROMPT_VERSION
+from core.rate_limiter import get_rate_limiter
+from core.content_fingerprint import compute_fingerprints, find_stale_items, with_fingerprint
+from core.batch_planner import build_model_profile, plan_batch, format_plan
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -114,6 +120,87 @@ def filter_content_items(content_items: List[Dict],
     
     return filtered_items
 
+def select_generation_order(all_content_items: List[Dict],
+                            G: nx.DiGraph,
+                            status: Optional[str] = None,
+                            content_ids: Optional[List[str]] = None,
+                            section: Optional[str] = None,
+                            model: str = "gemini-1.5-flash",
+                            temperature: float = 0.7,
+                            max_items: int = None,
+                            retry_failed: bool = False,
+                            incremental: bool = False) -> Tuple[List[str], Dict[str, str]]:
+    """Select the items a batch run would generate, in dependency order.
+    
+    Args:
+        all_content_items: List of all content inventory items
+        G: Dependency graph of all content items
+        status: Filter by status (e.g., "Not Started")
+        content_ids: Filter by specific content IDs
+        section: Filter by section
+        model: Model to use for generation
+        temperature: Temperature for generation
+        max_items: Maximum number of items to generate
+        retry_failed: Whether to retry previously failed items
+        incremental: Select only stale items and their downstream dependents
+        
+    Returns:
+        Tuple of (generation_order, fingerprints of every item)
+    """
+    # Fingerprints are recorded after every generation, so later incremental runs can skip the item
+    fingerprints = compute_fingerprints(G, model, temperature, CONTENT_PROMPT_VERSION)
+    if incremental:
+        # Select stale items instead of filtering by status
+        stale_ids = find_stale_items(G, fingerprints)
+        filtered_items = [item for item in filter_content_items(all_content_items, None, content_ids, section)
+                          if item['content_id'] in stale_ids]
+        logger.info(f"Incremental run: {len(filtered_items)} of {len(all_content_items)} items are stale")
+    else:
+        # Apply filters; queued items are left over from an interrupted run
+        statuses = ["Not Started", "Queued"]
+        if retry_failed:
+            statuses.append("Failed")
+        
+        if status:
+            statuses = [status]
+        
+        filtered_items = []
+        for s in statuses:
+            filtered_items.extend(filter_content_items(all_content_items, s, content_ids, section))
+    
+    # Get subgraph of only the filtered items
+    filtered_ids = [item['content_id'] for item in filtered_items]
+    subgraph = G.subgraph(filtered_ids)
+    
+    # Determine generation order
+    generation_order = get_generation_order(subgraph)
+    
+    # Limit to max_items if specified
+    if max_items and len(generation_order) > max_items:
+        generation_order = generation_order[:max_items]
+    
+    return generation_order, fingerprints
+
+@contextmanager
+def restore_unstarted_statuses(original_statuses: Dict[str, Optional[str]], started: Set[str]):
+    """Restore items that never started to their previous status on exit.
+    
+    Items are restored with one request per status.
+    
+    Args:
+        original_statuses: Status of each item in the batch before it was queued
+        started: Items whose generation started; filled in while the batch runs
+    """
+    try:
+        yield
+    finally:
+        restore = {}
+        for content_id, previous_status in original_statuses.items():
+            if content_id not in started:
+                restore.setdefault(previous_status or "Not Started", []).append(content_id)
+        for previous_status, restore_ids in restore.items():
+            update_content_statuses(restore_ids, previous_status)
+
 def generate_content_batch(status: Optional[str] = None,
                           content_ids: Optional[List[str]] = None,
                           section: Optional[str] = None,
@@ -122,7 +209,9 @@ def generate_content_batch(status: Optional[str] = None,
                           max_items: int = None,
                           force: bool = False,
                           retry_failed: bool = False,
-                          delay: int = 0) -> Tuple[int, int]:
+                          delay: int = 0,
+                          max_concurrency: Optional[int] = None,
+                          incremental: bool = False) -> Tuple[int, int]:
     """Generate content for multiple items in dependency order.
     
     Args:
@@ -135,6 +224,10 @@ def generate_content_batch(status: Optional[str] = None,
         force: Whether to force generation even if dependencies aren't met
         retry_failed: Whether to retry previously failed items
         delay: Delay between generations in seconds
+        max_concurrency: Maximum number of items generated at once (defaults to the
+            model limiter's maximum; use 1 for strictly sequential generation)
+        incremental: Regenerate only items whose fingerprint changed and their
+            downstream dependents, regardless of status
         
     Returns:
         Tuple of (success_count, failure_count)
@@ -150,81 +243,190 @@ def generate_content_batch(status: Optional[str] = None,
         logger.error("No content items found in inventory")
         return 0, 0
     
-    # Apply filters
-    statuses = ["Not Started"]
-    if retry_failed:
-        statuses.append("Failed")
-    
-    if status:
-        statuses = [status]
-    
-    filtered_items = []
-    for s in statuses:
-        filtered_items.extend(filter_content_items(all_content_items, s, content_ids, section))
-    
-    if not filtered_items:
-        logger.info(f"No content items match the criteria (status={status}, content_ids={content_ids}, section={section})")
-        return 0, 0
-    
     # Build dependency graph
     G = build_dependency_graph(all_content_items)
     
-    # Get subgraph of only the filtered items
-    filtered_ids = [item['content_id'] for item in filtered_items]
-    subgraph = G.subgraph(filtered_ids)
-    
-    # Determine generation order
-    generation_order = get_generation_order(subgraph)
+    generation_order, fingerprints = select_generation_order(
+        all_content_items, G, status, content_ids, section,
+        model, temperature, max_items, retry_failed, incremental
+    )
     
-    # Limit to max_items if specified
-    if max_items and len(generation_order) > max_items:
-        generation_order = generation_order[:max_items]
+    if not generation_order:
+        logger.info(f"No content items match the criteria (status={status}, content_ids={content_ids}, section={section})")
+        return 0, 0
     
     logger.info(f"Will generate {len(generation_order)} items in dependency order")
     
-    # Generate content for each item in order
+    limiter = get_rate_limiter(model)
+    if max_concurrency is None:
+        max_concurrency = limiter.max_concurrency
+    max_concurrency = max(1, max_concurrency)
+    
+    # Generate content with up to max_concurrency items in flight; the shared
+    # limiter adapts how many of their LLM requests actually run at once
     success_count = 0
     failure_count = 0
     
-    for i, content_id in enumerate(generation_order):
-        logger.info(f"Generating item {i+1}/{len(generation_order)}: {content_id}")
-        
-        # Check if dependencies are met
-        dependencies_met = True
-        if not force:
-            for pred in G.predecessors(content_id):
-                pred_data = G.nodes[pred]['data']
-                if pred_data.get('status') != 'Completed':
-                    logger.warning(f"Dependency {pred} for {content_id} is not completed (status: {pred_data.get('status')})")
-                    dependencies_met = False
-        
-        if not dependencies_met:
-            logger.error(f"Dependencies not met for {content_id}. Use --force to ignore dependencies.")
-            failure_count += 1
-            continue
-        
-        try:
-            # Generate content
-            result = generate_content_for_id(content_id, model, temperature, force=True)
+    in_run = set(generation_order)
+    pending = list(generation_order)
+    finished = set()
+    futures = {}
+    started = set()
+    submitted = 0
+    
+    # Record the whole batch as queued in one request
+    original_statuses = {content_id: G.nodes[content_id]['data'].get('status') for content_id in generation_order}
+    update_content_statuses(generation_order, "Queued")
+    
+    # Mirror the queued status, so dependents of items that fail in this run are
+    # not generated from their stale 'Completed' status
+    for content_id in generation_order:
+        G.nodes[content_id]['data']['status'] = 'Queued'
+    
+    with restore_unstarted_statuses(original_statuses, started), \
+            ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        while pending or futures:
+            # Start every item whose in-run dependencies have finished
+            for content_id in list(pending):
+                if len(futures) >= max_concurrency:
+                    break
+                
+                waiting_on = [pred for pred in G.predecessors(content_id) if pred in in_run and pred not in finished]
+                if waiting_on and (futures or pending[0] != content_id):
+                    continue
+                
+                pending.remove(content_id)
+                submitted += 1
+                logger.info(f"Generating item {submitted}/{len(generation_order)}: {content_id}")
+                
+                # Check if dependencies are met
+                dependencies_met = True
+                if not force:
+                    for pred in G.predecessors(content_id):
+                        pred_data = G.nodes[pred]['data']
+                        if pred_data.get('status') != 'Completed':
+                            logger.warning(f"Dependency {pred} for {content_id} is not completed (status: {pred_data.get('status')})")
+                            dependencies_met = False
+                
+                if not dependencies_met:
+                    logger.error(f"Dependencies not met for {content_id}. Use --force to ignore dependencies.")
+                    failure_count += 1
+                    G.nodes[content_id]['data']['status'] = 'Failed'
+                    finished.add(content_id)
+                    continue
+                
+                # Add delay if specified
+                if delay > 0 and submitted > 1:
+                    logger.info(f"Waiting {delay} seconds before next generation...")
+                    time.sleep(delay)
+                
+                futures[executor.submit(generate_content_for_id, content_id, model, temperature, force=True)] = content_id
+                started.add(content_id)
             
-            if result:
-                success_count += 1
-                logger.info(f"Successfully generated content for {content_id}")
-            else:
-                failure_count += 1
-                logger.error(f"Failed to generate content for {content_id}")
+            if not futures:
+                continue
             
-            # Add delay if specified
-            if delay > 0 and i < len(generation_order) - 1:
-                logger.info(f"Waiting {delay} seconds before next generation...")
-                time.sleep(delay)
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                content_id = futures.pop(future)
+                finished.add(content_id)
                 
-        except Exception as e:
-            failure_count += 1
-            logger.error(f"Error generating content for {content_id}: {str(e)}")
+                try:
+                    result = future.result()
+                    
+                    if result:
+                        success_count += 1
+                        G.nodes[content_id]['data']['status'] = 'Completed'
+                        logger.info(f"Successfully generated content for {content_id}")
+                        
+                        # Generation replaces the item's metadata, so record the fingerprint afterwards
+                        record_fingerprint(content_id, fingerprints[content_id])
+                    else:
+                        failure_count += 1
+                        G.nodes[content_id]['data']['status'] = 'Failed'
+                        logger.error(f"Failed to generate content for {content_id}")
+                except Exception as e:
+                    failure_count += 1
+                    G.nodes[content_id]['data']['status'] = 'Failed'
+                    logger.error(f"Error generating content for {content_id}: {str(e)}")
+                
+                logger.info(limiter.format_stats())
     
     return success_count, failure_count
 
+def plan_content_batch(status: Optional[str] = None,
+                       content_ids: Optional[List[str]] = None,
+                       section: Optional[str] = None,
+                       model: str = "gemini-1.5-flash",
+                       temperature: float = 0.7,
+                       max_items: int = None,
+                       retry_failed: bool = False,
+                       max_concurrency: Optional[int] = None,
+                       incremental: bool = False,
+                       history_limit: int = 500) -> Optional[Dict]:
+    """Forecast a batch run without generating anything.
+    
+    Uses historical prompt/output sizes and latencies for the model to estimate
+    tokens, API calls, wall-clock time and the critical path.
+    
+    Args:
+        status: Filter by status (e.g., "Not Started")
+        content_ids: Filter by specific content IDs
+        section: Filter by section
+        model: Model to use for generation
+        temperature: Temperature for generation
+        max_items: Maximum number of items to generate
+        retry_failed: Whether to retry previously failed items
+        max_concurrency: Number of items generated at once (defaults to the
+            model limiter's maximum)
+        incremental: Plan only stale items and their downstream dependents
+        history_limit: Number of recent prompts to base the forecast on
+        
+    Returns:
+        Forecast dictionary from plan_batch(), or None if nothing would be generated
+    """
+    # Check Supabase connection
+    if not is_connected():
+        logger.error("Not connected to Supabase")
+        return None
+    
+    all_content_items = get_content_inventory()
+    if not all_content_items:
+        logger.error("No content items found in inventory")
+        return None
+    
+    G = build_dependency_graph(all_content_items)
+    generation_order, _ = select_generation_order(
+        all_content_items, G, status, content_ids, section,
+        model, temperature, max_items, retry_failed, incremental
+    )
+    
+    if not generation_order:
+        logger.info(f"No content items match the criteria (status={status}, content_ids={content_ids}, section={section})")
+        return None
+    
+    if max_concurrency is None:
+        max_concurrency = get_rate_limiter(model).max_concurrency
+    
+    profile = build_model_profile(get_generation_history(model=model, limit=history_limit))
+    plan = plan_batch(G, generation_order, profile, max_concurrency)
+    
+    print(format_plan(plan, model))
+    return plan
+
+def record_fingerprint(content_id: str, fingerprint: str) -> bool:
+    """Store a content item's fingerprint in its inventory metadata.
+    
+    Args:
+        content_id: Content ID
+        fingerprint: Fingerprint the content was generated from
+        
+    Returns:
+        True if the fingerprint was stored, False otherwise
+    """
+    metadata = with_fingerprint(get_content_by_id(content_id), fingerprint)
+    return update_content_item(content_id, {'metadata': json.dumps(metadata)})
+
 def reset_content_status(content_ids: Optional[List[str]] = None,
                         section: Optional[str] = None,
                         all_items: bool = False) -> int:
@@ -262,15 +464,11 @@ def reset_content_status(content_ids: Optional[List[str]] = None,
         logger.error("No filter specified. Use --content-ids, --section, or --all")
         return 0
     
-    # Reset status for each item
-    reset_count = 0
-    for item in filtered_items:
-        content_id = item['content_id']
-        update_content_status(content_id, "Not Started", {
-            "reset_time": datetime.now().isoformat()
-        })
-        logger.info(f"Reset status for content ID {content_id} to Not Started")
-        reset_count += 1
+    # Reset status for all matching items in bulk
+    reset_count = update_content_statuses([item['content_id'] for item in filtered_items], "Not Started", {
+        "reset_time": datetime.now().isoformat()
+    })
+    logger.info(f"Reset status for {reset_count} content items to Not Started")
     
     return reset_count
 
@@ -292,6 +490,9 @@ def main():
     generation_group.add_argument("--force", action="store_true", help="Force generation even if dependencies aren't met")
     generation_group.add_argument("--retry-failed", action="store_true", help="Retry previously failed items")
     generation_group.add_argument("--delay", type=int, default=0, help="Delay between generations in seconds")
+    generation_group.add_argument("--plan", action="store_true", help="Forecast tokens, API calls and duration without generating")
+    generation_group.add_argument("--incremental", action="store_true", help="Only regenerate items whose inputs or upstream dependencies changed")
+    generation_group.add_argument("--max-concurrency", type=int, help="Maximum number of items generated at once (default: adaptive limiter maximum)")
     
     # Reset options
     reset_group = parser.add_argument_group("Reset Options")
@@ -312,6 +513,21 @@ def main():
         logger.info(f"Reset {reset_count} content items")
         return
     
+    # Forecast the run instead of generating
+    if args.plan:
+        plan_content_batch(
+            status=args.status,
+            content_ids=content_ids,
+            section=args.section,
+            model=args.model,
+            temperature=args.temperature,
+            max_items=args.max_items,
+            retry_failed=args.retry_failed,
+            max_concurrency=args.max_concurrency,
+            incremental=args.incremental
+        )
+        return
+    
     # Generate content
     success_count, failure_count = generate_content_batch(
         status=args.status,
@@ -322,7 +538,9 @@ def main():
         max_items=args.max_items,
         force=args.force,
         retry_failed=args.retry_failed,
-        delay=args.delay
+        delay=args.delay,
+        max_concurrency=args.max_concurrency,
+        incremental=args.incremental
     )
     
     logger.info(f"Generation complete: {success_count} succeeded, {failure_count} failed")
@@ -9,7 +9,7 @@ import datetime
 from dotenv import load_dotenv
 
 # Import our custom modules
-from supabase_client import is_connected, update_content_status, get_content_inventory
+from supabase_client import is_connected, update_content_statuses, get_content_inventory
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,14 +38,13 @@ def reset_content_status(content_ids=None):
             content_items = get_content_inventory()
             content_ids = [item['content_id'] for item in content_items]
         
-        # Reset status for each content item
-        for content_id in content_ids:
-            update_content_status(content_id, "Not Started", {
-                "reset_time": datetime.datetime.now().isoformat()
-            })
-            logger.info(f"Reset status for content ID {content_id} to Not Started")
+        # Reset status for all content items in bulk
+        reset_count = update_content_statuses(content_ids, "Not Started", {
+            "reset_time": datetime.datetime.now().isoformat()
+        })
+        logger.info(f"Reset status for {reset_count} content items to Not Started")
         
-        return True
+        return reset_count == len(set(content_ids))
     except Exception as e:
         logger.error(f"Error resetting content status: {str(e)}")
         return False
@@ -19,6 +19,7 @@ setup(
         "python-dotenv",
         "google-generativeai",
         "pandas",
+        "numpy",
         "matplotlib",
         "seaborn",
     ],
@@ -92,6 +92,17 @@ CREATE TABLE IF NOT EXISTS reference_categories (
 -- Create index for reference categories
 CREATE INDEX IF NOT EXISTS idx_reference_categories_name ON reference_categories(name);
 
+-- Reference to Category Junction Table
+CREATE TABLE IF NOT EXISTS reference_to_category (
+    reference_id UUID NOT NULL REFERENCES reference_sources(id) ON DELETE CASCADE,
+    category_id UUID NOT NULL REFERENCES reference_categories(id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (reference_id, category_id)
+);
+
+-- Create index for looking up the references in a category
+CREATE INDEX IF NOT EXISTS idx_reference_to_category_category_id ON reference_to_category(category_id);
+
 -- Reference Types Table
 CREATE TABLE IF NOT EXISTS reference_types (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -137,9 +148,332 @@ ON CONFLICT (name) DO NOTHING;
 -- Create index for reference types
 CREATE INDEX IF NOT EXISTS idx_reference_types_name ON reference_types(name);
 
+-- Reference detail functions
+-- Each returns everything a detail page needs as one JSON payload, so the
+-- application fetches it with a single round trip instead of one query per table.
+
+-- A reference with its category IDs and latest quality assessment, or NULL
+CREATE OR REPLACE FUNCTION get_reference_details(p_reference_id UUID)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT to_jsonb(r) || jsonb_build_object(
+        'categories', COALESCE((
+            SELECT jsonb_agg(rc.category_id)
+            FROM reference_to_category rc
+            WHERE rc.reference_id = r.id
+        ), '[]'::jsonb),
+        'quality_assessment', (
+            SELECT to_jsonb(q)
+            FROM reference_quality q
+            WHERE q.reference_id = r.id
+            ORDER BY q.updated_at DESC
+            LIMIT 1
+        )
+    )
+    FROM reference_sources r
+    WHERE r.id = p_reference_id;
+$$;
+
+-- The references linked to a content item with their citation, quality score
+-- and category names, most relevant first
+CREATE OR REPLACE FUNCTION get_content_reference_details(p_content_id TEXT)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT COALESCE(jsonb_agg(
+        to_jsonb(r) || jsonb_build_object(
+            'citation_key', COALESCE(cr.citation_key, ''),
+            'citation_context', COALESCE(cr.citation_context, ''),
+            'relevance_score', cr.relevance_score,
+            'quality_score', COALESCE((
+                SELECT q.overall_score
+                FROM reference_quality q
+                WHERE q.reference_id = r.id
+                ORDER BY q.updated_at DESC
+                LIMIT 1
+            ), 0),
+            'categories', COALESCE((
+                SELECT jsonb_agg(c.name)
+                FROM reference_to_category rc
+                JOIN reference_categories c ON c.id = rc.category_id
+                WHERE rc.reference_id = r.id
+            ), '[]'::jsonb)
+        )
+        ORDER BY COALESCE(cr.relevance_score, 0) DESC, r.title
+    ), '[]'::jsonb)
+    FROM content_references cr
+    JOIN reference_sources r ON r.id = cr.reference_id
+    WHERE cr.content_id = p_content_id;
+$$;
+
+-- Reference Statistics Table
+-- Running totals behind the reference dashboard, kept current by the triggers
+-- below so reading them does not depend on the size of the library. Rows are
+-- keyed by group and key:
+--   ('summary', 'references')      count = active references
+--   ('summary', 'quality')         count = quality scores of active references, total = their sum
+--   ('summary', 'linked_content')  count = content items with at least one reference
+--   ('type', <reference type>)     count = active references of the type
+--   ('category', <category id>)    count = active references in the category
+CREATE TABLE IF NOT EXISTS reference_statistics (
+    stat_group TEXT NOT NULL,
+    stat_key TEXT NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    total NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (stat_group, stat_key)
+);
+
+-- Number of references linked to each content item, used to count linked content
+CREATE TABLE IF NOT EXISTS content_reference_counts (
+    content_id TEXT PRIMARY KEY,
+    link_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Add to a statistic, creating it if needed
+CREATE OR REPLACE FUNCTION adjust_reference_statistic(p_group TEXT, p_key TEXT, p_count BIGINT, p_total NUMERIC DEFAULT 0)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO reference_statistics (stat_group, stat_key, count, total)
+    VALUES (p_group, p_key, p_count, p_total)
+    ON CONFLICT (stat_group, stat_key) DO UPDATE
+    SET count = reference_statistics.count + EXCLUDED.count,
+        total = reference_statistics.total + EXCLUDED.total,
+        updated_at = NOW();
+$$;
+
+-- Add (p_sign = 1) or remove (p_sign = -1) an active reference with its quality scores and categories
+CREATE OR REPLACE FUNCTION apply_reference_to_statistics(p_reference_id UUID, p_reference_type TEXT, p_sign INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_count BIGINT;
+    v_total NUMERIC;
+    v_category_id UUID;
+BEGIN
+    PERFORM adjust_reference_statistic('summary', 'references', p_sign);
+    IF p_reference_type IS NOT NULL THEN
+        PERFORM adjust_reference_statistic('type', p_reference_type, p_sign);
+    END IF;
+
+    SELECT COUNT(overall_score), COALESCE(SUM(overall_score), 0) INTO v_count, v_total
+    FROM reference_quality WHERE reference_id = p_reference_id;
+    IF v_count > 0 THEN
+        PERFORM adjust_reference_statistic('summary', 'quality', p_sign * v_count, p_sign * v_total);
+    END IF;
+
+    FOR v_category_id IN SELECT category_id FROM reference_to_category WHERE reference_id = p_reference_id LOOP
+        PERFORM adjust_reference_statistic('category', v_category_id::TEXT, p_sign);
+    END LOOP;
+END;
+$$;
+
+-- Whether a reference exists and is active
+CREATE OR REPLACE FUNCTION reference_is_active(p_reference_id UUID)
+RETURNS BOOLEAN
+LANGUAGE sql STABLE
+AS $$
+    SELECT COALESCE((SELECT is_active FROM reference_sources WHERE id = p_reference_id), FALSE);
+$$;
+
+CREATE OR REPLACE FUNCTION reference_sources_statistics_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Deletes are handled before the row goes, while its quality and category rows still exist
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+        PERFORM apply_reference_to_statistics(OLD.id, OLD.reference_type, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+        PERFORM apply_reference_to_statistics(NEW.id, NEW.reference_type, 1);
+    END IF;
+    RETURN COALESCE(NEW, OLD);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION reference_quality_statistics_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.overall_score IS NOT NULL AND reference_is_active(OLD.reference_id) THEN
+        PERFORM adjust_reference_statistic('summary', 'quality', -1, -OLD.overall_score);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.overall_score IS NOT NULL AND reference_is_active(NEW.reference_id) THEN
+        PERFORM adjust_reference_statistic('summary', 'quality', 1, NEW.overall_score);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION reference_to_category_statistics_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND reference_is_active(OLD.reference_id) THEN
+        PERFORM adjust_reference_statistic('category', OLD.category_id::TEXT, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND reference_is_active(NEW.reference_id) THEN
+        PERFORM adjust_reference_statistic('category', NEW.category_id::TEXT, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION content_references_statistics_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_link_count BIGINT;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE content_reference_counts SET link_count = link_count - 1
+        WHERE content_id = OLD.content_id
+        RETURNING link_count INTO v_link_count;
+        IF v_link_count = 0 THEN
+            DELETE FROM content_reference_counts WHERE content_id = OLD.content_id;
+            PERFORM adjust_reference_statistic('summary', 'linked_content', -1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO content_reference_counts (content_id, link_count) VALUES (NEW.content_id, 1)
+        ON CONFLICT (content_id) DO UPDATE SET link_count = content_reference_counts.link_count + 1
+        RETURNING link_count INTO v_link_count;
+        IF v_link_count = 1 THEN
+            PERFORM adjust_reference_statistic('summary', 'linked_content', 1);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Upserts rewrite every column, so updates only count when the statistics change
+DROP TRIGGER IF EXISTS reference_sources_statistics_insert ON reference_sources;
+CREATE TRIGGER reference_sources_statistics_insert
+    AFTER INSERT ON reference_sources
+    FOR EACH ROW EXECUTE FUNCTION reference_sources_statistics_trigger();
+
+DROP TRIGGER IF EXISTS reference_sources_statistics_update ON reference_sources;
+CREATE TRIGGER reference_sources_statistics_update
+    AFTER UPDATE ON reference_sources
+    FOR EACH ROW
+    WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active OR OLD.reference_type IS DISTINCT FROM NEW.reference_type)
+    EXECUTE FUNCTION reference_sources_statistics_trigger();
+
+DROP TRIGGER IF EXISTS reference_sources_statistics_delete ON reference_sources;
+CREATE TRIGGER reference_sources_statistics_delete
+    BEFORE DELETE ON reference_sources
+    FOR EACH ROW EXECUTE FUNCTION reference_sources_statistics_trigger();
+
+DROP TRIGGER IF EXISTS reference_quality_statistics ON reference_quality;
+CREATE TRIGGER reference_quality_statistics
+    AFTER INSERT OR DELETE ON reference_quality
+    FOR EACH ROW EXECUTE FUNCTION reference_quality_statistics_trigger();
+
+DROP TRIGGER IF EXISTS reference_quality_statistics_update ON reference_quality;
+CREATE TRIGGER reference_quality_statistics_update
+    AFTER UPDATE ON reference_quality
+    FOR EACH ROW
+    WHEN (OLD.overall_score IS DISTINCT FROM NEW.overall_score OR OLD.reference_id IS DISTINCT FROM NEW.reference_id)
+    EXECUTE FUNCTION reference_quality_statistics_trigger();
+
+DROP TRIGGER IF EXISTS reference_to_category_statistics ON reference_to_category;
+CREATE TRIGGER reference_to_category_statistics
+    AFTER INSERT OR UPDATE OR DELETE ON reference_to_category
+    FOR EACH ROW EXECUTE FUNCTION reference_to_category_statistics_trigger();
+
+DROP TRIGGER IF EXISTS content_references_statistics ON content_references;
+CREATE TRIGGER content_references_statistics
+    AFTER INSERT OR DELETE ON content_references
+    FOR EACH ROW EXECUTE FUNCTION content_references_statistics_trigger();
+
+DROP TRIGGER IF EXISTS content_references_statistics_update ON content_references;
+CREATE TRIGGER content_references_statistics_update
+    AFTER UPDATE ON content_references
+    FOR EACH ROW
+    WHEN (OLD.content_id IS DISTINCT FROM NEW.content_id)
+    EXECUTE FUNCTION content_references_statistics_trigger();
+
+-- Recompute all statistics from the tables, correcting any drift
+CREATE OR REPLACE FUNCTION rebuild_reference_statistics()
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    LOCK TABLE reference_statistics, content_reference_counts IN EXCLUSIVE MODE;
+    DELETE FROM reference_statistics;
+    DELETE FROM content_reference_counts;
+
+    INSERT INTO reference_statistics (stat_group, stat_key, count)
+    SELECT 'summary', 'references', COUNT(*) FROM reference_sources WHERE is_active;
+
+    INSERT INTO reference_statistics (stat_group, stat_key, count)
+    SELECT 'type', reference_type, COUNT(*) FROM reference_sources
+    WHERE is_active AND reference_type IS NOT NULL
+    GROUP BY reference_type;
+
+    INSERT INTO reference_statistics (stat_group, stat_key, count, total)
+    SELECT 'summary', 'quality', COUNT(q.overall_score), COALESCE(SUM(q.overall_score), 0)
+    FROM reference_quality q JOIN reference_sources r ON r.id = q.reference_id
+    WHERE r.is_active;
+
+    INSERT INTO reference_statistics (stat_group, stat_key, count)
+    SELECT 'category', rc.category_id::TEXT, COUNT(*)
+    FROM reference_to_category rc JOIN reference_sources r ON r.id = rc.reference_id
+    WHERE r.is_active
+    GROUP BY rc.category_id;
+
+    INSERT INTO content_reference_counts (content_id, link_count)
+    SELECT content_id, COUNT(*) FROM content_references GROUP BY content_id;
+
+    INSERT INTO reference_statistics (stat_group, stat_key, count)
+    SELECT 'summary', 'linked_content', COUNT(*) FROM content_reference_counts;
+END;
+$$;
+
+-- Reference dashboard statistics as one JSON payload
+CREATE OR REPLACE FUNCTION get_reference_statistics()
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'total_references', COALESCE((SELECT count FROM reference_statistics
+                                      WHERE stat_group = 'summary' AND stat_key = 'references'), 0),
+        'unique_types', (SELECT COUNT(*) FROM reference_statistics WHERE stat_group = 'type' AND count > 0),
+        'avg_quality', COALESCE((SELECT total::FLOAT / NULLIF(count, 0) FROM reference_statistics
+                                 WHERE stat_group = 'summary' AND stat_key = 'quality'), 0),
+        'linked_content_count', COALESCE((SELECT count FROM reference_statistics
+                                          WHERE stat_group = 'summary' AND stat_key = 'linked_content'), 0),
+        'type_breakdown', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('reference_type', stat_key, 'count', count) ORDER BY count DESC)
+            FROM reference_statistics WHERE stat_group = 'type' AND count > 0
+        ), '[]'::jsonb),
+        'category_breakdown', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('name', c.name, 'count', s.count) ORDER BY s.count DESC)
+            FROM reference_statistics s JOIN reference_categories c ON c.id::TEXT = s.stat_key
+            WHERE s.stat_group = 'category' AND s.count > 0
+        ), '[]'::jsonb)
+    );
+$$;
+
+SELECT rebuild_reference_statistics();
+
 -- Comments
 COMMENT ON TABLE reference_sources IS 'Stores reference information for content sources';
 COMMENT ON TABLE reference_quality IS 'Stores quality assessments for references using CRAAP criteria';
 COMMENT ON TABLE content_references IS 'Junction table linking content items to references';
 COMMENT ON TABLE reference_categories IS 'Categories for organizing references';
 COMMENT ON TABLE reference_types IS 'Types of references with required fields';
+COMMENT ON TABLE reference_to_category IS 'Junction table linking references to categories';
+COMMENT ON FUNCTION get_reference_details(UUID) IS 'Reference with categories and quality assessment as JSON';
+COMMENT ON FUNCTION get_content_reference_details(TEXT) IS 'References linked to a content item as JSON';
+COMMENT ON TABLE reference_statistics IS 'Running totals for the reference dashboard, maintained by triggers';
+COMMENT ON TABLE content_reference_counts IS 'Number of references linked to each content item';
+COMMENT ON FUNCTION rebuild_reference_statistics() IS 'Recomputes reference_statistics from the tables';
+COMMENT ON FUNCTION get_reference_statistics() IS 'Reference dashboard statistics as JSON';
@@ -69,6 +69,10 @@ CREATE TABLE IF NOT EXISTS generation_outputs (
 CREATE INDEX IF NOT EXISTS generation_outputs_prompt_id_idx ON generation_outputs (prompt_id);
 CREATE INDEX IF NOT EXISTS generation_outputs_content_id_idx ON generation_outputs (content_id);
 
+-- Text lengths used by generation forecasts, so history queries need not download the text
+ALTER TABLE prompt_logs ADD COLUMN IF NOT EXISTS prompt_chars integer GENERATED ALWAYS AS (char_length(prompt_text)) STORED;
+ALTER TABLE generation_outputs ADD COLUMN IF NOT EXISTS output_chars integer GENERATED ALWAYS AS (char_length(output_text)) STORED;
+
 -- Create content_files table
 CREATE TABLE IF NOT EXISTS content_files (
   id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
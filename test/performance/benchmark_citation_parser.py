@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the citation parser.
+
+Times parse_citation against the regular-expression extractor it replaced,
+over the citation corpus in test/data/citations or, with --archive, over every
+reference item in the generated_content archive. A pathological citation (a
+long run of commas after an APA year) is also timed, since the legacy
+extractor's patterns backtrack on it.
+
+Usage:
+    python test/performance/benchmark_citation_parser.py [--archive] [--repeat N]
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+from typing import List, Callable
+
+# Add the repository root to the path so we can import our modules
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from reference_management.citation_parser import parse_citation
+from reference_management.improved_reference_extractor import extract_references_from_content
+
+CORPUS_FILE = os.path.join(ROOT_DIR, 'test', 'data', 'citations', 'citation_corpus.txt')
+ARCHIVE_DIR = os.path.join(ROOT_DIR, 'generated_content')
+
+PATHOLOGICAL_CITATION = "(2020). " + "word, " * 4000 + "x"
+
+def legacy_extract_reference_from_text(text):
+    """Extract reference information the way the extractor did before the citation parser."""
+    # Clean up the text
+    text = text.strip()
+
+    # If the text is very short, just use it as the title
+    if len(text) < 50:
+        return {
+            'authors': 'Unknown',
+            'publication_date': None,
+            'title': text,
+            'publication_name': 'Unknown',
+            'url': None,
+            'reference_type': 'Article'
+        }
+
+    # Try to determine if this is a structured reference or just a text snippet
+    is_structured = bool(re.search(r'\((\d{4})\)|doi:|https?://|Retrieved from', text, re.IGNORECASE))
+
+    if is_structured:
+        # Try to extract author - look for patterns like "Author, A. B." or "Author et al."
+        author_match = re.search(r'^([^\(\.]+?(et al\.)?)[,\.]', text)
+        authors = author_match.group(1).strip() if author_match else "Unknown"
+
+        # Try to extract year
+        year_match = re.search(r'\((\d{4}[a-z]?)\)', text)
+        year = year_match.group(1) if year_match else None
+        publication_date = f"{year}-01-01" if year and len(year) == 4 else None
+
+        # Try to extract title - different patterns for different citation styles
+        # APA style: Author. (Year). Title. Publication.
+        title_apa_match = re.search(r'\(\d{4}[a-z]?\)\.?\s+([^\.]+(\.[^\.]*)?)\.', text)
+        # Other style: Author. Title. Publication, Year.
+        title_other_match = re.search(r'^[^\.]+?(et al\.)?\.\s+([^\.]+(\.[^\.]*)?)\.', text)
+
+        if title_apa_match:
+            title = title_apa_match.group(1).strip()
+        elif title_other_match:
+            title = title_other_match.group(2).strip()
+        else:
+            # If no standard format, use a portion of text that's likely to be the title
+            title = text[:100].split('. ')[1] if '. ' in text[:100] else text[:100]
+
+        # Try to extract publication name
+        pub_match = None
+        if year_match:
+            # Try after the year and title
+            pub_match = re.search(r'\(\d{4}[a-z]?\)\.?\s+[^\.]+(\.[^\.]*)?\.\s+([^\.]+(\.[^\.]*)?)[\.,\s]', text)
+
+        if not pub_match:
+            # Try before a URL or DOI
+            pub_match = re.search(r'\. ([^\.]+(\.[^\.]*)?)[\.,] (?:https?://|doi:|Retrieved)', text, re.IGNORECASE)
+
+        publication = "Unknown"
+        if pub_match and pub_match.lastindex > 1:
+            try:
+                publication = pub_match.group(pub_match.lastindex - 1).strip()
+            except (IndexError, AttributeError):
+                pass
+
+        # Try to extract URL/DOI
+        url_match = re.search(r'(https?://[^\s\)]+|doi:[^\s\)]+)', text, re.IGNORECASE)
+        url = url_match.group(1) if url_match else None
+
+        # Try to determine reference type
+        ref_type = 'Article'  # Default
+        if 'journal' in text.lower() or 'proceedings' in text.lower():
+            ref_type = 'Journal Article'
+        elif 'book' in text.lower() or 'chapter' in text.lower():
+            ref_type = 'Book'
+        elif 'conference' in text.lower():
+            ref_type = 'Conference Paper'
+        elif 'thesis' in text.lower() or 'dissertation' in text.lower():
+            ref_type = 'Thesis'
+        elif 'report' in text.lower() or 'technical' in text.lower():
+            ref_type = 'Report'
+        elif url and ('wikipedia' in url.lower() or 'wiki' in url.lower()):
+            ref_type = 'Encyclopedia'
+        elif url:
+            ref_type = 'Website'
+    else:
+        # For unstructured text, use simpler extraction
+        # Use the first sentence or phrase as title
+        title_match = re.search(r'^([^\.]+(\.[^\.]*)?)[\s\.]', text)
+        title = title_match.group(1).strip() if title_match else text[:100]
+
+        # Check if there's any name-like pattern at the beginning
+        author_match = re.search(r'^([A-Z][a-z]+(\s[A-Z][a-z]+)+)', text)
+        authors = author_match.group(1) if author_match else "Unknown"
+
+        publication_date = None
+        publication = "Unknown"
+        url = None
+        ref_type = 'Article'
+
+    # Clean up the title - remove quotes if they wrap the entire title
+    title = re.sub(r'^["\'](.+)["\']$', r'\1', title)
+
+    # Ensure title isn't too long
+    if len(title) > 255:
+        title = title[:252] + '...'
+
+    return {
+        'authors': authors,
+        'publication_date': publication_date,
+        'title': title,
+        'publication_name': publication,
+        'url': url,
+        'reference_type': ref_type,
+        'content': text  # Store the original text for reference
+    }
+
+def load_corpus(path: str = CORPUS_FILE) -> List[str]:
+    """Load citations from a corpus file, skipping blank lines and comments.
+
+    Args:
+        path: Path to the corpus file
+
+    Returns:
+        List of citation strings
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def load_archive(directory: str = ARCHIVE_DIR) -> List[str]:
+    """Load every reference item from the markdown files in the content archive.
+
+    Args:
+        directory: Directory of generated markdown content
+
+    Returns:
+        List of reference item strings
+    """
+    citations = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.md'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            citations.extend(extract_references_from_content(f.read()))
+    return citations
+
+def time_parser(parser: Callable, citations: List[str], repeat: int) -> float:
+    """Get the best time in seconds for one pass of a parser over the citations."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for citation in citations:
+            parser(citation)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark the citation parser.")
+    parser.add_argument("--archive", action="store_true",
+                        help="Parse every reference item in generated_content instead of the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes to time; the best is reported")
+
+    args = parser.parse_args()
+
+    citations = load_archive() if args.archive else load_corpus()
+    if not citations:
+        print("No citations to parse")
+        sys.exit(1)
+
+    print(f"Parsing {len(citations)} citations ({'archive' if args.archive else 'corpus'}), "
+          f"best of {args.repeat} passes")
+    results = {}
+    for name, function in [('legacy extractor', legacy_extract_reference_from_text),
+                           ('parse_citation', parse_citation)]:
+        seconds = time_parser(function, citations, args.repeat)
+        results[name] = seconds
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms  {len(citations) / seconds:10.0f} citations/s")
+    print(f"  speed-up: {results['legacy extractor'] / results['parse_citation']:.2f}x")
+
+    print(f"Pathological citation ({len(PATHOLOGICAL_CITATION)} characters)")
+    for name, function in [('legacy extractor', legacy_extract_reference_from_text),
+                           ('parse_citation', parse_citation)]:
+        seconds = time_parser(function, [PATHOLOGICAL_CITATION], 1)
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
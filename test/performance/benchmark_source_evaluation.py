@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for batch CRAAP source evaluation.
+
+Times evaluate_sources, which scores a whole source list with NumPy, against
+calling evaluate_source on each source as evaluate_sources used to, over a
+synthetic reference library. The two sets of evaluations are also compared
+to confirm they are identical.
+
+Usage:
+    python test/performance/benchmark_source_evaluation.py [--count N] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, Callable
+
+# Add the quality directory to the path so we can import our modules
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'quality'))
+
+from source_evaluation import Source, evaluate_source, evaluate_sources
+
+PUBLICATIONS = [
+    "Journal of Artificial Intelligence Research", "Proceedings of the ACM Conference on Fairness",
+    "IEEE Transactions on Neural Networks", "Nature Machine Intelligence", "Harvard Business Review",
+    "MIT Technology Review", "Company Engineering Blog", "The Verge", "World Economic Forum", ""
+]
+
+AUTHORS = [
+    ["Smith, J.", "Doe, A."], ["Vaswani, A. (Google Brain)"], ["OpenAI"], ["Stanford HAI"],
+    ["Legacy Researcher"], ["Chen, L.", "Microsoft Research"], ["McKinsey & Company"], []
+]
+
+SOURCE_TYPES = ["academic", "industry", "news", "technology", "ai", ""]
+
+def make_library(count: int, seed: int = 41) -> List[Source]:
+    """Create a synthetic reference library.
+
+    Args:
+        count: Number of sources
+        seed: Random seed
+
+    Returns:
+        List of Source objects
+    """
+    rng = random.Random(seed)
+    sources = []
+    for i in range(count):
+        sources.append(Source(
+            citation=f"Reference {i}",
+            year=rng.choice([None] + list(range(1990, 2027))),
+            authors=list(rng.choice(AUTHORS)),
+            # Some distinct venues so the library is not all repeats
+            publication=rng.choice(PUBLICATIONS) + (f" Vol. {rng.randint(1, 50)}" if rng.random() < 0.3 else ""),
+            doi=f"10.1234/ref.{i}" if rng.random() < 0.4 else "",
+            source_type=rng.choice(SOURCE_TYPES)
+        ))
+    return sources
+
+def evaluate_one_by_one(sources: List[Source]):
+    """Evaluate sources one at a time, as evaluate_sources did before."""
+    return [evaluate_source(source) for source in sources]
+
+def time_evaluator(evaluator: Callable, sources: List[Source], repeat: int) -> float:
+    """Get the best time in seconds for one pass of an evaluator over the sources."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        evaluator(sources)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark batch CRAAP source evaluation.")
+    parser.add_argument("--count", type=int, default=100000, help="Number of sources in the library")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes to time; the best is reported")
+
+    args = parser.parse_args()
+
+    sources = make_library(args.count)
+
+    expected = [evaluation.to_dict() for evaluation in evaluate_one_by_one(sources)]
+    actual = [evaluation.to_dict() for evaluation in evaluate_sources(sources)]
+    if expected != actual:
+        print("Batch evaluations differ from single-source evaluations")
+        sys.exit(1)
+
+    print(f"Evaluating {len(sources)} sources, best of {args.repeat} passes (results identical)")
+    results = {}
+    for name, function in [('one by one', evaluate_one_by_one), ('evaluate_sources', evaluate_sources)]:
+        seconds = time_evaluator(function, sources, args.repeat)
+        results[name] = seconds
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms  {len(sources) / seconds:10.0f} sources/s")
+    print(f"  speed-up: {results['one by one'] / results['evaluate_sources']:.2f}x")
+
+if __name__ == "__main__":
+    main()
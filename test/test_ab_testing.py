@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test cases for the A/B testing framework.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+from collections import Counter
+from unittest.mock import patch
+
+# Add the repository, quality, core and workflows directories to the path so we
+# can import the module; core and workflows go last so the installed supabase
+# package is not shadowed by core/supabase
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'quality'))
+sys.path.append(os.path.join(ROOT_DIR, 'core'))
+sys.path.append(os.path.join(ROOT_DIR, 'workflows'))
+
+# Import the module to test
+import ab_testing
+from ab_testing import ABTest
+
+CONTENT_IDS = [f"LRN-BEG-{i:03d}" for i in range(1, 21)]
+
+# Base score of each model and the step its scores cycle through from item to item;
+# strong and close are too alike to separate on 20 items, weak is clearly worse
+MODEL_SCORES = {'strong': (4.5, 3), 'close': (4.4, 2), 'weak': (2.0, 1)}
+
+
+def fake_generate(content_id, model, temperature, output_dir, force):
+    """Write a variant naming its model and content item."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, f"{content_id}.md"), 'w') as f:
+        f.write(f"{model} {content_id}")
+    return True, f"{model} {content_id}"
+
+
+def fake_evaluate(content_path, content_id):
+    """Score a variant by its model, with some item-to-item spread."""
+    with open(content_path) as f:
+        model, _ = f.read().split()
+    base, step = MODEL_SCORES[model]
+    return {
+        'scores': {'average': base + CONTENT_IDS.index(content_id) * step % 5 * 0.1},
+        'quality_rating': 'Good',
+        'source_count': 3,
+        'word_count': 1200
+    }
+
+
+class TestSequentialRun(unittest.TestCase):
+    """Test cases for ABTest.run_test in sequential mode."""
+
+    def setUp(self):
+        """Mock the inventory, generation and evaluation."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+        self.patchers = {
+            'is_connected': patch.object(ab_testing, 'is_connected', return_value=True),
+            'get_content_item': patch.object(ab_testing, 'get_content_item',
+                                             side_effect=lambda content_id: {'content_id': content_id,
+                                                                             'status': 'Completed'}),
+            'generate_content_for_item': patch.object(ab_testing, 'generate_content_for_item',
+                                                      side_effect=fake_generate),
+            'evaluate_content': patch.object(ab_testing, 'evaluate_content', side_effect=fake_evaluate),
+            'update_content_status': patch.object(ab_testing, 'update_content_status'),
+        }
+        self.mocks = {name: patcher.start() for name, patcher in self.patchers.items()}
+        for patcher in self.patchers.values():
+            self.addCleanup(patcher.stop)
+
+    def test_stopped_arms_are_not_sampled_again(self):
+        """Test that an arm settled as worse stops being generated while the others go on."""
+        test = ABTest(CONTENT_IDS, list(MODEL_SCORES), output_dir=self.temp_dir)
+
+        results = test.run_test(force=True, max_concurrency=3, sequential=True)
+
+        comparison = test.comparison
+        self.assertEqual(list(comparison.stopped), [('weak', 0.7)])
+        self.assertEqual(comparison.active, [('strong', 0.7), ('close', 0.7)])
+
+        # The weak arm was generated only for the items it was sampled on before it stopped
+        calls = Counter(call.args[1] for call in self.mocks['generate_content_for_item'].call_args_list)
+        samples = comparison.stopped[('weak', 0.7)]['samples']
+        self.assertLess(samples, len(CONTENT_IDS))
+        self.assertEqual(calls, {'strong': len(CONTENT_IDS), 'close': len(CONTENT_IDS), 'weak': samples})
+        self.assertEqual(sorted(result['content_id'] for result in results if result['model'] == 'weak'),
+                         CONTENT_IDS[:samples])
+
+        # Results follow content order, and statuses are restored
+        self.assertEqual([result['content_id'] for result in results],
+                         sorted(result['content_id'] for result in results))
+        self.mocks['update_content_status'].assert_any_call(CONTENT_IDS[0], 'Completed')
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, 'variants')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
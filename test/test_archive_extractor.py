@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test cases for archive-wide reference extraction.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import sys
+import os
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management import archive_extractor
+from reference_management.archive_extractor import extract_archive_references, extract_source_records, hash_content
+
+ARTICLE = ("Smith, J. (2020). The impact of AI on society. *Journal of Technology*, *45*(2), 123-145. "
+           "https://doi.org/10.1234/jtech.2020.45.2.123")
+BOOK = "Russell, S. J., & Norvig, P. (2021). *Artificial intelligence: A modern approach* (4th ed.). Pearson."
+
+
+def make_content(*citations):
+    """Build a markdown document with a references section."""
+    return "# Title\n\nSome content.\n\n## References\n\n" + "\n".join(f"[{i}] {c}" for i, c in enumerate(citations))
+
+
+class TestExtractSourceRecords(unittest.TestCase):
+    """Test cases for extract_source_records."""
+
+    def test_records_are_parsed_and_deduplicated(self):
+        """Test that repeated citations in a source are kept once."""
+        text = make_content(ARTICLE, BOOK, BOOK)
+        records = extract_source_records(('file:A.md', 'A', hash_content(text), text))
+
+        self.assertEqual([record['citation_key'] for record in records], ['REF1', 'REF2'])
+        self.assertEqual(records[0]['content_id'], 'A')
+        self.assertEqual(records[0]['doi'], '10.1234/jtech.2020.45.2.123')
+        self.assertEqual(records[1]['reference_type'], 'Book')
+
+
+class TestExtractArchiveReferences(unittest.TestCase):
+    """Test cases for extract_archive_references."""
+
+    def setUp(self):
+        """Create an archive with two content files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive_dir = os.path.join(self.temp_dir, 'generated_content')
+        os.makedirs(self.archive_dir)
+        self.write_content('A', make_content(ARTICLE))
+        self.write_content('B', make_content(ARTICLE, BOOK))
+        self.output_file = os.path.join(self.temp_dir, 'references.jsonl')
+        self.manifest_file = os.path.join(self.temp_dir, 'manifest.json')
+
+    def tearDown(self):
+        """Remove the archive."""
+        shutil.rmtree(self.temp_dir)
+
+    def write_content(self, content_id, text):
+        """Write a content file to the archive."""
+        with open(os.path.join(self.archive_dir, f"{content_id}.md"), 'w') as f:
+            f.write(text)
+
+    def extract(self, **kwargs):
+        """Run an extraction of the files only."""
+        return extract_archive_references(archive_dir=self.archive_dir, include_outputs=False,
+                                          output_file=self.output_file, manifest_file=self.manifest_file,
+                                          max_workers=2, **kwargs)
+
+    def read_output(self):
+        """Read the records in the output file."""
+        with open(self.output_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_extracts_every_file(self):
+        """Test that the first run extracts every file."""
+        stats = self.extract()
+
+        self.assertEqual(stats['extracted'], 2)
+        self.assertEqual(stats['records'], 3)
+        self.assertEqual([(r['content_id'], r['citation_key']) for r in self.read_output()],
+                         [('A', 'REF1'), ('B', 'REF1'), ('B', 'REF2')])
+
+    def test_rerun_skips_unchanged_files(self):
+        """Test that a re-run only extracts new or changed files."""
+        self.extract()
+        self.write_content('B', make_content(BOOK))
+        self.write_content('C', make_content(ARTICLE))
+
+        stats = self.extract()
+
+        self.assertEqual(stats['unchanged'], 1)
+        self.assertEqual(stats['extracted'], 2)
+        self.assertEqual(sorted(r['content_id'] for r in self.read_output()), ['B', 'C'])
+
+        self.assertEqual(self.extract()['extracted'], 0)
+        self.assertEqual(self.extract(full=True)['extracted'], 3)
+
+    def test_failed_output_keeps_manifest(self):
+        """Test that the manifest is not updated when the output cannot be written."""
+        with patch.object(archive_extractor.RecordWriter, 'close', return_value=False):
+            stats = self.extract()
+
+        self.assertEqual(stats['failed'], 2)
+        self.assertFalse(os.path.exists(self.manifest_file))
+        self.assertEqual(self.extract()['extracted'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test cases for the batch planner.
+"""
+
+import unittest
+import sys
+import os
+import networkx as nx
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from core.batch_planner import build_model_profile, plan_batch, DEFAULT_PROFILE
+
+
+class TestBatchPlanner(unittest.TestCase):
+    """Test cases for the batch planner."""
+
+    def setUp(self):
+        """Set up a graph with a chain A -> B -> C and independent D and E."""
+        self.G = nx.DiGraph()
+        self.G.add_nodes_from(['A', 'B', 'C', 'D', 'E'])
+        self.G.add_edge('A', 'B')
+        self.G.add_edge('B', 'C')
+        self.order = ['A', 'D', 'E', 'B', 'C']
+        self.profile = {
+            'calls_per_item': 2.0,
+            'prompt_tokens_per_item': 500.0,
+            'output_tokens_per_item': 1500.0,
+            'latency_per_call': 10.0,
+            'sample_size': 3,
+        }
+
+    def test_profile_from_history(self):
+        """Test that history is averaged per generation session."""
+        history = [
+            {'session_id': 's1', 'prompt_chars': 400, 'output_chars': 8000, 'latency_seconds': 12.0},
+            {'session_id': 's1', 'prompt_chars': 400, 'output_chars': 800, 'latency_seconds': 4.0},
+            {'session_id': 's2', 'prompt_chars': 800, 'output_chars': 3200, 'latency_seconds': None},
+        ]
+
+        profile = build_model_profile(history)
+
+        self.assertEqual(profile['sample_size'], 2)
+        self.assertEqual(profile['calls_per_item'], 1.5)
+        self.assertEqual(profile['prompt_tokens_per_item'], 200.0)
+        self.assertEqual(profile['output_tokens_per_item'], 1500.0)
+        self.assertEqual(profile['latency_per_call'], 8.0)
+
+    def test_profile_without_history(self):
+        """Test that the default profile is used without history."""
+        self.assertEqual(build_model_profile([]), DEFAULT_PROFILE)
+
+    def test_plan_totals(self):
+        """Test token and API call forecasts."""
+        plan = plan_batch(self.G, self.order, self.profile, 1)
+
+        self.assertEqual(plan['items'], 5)
+        self.assertEqual(plan['api_calls'], 10)
+        self.assertEqual(plan['total_tokens'], 10000)
+        self.assertEqual(plan['serial_seconds'], 100.0)
+        self.assertEqual(plan['wall_clock_seconds'], 100.0)
+
+    def test_critical_path_bounds_wall_clock(self):
+        """Test that extra concurrency cannot beat the dependency chain."""
+        plan = plan_batch(self.G, self.order, self.profile, 10)
+
+        self.assertEqual(plan['critical_path'], ['A', 'B', 'C'])
+        self.assertEqual(plan['critical_path_seconds'], 60.0)
+        self.assertEqual(plan['wall_clock_seconds'], 60.0)
+
+    def test_wall_clock_at_limited_concurrency(self):
+        """Test the simulated schedule with two workers."""
+        plan = plan_batch(self.G, self.order, self.profile, 2)
+
+        # A and D run first, then E and B, then C
+        self.assertEqual(plan['wall_clock_seconds'], 60.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test cases for the content-reference citation index.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management import reference_management
+from reference_management.citation_index import CitationIndex
+
+LINKS = [
+    {'content_id': 'LRN-001', 'reference_id': 'ref-a'},
+    {'content_id': 'LRN-001', 'reference_id': 'ref-b'},
+    {'content_id': 'LRN-002', 'reference_id': 'ref-a'},
+    {'content_id': 'LRN-002', 'reference_id': 'ref-b'},
+    {'content_id': 'LRN-002', 'reference_id': 'ref-c'},
+    {'content_id': 'APP-001', 'reference_id': 'ref-a'},
+]
+
+
+class TestCitationIndex(unittest.TestCase):
+    """Test cases for CitationIndex."""
+
+    def setUp(self):
+        """Set up an index with a few links."""
+        self.index = CitationIndex()
+        self.index.add_many(LINKS)
+
+    def test_neighbours(self):
+        """Test lookups in both directions."""
+        self.assertEqual(self.index.get_citing_content('ref-a'), ['APP-001', 'LRN-001', 'LRN-002'])
+        self.assertEqual(self.index.get_content_references('LRN-002'), ['ref-a', 'ref-b', 'ref-c'])
+        self.assertEqual(self.index.get_citing_content('ref-unknown'), [])
+        self.assertEqual(len(self.index), 6)
+
+    def test_duplicate_links_are_ignored(self):
+        """Test that adding an existing link changes nothing."""
+        self.index.add('LRN-001', 'ref-a')
+        self.assertEqual(len(self.index), 6)
+
+    def test_co_cited_references(self):
+        """Test that co-cited references are ranked by shared content."""
+        self.assertEqual(self.index.get_co_cited_references('ref-a'), [('ref-b', 2), ('ref-c', 1)])
+        self.assertEqual(self.index.get_co_cited_references('ref-a', limit=1), [('ref-b', 2)])
+
+    def test_shared_references(self):
+        """Test references shared across a group of content items."""
+        self.assertEqual(self.index.get_shared_references(['LRN-001', 'LRN-002']), [('ref-a', 2), ('ref-b', 2)])
+        self.assertEqual(self.index.get_shared_references(['LRN-002', 'APP-001'], min_count=1),
+                         [('ref-a', 2), ('ref-b', 1), ('ref-c', 1)])
+
+    def test_impact(self):
+        """Test which content items lose references, and which lose all of them."""
+        impact = self.index.get_impact(['ref-a', 'ref-b'])
+
+        self.assertEqual(impact['affected_content'], {'APP-001': 0, 'LRN-001': 0, 'LRN-002': 1})
+        self.assertEqual(impact['orphaned_content'], ['APP-001', 'LRN-001'])
+
+    def test_remove(self):
+        """Test that removed links are no longer returned."""
+        self.index.remove('APP-001', 'ref-a')
+
+        self.assertEqual(self.index.get_citing_content('ref-a'), ['LRN-001', 'LRN-002'])
+        self.assertEqual(self.index.content_count, 2)
+        self.assertEqual(len(self.index), 5)
+
+
+class TestCitationIndexLoading(unittest.TestCase):
+    """Test cases for building the citation index and keeping it in sync."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase with no index loaded."""
+        for patcher in [patch.object(reference_management, 'is_connected', return_value=True),
+                        patch.object(reference_management, '_citation_index', None)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_build_pages_through_links(self):
+        """Test that the index is built with keyset pagination."""
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value
+        query.order.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[dict(link, id=f"link-{i}") for i, link in enumerate(LINKS[:4])])
+        query.gt.return_value.order.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[dict(link, id=f"link-{i + 4}") for i, link in enumerate(LINKS[4:])])
+
+        with patch.object(reference_management, 'supabase', mock_supabase):
+            index = reference_management.build_citation_index(page_size=4)
+
+        self.assertEqual(len(index), 6)
+        query.gt.assert_called_once_with('id', 'link-3')
+
+    def test_new_links_update_loaded_index(self):
+        """Test that linking a reference adds it to the loaded index."""
+        index = CitationIndex()
+        mock_supabase = MagicMock()
+        links_table = mock_supabase.table.return_value
+        links_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
+        links_table.insert.return_value.execute.return_value = MagicMock(data=[{'id': 'link-1'}])
+
+        with patch.object(reference_management, '_citation_index', index), \
+                patch.object(reference_management, 'supabase', mock_supabase):
+            reference_management.link_reference_to_content('LRN-003', 'ref-d')
+            self.assertEqual(reference_management.get_citing_content('ref-d'), ['LRN-003'])
+
+
+if __name__ == '__main__':
+    unittest.main()
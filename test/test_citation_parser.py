@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test cases for the citation parser.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management.citation_parser import parse_citation
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'citations', 'citation_corpus.txt')
+
+
+class TestParseCitation(unittest.TestCase):
+    """Test cases for parse_citation."""
+
+    def test_apa_journal_article(self):
+        """Test an APA journal article with a DOI URL."""
+        reference = parse_citation(
+            "Smith, J. (2020). The impact of AI on society. *Journal of Technology*, *45*(2), 123-145. "
+            "https://doi.org/10.1234/jtech.2020.45.2.123"
+        )
+
+        self.assertEqual(reference['authors'], 'Smith, J.')
+        self.assertEqual(reference['publication_date'], '2020-01-01')
+        self.assertEqual(reference['title'], 'The impact of AI on society')
+        self.assertEqual(reference['publication_name'], 'Journal of Technology')
+        self.assertEqual(reference['url'], 'https://doi.org/10.1234/jtech.2020.45.2.123')
+        self.assertEqual(reference['doi'], '10.1234/jtech.2020.45.2.123')
+        self.assertEqual(reference['reference_type'], 'Article')
+
+    def test_apa_book(self):
+        """Test an APA book with an emphasised title and an edition note."""
+        reference = parse_citation(
+            "[david2019strategic] David, F. R., & David, M. E. (2019). "
+            "<em>Strategic management: Concepts and cases</em> (17th ed.). Pearson."
+        )
+
+        self.assertEqual(reference['authors'], 'David, F. R., & David, M. E.')
+        self.assertEqual(reference['title'], 'Strategic management: Concepts and cases')
+        self.assertEqual(reference['publication_name'], 'Pearson')
+        self.assertEqual(reference['reference_type'], 'Book')
+
+    def test_apa_proceedings(self):
+        """Test an APA conference paper published in proceedings."""
+        reference = parse_citation(
+            "Brown, C., & Green, E. (2021). AI-Powered Workflow Automation in SMEs. In *Proceedings of the "
+            "International Conference on Business Process Management* (pp. 150-165). ACM."
+        )
+
+        self.assertEqual(reference['title'], 'AI-Powered Workflow Automation in SMEs')
+        self.assertEqual(reference['publication_name'],
+                         'Proceedings of the International Conference on Business Process Management')
+        self.assertEqual(reference['reference_type'], 'Conference')
+
+    def test_question_title(self):
+        """Test that a title ending in a question mark keeps it."""
+        reference = parse_citation(
+            "Krlev, G., Mildenberger, T., & Anheier, H. K. (2019). How to measure social impact? "
+            "*Voluntas*, *30*(2), 221-235."
+        )
+
+        self.assertEqual(reference['title'], 'How to measure social impact?')
+        self.assertEqual(reference['publication_name'], 'Voluntas')
+
+    def test_mla(self):
+        """Test an MLA citation with a quoted title."""
+        reference = parse_citation(
+            'Vaswani, Ashish, et al. "Attention Is All You Need." *Advances in Neural Information '
+            'Processing Systems*, vol. 30, 2017, pp. 5998-6008.'
+        )
+
+        self.assertEqual(reference['authors'], 'Vaswani, Ashish, et al.')
+        self.assertEqual(reference['title'], 'Attention Is All You Need')
+        self.assertEqual(reference['publication_name'], 'Advances in Neural Information Processing Systems')
+        self.assertEqual(reference['publication_date'], '2017-01-01')
+
+    def test_ieee(self):
+        """Test a numbered IEEE citation."""
+        reference = parse_citation(
+            '[1] K. He, X. Zhang, S. Ren, and J. Sun, "Deep residual learning for image recognition," '
+            'in Proc. IEEE Conf. Comput. Vis. Pattern Recognit., 2016, pp. 770-778.'
+        )
+
+        self.assertEqual(reference['authors'], 'K. He, X. Zhang, S. Ren, and J. Sun')
+        self.assertEqual(reference['title'], 'Deep residual learning for image recognition')
+        self.assertEqual(reference['publication_date'], '2016-01-01')
+        self.assertEqual(reference['reference_type'], 'Conference')
+
+    def test_website(self):
+        """Test a web page with an access note."""
+        reference = parse_citation(
+            "Wikipedia. (2022). Artificial intelligence. "
+            "Retrieved from https://en.wikipedia.org/wiki/Artificial_intelligence"
+        )
+
+        self.assertEqual(reference['authors'], 'Wikipedia')
+        self.assertEqual(reference['title'], 'Artificial intelligence')
+        self.assertEqual(reference['url'], 'https://en.wikipedia.org/wiki/Artificial_intelligence')
+        self.assertEqual(reference['reference_type'], 'Website')
+
+    def test_unstructured_and_short_text(self):
+        """Test that snippets and short text fall back to a title only."""
+        snippet = "This is just a text snippet without any structured citation format."
+        self.assertEqual(parse_citation(snippet)['title'], snippet.rstrip('.'))
+        self.assertEqual(parse_citation(snippet)['authors'], 'Unknown')
+        self.assertEqual(parse_citation("  Short note  ")['title'], 'Short note')
+
+    def test_pathological_input_is_linear(self):
+        """Test that a long run of separators is parsed without backtracking."""
+        reference = parse_citation("(2020). " + "word, " * 4000 + "x")
+        self.assertEqual(reference['publication_date'], '2020-01-01')
+
+    def test_corpus(self):
+        """Test that every corpus citation parses into a complete reference."""
+        with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+            citations = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+        self.assertGreater(len(citations), 100)
+        for citation in citations:
+            reference = parse_citation(citation)
+            self.assertEqual(set(reference), {'authors', 'publication_date', 'title', 'publication_name',
+                                              'url', 'doi', 'reference_type', 'content'})
+            self.assertTrue(reference['title'])
+            self.assertLessEqual(len(reference['title']), 255)
+            if len(citation) >= 50:
+                self.assertIsNotNone(reference['publication_date'], citation)
+
+
+if __name__ == '__main__':
+    unittest.main()
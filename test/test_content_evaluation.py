@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test cases for the content evaluation features.
+"""
+
+import unittest
+import tempfile
+import shutil
+import re
+import sys
+import os
+from unittest.mock import patch
+
+# Add the quality directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quality')))
+
+# Import the module to test
+import content_evaluation
+from content_evaluation import (
+    ContentEvaluation, ContentFeatures, EvaluationCache, MISSION_PILLARS, HEDGING_TERMS,
+    evaluate_content, get_cached_evaluation
+)
+
+TRICKY_TEXT = (
+    "## Ethics and Energy\n"
+    "This is a test. It is\n\ta model, is  a thing; Is A? ÉTHICS ethics_x model-based\n"
+    "Responsible AI, responsible  ai. For instance, such as\nsuch as. refers to refers\nto\n\n"
+    "- one\n* two\n![img](x) ```code``` [REF1] [Smith2020] [REF1]?\n"
+)
+
+ARTICLE = """# Responsible AI for Beginners
+
+Responsible AI is a practice that means building fair systems. It may help, and it could matter.
+
+## Sustainability
+
+Energy and carbon costs are a climate concern. For example, training a model uses energy [REF1].
+
+## Inclusion
+
+Inclusive and accessible design supports global diversity [REF2]. Is a simple introduction enough?
+
+## Sources
+
+[1] Smith, J. (2023). *Journal of AI Ethics*. https://doi.org/10.1234/ethics
+[2] Doe, A. (2021). *Accessible AI*. Tech Press.
+"""
+
+
+def regex_count(pattern, text):
+    """Count matches of a pattern the way the evaluation criteria used to."""
+    return len(re.findall(pattern, text))
+
+
+class TestContentFeatures(unittest.TestCase):
+    """Test cases for ContentFeatures."""
+
+    def setUp(self):
+        """Extract the features of the tricky text."""
+        self.features = ContentFeatures(TRICKY_TEXT)
+        self.lower = TRICKY_TEXT.lower()
+
+    def test_counts_match_whole_word_searches(self):
+        """Test that term and phrase counts match whole-word regex searches."""
+        terms = [keyword for keywords in MISSION_PILLARS.values() for keyword in keywords] + HEDGING_TERMS + \
+                ["model", "example", "for instance", "such as", "refers to", "means", "is", "a"]
+        for term in terms:
+            self.assertEqual(self.features.count(term), regex_count(r'\b' + term + r'\b', self.lower), term)
+
+    def test_spaced_pairs(self):
+        """Test that pairs separated by any whitespace are counted."""
+        self.assertEqual(self.features.count_spaced("is", "a"), regex_count(r'\bis\s+a\b', self.lower))
+        self.assertEqual(self.features.count_spaced("refers", "to"), 2)
+
+    def test_structure(self):
+        """Test the structural counts."""
+        self.assertEqual(self.features.word_count, regex_count(r'\b\w+\b', TRICKY_TEXT))
+        self.assertEqual(self.features.sentence_count, regex_count(r'[.!?]+', TRICKY_TEXT))
+        self.assertEqual(self.features.paragraph_count, regex_count(r'\n\s*\n', TRICKY_TEXT))
+        self.assertEqual(self.features.list_item_count, 2)
+        self.assertEqual(self.features.citations, {'[REF1]', '[Smith2020]'})
+
+
+class TestContentEvaluation(unittest.TestCase):
+    """Test cases for ContentEvaluation."""
+
+    def setUp(self):
+        """Write an article to evaluate."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_path = os.path.join(self.temp_dir, 'LRN-BEG-001.md')
+        with open(self.content_path, 'w') as f:
+            f.write(ARTICLE)
+
+    def tearDown(self):
+        """Remove the article."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_evaluate(self):
+        """Test the scores of a short article."""
+        evaluation = ContentEvaluation(self.content_path).evaluate()
+
+        self.assertEqual(evaluation['content_id'], 'LRN-BEG-001')
+        self.assertEqual(evaluation['word_count'], regex_count(r'\b\w+\b', ARTICLE))
+        self.assertEqual(evaluation['scores']['mission_alignment'], 5)
+        self.assertIn("All mission pillars mentioned", evaluation['notes']['mission_alignment'])
+        self.assertIn("Too short", evaluation['notes']['engagement'])
+        self.assertIn("beginner audience", evaluation['notes']['relevance'])
+
+    def test_html_is_only_built_on_request(self):
+        """Test that evaluation does not render the content to HTML."""
+        evaluation = ContentEvaluation(self.content_path)
+        evaluation.evaluate()
+
+        self.assertIsNone(evaluation._soup)
+        self.assertEqual(len(evaluation.soup.find_all('h2')), 3)
+
+    def test_source_quality_is_evaluated_once(self):
+        """Test that accuracy reuses the source quality evaluation."""
+        evaluation = ContentEvaluation(self.content_path)
+
+        with patch.object(ContentEvaluation, '_evaluate_source_quality', return_value=(4, "")) as evaluate:
+            evaluation.evaluate()
+            evaluation.evaluate()
+
+        evaluate.assert_called_once()
+
+
+class TestEvaluationCache(unittest.TestCase):
+    """Test cases for memoised content evaluations."""
+
+    def setUp(self):
+        """Write an article and use a cache in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.content_path = os.path.join(self.temp_dir, 'LRN-BEG-001.md')
+        self.write(ARTICLE)
+
+        patcher = patch.object(content_evaluation, '_evaluation_cache', EvaluationCache(self.cache_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        evaluate = ContentEvaluation.evaluate
+        patcher = patch.object(ContentEvaluation, 'evaluate', autospec=True, side_effect=evaluate)
+        self.evaluate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, text):
+        """Write the article."""
+        with open(self.content_path, 'w') as f:
+            f.write(text)
+
+    def test_unchanged_content_is_evaluated_once(self):
+        """Test that an unchanged file reuses its evaluation."""
+        first = evaluate_content(self.content_path)
+        first['scores']['average'] = 0
+        second = evaluate_content(self.content_path)
+
+        self.assertEqual(self.evaluate.call_count, 1)
+        self.assertNotEqual(second['scores']['average'], 0)
+        self.assertEqual(get_cached_evaluation(self.content_path)['scores'], second['scores'])
+
+    def test_changed_content_is_evaluated_again(self):
+        """Test that editing the file or the evaluator invalidates the evaluation."""
+        evaluate_content(self.content_path)
+        self.write(ARTICLE + "\nOne more sentence.\n")
+        self.assertIsNone(get_cached_evaluation(self.content_path))
+        evaluate_content(self.content_path)
+
+        with patch.object(content_evaluation, 'EVALUATOR_VERSION', content_evaluation.EVALUATOR_VERSION + 1):
+            evaluate_content(self.content_path)
+
+        self.assertEqual(self.evaluate.call_count, 3)
+
+    def test_evaluations_persist_across_processes(self):
+        """Test that a fresh cache reads evaluations from disk."""
+        evaluate_content(self.content_path)
+
+        with patch.object(content_evaluation, '_evaluation_cache', EvaluationCache(self.cache_dir)):
+            evaluation = evaluate_content(self.content_path, 'LRN-BEG-001')
+            self.assertIsNone(get_cached_evaluation(self.content_path, 'LRN-ADV-001'))
+
+        self.assertEqual(self.evaluate.call_count, 1)
+        self.assertEqual(evaluation['content_path'], self.content_path)
+
+    def test_cli_evaluates_once_and_indexes_the_result(self):
+        """Test that the command line evaluates a cold file once and indexes what it printed."""
+        import evaluation_index
+        index = evaluation_index.EvaluationIndex(os.path.join(self.temp_dir, 'index.sqlite'))
+
+        with patch.object(sys, 'argv', ['content_evaluation.py', self.content_path, '--json']), \
+                patch.object(evaluation_index, 'EvaluationIndex', return_value=index), \
+                patch('builtins.print') as printed:
+            content_evaluation.main()
+
+        self.assertEqual(self.evaluate.call_count, 1)
+        self.assertEqual(index.get('LRN-BEG-001'), get_cached_evaluation(self.content_path))
+        self.assertIn('"content_id": "LRN-BEG-001"', printed.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
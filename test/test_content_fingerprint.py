@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test cases for content fingerprints used by incremental batch generation.
+"""
+
+import unittest
+import json
+import sys
+import os
+import networkx as nx
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from core.content_fingerprint import compute_fingerprints, find_stale_items, with_fingerprint
+
+
+class TestContentFingerprint(unittest.TestCase):
+    """Test cases for content fingerprints."""
+
+    def setUp(self):
+        """Set up a small dependency chain A -> B -> C plus an independent D."""
+        self.items = {
+            content_id: {
+                'content_id': content_id,
+                'title': f"Title {content_id}",
+                'content_type': 'Article',
+                'status': 'Completed',
+                'smart_objectives': 'Learn things',
+            }
+            for content_id in ['A', 'B', 'C', 'D']
+        }
+
+    def build_graph(self):
+        """Build the dependency graph from the current items."""
+        G = nx.DiGraph()
+        for content_id, item in self.items.items():
+            G.add_node(content_id, data=item)
+        G.add_edge('A', 'B')
+        G.add_edge('B', 'C')
+        return G
+
+    def mark_generated(self, fingerprints):
+        """Store the given fingerprints as if every item had been generated."""
+        for content_id, fingerprint in fingerprints.items():
+            self.items[content_id]['metadata'] = json.dumps(with_fingerprint(self.items[content_id], fingerprint))
+
+    def test_fingerprints_are_deterministic(self):
+        """Test that unchanged inputs give the same fingerprints."""
+        first = compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1')
+        second = compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1')
+        self.assertEqual(first, second)
+
+    def test_nothing_stale_after_generation(self):
+        """Test that a fully generated inventory has no stale items."""
+        fingerprints = compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1')
+        self.mark_generated(fingerprints)
+
+        G = self.build_graph()
+        self.assertEqual(find_stale_items(G, compute_fingerprints(G, 'gemini-1.5-flash', 0.7, '1')), set())
+
+    def test_changed_field_marks_item_and_dependents_stale(self):
+        """Test that editing an item invalidates it and everything downstream."""
+        self.mark_generated(compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1'))
+        self.items['B']['smart_objectives'] = 'Learn other things'
+
+        G = self.build_graph()
+        stale = find_stale_items(G, compute_fingerprints(G, 'gemini-1.5-flash', 0.7, '1'))
+        self.assertEqual(stale, {'B', 'C'})
+
+    def test_status_fields_do_not_affect_fingerprint(self):
+        """Test that bookkeeping fields do not change the fingerprint."""
+        before = compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1')
+        self.items['A']['updated_at'] = '2025-01-01T00:00:00'
+        self.items['A']['notes'] = 'Reviewed'
+        after = compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1')
+        self.assertEqual(before, after)
+
+    def test_model_and_prompt_version_invalidate_everything(self):
+        """Test that generation settings are part of the fingerprint."""
+        self.mark_generated(compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1'))
+        G = self.build_graph()
+
+        self.assertEqual(find_stale_items(G, compute_fingerprints(G, 'gemini-1.5-pro', 0.7, '1')), {'A', 'B', 'C', 'D'})
+        self.assertEqual(find_stale_items(G, compute_fingerprints(G, 'gemini-1.5-flash', 0.7, '2')), {'A', 'B', 'C', 'D'})
+
+    def test_incomplete_items_are_stale(self):
+        """Test that items that never completed are always regenerated."""
+        self.mark_generated(compute_fingerprints(self.build_graph(), 'gemini-1.5-flash', 0.7, '1'))
+        self.items['D']['status'] = 'Failed'
+
+        G = self.build_graph()
+        self.assertEqual(find_stale_items(G, compute_fingerprints(G, 'gemini-1.5-flash', 0.7, '1')), {'D'})
+
+
+if __name__ == '__main__':
+    unittest.main()
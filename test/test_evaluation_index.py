@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test cases for the corpus evaluation index.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+from unittest.mock import patch
+
+# Add the quality directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quality')))
+
+# Import the module to test
+import evaluation_index
+import content_evaluation
+from content_evaluation import EvaluationCache
+from evaluation_index import EvaluationIndex, evaluate_corpus, load_current_evaluations
+
+ARTICLE = """# Responsible AI for Beginners
+
+Responsible AI is a practice that means building fair systems. Energy and carbon costs matter too.
+
+## Inclusion
+
+Inclusive and accessible design supports global diversity [REF1].
+
+## Sources
+
+[1] Smith, J. (2023). *Journal of AI Ethics*. https://doi.org/10.1234/ethics
+"""
+
+
+class TestEvaluateCorpus(unittest.TestCase):
+    """Test cases for evaluate_corpus."""
+
+    def setUp(self):
+        """Write a small corpus and use an index in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.content_dir = os.path.join(self.temp_dir, 'content')
+        os.makedirs(self.content_dir)
+        self.index_path = os.path.join(self.temp_dir, 'index', 'evaluations.sqlite')
+        for content_id in ['LRN-BEG-001', 'LRN-BEG-002', 'DEV-PRO-001']:
+            self.write(content_id, ARTICLE)
+        self.cache = EvaluationCache(os.path.join(self.temp_dir, 'cache'))
+        patcher = patch.object(content_evaluation, '_evaluation_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, content_id, text):
+        """Write a content file."""
+        with open(os.path.join(self.content_dir, f"{content_id}.md"), 'w') as f:
+            f.write(text)
+
+    def test_index_is_incremental(self):
+        """Test that only new or changed content is evaluated again."""
+        evaluate = evaluation_index.evaluate_file
+        patcher = patch.object(evaluation_index, 'evaluate_file', side_effect=evaluate)
+        self.evaluate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        stats = evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+        self.assertEqual((stats['evaluated'], stats['unchanged'], stats['failed']), (3, 0, 0))
+
+        self.write('LRN-BEG-002', ARTICLE + "\nOne more sentence.\n")
+        stats = evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+        self.assertEqual((stats['evaluated'], stats['unchanged']), (1, 2))
+        self.assertEqual(self.evaluate.call_count, 4)
+
+        with patch.object(content_evaluation, 'EVALUATOR_VERSION', content_evaluation.EVALUATOR_VERSION + 1):
+            stats = evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+        self.assertEqual(stats['evaluated'], 3)
+
+    def test_process_pool_matches_in_process_evaluation(self):
+        """Test that evaluations from worker processes are indexed like in-process ones."""
+        stats = evaluate_corpus(self.content_dir, self.index_path, max_workers=2)
+        evaluations = EvaluationIndex(self.index_path).load_evaluations()
+
+        self.assertEqual(stats['evaluated'], 3)
+        self.assertEqual(sorted(evaluations), ['DEV-PRO-001', 'LRN-BEG-001', 'LRN-BEG-002'])
+        expected = content_evaluation.ContentEvaluation(os.path.join(self.content_dir, 'DEV-PRO-001.md')).evaluate()
+        self.assertEqual(evaluations['DEV-PRO-001'], expected)
+
+    def test_crash_keeps_hash_failures(self):
+        """Test that tasks lost to a crash are added to files that could not be hashed."""
+        hash_content_file = evaluation_index.hash_content_file
+        evaluate_file = evaluation_index.evaluate_file
+
+        def hash_or_fail(content_path):
+            return None if content_path.endswith('DEV-PRO-001.md') else hash_content_file(content_path)
+
+        def evaluate_or_crash(task):
+            if task[1] == 'LRN-BEG-002':
+                raise RuntimeError("worker died")
+            return evaluate_file(task)
+
+        with patch.object(evaluation_index, 'hash_content_file', side_effect=hash_or_fail), \
+                patch.object(evaluation_index, 'evaluate_file', side_effect=evaluate_or_crash):
+            stats = evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+
+        self.assertEqual((stats['files'], stats['evaluated'], stats['failed']), (3, 0, 3))
+
+    def test_prune_removes_deleted_content(self):
+        """Test that pruning drops evaluations of content that no longer exists."""
+        evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+        os.remove(os.path.join(self.content_dir, 'LRN-BEG-001.md'))
+
+        stats = evaluate_corpus(self.content_dir, self.index_path, prune=True, max_workers=1)
+
+        self.assertEqual(stats['removed'], 1)
+        index = EvaluationIndex(self.index_path)
+        self.assertIsNone(index.get('LRN-BEG-001'))
+        self.assertEqual(index.get('LRN-BEG-002')['content_id'], 'LRN-BEG-002')
+
+    def test_corpus_evaluations_are_memoised(self):
+        """Test that evaluate_corpus fills the evaluation cache evaluate_content reads."""
+        evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+        path = os.path.join(self.content_dir, 'LRN-BEG-001.md')
+
+        with patch.object(content_evaluation.ContentEvaluation, 'evaluate') as evaluate:
+            evaluation = content_evaluation.evaluate_content(path)
+
+        evaluate.assert_not_called()
+        self.assertEqual(evaluation, EvaluationIndex(self.index_path).get('LRN-BEG-001'))
+
+    def test_stale_index_rows_are_not_used(self):
+        """Test that content changed since the last run is read from the cache, not the index."""
+        evaluate_corpus(self.content_dir, self.index_path, max_workers=1)
+        changed = ARTICLE.replace("## Inclusion", "## Inclusion and Diversity\n\nMore text.")
+        self.write('LRN-BEG-002', changed)
+        self.write('LRN-BEG-001', ARTICLE + "\nUnevaluated addition.\n")
+        paths = sorted(os.path.join(self.content_dir, name) for name in os.listdir(self.content_dir))
+        current = content_evaluation.evaluate_content(os.path.join(self.content_dir, 'LRN-BEG-002.md'))
+
+        evaluations = load_current_evaluations(paths, self.index_path)
+
+        self.assertEqual(sorted(evaluations), ['DEV-PRO-001', 'LRN-BEG-002'])
+        self.assertEqual(evaluations['LRN-BEG-002'], current)
+        self.assertNotEqual(EvaluationIndex(self.index_path).get('LRN-BEG-002'), current)
+
+
+class TestEvaluationIndex(unittest.TestCase):
+    """Test cases for EvaluationIndex."""
+
+    def test_missing_index_is_empty(self):
+        """Test that reading an index that was never written does not create it."""
+        path = os.path.join(tempfile.gettempdir(), 'missing', 'evaluations.sqlite')
+        index = EvaluationIndex(path)
+
+        self.assertEqual(index.load_evaluations(), {})
+        self.assertEqual(index.get_keys(), {})
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
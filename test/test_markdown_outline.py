@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test cases for the markdown outline parser.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the quality directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quality')))
+
+# Import the module to test
+from markdown_outline import parse_outline, plain_text
+
+DOCUMENT = """# Building **Responsible** AI
+
+Intro paragraph.
+
+Setext Title
+------------
+
+## Getting Started ##
+
+- first item
+- second item
+    - nested item
+1. numbered item
+
+```python
+# a comment, not a heading
+print("hello")
+```
+
+```markdown
+## Template Heading
+```
+
+    # indented code
+
+![Diagram](images/diagram.png "A diagram")
+
+### [Ethics](https://example.com) &amp; `Bias`
+"""
+
+
+class TestParseOutline(unittest.TestCase):
+    """Test cases for parse_outline."""
+
+    def setUp(self):
+        """Parse the document."""
+        self.outline = parse_outline(DOCUMENT)
+
+    def test_headings(self):
+        """Test ATX and setext headings, and headings inside code blocks."""
+        self.assertEqual([(h.level, h.text) for h in self.outline.headings], [
+            (1, "Building Responsible AI"),
+            (2, "Setext Title"),
+            (2, "Getting Started"),
+            (2, "Template Heading"),
+            (3, "Ethics & Bias"),
+        ])
+
+    def test_code_blocks(self):
+        """Test that fenced code blocks are found with their language."""
+        self.assertEqual([block.language for block in self.outline.code_blocks], ['python', 'markdown'])
+        python_block = self.outline.code_blocks[0]
+        self.assertEqual(self.outline.lines[python_block.start], '```python')
+        self.assertEqual(self.outline.lines[python_block.end - 1], '```')
+
+    def test_lists_and_images(self):
+        """Test list items, including nested ones, and images."""
+        self.assertEqual(len(self.outline.list_item_lines), 4)
+        self.assertEqual(self.outline.images, [('Diagram', 'images/diagram.png')])
+
+    def test_sections(self):
+        """Test that the document is split at each heading."""
+        sections = self.outline.sections
+
+        self.assertEqual(len(sections), 5)
+        self.assertEqual(sections[0].heading.text, "Building Responsible AI")
+        self.assertIn("Intro paragraph.", self.outline.section_text(sections[0]))
+        self.assertIn("- first item", self.outline.section_text(sections[2]))
+
+        # A setext section starts after its underline
+        self.assertEqual(self.outline.lines[sections[1].heading.line], "Setext Title")
+        self.assertEqual(sections[1].start, sections[1].heading.line + 2)
+        self.assertNotIn("-----", self.outline.section_text(sections[1]))
+
+    def test_unclosed_fence(self):
+        """Test that an unclosed fence runs to the end of the document."""
+        outline = parse_outline("# Title\n\n```bash\n# not a heading\n")
+
+        self.assertEqual([h.text for h in outline.headings], ["Title"])
+        self.assertEqual(outline.code_blocks[0].end, 5)
+
+    def test_plain_text(self):
+        """Test that inline markup is stripped."""
+        self.assertEqual(plain_text("*Fair* ![icon](i.png) [AI](x) \\#1"), "Fair  AI #1")
+
+
+if __name__ == '__main__':
+    unittest.main()
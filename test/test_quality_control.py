@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Test cases for quality control regeneration.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+import time
+from unittest.mock import patch, MagicMock
+
+# Add the repository, quality, core and workflows directories to the path so we
+# can import the module; core and workflows go last so the installed supabase
+# package is not shadowed by core/supabase
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'quality'))
+sys.path.append(os.path.join(ROOT_DIR, 'core'))
+sys.path.append(os.path.join(ROOT_DIR, 'workflows'))
+
+# Import the module to test
+import quality_control
+from quality_control import QualityControl
+
+CONTENT_ID = 'LRN-BEG-001'
+
+
+def fake_evaluation(content_path):
+    """Evaluate a file written as "<average> <word count>"."""
+    with open(content_path) as f:
+        average, word_count = f.read().split()
+    return {
+        'content_id': CONTENT_ID,
+        'content_path': content_path,
+        'scores': {'average': float(average)},
+        'word_count': int(word_count),
+        'source_count': 5,
+        'quality_rating': 'Good'
+    }
+
+
+class TestRegenerateBestOfN(unittest.TestCase):
+    """Test cases for QualityControl.regenerate_best_of_n."""
+
+    def setUp(self):
+        """Write current content and mock generation, evaluation and status updates."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.content_path = os.path.join(self.temp_dir, f"{CONTENT_ID}.md")
+        with open(self.content_path, 'w') as f:
+            f.write("3.0 1500")
+
+        self.qc = QualityControl()
+        self.current = self.qc.check_thresholds(fake_evaluation(self.content_path))[1]
+
+        # Candidate text by model
+        self.outputs = {}
+        self.generate = MagicMock(side_effect=self.fake_generate)
+        self.limiter = MagicMock(concurrency=1)
+        for patcher in [patch.object(quality_control, 'generate_content_for_item', self.generate),
+                        patch.object(quality_control, 'evaluate_content', side_effect=fake_evaluation),
+                        patch.object(quality_control, 'get_rate_limiter', return_value=self.limiter),
+                        patch.object(quality_control, 'update_content_status')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fake_generate(self, content_id, model, temperature, output_dir, force):
+        """Write the model's candidate text to the output directory."""
+        if isinstance(self.outputs[model], Exception):
+            raise self.outputs[model]
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, f"{content_id}.md"), 'w') as f:
+            f.write(self.outputs[model])
+        return True, self.outputs[model]
+
+    def regenerate(self, models, candidates=3):
+        """Run best-of-N regeneration of the content."""
+        return self.qc.regenerate_best_of_n(CONTENT_ID, self.content_path, self.current, models,
+                                            candidates=candidates)
+
+    def read_content(self):
+        """Read the current content file."""
+        with open(self.content_path) as f:
+            return f.read()
+
+    def assert_no_candidate_dirs(self):
+        """Assert that every candidate directory was removed."""
+        self.assertEqual(os.listdir(self.temp_dir), [f"{CONTENT_ID}.md"])
+
+    def test_passing_candidate_stops_the_rest(self):
+        """Test that candidates queued behind a passing one are never generated."""
+        self.outputs = {'first': "4.0 1500", 'second': "4.5 1500", 'third': "4.8 1500"}
+
+        success, evaluation = self.regenerate(['first', 'second', 'third'])
+
+        self.assertTrue(success)
+        self.assertEqual(self.generate.call_count, 1)
+        self.assertEqual(self.read_content(), "4.0 1500")
+        self.assertEqual(evaluation['content_path'], self.content_path)
+        self.assert_no_candidate_dirs()
+
+    def test_passing_candidate_ranks_above_higher_failing_one(self):
+        """Test that a passing candidate wins over a failing one with a higher average."""
+        self.outputs = {'short': "4.9 500", 'good': "3.8 1500", 'unused': "4.8 1500"}
+
+        success, evaluation = self.regenerate(['short', 'good', 'unused'])
+
+        self.assertTrue(success)
+        self.assertEqual([call.args[1] for call in self.generate.call_args_list], ['short', 'good'])
+        self.assertEqual(self.read_content(), "3.8 1500")
+        self.assertEqual(evaluation['scores']['average'], 3.8)
+
+    def test_content_is_only_replaced_by_a_better_candidate(self):
+        """Test that candidates scoring below the current content are discarded."""
+        self.outputs = {'worse': "2.0 1500", 'broken': RuntimeError("model unavailable")}
+
+        success, evaluation = self.regenerate(['worse', 'broken'], candidates=2)
+
+        self.assertFalse(success)
+        self.assertIs(evaluation, self.current)
+        self.assertEqual(self.read_content(), "3.0 1500")
+        self.assert_no_candidate_dirs()
+
+    def test_pool_is_limited_by_the_rate_limiter(self):
+        """Test that no more candidates run at once than the limiter allows."""
+        self.outputs = {'first': "3.2 1500", 'second': "3.3 1500"}
+        self.limiter.concurrency = 2
+
+        with patch.object(quality_control, 'ThreadPoolExecutor',
+                          wraps=quality_control.ThreadPoolExecutor) as executor:
+            self.regenerate(['first', 'second'], candidates=5)
+
+        self.assertEqual(executor.call_args.kwargs['max_workers'], 2)
+        self.assertEqual(self.generate.call_count, 5)
+        self.assertEqual(self.read_content(), "3.3 1500")
+        self.assert_no_candidate_dirs()
+
+
+class TestBatchQualityCheck(unittest.TestCase):
+    """Test cases for QualityControl.batch_quality_check and its report."""
+
+    INVENTORY = [
+        {'content_id': 'LRN-BEG-001', 'title': 'First'},
+        {'content_id': 'LRN-BEG-002', 'title': 'Second'},
+        {'content_id': 'LRN-BEG-003', 'title': 'Third'},
+    ]
+
+    def setUp(self):
+        """Mock the inventory, the limiter and per-item checks."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.report_path = os.path.join(self.temp_dir, 'quality_report.html')
+        self.qc = QualityControl()
+
+        for patcher in [patch.object(quality_control, 'is_connected', return_value=True),
+                        patch.object(quality_control, 'get_content_inventory', return_value=self.INVENTORY),
+                        patch.object(quality_control, 'get_rate_limiter',
+                                     return_value=MagicMock(max_concurrency=3, format_stats=MagicMock(return_value=''))),
+                        patch.object(self.qc, 'check_and_regenerate', side_effect=self.fake_check)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Keep a copy of the report each time it is written
+        self.reports = []
+        write = self.qc.write_quality_report
+
+        def write_and_keep(results, report_path, total=None):
+            written = write(results, report_path, total)
+            with open(report_path) as f:
+                self.reports.append(f.read())
+            return written
+
+        patcher = patch.object(self.qc, 'write_quality_report', side_effect=write_and_keep)
+        self.write_report = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_check(self, content_id, **kwargs):
+        """Finish the first item last, fail on the second and pass the third."""
+        if content_id == 'LRN-BEG-001':
+            time.sleep(0.2)
+        if content_id == 'LRN-BEG-002':
+            raise RuntimeError("evaluation crashed")
+        return True, {'scores': {'average': 4.0}, 'quality_rating': 'Good', 'word_count': 1200, 'source_count': 4}
+
+    def test_results_keep_inventory_order_and_record_errors(self):
+        """Test that an item raising is recorded as a failure and results follow the inventory."""
+        results = self.qc.batch_quality_check(delay=0)
+
+        self.assertEqual(list(results), ['LRN-BEG-001', 'LRN-BEG-002', 'LRN-BEG-003'])
+        self.assertTrue(results['LRN-BEG-001']['success'])
+        self.assertFalse(results['LRN-BEG-002']['success'])
+        self.assertEqual(results['LRN-BEG-002']['evaluation']['failures'],
+                         ["Quality check error: evaluation crashed"])
+        self.assertEqual(results['LRN-BEG-002']['title'], 'Second')
+
+    def test_report_is_rewritten_as_items_finish(self):
+        """Test that in-progress reports reload and count progress, and the final one does not."""
+        self.qc.batch_quality_check(delay=0, report_path=self.report_path)
+
+        self.assertEqual(self.write_report.call_count, 4)
+        self.assertEqual([call.kwargs.get('total') for call in self.write_report.call_args_list],
+                         [3, 3, 3, None])
+
+        in_progress, final = self.reports[0], self.reports[-1]
+        self.assertIn('<meta http-equiv="refresh" content="30">', in_progress)
+        self.assertIn("1 of 3 items checked", in_progress)
+        self.assertIn('<meta http-equiv="refresh" content="30">', self.reports[1])
+        self.assertIn("2 of 3 items checked", self.reports[1])
+        self.assertNotIn('http-equiv="refresh"', self.reports[2])
+        self.assertNotIn('http-equiv="refresh"', final)
+        self.assertNotIn("In progress", final)
+        self.assertIn("Quality check error: evaluation crashed", final)
+        self.assertLess(final.index('LRN-BEG-001'), final.index('LRN-BEG-002'))
+        self.assertFalse(os.path.exists(f"{self.report_path}.tmp"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test cases for the adaptive concurrency limiter.
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from core.rate_limiter import AdaptiveConcurrencyLimiter, is_rate_limit_error, get_rate_limiter
+
+
+class ResourceExhausted(Exception):
+    """Stand-in for google.api_core.exceptions.ResourceExhausted."""
+
+
+class TestRateLimitErrors(unittest.TestCase):
+    """Test cases for throttling error detection."""
+
+    def test_quota_messages(self):
+        """Test that 429 and quota messages are recognised."""
+        self.assertTrue(is_rate_limit_error(Exception("429 Quota exceeded for model")))
+        self.assertTrue(is_rate_limit_error(Exception("Rate limit reached")))
+        self.assertTrue(is_rate_limit_error(ResourceExhausted("try again later")))
+
+    def test_other_errors(self):
+        """Test that unrelated errors are not treated as throttling."""
+        self.assertFalse(is_rate_limit_error(ValueError("Failed to parse response as JSON")))
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    """Test cases for the AIMD controller."""
+
+    def run_saturated(self, limiter, error=None, latency=0.1):
+        """Run one full round of requests with every slot in use."""
+        epochs = [limiter.acquire() for _ in range(limiter.concurrency)]
+        for epoch in epochs:
+            limiter.release(epoch, latency, error)
+
+    def test_additive_increase(self):
+        """Test that the limit grows by one slot per healthy round."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=2, max_concurrency=10)
+
+        self.run_saturated(limiter)
+        self.assertEqual(limiter.concurrency, 3)
+
+        self.run_saturated(limiter)
+        self.assertEqual(limiter.concurrency, 4)
+
+    def test_no_increase_when_not_saturated(self):
+        """Test that the limit only grows when the slots are actually used."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=4, max_concurrency=10)
+
+        for _ in range(20):
+            limiter.release(limiter.acquire(), 0.1)
+
+        self.assertEqual(limiter.concurrency, 4)
+
+    def test_multiplicative_decrease_once_per_burst(self):
+        """Test that a burst of throttled requests halves the limit once."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=8, max_concurrency=10)
+
+        self.run_saturated(limiter, Exception("429 Resource has been exhausted (e.g. check quota)."))
+
+        self.assertEqual(limiter.concurrency, 4)
+        stats = limiter.get_stats()
+        self.assertEqual(stats['throttled'], 8)
+        self.assertEqual(stats['decreases'], 1)
+
+    def test_bounds(self):
+        """Test that the limit stays within the configured bounds."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=1, min_concurrency=1, max_concurrency=2)
+
+        for _ in range(5):
+            self.run_saturated(limiter)
+        self.assertEqual(limiter.concurrency, 2)
+
+        for _ in range(5):
+            self.run_saturated(limiter, Exception("quota exceeded"))
+        self.assertEqual(limiter.concurrency, 1)
+
+    def test_unhealthy_error_rate_blocks_increase(self):
+        """Test that a high error rate holds the limit steady."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=2, max_concurrency=10, error_rate_threshold=0.1)
+
+        self.run_saturated(limiter, ValueError("bad response"))
+        self.run_saturated(limiter)
+
+        self.assertEqual(limiter.concurrency, 2)
+        self.assertEqual(limiter.get_stats()['errors'], 2)
+
+    def test_rising_latency_blocks_increase(self):
+        """Test that latency well above its observed baseline holds the limit steady by default."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=2, max_concurrency=10)
+
+        for _ in range(5):
+            limiter.release(limiter.acquire(), 1.0)
+        self.run_saturated(limiter, latency=1.0)
+        self.assertEqual(limiter.concurrency, 3)
+
+        for _ in range(3):
+            self.run_saturated(limiter, latency=10.0)
+        self.assertEqual(limiter.concurrency, 3)
+
+    def test_slot_limits_in_flight_requests(self):
+        """Test that concurrent callers never exceed the limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=2, max_concurrency=2)
+        lock = threading.Lock()
+        peak = [0]
+
+        def work():
+            with limiter.slot():
+                with lock:
+                    peak[0] = max(peak[0], limiter.in_flight)
+
+        threads = [threading.Thread(target=work) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(peak[0], 2)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.get_stats()['successes'], 10)
+
+    def test_slot_records_errors_and_reraises(self):
+        """Test that errors inside a slot are recorded and propagated."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=4, max_concurrency=4)
+
+        with self.assertRaises(ResourceExhausted):
+            with limiter.slot():
+                raise ResourceExhausted("quota")
+
+        self.assertEqual(limiter.concurrency, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_interrupt_is_not_recorded_as_error(self):
+        """Test that an interrupt frees the slot without counting as an error or throttling."""
+        limiter = AdaptiveConcurrencyLimiter(initial_concurrency=4, max_concurrency=4)
+
+        with self.assertRaises(KeyboardInterrupt):
+            with limiter.slot():
+                raise KeyboardInterrupt()
+
+        stats = limiter.get_stats()
+        self.assertEqual((limiter.in_flight, limiter.concurrency), (0, 4))
+        self.assertEqual((stats['errors'], stats['throttled'], stats['successes']), (0, 0, 0))
+
+    def test_shared_limiter_per_model(self):
+        """Test that the same limiter is returned for the same model."""
+        self.assertIs(get_rate_limiter("test-model"), get_rate_limiter("test-model"))
+        self.assertIsNot(get_rate_limiter("test-model"), get_rate_limiter("other-test-model"))
+
+
+if __name__ == '__main__':
+    unittest.main()
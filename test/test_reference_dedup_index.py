@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test cases for the reference de-duplication index.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management.reference_dedup_index import (
+    ReferenceDedupIndex, normalize_doi, normalize_url, normalize_title
+)
+
+
+class TestNormalization(unittest.TestCase):
+    """Test cases for key normalisation."""
+
+    def test_normalize_doi(self):
+        """Test that DOI forms normalise to the bare lowercase DOI."""
+        self.assertEqual(normalize_doi('10.1000/ABC.123'), '10.1000/abc.123')
+        self.assertEqual(normalize_doi('doi:10.1000/abc.123.'), '10.1000/abc.123')
+        self.assertEqual(normalize_doi('https://doi.org/10.1000/abc.123'), '10.1000/abc.123')
+        self.assertIsNone(normalize_doi('https://example.com/paper'))
+        self.assertIsNone(normalize_doi(None))
+
+    def test_normalize_url(self):
+        """Test that URL variants normalise to the same key."""
+        expected = 'example.com/papers/42'
+        self.assertEqual(normalize_url('https://www.example.com/papers/42/'), expected)
+        self.assertEqual(normalize_url('http://EXAMPLE.com/papers/42#section'), expected)
+        self.assertEqual(normalize_url('https://example.com/papers/42).'), expected)
+        self.assertIsNone(normalize_url('https://www.example.com/'))
+        self.assertIsNone(normalize_url('example.com/papers/42'))
+
+    def test_normalize_title(self):
+        """Test that case, punctuation and spacing are ignored in titles."""
+        self.assertEqual(normalize_title('  Deep   Learning: A Review! '), 'deep learning a review')
+        self.assertIsNone(normalize_title('Unknown'))
+        self.assertIsNone(normalize_title(''))
+
+
+class TestReferenceDedupIndex(unittest.TestCase):
+    """Test cases for ReferenceDedupIndex."""
+
+    def setUp(self):
+        """Set up an index with a few references."""
+        self.index = ReferenceDedupIndex()
+        self.index.add_many([
+            {'id': 'ref-1', 'title': 'Deep Learning', 'doi': '10.1038/nature14539', 'url': None},
+            {'id': 'ref-2', 'title': 'AI Ethics Guidelines', 'url': 'https://www.example.org/ethics/guidelines'},
+            {'id': 'ref-3', 'title': 'Attention Is All You Need', 'url': 'https://arxiv.org/abs/1706.03762'},
+        ])
+
+    def test_find_by_doi(self):
+        """Test that a DOI match wins even with a different title."""
+        self.assertEqual(self.index.find({'title': 'Deep learning (review)', 'url': 'doi:10.1038/NATURE14539'}), 'ref-1')
+
+    def test_find_by_url(self):
+        """Test that references are matched on normalised URLs."""
+        self.assertEqual(self.index.find({'title': 'Guidelines', 'url': 'http://example.org/ethics/guidelines/'}), 'ref-2')
+
+    def test_find_by_title(self):
+        """Test that references are matched on normalised titles."""
+        self.assertEqual(self.index.find({'title': 'attention is all you need.'}), 'ref-3')
+
+    def test_no_match(self):
+        """Test that unrelated and placeholder references do not match."""
+        self.assertIsNone(self.index.find({'title': 'Reinforcement Learning', 'url': 'https://example.org/'}))
+        self.assertIsNone(self.index.find({'title': 'Unknown'}))
+
+    def test_update_replaces_keys(self):
+        """Test that updating a reference drops its old keys."""
+        self.index.add({'id': 'ref-3', 'title': 'Transformers', 'url': 'https://arxiv.org/abs/1706.03762'})
+
+        self.assertIsNone(self.index.find({'title': 'Attention Is All You Need'}))
+        self.assertEqual(self.index.find({'title': 'Transformers'}), 'ref-3')
+        self.assertEqual(len(self.index), 3)
+
+    def test_add_variant_keeps_existing_keys(self):
+        """Test that recording a variant of a reference keeps its original keys."""
+        self.index.add({'id': 'ref-3', 'title': 'Attention is all you need (2017)'}, replace=False)
+
+        self.assertEqual(self.index.find({'title': 'Attention Is All You Need'}), 'ref-3')
+        self.assertEqual(self.index.find({'title': 'Attention is all you need (2017)'}), 'ref-3')
+
+    def test_first_reference_keeps_shared_key(self):
+        """Test that a later duplicate does not take over an existing key."""
+        self.index.add({'id': 'ref-4', 'title': 'Deep Learning'})
+        self.assertEqual(self.index.find({'title': 'Deep Learning'}), 'ref-1')
+
+        self.index.remove('ref-4')
+        self.assertEqual(self.index.find({'title': 'Deep Learning'}), 'ref-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Test cases for the reference management module.
+"""
+
+import unittest
+import json
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management import reference_management
+from reference_management.reference_management import (
+    Reference, ReferenceQuality, iter_reference_pages, bulk_update_references,
+    create_references, link_references, get_reference, get_content_references,
+    get_reference_statistics, get_reference_categories, get_reference_types,
+    invalidate_reference_lookups
+)
+from reference_management.reference_minhash import ReferenceLSHIndex
+
+
+class TestReferencePaging(unittest.TestCase):
+    """Test cases for iter_reference_pages."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase."""
+        patcher = patch.object(reference_management, 'is_connected', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_supabase(self, ids):
+        """Create a mock Supabase client serving the given reference IDs."""
+        mock_supabase = MagicMock()
+        self.queries = []
+
+        def select(columns):
+            state = {'after': None}
+            query = MagicMock()
+            self.queries.append(state)
+
+            def gt(column, value):
+                state['after'] = value
+                return query
+
+            def execute():
+                rows = [{'id': ref_id} for ref_id in sorted(ids) if state['after'] is None or ref_id > state['after']]
+                return MagicMock(data=rows[:state['limit']])
+
+            def limit(count):
+                state['limit'] = count
+                return query
+
+            query.gt.side_effect = gt
+            query.eq.return_value = query
+            query.order.return_value = query
+            query.limit.side_effect = limit
+            query.execute.side_effect = execute
+            return query
+
+        mock_supabase.table.return_value.select.side_effect = select
+        return mock_supabase
+
+    def test_pages_by_id(self):
+        """Test that pages follow on from the last ID of the previous page."""
+        ids = [f"ref-{i:02d}" for i in range(7)]
+
+        with patch.object(reference_management, 'supabase', self.make_supabase(ids)):
+            pages = list(iter_reference_pages(page_size=3))
+
+        self.assertEqual([[ref['id'] for ref in page] for page in pages],
+                         [ids[0:3], ids[3:6], ids[6:7]])
+        self.assertEqual([query['after'] for query in self.queries], [None, 'ref-02', 'ref-05'])
+
+    def test_resume_after_id(self):
+        """Test that paging can start after a checkpointed ID."""
+        ids = [f"ref-{i:02d}" for i in range(6)]
+
+        with patch.object(reference_management, 'supabase', self.make_supabase(ids)):
+            pages = list(iter_reference_pages(page_size=3, after_id='ref-02'))
+
+        self.assertEqual([[ref['id'] for ref in page] for page in pages], [ids[3:6]])
+        # A full last page needs one more (empty) request to detect the end
+        self.assertEqual(len(self.queries), 2)
+
+
+class TestBulkUpdateReferences(unittest.TestCase):
+    """Test cases for bulk_update_references."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase."""
+        patcher = patch.object(reference_management, 'is_connected', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_upserts_in_chunks(self):
+        """Test that references are written in chunks of upserted rows."""
+        mock_supabase = MagicMock()
+        table = mock_supabase.table.return_value
+        table.upsert.side_effect = lambda rows: MagicMock(execute=MagicMock(return_value=MagicMock(data=rows)))
+        references = [Reference(reference_id=f"ref-{i}", title=f"Title {i}", metadata={'ai_processed': True})
+                      for i in range(5)]
+
+        with patch.object(reference_management, 'supabase', mock_supabase):
+            updated = bulk_update_references(references, chunk_size=2)
+
+        self.assertEqual(updated, 5)
+        chunks = [call[0][0] for call in table.upsert.call_args_list]
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(json.loads(chunks[0][0]['metadata']), {'ai_processed': True})
+        table.delete.assert_not_called()
+
+    def test_failed_chunk_is_not_counted(self):
+        """Test that a failing chunk does not stop the remaining chunks."""
+        mock_supabase = MagicMock()
+        table = mock_supabase.table.return_value
+        responses = [Exception("timeout"), MagicMock(data=[{'id': 'ref-2'}])]
+
+        def upsert(rows):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return MagicMock(execute=MagicMock(return_value=response))
+
+        table.upsert.side_effect = upsert
+        references = [Reference(reference_id=f"ref-{i}", title=f"Title {i}") for i in range(3)]
+
+        with patch.object(reference_management, 'supabase', mock_supabase):
+            self.assertEqual(bulk_update_references(references, chunk_size=2), 1)
+
+
+
+def make_table_supabase(fail_rows=()):
+    """Create a mock Supabase client that records inserts per table.
+
+    Inserts echo their rows back; a multi-row insert containing a row whose
+    title is in fail_rows raises, as would a failing database constraint.
+    """
+    mock_supabase = MagicMock()
+    tables = {}
+    writes = []
+
+    def table(name):
+        if name not in tables:
+            table_mock = MagicMock()
+
+            def write(rows, **options):
+                writes.append((name, rows))
+                batch = rows if isinstance(rows, list) else [rows]
+                if any(row.get('title') in fail_rows for row in batch):
+                    raise Exception("constraint violation")
+                return MagicMock(execute=MagicMock(return_value=MagicMock(data=batch)))
+
+            table_mock.insert.side_effect = write
+            table_mock.upsert.side_effect = write
+            tables[name] = table_mock
+        return tables[name]
+
+    mock_supabase.table.side_effect = table
+    return mock_supabase, tables, writes
+
+
+class TestCreateReferences(unittest.TestCase):
+    """Test cases for create_references."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase with an empty library."""
+        for patcher in [patch.object(reference_management, 'is_connected', return_value=True),
+                        patch.object(reference_management, 'get_near_duplicate_index',
+                                     return_value=ReferenceLSHIndex())]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_inserts_each_table_once(self):
+        """Test that references, categories and quality rows are each written in one request."""
+        mock_supabase, tables, writes = make_table_supabase()
+        references = [
+            Reference(title='Deep Learning', authors='LeCun, Y., Bengio, Y., Hinton, G.',
+                      categories=['cat-1', 'cat-2'],
+                      quality_assessment=ReferenceQuality(currency_score=4, relevance_score=5, authority_score=5,
+                                                          accuracy_score=4, purpose_score=2)),
+            Reference(title='Attention Is All You Need', authors='Vaswani, A., Shazeer, N.'),
+            Reference(title='Deep learning.', authors='Hinton G, LeCun Y, Bengio Y et al.'),
+        ]
+
+        with patch.object(reference_management, 'supabase', mock_supabase):
+            reference_ids = create_references(references, reuse_near_duplicates=True)
+
+        self.assertEqual(reference_ids, [references[0].reference_id, references[1].reference_id,
+                                         references[0].reference_id])
+        self.assertEqual([name for name, _ in writes], ['reference_sources', 'reference_to_category',
+                                                        'reference_quality'])
+        self.assertEqual(len(writes[0][1]), 2)
+        self.assertEqual(len(writes[1][1]), 2)
+        self.assertEqual(writes[2][1][0]['reference_id'], references[0].reference_id)
+        self.assertEqual(writes[2][1][0]['overall_score'], 4)
+
+    def test_failed_row_is_reported(self):
+        """Test that a failing row maps to None without failing the rest."""
+        mock_supabase, tables, writes = make_table_supabase(fail_rows={'Broken'})
+        references = [Reference(title='Deep Learning'), Reference(title='Broken'),
+                      Reference(title='Attention Is All You Need')]
+
+        with patch.object(reference_management, 'supabase', mock_supabase):
+            reference_ids = create_references(references)
+
+        self.assertEqual(reference_ids, [references[0].reference_id, None, references[2].reference_id])
+
+
+class TestLinkReferences(unittest.TestCase):
+    """Test cases for link_references."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase."""
+        patcher = patch.object(reference_management, 'is_connected', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_existing_and_inserts_rest_together(self):
+        """Test that existing links are reused and new links are inserted in one request."""
+        mock_supabase, tables, writes = make_table_supabase()
+        links_table = mock_supabase.table('content_references')
+        links_table.select.return_value.eq.return_value.in_.return_value.execute.return_value = \
+            MagicMock(data=[{'id': 'link-1', 'reference_id': 'ref-1'}])
+        links = [
+            {'reference_id': 'ref-1', 'citation_key': 'REF1'},
+            {'reference_id': 'ref-2', 'citation_key': 'REF2'},
+            {'reference_id': 'ref-3', 'citation_key': 'REF3'},
+            {'reference_id': 'ref-2', 'citation_key': 'REF4'},
+        ]
+
+        with patch.object(reference_management, 'supabase', mock_supabase):
+            link_ids = link_references('content-1', links)
+
+        self.assertEqual(len(writes), 1)
+        inserted = writes[0][1]
+        self.assertEqual([row['reference_id'] for row in inserted], ['ref-2', 'ref-3'])
+        self.assertEqual([row['citation_key'] for row in inserted], ['REF2', 'REF3'])
+        self.assertEqual(link_ids, ['link-1', inserted[0]['id'], inserted[1]['id'], inserted[0]['id']])
+        links_table.select.assert_called_once()
+
+
+
+class MissingFunctionError(Exception):
+    """Error raised by PostgREST for a database function that does not exist."""
+    code = 'PGRST202'
+
+
+class TestReferenceDetailFunctions(unittest.TestCase):
+    """Test cases for fetching reference details with database functions."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase with the functions installed."""
+        self.mock_supabase = MagicMock()
+        for patcher in [patch.object(reference_management, 'is_connected', return_value=True),
+                        patch.object(reference_management, '_missing_functions', set()),
+                        patch.object(reference_management, 'supabase', self.mock_supabase)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_get_reference_in_one_call(self):
+        """Test that a reference, its categories and quality come from one function call."""
+        self.mock_supabase.rpc.return_value.execute.return_value = MagicMock(data={
+            'id': 'ref-1', 'title': 'Deep Learning', 'metadata': {'source': 'import'},
+            'categories': ['cat-1'],
+            'quality_assessment': {'id': 'q-1', 'reference_id': 'ref-1', 'overall_score': 4}
+        })
+
+        reference = get_reference('ref-1')
+
+        self.mock_supabase.rpc.assert_called_once_with('get_reference_details', {'p_reference_id': 'ref-1'})
+        self.mock_supabase.table.assert_not_called()
+        self.assertEqual(reference.title, 'Deep Learning')
+        self.assertEqual(reference.categories, ['cat-1'])
+        self.assertEqual(reference.quality_assessment.overall_score, 4)
+
+    def test_get_reference_not_found(self):
+        """Test that a missing reference returns None without querying the tables."""
+        self.mock_supabase.rpc.return_value.execute.return_value = MagicMock(data=None)
+
+        self.assertIsNone(get_reference('ref-1'))
+        self.mock_supabase.table.assert_not_called()
+
+    def test_falls_back_when_function_is_missing(self):
+        """Test that the tables are queried, and the function not retried, when it is not installed."""
+        self.mock_supabase.rpc.return_value.execute.side_effect = MissingFunctionError("function not found")
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = \
+            MagicMock(data=[])
+
+        self.assertEqual(get_content_references('content-1'), [])
+        self.assertEqual(get_content_references('content-1'), [])
+
+        self.mock_supabase.rpc.assert_called_once()
+        self.assertEqual(self.mock_supabase.table.call_count, 2)
+
+    def test_get_content_references_in_one_call(self):
+        """Test that content references come from one function call."""
+        rows = [{'id': 'ref-1', 'title': 'Deep Learning', 'citation_key': 'REF1',
+                 'quality_score': 4, 'categories': ['Research']}]
+        self.mock_supabase.rpc.return_value.execute.return_value = MagicMock(data=rows)
+
+        self.assertEqual(get_content_references('content-1'), rows)
+        self.mock_supabase.rpc.assert_called_once_with('get_content_reference_details', {'p_content_id': 'content-1'})
+
+
+    def test_statistics_in_one_call(self):
+        """Test that statistics are read from the statistics table in one call."""
+        stats = {'total_references': 3, 'unique_types': 2, 'avg_quality': 3.5, 'linked_content_count': 1,
+                 'type_breakdown': [{'reference_type': 'Article', 'count': 2}],
+                 'category_breakdown': [{'name': 'Research', 'count': 1}]}
+        self.mock_supabase.rpc.return_value.execute.return_value = MagicMock(data=stats)
+
+        self.assertEqual(get_reference_statistics(), stats)
+        self.mock_supabase.rpc.assert_called_once_with('get_reference_statistics', {})
+        self.mock_supabase.table.assert_not_called()
+
+    def test_statistics_computed_when_function_is_missing(self):
+        """Test that statistics are aggregated from the tables when the function is not installed."""
+        self.mock_supabase.rpc.return_value.execute.side_effect = MissingFunctionError("function not found")
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = \
+            MagicMock(data=[])
+
+        self.assertEqual(get_reference_statistics()['total_references'], 0)
+        self.mock_supabase.table.assert_called_once_with('reference_sources')
+
+class TestReferenceLookupCache(unittest.TestCase):
+    """Test cases for the reference category and type cache."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase with an empty cache."""
+        self.mock_supabase = MagicMock()
+        self.categories = [{'id': 'cat-1', 'name': 'Ethics'}]
+        self.mock_supabase.table.return_value.select.return_value.order.return_value.execute.side_effect = \
+            lambda: MagicMock(data=[dict(row) for row in self.categories])
+        for patcher in [patch.object(reference_management, 'is_connected', return_value=True),
+                        patch.object(reference_management, 'supabase', self.mock_supabase)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        invalidate_reference_lookups()
+        self.addCleanup(invalidate_reference_lookups)
+
+    def test_cached_between_calls(self):
+        """Test that categories and types are each loaded once."""
+        self.assertEqual(get_reference_categories(), self.categories)
+        self.assertEqual(get_reference_categories(), self.categories)
+        get_reference_types()
+        get_reference_types()
+
+        self.assertEqual([call[0][0] for call in self.mock_supabase.table.call_args_list],
+                         ['reference_categories', 'reference_types'])
+
+    def test_returned_rows_are_copies(self):
+        """Test that changing returned rows does not change the cache."""
+        get_reference_categories()[0]['name'] = 'Changed'
+        self.assertEqual(get_reference_categories()[0]['name'], 'Ethics')
+
+    def test_invalidate_and_ttl(self):
+        """Test that the cache is reloaded after invalidation and after the TTL."""
+        get_reference_categories()
+        self.categories = [{'id': 'cat-1', 'name': 'AI Ethics'}]
+        self.assertEqual(get_reference_categories()[0]['name'], 'Ethics')
+
+        invalidate_reference_lookups()
+        self.assertEqual(get_reference_categories()[0]['name'], 'AI Ethics')
+
+        self.categories = [{'id': 'cat-1', 'name': 'Responsible AI'}]
+        with patch.object(reference_management, 'REFERENCE_LOOKUP_CACHE_TTL', 0):
+            self.assertEqual(get_reference_categories()[0]['name'], 'Responsible AI')
+
+    def test_load_racing_invalidation_is_not_cached(self):
+        """Test that rows loaded before an invalidation are not cached."""
+        def execute():
+            invalidate_reference_lookups()
+            return MagicMock(data=[dict(row) for row in self.categories])
+
+        self.mock_supabase.table.return_value.select.return_value.order.return_value.execute.side_effect = execute
+        get_reference_categories()
+        get_reference_categories()
+
+        self.assertEqual(self.mock_supabase.table.call_count, 2)
+
+    def test_category_names_reload_for_new_category(self):
+        """Test that an unknown category ID reloads the cached categories once."""
+        get_reference_categories()
+        self.categories.append({'id': 'cat-2', 'name': 'Policy'})
+
+        names = reference_management._get_category_names(['cat-1', 'cat-2'])
+
+        self.assertEqual(names, {'cat-1': 'Ethics', 'cat-2': 'Policy'})
+        self.assertEqual(self.mock_supabase.table.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test cases for near-duplicate reference detection.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management import reference_management
+from reference_management.reference_management import Reference
+from reference_management.reference_minhash import (
+    ReferenceLSHIndex, MinHasher, shingle_reference, estimate_similarity
+)
+
+ATTENTION = {
+    'id': 'ref-1',
+    'title': 'Attention Is All You Need',
+    'authors': 'Vaswani, A., Shazeer, N., Parmar, N., Uszkoreit, J.',
+    'publication_name': 'Advances in Neural Information Processing Systems',
+}
+
+ATTENTION_VARIANT = {
+    'id': 'ref-2',
+    'title': 'Attention is all you need.',
+    'authors': 'Shazeer N, Vaswani A, Uszkoreit J, Parmar N et al.',
+    'publication_name': 'Advances in Neural Information Processing Systems',
+}
+
+RESNET = {
+    'id': 'ref-3',
+    'title': 'Deep Residual Learning for Image Recognition',
+    'authors': 'He, K., Zhang, X., Ren, S., Sun, J.',
+    'publication_name': 'IEEE Conference on Computer Vision and Pattern Recognition',
+}
+
+RESNET_VARIANT = {
+    'id': 'ref-4',
+    'title': 'Deep residual learning for image recognition',
+    'authors': 'Kaiming He, Xiangyu Zhang, Shaoqing Ren, Jian Sun',
+    'publication_name': 'IEEE Conference on Computer Vision and Pattern Recognition',
+}
+
+
+class TestMinHash(unittest.TestCase):
+    """Test cases for shingles and signatures."""
+
+    def test_shingles_ignore_order_initials_and_et_al(self):
+        """Test that author order, initials and "et al." do not matter."""
+        first = shingle_reference({'title': 'Deep Learning', 'authors': 'LeCun, Y., Bengio, Y., Hinton, G.'})
+        second = shingle_reference({'title': 'Deep learning.', 'authors': 'Hinton G, LeCun Y, Bengio Y et al.'})
+        self.assertEqual(first, second)
+
+    def test_shingles_keep_numbers_and_year(self):
+        """Test that single-digit numbers and the publication year are kept."""
+        shingles = shingle_reference({'title': 'GPT-4 Technical Report', 'publication_date': '2023-03-15'})
+        self.assertEqual(shingles, {'gpt', '4', 'technical', 'report', '2023'})
+
+    def test_signature_similarity_tracks_jaccard(self):
+        """Test that identical sets match exactly and disjoint sets do not."""
+        hasher = MinHasher()
+        signature = hasher.signature({'alpha', 'beta', 'gamma'})
+
+        self.assertEqual(estimate_similarity(signature, hasher.signature({'gamma', 'beta', 'alpha'})), 1.0)
+        self.assertLess(estimate_similarity(signature, hasher.signature({'delta', 'epsilon', 'zeta'})), 0.1)
+
+    def test_signatures_are_reproducible(self):
+        """Test that separate hashers produce the same signatures."""
+        self.assertTrue((MinHasher().signature({'alpha', 'beta'}) == MinHasher().signature({'alpha', 'beta'})).all())
+
+
+class TestReferenceLSHIndex(unittest.TestCase):
+    """Test cases for ReferenceLSHIndex."""
+
+    def setUp(self):
+        """Set up an index with two references."""
+        self.index = ReferenceLSHIndex()
+        self.index.add_many([ATTENTION, RESNET])
+
+    def test_finds_near_duplicate(self):
+        """Test that an LLM-style variant is found as a near-duplicate."""
+        match = self.index.find_near_duplicate(ATTENTION_VARIANT)
+
+        self.assertIsNotNone(match)
+        self.assertEqual(match[0], 'ref-1')
+
+    def test_unrelated_reference_is_not_a_duplicate(self):
+        """Test that an unrelated reference has no near-duplicate."""
+        self.assertIsNone(self.index.find_near_duplicate({
+            'title': 'Generative Adversarial Networks',
+            'authors': 'Goodfellow, I.',
+            'publication_name': 'Communications of the ACM',
+        }))
+
+    def test_conflicting_numbers_are_not_duplicates(self):
+        """Test that versions and years of otherwise identical references are kept apart."""
+        self.index.add_many([
+            {'id': 'gpt-4', 'title': 'GPT-4 Technical Report', 'authors': 'OpenAI'},
+            {'id': 'index-2023', 'title': 'Artificial Intelligence Index Report', 'authors': 'Stanford HAI',
+             'publication_date': '2023-04-03'},
+        ])
+
+        self.assertIsNone(self.index.find_near_duplicate({'title': 'GPT-3 Technical Report', 'authors': 'OpenAI'}))
+        self.assertIsNone(self.index.find_near_duplicate({
+            'title': 'Artificial Intelligence Index Report', 'authors': 'Stanford HAI', 'publication_date': '2024-04-15'
+        }))
+        self.assertEqual(self.index.find_near_duplicate({
+            'title': 'Artificial Intelligence Index Report 2023', 'authors': 'Stanford HAI'
+        })[0], 'index-2023')
+
+    def test_query_skips_itself(self):
+        """Test that an indexed reference is not its own duplicate."""
+        self.assertEqual(self.index.query(ATTENTION), [])
+
+    def test_find_clusters(self):
+        """Test that duplicates are grouped and singletons are left out."""
+        self.index.add_many([ATTENTION_VARIANT, RESNET_VARIANT, {'id': 'ref-5', 'title': 'Something Else Entirely'}])
+
+        self.assertEqual(self.index.find_clusters(), [['ref-1', 'ref-2'], ['ref-3', 'ref-4']])
+
+    def test_remove(self):
+        """Test that removed references are no longer matched."""
+        self.index.remove('ref-1')
+
+        self.assertIsNone(self.index.find_near_duplicate(ATTENTION_VARIANT))
+        self.assertEqual(len(self.index), 1)
+
+
+class TestCreateReferenceNearDuplicates(unittest.TestCase):
+    """Test cases for the near-duplicate check in create_reference."""
+
+    def setUp(self):
+        """Pretend to be connected to Supabase with an indexed library."""
+        self.index = ReferenceLSHIndex()
+        self.index.add(ATTENTION)
+        self.mock_supabase = MagicMock()
+        for patcher in [patch.object(reference_management, 'is_connected', return_value=True),
+                        patch.object(reference_management, 'get_near_duplicate_index', return_value=self.index),
+                        patch.object(reference_management, 'supabase', self.mock_supabase)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_near_duplicate_is_created_by_default(self):
+        """Test that a near-duplicate is only reported, and still created."""
+        reference = Reference(title=ATTENTION_VARIANT['title'], authors=ATTENTION_VARIANT['authors'],
+                              publication_name=ATTENTION_VARIANT['publication_name'])
+        insert = self.mock_supabase.table.return_value.insert
+        insert.return_value.execute.return_value = MagicMock(data=[{'id': reference.reference_id}])
+
+        with self.assertLogs(reference_management.logger, level='WARNING'):
+            self.assertEqual(reference_management.create_reference(reference), reference.reference_id)
+        insert.assert_called_once()
+
+    def test_reuse_near_duplicates(self):
+        """Test that a near-duplicate is not inserted when reuse is asked for."""
+        reference = Reference(title=ATTENTION_VARIANT['title'], authors=ATTENTION_VARIANT['authors'],
+                              publication_name=ATTENTION_VARIANT['publication_name'])
+
+        self.assertEqual(reference_management.create_reference(reference, reuse_near_duplicates=True), 'ref-1')
+        self.mock_supabase.table.assert_not_called()
+
+    def test_inactive_reference_leaves_index(self):
+        """Test that deactivating a reference removes it from the loaded index."""
+        with patch.object(reference_management, '_near_duplicate_index', self.index):
+            reference_management._index_reference({**ATTENTION, 'is_active': False})
+
+        self.assertEqual(len(self.index), 0)
+
+if __name__ == '__main__':
+    unittest.main()
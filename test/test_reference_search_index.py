@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Test cases for the reference search index.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch, MagicMock, ANY
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from reference_management import reference_management
+from reference_management.reference_search_index import ReferenceSearchIndex, tokenize
+
+
+class TestReferenceSearchIndex(unittest.TestCase):
+    """Test cases for ReferenceSearchIndex."""
+
+    def setUp(self):
+        """Set up an index with a few references."""
+        self.index = ReferenceSearchIndex()
+        self.index.add_many([
+            {'id': 'ref-1', 'title': 'Machine Learning for Climate Science', 'authors': 'Smith, J.',
+             'abstract': 'We apply neural networks to weather data.', 'keywords': ['climate', 'ai']},
+            {'id': 'ref-2', 'title': 'Ethics of Artificial Intelligence', 'authors': 'Jones, A.',
+             'abstract': 'A survey of machine ethics.', 'doi': '10.1000/ethics.2020'},
+            {'id': 'ref-3', 'title': 'Deep Learning', 'authors': 'Goodfellow, I. and Bengio, Y.',
+             'abstract': 'An introduction to deep learning.'},
+            {'id': 'ref-4', 'title': 'Machine Translation', 'authors': 'Brown, P.', 'is_active': False},
+        ])
+
+    def ids(self, query, **kwargs):
+        """Search and return only the reference IDs."""
+        return [reference_id for reference_id, _ in self.index.search_ids(query, **kwargs)]
+
+    def test_tokenize(self):
+        """Test that text is split into lowercase terms."""
+        self.assertEqual(tokenize('Deep-Learning, 2nd Ed.'), ['deep', 'learning', '2nd', 'ed'])
+        self.assertEqual(tokenize(['climate', 'AI']), ['climate', 'ai'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_title_matches_rank_first(self):
+        """Test that a title match outranks an abstract match."""
+        self.assertEqual(self.ids('machine '), ['ref-1', 'ref-2'])
+
+    def test_prefix_matching_of_last_term(self):
+        """Test that the last query term also matches as a prefix."""
+        self.assertEqual(self.ids('goodf'), ['ref-3'])
+        self.assertEqual(self.ids('goodf '), [])
+        self.assertEqual(self.ids('deep lea', match_all=True), ['ref-3'])
+
+    def test_match_all(self):
+        """Test that match_all requires every query term."""
+        self.assertEqual(set(self.ids('machine learning ')), {'ref-1', 'ref-2', 'ref-3'})
+        self.assertEqual(self.ids('machine learning ', match_all=True), ['ref-1'])
+
+    def test_doi_and_keywords_are_indexed(self):
+        """Test that DOIs and keywords are searchable."""
+        self.assertEqual(self.ids('10.1000/ethics'), ['ref-2'])
+        self.assertEqual(self.ids('climate ai ', match_all=True), ['ref-1'])
+
+    def test_inactive_references(self):
+        """Test that inactive references are only returned on request."""
+        self.assertEqual(self.ids('translation'), [])
+        self.assertEqual(self.ids('translation', active_only=False), ['ref-4'])
+
+    def test_update_replaces_terms(self):
+        """Test that re-adding a reference replaces its old terms."""
+        self.index.add({'id': 'ref-3', 'title': 'Reinforcement Learning'})
+
+        self.assertEqual(self.ids('deep'), [])
+        self.assertEqual(self.ids('reinforcement'), ['ref-3'])
+        self.assertEqual(len(self.index), 4)
+
+    def test_remove(self):
+        """Test that removed references are no longer found and slots are reused."""
+        self.index.remove('ref-1')
+        self.assertEqual(self.ids('climate'), [])
+        self.assertNotIn('climate', self.index.vocabulary)
+
+        self.index.add({'id': 'ref-5', 'title': 'Climate Models'})
+        self.assertEqual(self.ids('climate'), ['ref-5'])
+        self.assertEqual(len(self.index.slot_ids), 4)
+
+    def test_limit(self):
+        """Test that results are limited to the best matches."""
+        self.assertEqual(self.ids('learning machine', limit=1), ['ref-1'])
+
+    def test_save_and_load(self):
+        """Test that a saved index gives the same results after loading."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'index', 'references.pkl')
+            self.index.synced_at = '2025-01-01T00:00:00'
+            self.assertTrue(self.index.save(path))
+
+            loaded = ReferenceSearchIndex.load(path)
+
+        self.assertEqual(loaded.search_ids('machine learning'), self.index.search_ids('machine learning'))
+        self.assertEqual(loaded.synced_at, '2025-01-01T00:00:00')
+        self.assertFalse(loaded.dirty)
+
+        loaded.add({'id': 'ref-6', 'title': 'Quantum Computing'})
+        self.assertEqual([reference_id for reference_id, _ in loaded.search_ids('quantum')], ['ref-6'])
+
+    def test_load_missing_file(self):
+        """Test that loading a missing index returns None."""
+        self.assertIsNone(ReferenceSearchIndex.load('/nonexistent/references.pkl'))
+
+
+class TestSearchReferences(unittest.TestCase):
+    """Test cases for search_references with the search index."""
+
+    def test_uses_index_and_adds_quality_scores(self):
+        """Test that search results come from the index in ranked order."""
+        index = ReferenceSearchIndex()
+        index.add_many([
+            {'id': 'ref-1', 'title': 'Learning', 'abstract': 'Machine ethics'},
+            {'id': 'ref-2', 'title': 'Machine Ethics'},
+        ])
+        mock_supabase = MagicMock()
+        quality_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        quality_query.execute.return_value = MagicMock(data=[{'reference_id': 'ref-1', 'overall_score': 4}])
+
+        with patch.object(reference_management, 'get_search_index', return_value=index), \
+                patch.object(reference_management, 'supabase', mock_supabase):
+            results = reference_management.search_references('machine eth')
+
+        self.assertEqual([ref['id'] for ref in results], ['ref-2', 'ref-1'])
+        self.assertEqual([ref['quality_score'] for ref in results], [0, 4])
+        mock_supabase.table.assert_called_once_with('reference_quality')
+
+    def test_large_match_sets_are_fetched_in_chunks(self):
+        """Test that every request filters on at most a chunk of IDs, and results keep their rank."""
+        index = ReferenceSearchIndex()
+        index.add_many([{'id': f"ref-{i:03d}", 'title': f"Machine learning {'ethics ' * (i % 3)}"}
+                        for i in range(450)])
+        chunks = []
+
+        def table(name):
+            mock_table = MagicMock()
+
+            def select(columns):
+                query = MagicMock()
+                query.eq.return_value = query
+
+                def in_(column, values):
+                    chunks.append((name, len(values)))
+                    rows = [{'id': value} if name == 'reference_sources' else
+                            {'reference_id': value, 'overall_score': 3, 'category_id': 'cat'} for value in values]
+                    query.execute.return_value = MagicMock(data=rows)
+                    return query
+
+                query.in_.side_effect = in_
+                return query
+
+            mock_table.select.side_effect = select
+            return mock_table
+
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = table
+
+        with patch.object(reference_management, 'is_connected', return_value=True), \
+                patch.object(reference_management, 'get_search_index', return_value=index), \
+                patch.object(reference_management, '_get_category_names', return_value={'cat': 'Ethics'}), \
+                patch.object(reference_management, 'supabase', mock_supabase):
+            results = reference_management.get_references(search_term='machine learning')
+
+        self.assertEqual(len(results), 450)
+        self.assertEqual([ref['id'] for ref in results],
+                         [reference_id for reference_id, _ in index.search_ids('machine learning', limit=None)])
+        for name in ('reference_sources', 'reference_quality', 'reference_to_category'):
+            self.assertEqual([size for table_name, size in chunks if table_name == name], [200, 200, 50])
+
+
+
+class TestRefreshSearchIndex(unittest.TestCase):
+    """Test cases for refresh_search_index."""
+
+    def setUp(self):
+        """Set up a synced index with a few references."""
+        self.index = ReferenceSearchIndex()
+        self.index.add_many([{'id': f"ref-{i}", 'title': f"Machine learning {i}"} for i in range(1, 5)])
+        self.index.synced_at = '2024-01-01T00:00:00'
+
+    def refresh(self, updated, id_pages):
+        """Refresh the index against updated references and pages of the ID scan."""
+        def iter_reference_pages(page_size=1000, updated_since=None, columns='*'):
+            return iter([updated] if updated_since else id_pages)
+
+        with patch.object(reference_management, 'iter_reference_pages', side_effect=iter_reference_pages):
+            return reference_management.refresh_search_index(self.index)
+
+    def test_deleted_references_are_removed(self):
+        """Test that references missing from the ID scan are no longer found."""
+        refreshed = self.refresh([{'id': 'ref-2', 'title': 'Machine ethics'}],
+                                 [[{'id': 'ref-1'}, {'id': 'ref-2'}], [{'id': 'ref-4'}]])
+
+        self.assertEqual(refreshed, 2)
+        self.assertEqual(sorted(self.index.docs), ['ref-1', 'ref-2', 'ref-4'])
+        self.assertEqual(sorted(ref['id'] for ref in self.index.search('machine', limit=None)),
+                         ['ref-1', 'ref-2', 'ref-4'])
+        self.assertEqual(self.index.search('ethics'), [dict(self.index.docs['ref-2'], search_score=ANY)])
+        self.assertNotEqual(self.index.synced_at, '2024-01-01T00:00:00')
+
+    def test_incomplete_scan_keeps_later_references(self):
+        """Test that references past the end of an interrupted ID scan are kept."""
+        refreshed = self.refresh([], [[{'id': 'ref-2'}]])
+
+        self.assertEqual(refreshed, 1)
+        self.assertEqual(sorted(self.index.docs), ['ref-2', 'ref-3', 'ref-4'])
+        self.assertEqual(self.refresh([], []), 0)
+        self.assertEqual(len(self.index), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test cases for section-level regeneration.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+from unittest.mock import patch
+
+# Add the repository and quality directories to the path so we can import the module
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'quality'))
+
+# Import the module to test
+import section_regeneration
+from content_evaluation import ContentEvaluation
+from section_regeneration import (
+    build_section_prompt, clean_section_body, regenerate_sections, select_sections, splice_sections
+)
+
+FILLER = "Models learn patterns from data and the training process adjusts weights over many steps. " * 5
+
+ARTICLE = f"""# Machine Learning Basics
+
+{FILLER}
+
+## How Models Learn
+
+{FILLER * 2}
+
+## Responsible Practice
+
+Responsible AI asks teams to test for bias and fairness [smith2023ethics]. {FILLER}
+
+## Deployment
+
+```python
+# Serve the model
+model.serve()
+```
+
+{FILLER}
+
+## Sources
+
+[smith2023ethics] Smith, J. (2023). Ethics of AI. *Journal of AI Ethics*. https://doi.org/10.1234/ethics
+"""
+
+REWRITE = ("Sustainability matters here: training uses energy and has a carbon cost, and inclusive, "
+           "accessible design keeps tools fair for a diverse, global audience, with attention to ethics and "
+           "bias [smith2023ethics]. " * 3)
+
+
+class TestSectionRegeneration(unittest.TestCase):
+    """Test cases for section selection, prompts and splicing."""
+
+    def setUp(self):
+        """Write and evaluate the article."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.content_path = os.path.join(self.temp_dir, 'LRN-BEG-001.md')
+        with open(self.content_path, 'w') as f:
+            f.write(ARTICLE)
+        self.evaluation = ContentEvaluation(self.content_path)
+
+    def headings(self, targets):
+        """Get the heading text of targets."""
+        return [target.section.heading.text for target in targets]
+
+    def test_select_sections_for_each_criterion(self):
+        """Test that the longest sections doing least for each criterion are chosen, never the Sources."""
+        targets = select_sections(self.evaluation, ['mission_alignment', 'engagement'], max_sections=3)
+
+        # Deployment has a code block, which counts towards engagement
+        self.assertEqual(self.headings(targets), ["How Models Learn", "Responsible Practice", "Deployment"])
+        self.assertEqual([target.criteria for target in targets],
+                         [['mission_alignment', 'engagement'], ['engagement'], ['mission_alignment']])
+        self.assertEqual(self.headings(select_sections(self.evaluation, ['mission_alignment'], max_sections=1)),
+                         ["How Models Learn"])
+        self.assertNotIn("Sources", self.headings(select_sections(self.evaluation, ['source_quality'], 10)))
+
+    def test_prompt_names_criteria_and_sources(self):
+        """Test that the prompt holds the section, its instructions and the sources to cite."""
+        target = select_sections(self.evaluation, ['source_quality', 'relevance'], max_sections=1)[0]
+        prompt = build_section_prompt(self.evaluation, target)
+
+        self.assertIn('"Machine Learning Basics"', prompt)
+        self.assertIn("beginner", prompt)
+        self.assertIn("[smith2023ethics] Smith, J. (2023)", prompt)
+        self.assertIn("for example [smith2023ethics]", prompt)
+        self.assertNotIn("## Sources", prompt)
+
+    def test_clean_section_body(self):
+        """Test that fences, commentary and a repeated heading are stripped."""
+        text = "```markdown\nHere is the revised section:\n\n## How Models Learn\nNew body.\n```"
+
+        self.assertEqual(clean_section_body(text, "How Models Learn"), "New body.")
+
+    def test_splice_keeps_other_sections(self):
+        """Test that only the chosen section bodies change."""
+        sections = self.evaluation.outline.sections
+        content = splice_sections(self.evaluation, {1: "New body."})
+
+        self.assertIn("## How Models Learn\n\nNew body.\n\n## Responsible Practice", content)
+        self.assertEqual(content.replace("\nNew body.\n", "\n" + FILLER * 2 + "\n"), ARTICLE)
+        self.assertEqual(len(sections), 5)
+
+    def test_splice_keeps_setext_underlines(self):
+        """Test that a setext heading keeps its underline when its body is replaced."""
+        with open(self.content_path, 'w') as f:
+            f.write(f"Machine Learning Basics\n=======================\n\n{FILLER}\n\n"
+                    f"How Models Learn\n----------------\n\n{FILLER}\n")
+        evaluation = ContentEvaluation(self.content_path)
+
+        content = splice_sections(evaluation, {0: "New intro.", 1: "New body."})
+
+        self.assertEqual(content, "Machine Learning Basics\n=======================\n\nNew intro.\n\n"
+                                  "How Models Learn\n----------------\n\nNew body.\n")
+
+    def test_regenerate_sections_improves_failing_criterion(self):
+        """Test that rewritten sections are spliced in and evaluated reusing the sources."""
+        before = self.evaluation.evaluate()
+
+        with patch.object(section_regeneration, 'generate_content', return_value=REWRITE) as generate:
+            revision = regenerate_sections(self.evaluation, ['mission_alignment'], max_sections=2)
+
+        self.assertEqual(generate.call_count, 2)
+        self.assertIs(revision.source_evaluations, self.evaluation.source_evaluations)
+        self.assertIn("## Deployment", revision.content)
+        self.assertGreater(revision.evaluate()['scores']['mission_alignment'], before['scores']['mission_alignment'])
+
+        # The file on disk is untouched
+        with open(self.content_path, 'r') as f:
+            self.assertEqual(f.read(), ARTICLE)
+
+    def test_regenerate_sections_without_output(self):
+        """Test that nothing is returned when every rewrite fails."""
+        with patch.object(section_regeneration, 'generate_content', side_effect=RuntimeError("quota")):
+            self.assertIsNone(regenerate_sections(self.evaluation, ['engagement']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test cases for sequential A/B testing.
+"""
+
+import unittest
+import random
+import math
+import sys
+import os
+
+# Add the quality directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quality')))
+
+# Import the module to test
+from sequential_testing import SequentialComparison, msprt_log_statistic
+
+
+def score(rng, mean):
+    """Draw a score on the 1-5 scale, rounded like evaluation averages."""
+    return min(5.0, max(1.0, round(rng.gauss(mean, 0.4), 1)))
+
+
+class TestMsprtStatistic(unittest.TestCase):
+    """Test cases for msprt_log_statistic."""
+
+    def test_evidence_grows_with_consistent_differences(self):
+        """Test that consistent differences build evidence and noise around zero does not."""
+        consistent = [0.8, 1.0, 0.9, 1.1, 0.9, 1.0]
+        noise = [0.3, -0.2, 0.1, -0.4, 0.2, 0.0]
+
+        self.assertEqual(msprt_log_statistic([1.0]), 0.0)
+        self.assertGreater(msprt_log_statistic(consistent), math.log(1 / 0.05))
+        self.assertGreater(msprt_log_statistic(consistent), msprt_log_statistic(consistent[:3]))
+        self.assertLess(msprt_log_statistic(noise), 0)
+
+    def test_identical_differences(self):
+        """Test that identical differences give a finite statistic."""
+        self.assertTrue(math.isfinite(msprt_log_statistic([0.4] * 5)))
+        self.assertGreater(msprt_log_statistic([0.4] * 5), msprt_log_statistic([0.4] * 3))
+        self.assertLess(msprt_log_statistic([0.0] * 5), 0)
+
+
+class TestSequentialComparison(unittest.TestCase):
+    """Test cases for SequentialComparison."""
+
+    def run_comparison(self, means, seed, samples=40):
+        """Sample arms with the given mean scores until the comparison finishes."""
+        rng = random.Random(seed)
+        comparison = SequentialComparison(list(means))
+        for sample_id in range(samples):
+            for arm in comparison.active:
+                comparison.add(arm, sample_id, score(rng, means[arm]))
+            comparison.update()
+            if comparison.finished:
+                break
+        return comparison
+
+    def test_stops_worse_arm(self):
+        """Test that a clearly worse arm is stopped early with the leader it lost to."""
+        comparison = self.run_comparison({'flash': 4.0, 'pro': 3.2, 'lite': 3.9}, seed=1)
+
+        self.assertEqual(list(comparison.stopped), ['pro'])
+        details = comparison.stopped['pro']
+        self.assertIn(details['leader'], ('flash', 'lite'))
+        self.assertGreater(details['difference'], 0.5)
+        self.assertLess(details['samples'], 15)
+        self.assertEqual(len(comparison.scores['pro']), details['samples'])
+
+    def test_waits_for_min_samples(self):
+        """Test that no arm is stopped before it has the minimum number of paired samples."""
+        comparison = SequentialComparison(['a', 'b'], min_samples=6)
+        for sample_id in range(5):
+            comparison.add('a', sample_id, 5.0)
+            comparison.add('b', sample_id, 1.0 + sample_id / 10)
+
+        self.assertEqual(comparison.update(), [])
+        comparison.add('a', 5, 5.0)
+        comparison.add('b', 5, 1.2)
+
+        self.assertEqual([arm for arm, _ in comparison.update()], ['b'])
+        self.assertTrue(comparison.finished)
+        self.assertEqual(comparison.leader(), 'a')
+
+    def test_false_stops_stay_below_alpha(self):
+        """Test that arms with equal means are rarely stopped, however often the test is checked."""
+        runs = 200
+        false_stops = sum(bool(self.run_comparison({'a': 3.6, 'b': 3.6, 'c': 3.6}, seed).stopped)
+                          for seed in range(runs))
+
+        self.assertLessEqual(false_stops / runs, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
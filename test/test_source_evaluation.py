@@ -4,8 +4,20 @@ Test cases for the Source Evaluation component of the Source Collection module.
 
 import json
 import unittest
+import sys
+import os
+import random
+import tempfile
+import shutil
 from unittest.mock import patch, MagicMock
 
+# Add the quality directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quality')))
+
+# Import the module to test
+import source_evaluation
+from source_evaluation import Source, RelevanceModel, evaluate_source, evaluate_sources
+
 class TestSourceEvaluation(unittest.TestCase):
     """Test cases for the Source Evaluation component."""
     
@@ -367,5 +379,128 @@ class TestSourceEvaluation(unittest.TestCase):
         
         mock_craap_test.assert_called_once_with(source, statement)
 
+
+class TestEvaluateSources(unittest.TestCase):
+    """Test cases for batch CRAAP evaluation."""
+
+    def make_sources(self, count):
+        """Create sources covering every currency band and authority signal."""
+        rng = random.Random(41)
+        publications = ["", "Journal of AI Research", "IEEE Transactions", "Company Blog",
+                        "MIT Press", "Proceedings of NeurIPS", "Tech News"]
+        authors = [None, [], ["Smith, J."], ["Jane Doe (Google)"], ["A. Author", "Stanford University"],
+                   ["Legacy Researcher"], ["OpenAI", "Microsoft Research"]]
+        source_types = ["", "academic", "industry", "technology", "ai"]
+        sources = []
+        for i in range(count):
+            sources.append(Source(
+                citation=f"Source {i}",
+                year=rng.choice([None, 0, 1995, 2008, 2012, 2016, 2019, 2021, 2022, 2023, 2024, 2025, 2030]),
+                authors=rng.choice(authors),
+                publication=rng.choice(publications),
+                doi=rng.choice(["", "", "10.1234/example"]),
+                source_type=rng.choice(source_types)
+            ))
+        return sources
+
+    def test_matches_single_source_evaluation(self):
+        """Test that batch results are identical to evaluating each source."""
+        sources = self.make_sources(500)
+
+        batch = evaluate_sources(sources)
+
+        self.assertEqual(len(batch), len(sources))
+        for source, evaluation in zip(sources, batch):
+            self.assertIs(evaluation.source, source)
+            self.assertEqual(evaluation.to_dict(), evaluate_source(source).to_dict())
+            self.assertIs(type(evaluation.authority_score), int)
+
+    def test_authority_notes(self):
+        """Test the authority notes for a source with every signal."""
+        source = Source(citation="Paper", year=2020, authors=["Researcher at Google", "Stanford"],
+                        publication="Journal of Machine Learning", doi="10.1234/jml")
+
+        evaluation = evaluate_sources([source])[0]
+
+        self.assertEqual(evaluation.authority_score, 5)
+        self.assertEqual(evaluation.notes["authority"],
+                         "Published in academic venue: Journal of Machine Learning; "
+                         "Author(s) affiliated with reputable organization: google; "
+                         "Has DOI, likely peer-reviewed academic work")
+
+    def test_empty_list(self):
+        """Test that no sources give no evaluations."""
+        self.assertEqual(evaluate_sources([]), [])
+
+
+class TestRelevanceModel(unittest.TestCase):
+    """Test cases for TF-IDF relevance scoring."""
+
+    LIBRARY = [
+        "Attention is all you need: transformer networks for machine translation",
+        "Generative AI adoption in business functions: a global survey",
+        "Deep residual learning for image recognition",
+        "The economics of generative AI in the enterprise",
+        "Soil erosion in river deltas",
+    ]
+
+    def setUp(self):
+        """Fit a model on a small library and make it the cached model."""
+        self.model = RelevanceModel.fit(self.LIBRARY)
+        patcher = patch.object(source_evaluation, '_relevance_model', self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scores_rank_relevant_texts_first(self):
+        """Test that similarities follow the overlap with the query."""
+        scores = self.model.score("generative AI adoption in business", self.LIBRARY)
+
+        self.assertEqual(int(scores.argmax()), 1)
+        self.assertEqual(scores[4], 0.0)
+        self.assertAlmostEqual(float(self.model.score(self.LIBRARY[2], [self.LIBRARY[2]])[0]), 1.0)
+        self.assertEqual(self.model.score("unseen words only", self.LIBRARY).tolist(), [0.0] * 5)
+
+    def test_save_and_load(self):
+        """Test that a saved model scores the same after loading."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'relevance_model.pkl')
+
+        self.assertTrue(self.model.save(path))
+        loaded = RelevanceModel.load(path)
+
+        self.assertEqual(len(loaded), len(self.model))
+        query = "transformer translation"
+        self.assertEqual(loaded.score(query, self.LIBRARY).tolist(), self.model.score(query, self.LIBRARY).tolist())
+        self.assertIsNone(RelevanceModel.load(os.path.join(temp_dir, 'missing.pkl')))
+
+    def test_evaluate_sources_uses_topic(self):
+        """Test that relevance scores reflect the topic and match single-source evaluation."""
+        sources = [Source(citation=f"Source {i}", title=title, year=2023) for i, title in enumerate(self.LIBRARY)]
+
+        evaluations = evaluate_sources(sources, "Generative AI in business", ["adoption", "enterprise"])
+
+        self.assertEqual(evaluations[1].relevance_score, 5)
+        self.assertEqual(evaluations[4].relevance_score, 1)
+        self.assertIn("TF-IDF similarity", evaluations[1].notes["relevance"])
+        for source, evaluation in zip(sources, evaluations):
+            single = evaluate_source(source, "Generative AI in business", ["adoption", "enterprise"])
+            self.assertEqual(evaluation.to_dict(), single.to_dict())
+
+    def test_single_and_batch_scores_match_without_a_model(self):
+        """Test that relevance does not depend on the other sources when no model has been fitted."""
+        sources = [Source(citation=f"Source {i}", title=title, year=2023) for i, title in enumerate(self.LIBRARY)]
+
+        with patch.object(source_evaluation, 'get_relevance_model', return_value=None):
+            evaluations = evaluate_sources(sources, "Generative AI in business", ["adoption", "enterprise"])
+            singles = [evaluate_source(source, "Generative AI in business", ["adoption", "enterprise"])
+                       for source in sources]
+
+        self.assertEqual(evaluations[4].relevance_score, 1)
+        self.assertGreater(evaluations[1].relevance_score, evaluations[2].relevance_score)
+        for evaluation, single in zip(evaluations, singles):
+            self.assertEqual(evaluation.to_dict(), single.to_dict())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test cases for the Supabase client helpers.
+"""
+
+import unittest
+import json
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+from core import supabase_client
+
+
+class TestBulkStatusUpdates(unittest.TestCase):
+    """Test cases for update_content_statuses."""
+
+    def make_supabase(self):
+        """Create a mock Supabase client that echoes the updated IDs."""
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.update.return_value
+
+        def in_(column, values):
+            response = MagicMock()
+            response.execute.return_value = MagicMock(data=[{'content_id': value} for value in values])
+            return response
+
+        query.in_.side_effect = in_
+        return mock_supabase
+
+    def test_single_request_for_small_batches(self):
+        """Test that a small batch is updated in one request."""
+        mock_supabase = self.make_supabase()
+
+        with patch.object(supabase_client, 'supabase', mock_supabase):
+            updated = supabase_client.update_content_statuses(['A', 'B', 'C'], 'Not Started', {'reset_time': 'now'})
+
+        self.assertEqual(updated, 3)
+        query = mock_supabase.table.return_value.update
+        self.assertEqual(query.call_count, 1)
+        update_data = query.call_args[0][0]
+        self.assertEqual(update_data['status'], 'Not Started')
+        self.assertEqual(json.loads(update_data['metadata']), {'reset_time': 'now'})
+
+    def test_chunked_requests(self):
+        """Test that large batches are split into chunks."""
+        mock_supabase = self.make_supabase()
+        content_ids = [f"ID-{i:03d}" for i in range(450)]
+
+        with patch.object(supabase_client, 'supabase', mock_supabase):
+            updated = supabase_client.update_content_statuses(content_ids, 'Queued', chunk_size=200)
+
+        self.assertEqual(updated, 450)
+        in_calls = mock_supabase.table.return_value.update.return_value.in_.call_args_list
+        self.assertEqual([len(call[0][1]) for call in in_calls], [200, 200, 50])
+        self.assertNotIn('metadata', mock_supabase.table.return_value.update.call_args[0][0])
+
+    def test_empty_batch(self):
+        """Test that an empty batch makes no requests."""
+        mock_supabase = self.make_supabase()
+
+        with patch.object(supabase_client, 'supabase', mock_supabase):
+            self.assertEqual(supabase_client.update_content_statuses([], 'Queued'), 0)
+
+        mock_supabase.table.assert_not_called()
+
+
+class TestContentFilePages(unittest.TestCase):
+    """Test cases for iter_content_file_pages."""
+
+    def test_keyset_pages_with_content_ids(self):
+        """Test that pages follow the last ID and carry the output's content ID."""
+        rows = [{'id': f"f{i}", 'output_id': f"o{i}", 'file_content': 'text',
+                 'generation_outputs': {'content_id': f"C{i}"}} for i in range(5)]
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value
+
+        def page(after_id):
+            start = int(after_id[1:]) + 1 if after_id else 0
+            response = MagicMock()
+            response.order.return_value.limit.return_value.execute.return_value = MagicMock(
+                data=[dict(row) for row in rows[start:start + 2]])
+            return response
+
+        query.gt.side_effect = lambda column, value: page(value)
+        query.order.return_value.limit.return_value.execute.return_value = MagicMock(data=[dict(row) for row in rows[:2]])
+
+        with patch.object(supabase_client, 'supabase', mock_supabase):
+            pages = list(supabase_client.iter_content_file_pages(page_size=2))
+
+        self.assertEqual([[row['id'] for row in p] for p in pages], [['f0', 'f1'], ['f2', 'f3'], ['f4']])
+        self.assertEqual(pages[2][0]['content_id'], 'C4')
+        self.assertNotIn('generation_outputs', pages[0][0])
+        self.assertEqual([call[0][1] for call in query.gt.call_args_list], ['f1', 'f3'])
+
+
+class TestGenerationHistory(unittest.TestCase):
+    """Test cases for get_generation_history."""
+
+    def make_supabase(self, prompt_count, lengths=True):
+        """Create a mock Supabase client with prompt logs and one output per prompt."""
+        prompts = [{'id': f"p{i}", 'session_id': f"s{i}", 'prompt_chars': 100,
+                    'created_at': '2024-01-01T00:00:00'} for i in range(prompt_count)]
+        tables = {'prompt_logs': MagicMock(), 'generation_outputs': MagicMock()}
+        self.output_selects = []
+        self.chunk_sizes = []
+
+        def prompt_select(columns):
+            if 'prompt_chars' in columns and not lengths:
+                raise Exception("column prompt_logs.prompt_chars does not exist")
+            rows = [dict(prompt) for prompt in prompts]
+            if 'prompt_text' in columns:
+                for row in rows:
+                    row['prompt_text'] = 'x' * row.pop('prompt_chars')
+            query = MagicMock()
+            query.order.return_value.limit.return_value.execute.return_value = MagicMock(data=rows)
+            return query
+
+        def output_select(columns):
+            self.output_selects.append(columns)
+            query = MagicMock()
+
+            def in_(column, values):
+                self.chunk_sizes.append(len(values))
+                rows = [{'prompt_id': value, 'created_at': '2024-01-01T00:00:30'} for value in values]
+                for row in rows:
+                    if 'output_text' in columns:
+                        row['output_text'] = 'y' * 400
+                    else:
+                        row['output_chars'] = 400
+                response = MagicMock()
+                response.order.return_value.execute.return_value = MagicMock(data=rows)
+                return response
+
+            query.in_.side_effect = in_
+            return query
+
+        tables['prompt_logs'].select.side_effect = prompt_select
+        tables['generation_outputs'].select.side_effect = output_select
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        return mock_supabase
+
+    def test_chunked_output_requests_without_text(self):
+        """Test that outputs are fetched in chunks of prompt IDs using the length columns."""
+        mock_supabase = self.make_supabase(450)
+
+        with patch.object(supabase_client, 'supabase', mock_supabase):
+            history = supabase_client.get_generation_history(limit=450)
+
+        self.assertEqual(len(history), 450)
+        self.assertEqual(self.chunk_sizes, [200, 200, 50])
+        self.assertTrue(all('output_text' not in columns for columns in self.output_selects))
+        self.assertEqual((history[0]['prompt_chars'], history[0]['output_chars'], history[0]['latency_seconds']),
+                         (100, 400, 30.0))
+
+    def test_falls_back_to_text_without_length_columns(self):
+        """Test that databases without the length columns still give text lengths."""
+        mock_supabase = self.make_supabase(3, lengths=False)
+
+        with patch.object(supabase_client, 'supabase', mock_supabase):
+            history = supabase_client.get_generation_history()
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual((history[0]['prompt_chars'], history[0]['output_chars']), (100, 400))
+
+
+if __name__ == '__main__':
+    unittest.main()
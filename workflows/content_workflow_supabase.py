@@ -37,6 +37,10 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Version of the content generation prompt. Bump it whenever create_prompt changes
+# so incremental batch runs know previously generated content is stale.
+CONTENT_PROMPT_VERSION = "1"
+
 def create_prompt(content_item):
     """Create a prompt for the Google Generative AI API based on content item."""
     content_id = content_item['content_id']
@@ -166,6 +170,7 @@ def evaluate_sources_with_craap(sources, topic):
                 title=source['title'],
                 publication=source['venue'],
                 url=source.get('url', ''),
+                abstract=source.get('abstract') or '',
                 source_type="academic" if 'journal' in source['venue'].lower() or 'conference' in source['venue'].lower() else "industry"
             )
             source_objects.append(source_obj)
@@ -907,6 +912,21 @@ def generate_content_for_item(content_id, model_name="gemini-1.5-flash", tempera
         })
         return False, None
 
+def generate_content_for_id(content_id, model_name="gemini-1.5-flash", temperature=0.7, force=False):
+    """Generate content for a content item into the default output directory.
+
+    Args:
+        content_id: Content ID
+        model_name: Model name to use for generation
+        temperature: Temperature for generation
+        force: Whether to force regeneration even if dependencies are not met
+
+    Returns:
+        True if content was generated successfully, False otherwise
+    """
+    success, _ = generate_content_for_item(content_id, model_name, temperature, force=force)
+    return success
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description="Generate content for a specific content item.")
@@ -57,7 +57,7 @@ def create_content_with_references_prompt(content_item: Dict[str, Any]) -> str:
         "publication_name": "Name of journal/book/website",
         "url": "Full URL if available",
         "doi": "DOI if available (just the DOI, not the URL)",
-        "reference_type": "One of: Journal Article, Book, Book Chapter, Conference Paper, Report, Thesis, Website, Encyclopedia, Other",
+        "reference_type": "One of: Article, Book, Conference, Report, Website, Dataset, Software, Video, Podcast, Social Media, Interview, Other",
         "citation_context": "Brief description of how this reference was used in the content",
         "apa_citation": "The reference formatted in APA 7th edition style"
     }
@@ -363,7 +363,7 @@ def process_existing_references(content_id: str, model_name: str = "gemini-1.5-f
 
         logger.info(f"Found {len(reference_items)} reference items in content {content_id}")
 
-        # Process references in batches to avoid overwhelming the API
+        # Process references in batches; the shared limiter paces the API calls
         all_processed_references = []
         for i in range(0, len(reference_items), batch_size):
             batch = reference_items[i:i+batch_size]
@@ -371,12 +371,6 @@ def process_existing_references(content_id: str, model_name: str = "gemini-1.5-f
             processed_batch = process_references_batch(batch, model_name, rate_limit_delay)
             all_processed_references.extend(processed_batch)
 
-            # Add a delay between batches
-            if i + batch_size < len(reference_items):
-                import time
-                logger.info(f"Waiting 10 seconds between batches...")
-                time.sleep(10)
-
         processed_references = all_processed_references
 
         # Store processed references
@@ -20,8 +20,10 @@ logger = logging.getLogger(__name__)
 from workflows.content_workflow_supabase import generate_content_for_item as original_generate_content
 from reference_management.reference_management import (
     Reference, ReferenceQuality, create_reference, link_reference_to_content,
-    get_references, get_content_references
+    get_content_references, get_dedup_index
 )
+from reference_management.reference_dedup_index import ReferenceDedupIndex
+from reference_management.citation_parser import parse_citation
 
 def extract_reference_from_text(text: str) -> Dict[str, Any]:
     """Extract reference information from text.
@@ -32,50 +34,10 @@ def extract_reference_from_text(text: str) -> Dict[str, Any]:
     Returns:
         Dictionary with extracted reference information
     """
-    # This is a simplified example - adapt to your reference format
-    # Example format: Author(s). (Year). Title. Publication. URL/DOI
-
-    # Try to extract author
-    author_match = re.search(r'^([^\.]+)\.', text)
-    authors = author_match.group(1).strip() if author_match else "Unknown"
-
-    # Try to extract year
-    year_match = re.search(r'\((\d{4})\)', text)
-    year = year_match.group(1) if year_match else None
-
-    # Try to extract title
-    title_match = re.search(r'\(\d{4}\)\.\s+([^\.]+)\.', text)
-    if title_match:
-        title = title_match.group(1).strip()
-    else:
-        # If no year or standard format, just use the first sentence or part of text
-        title_alt_match = re.search(r'^[^\.]+\.\s+([^\.]+)\.', text)
-        title = title_alt_match.group(1).strip() if title_alt_match else text[:100]
-
-    # Try to extract publication
-    pub_match = re.search(r'\.\s+([^\.]+)\.\s+(?:https?|doi|Retrieved)', text, re.IGNORECASE)
-    publication = pub_match.group(1).strip() if pub_match else "Unknown"
-
-    # Try to extract URL/DOI
-    url_match = re.search(r'(https?://[^\s]+|doi:[^\s]+)', text, re.IGNORECASE)
-    url = url_match.group(1) if url_match else None
-
-    # Try to extract DOI separately
-    doi_match = re.search(r'doi:([^\s]+)', text, re.IGNORECASE) or re.search(r'https?://doi.org/([^\s]+)', text, re.IGNORECASE)
-    doi = doi_match.group(1) if doi_match else None
-
-    return {
-        'authors': authors,
-        'publication_date': f"{year}-01-01" if year else None,
-        'title': title,
-        'publication_name': publication,
-        'url': url,
-        'doi': doi,
-        'reference_type': 'Article',  # Default type
-        'content': text,  # Store original text
-        'abstract': "Automatically extracted from generated content",
-        'is_active': True
-    }
+    ref_data = parse_citation(text)
+    ref_data['abstract'] = "Automatically extracted from generated content"
+    ref_data['is_active'] = True
+    return ref_data
 
 def extract_references_from_content(content_text: str) -> List[str]:
     """Extract references from content text.
@@ -116,38 +78,32 @@ def store_references_in_database(content_id: str, reference_items: List[str]) ->
     Returns:
         List of reference IDs
     """
-    # Get existing references to avoid duplicates
-    existing_references = get_references()
-    existing_titles = [ref.get('title', '').lower() for ref in existing_references]
+    # Look up existing references by DOI, URL or title to avoid duplicates
+    dedup_index = get_dedup_index() or ReferenceDedupIndex()
 
     reference_ids = []
     for i, ref_text in enumerate(reference_items):
         # Extract reference data
         ref_data = extract_reference_from_text(ref_text)
 
-        # Skip if title already exists
-        if ref_data['title'].lower() in existing_titles:
+        # Link the existing reference instead of creating a duplicate
+        existing_id = dedup_index.find(ref_data)
+        if existing_id:
             logger.info(f"Skipping duplicate reference: {ref_data['title']}")
 
-            # Find the existing reference ID
-            for ref in existing_references:
-                if ref.get('title') and ref.get('title').lower() == ref_data['title'].lower():
-                    # Link existing reference to content
-                    citation_key = f"REF{i+1}"
-                    link_id = link_reference_to_content(
-                        content_id=content_id,
-                        reference_id=ref.get('id'),
-                        citation_key=citation_key,
-                        citation_context="Extracted from generated content"
-                    )
-
-                    if link_id:
-                        reference_ids.append(ref.get('id'))
-                        logger.info(f"Linked existing reference: {ref_data['title']} to content {content_id}")
-                    else:
-                        logger.error(f"Failed to link existing reference {ref.get('id')} to content {content_id}")
-
-                    break
+            citation_key = f"REF{i+1}"
+            link_id = link_reference_to_content(
+                content_id=content_id,
+                reference_id=existing_id,
+                citation_key=citation_key,
+                citation_context="Extracted from generated content"
+            )
+
+            if link_id:
+                reference_ids.append(existing_id)
+                logger.info(f"Linked existing reference: {ref_data['title']} to content {content_id}")
+            else:
+                logger.error(f"Failed to link existing reference {existing_id} to content {content_id}")
 
             continue
 
@@ -179,6 +135,9 @@ def store_references_in_database(content_id: str, reference_items: List[str]) ->
         # Store reference in database
         reference_id = create_reference(ref)
         if reference_id:
+            # Later duplicates in this batch should match the new reference
+            dedup_index.add({**ref_data, 'id': reference_id}, replace=False)
+
             # Link reference to content
             citation_key = f"REF{i+1}"
             link_id = link_reference_to_content(
@@ -190,7 +149,6 @@ def store_references_in_database(content_id: str, reference_items: List[str]) ->
 
             if link_id:
                 reference_ids.append(reference_id)
-                existing_titles.append(ref_data['title'].lower())
                 logger.info(f"Imported reference: {ref_data['title']} for content {content_id}")
             else:
                 logger.error(f"Failed to link reference {reference_id} to content {content_id}")